@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+Benchmark the session archive.
+
+The live path parses the payloads alone, or parses them and writes their messages into
+the archive. The read path walks the whole archive, or seeks a time range or an action
+ID with the index.
+"""
+from os.path import join
+from tempfile import TemporaryDirectory
+from timeit import repeat
+
+from src.sniparinject.core.archive import ArchiveReader, ArchiveWriter
+from src.sniparinject.core.capture import Flow
+from src.sniparinject.core.direction import Direction
+from src.sniparinject.core.parser import ProtocolParser
+
+PAYLOADS = 20000
+MESSAGES = 4
+FLOW = Flow('tcp', '12.218.12.2', 541, '10.0.0.7', 50000)
+
+
+def parse(parser: ProtocolParser, payloads: list) -> None:
+    """
+    Parse the payloads, as the sniffer without archive.
+
+    :type parser: ProtocolParser
+    :param parser: The parser.
+
+    :type payloads: list
+    :param payloads: The payloads.
+
+    :rtype: None
+    :return: Nothing.
+    """
+    for payload in payloads:
+        parser.parse(payload, Direction.NODE, True)
+
+
+def parse_archive(parser: ProtocolParser, payloads: list, path: str) -> None:
+    """
+    Parse the payloads and write their messages into a new archive.
+
+    :type parser: ProtocolParser
+    :param parser: The parser.
+
+    :type payloads: list
+    :param payloads: The payloads.
+
+    :type path: str
+    :param path: The path of the new archive.
+
+    :rtype: None
+    :return: Nothing.
+    """
+    archive = ArchiveWriter(path)
+    for timestamp, payload in enumerate(payloads):
+        archive.write(payload, parser.parse(payload, Direction.NODE, True), Direction.NODE, FLOW,
+                      float(timestamp))
+    archive.close()
+
+
+def read(path: str, *args) -> int:
+    """
+    Read the messages of the archive.
+
+    :type path: str
+    :param path: The path of the archive.
+
+    :type args: Any
+    :param args: The time range and the action ID.
+
+    :rtype: int
+    :return: The number of messages.
+    """
+    reader = ArchiveReader(path)
+    count = sum(1 for _ in reader.records(*args))
+    reader.close()
+
+    return count
+
+
+def print_results(title: str, results: dict, unit: int) -> None:
+    """
+    Print the time of every path and its ratio to the first one.
+
+    :type title: str
+    :param title: The title of the results.
+
+    :type results: dict
+    :param results: The seconds of every path.
+
+    :type unit: int
+    :param unit: The number of payloads of one run.
+
+    :rtype: None
+    :return: Nothing.
+    """
+    print(f'=== {title} ===')
+    baseline = next(iter(results.values()))
+    for name, seconds in results.items():
+        print(f'{name:<24} {seconds * 1e6 / unit:8.2f} us/payload {baseline / seconds:8.2f}x')
+
+
+def main() -> None:
+    """
+    Run the benchmark and print the results.
+
+    :rtype: None
+    :return: Nothing.
+    """
+    actions = {action_id: {'title': f'Action {action_id}', 'structs': [
+        {'name': 'X', 'type': 'unsigned short'}, {'name': 'Y', 'type': 'unsigned short'}]}
+        for action_id in range(1, 65)}
+    parser = ProtocolParser.from_settings({'Game': {'node': {'actions': actions}}})
+    payloads = [b''.join(bytes([(index + message) % 64 + 1, 0]) + bytes(4)
+                         for message in range(MESSAGES)) for index in range(PAYLOADS)]
+
+    with TemporaryDirectory() as directory:
+        paths = iter(join(directory, f'session.{number}.arc') for number in range(5))
+        results = {
+            'Parse': min(repeat(lambda: parse(parser, payloads), number=1, repeat=5)),
+            'Parse and archive': min(repeat(lambda: parse_archive(parser, payloads, next(paths)),
+                                            number=1, repeat=5)),
+        }
+        print_results('Live path', results, PAYLOADS)
+
+        path = join(directory, 'session.0.arc')
+        results = {
+            'Read all': min(repeat(lambda: read(path), number=1, repeat=5)),
+            'Seek 1% of the time': min(repeat(
+                lambda: read(path, PAYLOADS * 0.5, PAYLOADS * 0.51), number=1, repeat=5)),
+            'Seek one action': min(repeat(lambda: read(path, None, None, 7), number=1, repeat=5)),
+        }
+        print_results('Read path', results, PAYLOADS)
+
+
+if __name__ == '__main__':
+    main()
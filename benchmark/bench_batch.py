@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+Benchmark the batch decoding of many payloads with NumPy against the scalar unpack of
+every message.
+
+Both paths cut the payloads into messages, only the decoding is different.
+"""
+from time import perf_counter
+
+from src.sniparinject.core.batch import BatchDecoder, numpy
+from src.sniparinject.core.direction import Direction
+from src.sniparinject.core.parser import ProtocolParser
+
+from .bench_schema import PAYLOAD, SETTINGS
+
+PAYLOADS = 10_000
+MESSAGES = (1, 16, 128)
+
+
+def run(batch_decoder: BatchDecoder, payloads: list[bytes]) -> float:
+    """
+    Decode the payloads and return the best time of three runs.
+
+    :type batch_decoder: BatchDecoder
+    :param batch_decoder: The decoder.
+
+    :type payloads: list[bytes]
+    :param payloads: The data of the packets.
+
+    :rtype: float
+    :return: The seconds to decode the payloads.
+    """
+    times = []
+    for _ in range(3):
+        start = perf_counter()
+        batch_decoder.decode(payloads, Direction.HOST)
+        times.append(perf_counter() - start)
+
+    return min(times)
+
+
+def main() -> None:
+    """
+    Run the benchmark and print the results.
+
+    :rtype: None
+    :return: Nothing.
+    """
+    parser = ProtocolParser.from_settings(SETTINGS)
+    if numpy is None:
+        print('NumPy is not installed, only the scalar path is measured.')
+    for count in MESSAGES:
+        payloads = [PAYLOAD * count] * PAYLOADS
+        results = {'scalar unpack': run(BatchDecoder(parser, use_numpy=False), payloads)}
+        if numpy is not None:
+            results['numpy frombuffer'] = run(BatchDecoder(parser), payloads)
+
+        print(f'=== Batch: {PAYLOADS} payloads of {count} messages ===')
+        baseline = results['scalar unpack']
+        for name, seconds in results.items():
+            print(f'{name:<20} {seconds * 1e9 / PAYLOADS / count:8.1f} ns/message'
+                  f' {baseline / seconds:6.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+Benchmark the generated decode functions of the actions against the interpreted fields.
+
+Only the unpack and the format of the values are measured, not the ANSI styles.
+"""
+from timeit import repeat
+
+from src.sniparinject.core.schema import ProtocolSchema
+
+from .bench_schema import PAYLOAD, SETTINGS
+
+ITERATIONS = 100_000
+ACTIONS = {
+    'NPC Info': (0x78, PAYLOAD),
+    'Stats': (0x79, b'\x79\x00' + bytes(range(16))),
+}
+STATS = {
+    'title': 'Stats',
+    'structs': [
+        {'name': 'Class', 'type': 'unsigned char', 'reference': {0: 'Novice', 1: 'Swordman'}},
+        {'name': 'Level', 'type': 'unsigned char', 'output': {'fill_left': 3}},
+        {'name': 'Stats', 'type': 'unsigned char', 'size': 6},
+        {'name': 'Zeny', 'type': 'unsigned int', 'output': {'type': 'hex', 'zero_fill': 10}},
+        {'name': 'Flags', 'type': 'chars', 'size': 4, 'output': {'type': 'hex', 'fill': 10}},
+    ],
+}
+
+
+def interpreted(action, payload: bytes) -> list:
+    """
+    The interpreted path: every field checks its reference and runs its output steps.
+
+    :type action: CompiledAction
+    :param action: The compiled action.
+
+    :type payload: bytes
+    :param payload: The payload, with the ID.
+
+    :rtype: list
+    :return: The formatted values.
+    """
+    return [field.format(variable)
+            for field, variable in zip(action.fields, action.struct.unpack_from(payload, 2))]
+
+
+def main() -> None:
+    """
+    Run the benchmark and print the results.
+
+    :rtype: None
+    :return: Nothing.
+    """
+    game = dict(SETTINGS['Game'], host={'actions': {**SETTINGS['Game']['host']['actions'],
+                                                    0x79: STATS}})
+    actions = ProtocolSchema.from_settings({'Game': game}).host.actions
+    generated_actions = ProtocolSchema.from_settings(
+        {'Game': dict(game, codegen=True)}).host.actions
+    for title, (action_id, payload) in ACTIONS.items():
+        action, generated = actions[action_id], generated_actions[action_id]
+        assert interpreted(action, payload) == list(generated.decode(payload, 2))
+
+        results = {
+            'interpreted fields': min(repeat(
+                lambda: interpreted(action, payload), number=ITERATIONS, repeat=5)),
+            'generated function': min(repeat(
+                lambda: generated.decode(payload, 2), number=ITERATIONS, repeat=5)),
+        }
+
+        print(f'=== Codegen: {title}, {len(action.fields)} fields ===')
+        print(generated.source)
+        baseline = results['interpreted fields']
+        for name, seconds in results.items():
+            print(f'{name:<20} {seconds * 1e9 / ITERATIONS:8.1f} ns/message'
+                  f' {baseline / seconds:6.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+Benchmark the dense dispatch tuple of the compiled actions against the dictionary lookups.
+
+Only the lookup of the action of every ID is measured, half of the IDs are unknown.
+"""
+from timeit import repeat
+
+from src.sniparinject.core.schema import ProtocolSchema
+
+ITERATIONS = 1000
+ACTIONS = (16, 256, 4096)
+
+
+def yaml_lookup(actions: dict, ids: list[int]) -> int:
+    """
+    The first path: check the keys of the YAML dictionary, then get the action.
+
+    :type actions: dict
+    :param actions: The actions of the settings.
+
+    :type ids: list[int]
+    :param ids: The IDs of the messages.
+
+    :rtype: int
+    :return: The number of known IDs.
+    """
+    known = 0
+    for action_id in ids:
+        if action_id in actions.keys():
+            known += actions.get(action_id) is not None
+
+    return known
+
+
+def mapping_lookup(actions, ids: list[int]) -> int:
+    """
+    The previous path: get the compiled action from the read-only mapping.
+
+    :type actions: Mapping
+    :param actions: The compiled actions.
+
+    :type ids: list[int]
+    :param ids: The IDs of the messages.
+
+    :rtype: int
+    :return: The number of known IDs.
+    """
+    known = 0
+    for action_id in ids:
+        known += actions.get(action_id) is not None
+
+    return known
+
+
+def dispatch_lookup(dispatch: tuple, ids: list[int]) -> int:
+    """
+    The current path: index the dense tuple with the ID.
+
+    :type dispatch: tuple
+    :param dispatch: The compiled action of every ID, None if it is unknown.
+
+    :type ids: list[int]
+    :param ids: The IDs of the messages.
+
+    :rtype: int
+    :return: The number of known IDs.
+    """
+    known = 0
+    for action_id in ids:
+        known += dispatch[action_id] is not None
+
+    return known
+
+
+def main() -> None:
+    """
+    Run the benchmark and print the results.
+
+    :rtype: None
+    :return: Nothing.
+    """
+    for count in ACTIONS:
+        actions = {action_id: {'title': f'Action {action_id}'} for action_id in range(count)}
+        request = ProtocolSchema.from_settings({'Game': {'node': {'actions': actions}}}).node
+        ids = [action_id * 7 % (count * 2) for action_id in range(count * 2)]
+        known = yaml_lookup(actions, ids)
+        assert known == mapping_lookup(request.actions, ids) == dispatch_lookup(
+            request.dispatch, ids) == count
+
+        results = {
+            'YAML dictionary': min(repeat(
+                lambda: yaml_lookup(actions, ids), number=ITERATIONS, repeat=5)),
+            'compiled mapping': min(repeat(
+                lambda: mapping_lookup(request.actions, ids), number=ITERATIONS, repeat=5)),
+            'dispatch tuple': min(repeat(
+                lambda: dispatch_lookup(request.dispatch, ids), number=ITERATIONS, repeat=5)),
+        }
+
+        print(f'=== Dispatch: {count} actions ===')
+        baseline = results['YAML dictionary']
+        for name, seconds in results.items():
+            print(f'{name:<20} {seconds * 1e9 / ITERATIONS / len(ids):8.1f} ns/lookup'
+                  f' {baseline / seconds:6.2f}x')
+
+
+if __name__ == '__main__':
+    main()
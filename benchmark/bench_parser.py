@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+Benchmark the offset cursor of the parser against slicing the payload for every message.
+
+Only the decoding is measured, the format of the messages is the same in both paths.
+"""
+from timeit import repeat
+
+from src.sniparinject.core.schema import ACTION_ID, ProtocolSchema
+
+from .bench_schema import PAYLOAD, SETTINGS
+
+ITERATIONS = 100
+MESSAGES = (64, 1024, 8192)
+
+
+def sliced_decode(actions, payload: bytes) -> list:
+    """
+    The previous path: copy the consumed part and the rest of the payload for every message.
+
+    :type actions: Mapping
+    :param actions: The compiled actions.
+
+    :type payload: bytes
+    :param payload: The data of the packet.
+
+    :rtype: list
+    :return: The unpacked values of every message.
+    """
+    values = []
+    data = payload
+    while data:
+        action_id, = ACTION_ID.unpack(data[:ACTION_ID.size])
+        data = data[ACTION_ID.size:]
+        action = actions[action_id]
+        values.append(action.struct.unpack(data[:action.size]))
+        data = data[action.size:]
+
+    return values
+
+
+def cursor_decode(actions, payload: bytes) -> list:
+    """
+    The current path: unpack from an offset of a memoryview, nothing is copied.
+
+    :type actions: Mapping
+    :param actions: The compiled actions.
+
+    :type payload: bytes
+    :param payload: The data of the packet.
+
+    :rtype: list
+    :return: The unpacked values of every message.
+    """
+    values = []
+    view = memoryview(payload)
+    size = len(view)
+    offset = 0
+    while offset < size:
+        action_id, = ACTION_ID.unpack_from(view, offset)
+        offset += ACTION_ID.size
+        action = actions[action_id]
+        values.append(action.struct.unpack_from(view, offset))
+        offset += action.size
+
+    return values
+
+
+def main() -> None:
+    """
+    Run the benchmark and print the results.
+
+    :rtype: None
+    :return: Nothing.
+    """
+    actions = ProtocolSchema.from_settings(SETTINGS).host.actions
+    for count in MESSAGES:
+        payload = PAYLOAD * count
+        assert sliced_decode(actions, payload) == cursor_decode(actions, payload)
+
+        results = {
+            'sliced payload': min(repeat(
+                lambda: sliced_decode(actions, payload), number=ITERATIONS, repeat=5)),
+            'offset cursor': min(repeat(
+                lambda: cursor_decode(actions, payload), number=ITERATIONS, repeat=5)),
+        }
+
+        print(f'=== Parser: {count} messages per payload ===')
+        baseline = results['sliced payload']
+        for name, seconds in results.items():
+            print(f'{name:<20} {seconds * 1e9 / ITERATIONS / count:8.1f} ns/message'
+                  f' {baseline / seconds:6.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+Benchmark the templates of the renderer against the escape sequences built for every
+fragment of a message.
+"""
+from timeit import repeat
+
+from src.sniparinject.core.direction import Direction
+from src.sniparinject.core.parser import ProtocolParser, Record
+from src.sniparinject.core.renderer import Renderer
+from src.sniparinject.core.text_style import TextStyle
+
+ITERATIONS = 20000
+FIELDS = (1, 4, 16)
+
+
+def text_format(text: str, direction: Direction, style: TextStyle = TextStyle.NORMAL) -> str:
+    """
+    The previous path: build the escape sequence of the fragment.
+
+    :type text: str
+    :param text: The text which will be format.
+
+    :type direction: Direction
+    :param direction: Who sent the data, the host or the node.
+
+    :type style: TextStyle
+    :param style: Set the style of the text.
+
+    :rtype: str
+    :return: The format code.
+    """
+    format_code = ''
+
+    if style == TextStyle.TITLE:
+        format_code += '00;93;'
+
+    if style == TextStyle.NORMAL:
+        format_code += '00;30;'
+
+    if style == TextStyle.BOLD:
+        format_code += '00;37;'
+
+    if style == TextStyle.LIGHT:
+        format_code += '00;96;'
+
+    format_code += '44' if direction is Direction.HOST else '100'
+
+    return f'\x1b[{format_code}m{text}\x1b[0m'
+
+
+def render_fragments(record: Record) -> str:
+    """
+    The previous path: concatenate the fragments of the message.
+
+    :type record: Record
+    :param record: A parsed message of a known action.
+
+    :rtype: str
+    :return: Message of this action.
+    """
+    direction = record.direction
+    action = record.action
+    arrow = '<--' if direction is Direction.HOST else '-->'
+    message = text_format(f'{arrow} {action.title}', direction, TextStyle.TITLE)
+    message += text_format(' |', direction)
+    for field, value in zip(action.fields, record.values):
+        if field.name:
+            message += text_format(f' {field.name}', direction, TextStyle.BOLD)
+        message += text_format(f' {value}', direction, TextStyle.LIGHT)
+        message += text_format(' |', direction)
+
+    return message
+
+
+def main() -> None:
+    """
+    Run the benchmark and print the results.
+
+    :rtype: None
+    :return: Nothing.
+    """
+    for count in FIELDS:
+        structs = [{'name': f'Field {index}', 'type': 'unsigned short'} for index in range(count)]
+        parser = ProtocolParser.from_settings(
+            {'Game': {'node': {'actions': {0x0a: {'title': 'Move', 'structs': structs}}}}})
+        record, = parser.parse(b'\x0a\x00' + bytes(range(count * 2)), Direction.NODE)
+        renderer = Renderer()
+        plain_renderer = Renderer(False)
+        assert render_fragments(record) == renderer.render_message(record)
+
+        results = {
+            'fragments': min(repeat(
+                lambda: render_fragments(record), number=ITERATIONS, repeat=5)),
+            'template': min(repeat(
+                lambda: renderer.render_message(record), number=ITERATIONS, repeat=5)),
+            'template no color': min(repeat(
+                lambda: plain_renderer.render_message(record), number=ITERATIONS, repeat=5)),
+        }
+
+        print(f'=== Renderer: {count} fields ===')
+        baseline = results['fragments']
+        for name, seconds in results.items():
+            print(f'{name:<20} {seconds * 1e6 / ITERATIONS:8.2f} us/message'
+                  f' {baseline / seconds:6.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+Benchmark the shared memory ring against a multiprocessing queue between the capture and
+one parser process.
+
+Both paths send the same synthetic traffic, the consumer reads the ID of every payload.
+"""
+from multiprocessing import get_context
+from time import perf_counter
+
+from src.sniparinject.core.capture import Flow
+from src.sniparinject.core.direction import Direction
+from src.sniparinject.core.schema import ACTION_ID
+from src.sniparinject.core.shared_ring import SLOT_STOP, SharedRing
+
+from .bench_schema import PAYLOAD
+
+PAYLOADS = 200_000
+SIZES = (1, 8, 64)
+FLOW = Flow('tcp', '52.174.196.146', 5122, '192.168.1.7', 40000)
+
+
+def consume_queue(queue, results) -> None:
+    """
+    Read the payloads from the queue until None.
+
+    :type queue: multiprocessing.Queue
+    :param queue: The flow, the direction, the sequence and the payload.
+
+    :type results: multiprocessing.Queue
+    :param results: The sum of the IDs.
+
+    :rtype: None
+    :return: Nothing.
+    """
+    total = 0
+    for _, _, _, payload in iter(queue.get, None):
+        total += ACTION_ID.unpack_from(payload)[0]
+    results.put(total)
+
+
+def consume_ring(ring: SharedRing, results) -> None:
+    """
+    Read the payloads in place from the lane zero of the ring until the stop slot.
+
+    :type ring: SharedRing
+    :param ring: The ring.
+
+    :type results: multiprocessing.Queue
+    :param results: The sum of the IDs.
+
+    :rtype: None
+    :return: Nothing.
+    """
+    total = 0
+    while True:
+        kind, _, _, _, _, payload = ring.get(0)
+        if kind == SLOT_STOP:
+            break
+        total += ACTION_ID.unpack_from(payload)[0]
+        payload = None
+        ring.release(0)
+    ring.close()
+    results.put(total)
+
+
+def run_queue(payload: bytes) -> float:
+    """
+    Send the traffic through a multiprocessing queue.
+
+    :type payload: bytes
+    :param payload: The payload of every packet.
+
+    :rtype: float
+    :return: The seconds until the consumer read every payload.
+    """
+    context = get_context('spawn')
+    queue, results = context.Queue(4096), context.Queue()
+    process = context.Process(target=consume_queue, args=(queue, results))
+    process.start()
+    start = perf_counter()
+    for sequence in range(PAYLOADS):
+        queue.put((FLOW, Direction.HOST, sequence, bytes(payload)))
+    queue.put(None)
+    assert results.get() == PAYLOADS * payload[0]
+    seconds = perf_counter() - start
+    process.join()
+
+    return seconds
+
+
+def run_ring(payload: bytes) -> float:
+    """
+    Send the traffic through the shared memory ring.
+
+    :type payload: bytes
+    :param payload: The payload of every packet.
+
+    :rtype: float
+    :return: The seconds until the consumer read every payload.
+    """
+    context = get_context('spawn')
+    ring, results = SharedRing(1, slots=4096, slot_size=2048), context.Queue()
+    process = context.Process(target=consume_ring, args=(ring, results))
+    process.start()
+    start = perf_counter()
+    for sequence in range(PAYLOADS):
+        ring.put(0, FLOW, Direction.HOST, sequence, payload)
+    ring.put_stop(0)
+    assert results.get() == PAYLOADS * payload[0]
+    seconds = perf_counter() - start
+    process.join()
+    ring.unlink()
+
+    return seconds
+
+
+def main() -> None:
+    """
+    Run the benchmark and print the results.
+
+    :rtype: None
+    :return: Nothing.
+    """
+    for count in SIZES:
+        payload = PAYLOAD * count
+        results = {
+            'multiprocessing queue': run_queue(payload),
+            'shared memory ring': run_ring(payload),
+        }
+
+        print(f'=== Ring: {len(payload)} bytes per payload ===')
+        baseline = results['multiprocessing queue']
+        for name, seconds in results.items():
+            print(f'{name:<22} {PAYLOADS / seconds:10.0f} payloads/s {baseline / seconds:6.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+Benchmark the precompiled schema against the per-packet struct building.
+"""
+from struct import unpack
+from timeit import repeat
+
+from src.sniparinject.core.schema import ProtocolSchema
+
+ITERATIONS = 100_000
+SETTINGS = {
+    'Game': {
+        'host': {
+            'actions': {
+                0x78: {
+                    'title': 'NPC Info',
+                    'structs': [
+                        {'name': 'ID', 'type': 'unsigned int',
+                         'output': {'type': 'hex', 'auto_zero_fill': True}},
+                        {'type': 'chars', 'size': 1, 'output': {'type': 'hex'}},
+                        {'name': 'HP', 'type': 'unsigned short'},
+                        {'name': 'Max HP', 'type': 'unsigned short'},
+                    ],
+                },
+            },
+        },
+    },
+}
+PAYLOAD = b'\x78\x00\x0f\x00\x00\x00\xf8\x64\x00\xc8\x00'
+
+
+def per_packet_struct(structs: list, data: bytes) -> list:
+    """
+    The previous path: build the map of structs, join the format and unpack for every packet.
+
+    :type structs: list
+    :param structs: The structs of the action.
+
+    :type data: bytes
+    :param data: The data of the action, without the ID.
+
+    :rtype: list
+    :return: The formatted values.
+    """
+    structs_format = ''
+    size = 0
+    for struct in structs:
+        struct_map = {
+            'char': ('c', 1), 'signed char': ('b', 1), 'unsigned char': ('B', 1),
+            'bool': ('?', 1), 'short': ('h', 2), 'unsigned short': ('H', 2),
+            'int': ('i', 4), 'unsigned int': ('I', 4), 'long': ('q', 8),
+            'unsigned long': ('Q', 8), 'half precision': ('e', 2), 'float': ('f', 4),
+            'double': ('d', 8), 'chars': ('s', 1),
+        }
+        symbol, struct_size = struct_map.get(struct.get('type').lower())
+        repeat_count = int(struct.get('size') or 0)
+        if repeat_count > 1:
+            struct_size *= repeat_count
+            symbol = f'{repeat_count}{symbol}'
+        structs_format += symbol
+        size += struct_size
+
+    values = []
+    for index, variable in enumerate(unpack(f'<{structs_format}', data[:size])):
+        output = structs[index].get('output') or {}
+        if (output.get('type') or '').lower() == 'hex':
+            variable = variable.hex() if isinstance(variable, bytes) else hex(variable)
+        if output.get('auto_zero_fill'):
+            variable = str(variable).zfill(10)
+        values.append(variable)
+
+    return values
+
+
+def compiled_struct(actions, data: bytes) -> list:
+    """
+    The compiled path: a dictionary lookup and one unpack_from.
+
+    :type actions: Mapping
+    :param actions: The compiled actions.
+
+    :type data: bytes
+    :param data: The payload, with the ID.
+
+    :rtype: list
+    :return: The formatted values.
+    """
+    action = actions[0x78]
+    return [field.format(variable)
+            for field, variable in zip(action.fields, action.struct.unpack_from(data, 2))]
+
+
+def main() -> None:
+    """
+    Run the benchmark and print the results.
+
+    :rtype: None
+    :return: Nothing.
+    """
+    structs = SETTINGS['Game']['host']['actions'][0x78]['structs']
+    actions = ProtocolSchema.from_settings(SETTINGS).host.actions
+    assert per_packet_struct(structs, PAYLOAD[2:]) == compiled_struct(actions, PAYLOAD)
+
+    results = {
+        'per-packet struct': min(repeat(
+            lambda: per_packet_struct(structs, PAYLOAD[2:]), number=ITERATIONS, repeat=5)),
+        'compiled schema': min(repeat(
+            lambda: compiled_struct(actions, PAYLOAD), number=ITERATIONS, repeat=5)),
+    }
+
+    print(f'=== Schema: {ITERATIONS} messages ===')
+    baseline = results['per-packet struct']
+    for name, seconds in results.items():
+        print(f'{name:<20} {seconds * 1e9 / ITERATIONS:8.1f} ns/message'
+              f' {baseline / seconds:6.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+Benchmark the JSON Lines and CSV sinks against the ANSI output of the console.
+
+The same parsed messages are rendered and printed into a null stream, or written into
+the files of the sinks in a temporary directory.
+"""
+from contextlib import redirect_stdout
+from io import StringIO
+from os import devnull
+from os.path import join
+from tempfile import TemporaryDirectory
+from timeit import repeat
+
+from src.sniparinject.core.console import Console
+from src.sniparinject.core.direction import Direction
+from src.sniparinject.core.parser import ProtocolParser
+from src.sniparinject.core.renderer import Renderer
+from src.sniparinject.core.sinks import FileSink
+
+MESSAGES = 2000
+FIELDS = (1, 4, 16)
+
+
+def print_records(records: list, payload: bytes, renderer: Renderer) -> None:
+    """
+    Render the messages and print them, as the sniffer without sinks.
+
+    :type records: list
+    :param records: The parsed messages.
+
+    :type payload: bytes
+    :param payload: The data of the packet.
+
+    :type renderer: Renderer
+    :param renderer: The renderer.
+
+    :rtype: None
+    :return: Nothing.
+    """
+    Console.print_records(records, payload, renderer=renderer)
+
+
+def write_records(records: list, sink: FileSink) -> None:
+    """
+    Write the messages with the sink.
+
+    :type records: list
+    :param records: The parsed messages.
+
+    :type sink: FileSink
+    :param sink: The sink.
+
+    :rtype: None
+    :return: Nothing.
+    """
+    for record in records:
+        sink.write(record)
+
+
+def main() -> None:
+    """
+    Run the benchmark and print the results.
+
+    :rtype: None
+    :return: Nothing.
+    """
+    for count in FIELDS:
+        structs = [{'name': f'Field {index}', 'type': 'unsigned short'} for index in range(count)]
+        parser = ProtocolParser.from_settings(
+            {'Game': {'node': {'actions': {0x0a: {'title': 'Move', 'structs': structs}}}}})
+        payload = (b'\x0a\x00' + bytes(range(count * 2))) * MESSAGES
+        records = list(parser.parse(payload, Direction.NODE, timestamp=1.5))
+        renderer = Renderer()
+
+        with TemporaryDirectory() as directory, open(devnull, 'w', encoding='utf-8') as null:
+            json_sink = FileSink(join(directory, 'messages.jsonl'))
+            csv_sink = FileSink(join(directory, 'messages.csv'), 'csv')
+            with redirect_stdout(null):
+                results = {
+                    'ANSI console': min(repeat(
+                        lambda: print_records(records, payload, renderer), number=1, repeat=5)),
+                }
+            with redirect_stdout(StringIO()):
+                results['JSON Lines sink'] = min(repeat(
+                    lambda: write_records(records, json_sink), number=1, repeat=5))
+                results['CSV sink'] = min(repeat(
+                    lambda: write_records(records, csv_sink), number=1, repeat=5))
+            json_sink.close()
+            csv_sink.close()
+
+        print(f'=== Sinks: {count} fields ===')
+        baseline = results['ANSI console']
+        for name, seconds in results.items():
+            print(f'{name:<20} {seconds * 1e6 / MESSAGES:8.2f} us/message'
+                  f' {baseline / seconds:6.2f}x')
+
+
+if __name__ == '__main__':
+    main()
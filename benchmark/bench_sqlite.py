@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+Benchmark the insert throughput of the SQLite sink.
+
+The same parsed messages are inserted one by one with a commit by message, as a naive
+sink would do, or queued by the SQLite sink, which inserts them with `executemany` in
+periodic transactions from its thread. The time of the capture is the time spent in
+`write`, the total time also waits for the inserts.
+"""
+from os.path import join
+from sqlite3 import connect
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from src.sniparinject.core.direction import Direction
+from src.sniparinject.core.parser import ProtocolParser
+from src.sniparinject.core.sinks import SQLiteSink
+
+MESSAGES = 20000
+NAIVE_MESSAGES = 2000
+FIELDS = (1, 4, 16)
+
+
+def insert_naive(path: str, records: list, count: int) -> float:
+    """
+    Insert every message in its own transaction.
+
+    :type path: str
+    :param path: The path of the database.
+
+    :type records: list
+    :param records: The parsed messages.
+
+    :type count: int
+    :param count: Number of fields of the action.
+
+    :rtype: float
+    :return: The seconds of the inserts.
+    """
+    connection = connect(path, isolation_level=None)
+    columns = ', '.join(f'field_{index} INTEGER' for index in range(count))
+    connection.execute(f'CREATE TABLE node_000a (timestamp REAL, {columns})')
+    statement = f'INSERT INTO node_000a VALUES (?{", ?" * count})'
+    start = perf_counter()
+    for record in records:
+        connection.execute('BEGIN')
+        connection.execute(statement, (record.timestamp, *record.values))
+        connection.execute('COMMIT')
+    seconds = perf_counter() - start
+    connection.close()
+
+    return seconds
+
+
+def insert_sink(path: str, records: list) -> tuple[float, float]:
+    """
+    Write the messages with the SQLite sink and wait for the inserts.
+
+    :type path: str
+    :param path: The path of the database.
+
+    :type records: list
+    :param records: The parsed messages.
+
+    :rtype: tuple[float, float]
+    :return: The seconds of the writes and the seconds until the messages are inserted.
+    """
+    sink = SQLiteSink(path, max_rows=len(records))
+    start = perf_counter()
+    for record in records:
+        sink.write(record)
+    written = perf_counter() - start
+    sink.close()
+
+    return written, perf_counter() - start
+
+
+def main() -> None:
+    """
+    Run the benchmark and print the results.
+
+    :rtype: None
+    :return: Nothing.
+    """
+    for count in FIELDS:
+        structs = [{'name': f'Field {index}', 'type': 'unsigned short'} for index in range(count)]
+        parser = ProtocolParser.from_settings(
+            {'Game': {'node': {'actions': {0x0a: {'title': 'Move', 'structs': structs}}}}})
+        payload = (b'\x0a\x00' + bytes(range(count * 2))) * MESSAGES
+        records = list(parser.parse(payload, Direction.NODE, timestamp=1.5))
+
+        with TemporaryDirectory() as directory:
+            naive = insert_naive(join(directory, 'naive.db'), records[:NAIVE_MESSAGES], count)
+            written, total = insert_sink(join(directory, 'sink.db'), records)
+
+        print(f'=== SQLite: {count} fields ===')
+        baseline = NAIVE_MESSAGES / naive
+        for name, rate in (('Commit by message', baseline),
+                           ('Sink inserts', MESSAGES / total),
+                           ('Sink capture path', MESSAGES / written)):
+            print(f'{name:<20} {rate:12,.0f} messages/s {rate / baseline:8.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+Benchmark the time that the parse waits for the output, with a slow terminal.
+
+The terminal is a stream which waits for every call to `write`, the lines of every
+payload are printed line by line, in one call, or put in the buffer of the writer.
+"""
+from contextlib import redirect_stdout
+from time import perf_counter, sleep
+
+from src.sniparinject.core.console import Console
+from src.sniparinject.core.writer import ConsoleWriter
+
+PAYLOADS = 2000
+LINES = 4
+WRITE_DELAY = 0.00002
+
+
+class SlowTerminal:
+    """
+    A stream which waits for every call to `write`, like a terminal which scrolls.
+    """
+
+    def __init__(self) -> None:
+        """
+        A stream which waits for every call to `write`.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        self.characters = 0
+
+    def write(self, text: str) -> int:
+        """
+        Wait, then count the characters.
+
+        :type text: str
+        :param text: The written text.
+
+        :rtype: int
+        :return: The number of characters.
+        """
+        sleep(WRITE_DELAY)
+        self.characters += len(text)
+        return len(text)
+
+    def flush(self) -> None:
+        """
+        Nothing to flush.
+
+        :rtype: None
+        :return: Nothing.
+        """
+
+
+def print_lines(payloads: list[list[str]]) -> None:
+    """
+    The first path: one call to print by line.
+
+    :type payloads: list[list[str]]
+    :param payloads: The lines of every payload.
+
+    :rtype: None
+    :return: Nothing.
+    """
+    for lines in payloads:
+        for line in lines:
+            print(line)
+
+
+def print_payloads(payloads: list[list[str]]) -> None:
+    """
+    One call to print by payload.
+
+    :type payloads: list[list[str]]
+    :param payloads: The lines of every payload.
+
+    :rtype: None
+    :return: Nothing.
+    """
+    for lines in payloads:
+        Console.write_lines(lines)
+
+
+def main() -> None:
+    """
+    Run the benchmark and print the results.
+
+    :rtype: None
+    :return: Nothing.
+    """
+    payloads = [[f'\x1b[00;93;44m<-- Action {index} line {line}\x1b[0m' for line in range(LINES)]
+                for index in range(PAYLOADS)]
+    results = {}
+    for name, function in (('print by line', print_lines), ('print by payload', print_payloads)):
+        terminal = SlowTerminal()
+        with redirect_stdout(terminal):
+            start = perf_counter()
+            function(payloads)
+            seconds = perf_counter() - start
+        results[name] = (seconds, seconds)
+
+    terminal = SlowTerminal()
+    writer = ConsoleWriter(stream=terminal)
+    writer.start()
+    start = perf_counter()
+    for lines in payloads:
+        writer.write(lines)
+    parse = perf_counter() - start
+    writer.stop()
+    results['writer'] = (parse, perf_counter() - start)
+    assert writer.get_statistics()['lines'] == PAYLOADS * LINES
+
+    print(f'=== Output: {PAYLOADS} payloads of {LINES} lines ===')
+    baseline = results['print by line'][0]
+    for name, (parse, total) in results.items():
+        print(f'{name:<20} {parse * 1e6 / PAYLOADS:8.1f} us/payload waited'
+              f' {total * 1e3:8.1f} ms total {baseline / parse:8.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,15 @@
+#!/usr/bin/env bash
+set -e
+
+CURRENT_PATH=$(dirname "${0}")
+cd "${CURRENT_PATH}" || exit
+
+cd .. || exit
+
+source ./venv/bin/activate
+for BENCHMARK in ./benchmark/bench_*.py; do
+  MODULE=$(basename "${BENCHMARK}" .py)
+  python3 -m "benchmark.${MODULE}"
+  echo ""
+done
+deactivate
@@ -0,0 +1,497 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+Archive the raw game messages of a session in a compact binary file, with an index to
+read them again by time range or by action ID without reading the whole file.
+
+The file starts with its magic number, then the messages are written in blocks. A block
+has its header, with its size, its number of messages and its earliest and latest
+timestamps, then its messages, every one is a header with its size, timestamp, direction,
+flow ID and action ID, followed by its raw bytes. When the archive is closed, the index
+is written at the end: the offset and the timestamps of every block, the blocks of every
+action ID and the addresses of every flow, then the trailer with the offset of the index.
+"""
+import mmap
+from array import array
+from bisect import bisect_left
+from ipaddress import IPv4Address
+from os.path import exists
+from struct import Struct
+from typing import Iterator, NamedTuple, Optional, Union
+
+# pylint: disable=import-error
+from .capture import Flow, close_map
+from .direction import Direction
+from .parser import ParseResult
+
+ARCHIVE_MAGIC = b'SNIPARC\x01'
+INDEX_MAGIC = b'SNIPIDX\x01'
+BLOCK_MAGIC = b'BLCK'
+# Size of the data, timestamp, direction, flow ID and action ID of one message.
+MESSAGE_HEADER = Struct('<IdBIq')
+# Magic number, size of the messages, number of messages, earliest and latest timestamps.
+BLOCK_HEADER = Struct('<4sIIdd')
+# Number of blocks, action IDs and flows of the index.
+INDEX_HEADER = Struct('<III')
+# Offset, size of the messages, number of messages, earliest and latest timestamps.
+BLOCK_ENTRY = Struct('<QIIdd')
+# Action ID and number of blocks, followed by the number of every block.
+ACTION_ENTRY = Struct('<qI')
+# Flow ID, protocol, source IP and port, destination IP and port.
+FLOW_ENTRY = Struct('<IB4sH4sH')
+# Offset of the index and its magic number.
+TRAILER = Struct('<Q8s')
+# The action ID of the bytes of a payload which were not cut into messages.
+UNCUT = -1
+DIRECTIONS = (Direction.HOST, Direction.NODE)
+DIRECTION_CODES = {direction: code for code, direction in enumerate(DIRECTIONS)}
+PROTOCOLS = ('tcp', 'udp')
+
+
+class ArchiveRecord(NamedTuple):
+    """
+    One message read from the archive.
+
+    `flow` is None if the message was not archived with its flow, and `action_id` is
+    UNCUT for the bytes of a payload which were not cut into messages. `data` is a view of
+    the mapped file with the ID of the message.
+    """
+    timestamp: float
+    direction: Direction
+    flow: Optional[Flow]
+    action_id: int
+    data: memoryview
+
+
+class BlockEntry(NamedTuple):
+    """
+    The position and the timestamps of one block of the archive.
+    """
+    offset: int
+    size: int
+    count: int
+    earliest: float
+    latest: float
+
+
+# pylint: disable=too-many-instance-attributes
+class ArchiveWriter:
+    """
+    Write the raw messages of the parsed payloads into an archive.
+
+    The messages are appended to the current block in memory, which is written in only one
+    call when it has `block_size` bytes, so a message costs two appends to a buffer. The
+    index is kept in memory and written when the archive is closed.
+    """
+
+    def __init__(self, path: str, block_size: int = 65536) -> None:
+        """
+        Create the archive, an existing file is not overwritten.
+
+        :type path: str
+        :param path: The path of the archive.
+
+        :type block_size: int
+        :param block_size: The size in bytes which writes the current block.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        if exists(path):
+            raise RuntimeError(f'Error: The Archive ({path}) already exists.')
+
+        self.path = path
+        self.block_size = block_size
+        self.statistics = {'messages': 0, 'uncut': 0, 'blocks': 0, 'bytes': 0}
+        self._file = open(path, 'wb')  # pylint: disable=consider-using-with
+        self._file.write(ARCHIVE_MAGIC)
+        self._offset = len(ARCHIVE_MAGIC)
+        self._block = bytearray()
+        self._count = 0
+        self._earliest = 0.0
+        self._latest = 0.0
+        self._actions: set[int] = set()
+        self._blocks: list[BlockEntry] = []
+        self._action_blocks: dict[int, array] = {}
+        self._flows: dict[Flow, int] = {}
+
+    @classmethod
+    def from_settings(cls, settings: dict) -> 'ArchiveWriter':
+        """
+        Create the archive with the Archive settings.
+
+        :type settings: dict
+        :param settings: The Archive settings.
+
+        :rtype: ArchiveWriter
+        :return: The archive.
+        """
+        if not isinstance(settings, dict) or not settings.get('path'):
+            raise RuntimeError(f'Error: The Archive ({settings}) has no path.')
+
+        return cls(str(settings.get('path')), int(settings.get('block_size') or 65536))
+
+    # pylint: disable=too-many-locals,too-many-arguments,too-many-positional-arguments
+    def write(self, payload: Union[bytes, memoryview], result: ParseResult,
+              direction: Direction, flow: Optional[Flow] = None,
+              timestamp: float = 0.0) -> None:
+        """
+        Append the messages which were cut from the payload, and its bytes which were not
+        cut, except the start of a message which continues in the next data of the stream.
+
+        :type payload: Union[bytes, memoryview]
+        :param payload: The parsed data.
+
+        :type result: ParseResult
+        :param result: The result of the parse of the payload, with its spans.
+
+        :type direction: Direction
+        :param direction: Who sent the data, the host or the node.
+
+        :type flow: Optional[Flow]
+        :param flow: The flow of the payload, None if it is not known.
+
+        :type timestamp: float
+        :param timestamp: The time of the payload.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        flow_id = self._flows.get(flow, 0) if flow is not None else 0
+        if not flow_id and flow is not None:
+            flow_id = self._flows[flow] = len(self._flows) + 1
+        code = DIRECTION_CODES[direction]
+        block = self._block
+        pack = MESSAGE_HEADER.pack
+        add = self._actions.add
+        end = 0
+        for action_id, start, end in result.spans:
+            block += pack(end - start, timestamp, code, flow_id, action_id)
+            block += payload[start:end]
+            add(action_id)
+        count = len(result.spans)
+
+        uncut = len(payload) - result.incomplete
+        if end < uncut:
+            block += pack(uncut - end, timestamp, code, flow_id, UNCUT)
+            block += payload[end:uncut]
+            add(UNCUT)
+            self.statistics['uncut'] += 1
+            count += 1
+
+        if count:
+            if not self._count:
+                self._earliest = self._latest = timestamp
+            elif timestamp > self._latest:
+                self._latest = timestamp
+            elif timestamp < self._earliest:
+                self._earliest = timestamp
+            self._count += count
+            self.statistics['messages'] += count
+            if len(block) >= self.block_size:
+                self._write_block()
+
+    def close(self) -> None:
+        """
+        Write the current block, the index and the trailer, then close the file.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        if self._file.closed:
+            return
+
+        self._write_block()
+        index = bytearray(INDEX_HEADER.pack(len(self._blocks), len(self._action_blocks),
+                                            len(self._flows)))
+        for entry in self._blocks:
+            index += BLOCK_ENTRY.pack(*entry)
+        for action_id, blocks in self._action_blocks.items():
+            index += ACTION_ENTRY.pack(action_id, len(blocks))
+            index += blocks.tobytes()
+        for flow, flow_id in self._flows.items():
+            index += FLOW_ENTRY.pack(flow_id, PROTOCOLS.index(flow.protocol),
+                                     IPv4Address(flow.src_ip).packed, flow.src_port,
+                                     IPv4Address(flow.dst_ip).packed, flow.dst_port)
+        index += TRAILER.pack(self._offset, INDEX_MAGIC)
+        self._file.write(index)
+        self._file.close()
+
+    def get_statistics(self) -> dict:
+        """
+        Return the counters of the archive.
+
+        :rtype: dict
+        :return: The archived messages, the uncut bytes, the written blocks and bytes, and
+            the flows.
+        """
+        return dict(self.statistics, flows=len(self._flows))
+
+    def _write_block(self) -> None:
+        """
+        Write the current block with its header and add it to the index.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        if not self._count:
+            return
+
+        number = len(self._blocks)
+        entry = BlockEntry(self._offset, len(self._block), self._count, self._earliest,
+                           self._latest)
+        self._file.write(BLOCK_HEADER.pack(BLOCK_MAGIC, entry.size, entry.count, entry.earliest,
+                                           entry.latest))
+        self._file.write(self._block)
+        self._blocks.append(entry)
+        for action_id in self._actions:
+            self._action_blocks.setdefault(action_id, array('I')).append(number)
+
+        self._offset += BLOCK_HEADER.size + entry.size
+        self.statistics['blocks'] += 1
+        self.statistics['bytes'] = self._offset
+        self._block = bytearray()
+        self._count = 0
+        self._actions = set()
+
+
+class ArchiveReader:
+    """
+    Read the messages of an archive which is mapped in memory.
+
+    The index is read from the end of the file, only the blocks which could have messages
+    of the time range or of the action ID are read. The archive of a sniffer which did not
+    close it has no index, then the block headers are walked to build it again.
+    """
+
+    def __init__(self, archive_file: str) -> None:
+        """
+        Read the messages of an archive.
+
+        :type archive_file: str
+        :param archive_file: The archive.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        self.archive_file = archive_file
+        self.map: Optional[mmap.mmap] = None
+        self.blocks: list[BlockEntry] = []
+        self.actions: dict[int, list[int]] = {}
+        self.flows: dict[int, Flow] = {}
+        self.statistics = {'blocks': 0, 'messages': 0, 'recovered': False}
+        self._latest: list[float] = []
+        self._earliest: list[float] = []
+
+    def open(self) -> None:
+        """
+        Map the file in memory and read its index.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        with open(self.archive_file, 'rb') as file:
+            self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self.map[:len(ARCHIVE_MAGIC)] != ARCHIVE_MAGIC:
+            self.close()
+            raise ValueError(f'Error: The file ({self.archive_file}) is not an archive.')
+
+        size = len(self.map)
+        offset, magic = (TRAILER.unpack_from(self.map, size - TRAILER.size)
+                         if size >= len(ARCHIVE_MAGIC) + TRAILER.size else (0, b''))
+        if magic == INDEX_MAGIC:
+            self._read_index(offset)
+        else:
+            self._scan_blocks()
+            self.statistics['recovered'] = True
+
+        self._latest = []
+        self._earliest = [0.0] * len(self.blocks)
+        latest = float('-inf')
+        for entry in self.blocks:
+            latest = max(latest, entry.latest)
+            self._latest.append(latest)
+        earliest = float('inf')
+        for number in range(len(self.blocks) - 1, -1, -1):
+            earliest = min(earliest, self.blocks[number].earliest)
+            self._earliest[number] = earliest
+
+    def records(self, start: Optional[float] = None, end: Optional[float] = None,
+                action_id: Optional[int] = None) -> Iterator[ArchiveRecord]:
+        """
+        Return the messages of the time range and of the action ID, in order of the file.
+
+        :type start: Optional[float]
+        :param start: The first timestamp, None from the start of the archive.
+
+        :type end: Optional[float]
+        :param end: The last timestamp, None until the end of the archive.
+
+        :type action_id: Optional[int]
+        :param action_id: Only the messages of this ID, None for all of them.
+
+        :rtype: Iterator[ArchiveRecord]
+        :return: The messages, their data are views of the map.
+        """
+        if self.map is None:
+            self.open()
+
+        earliest = start if start is not None else float('-inf')
+        latest = end if end is not None else float('inf')
+        view = memoryview(self.map)
+        try:
+            for number in self.find_blocks(start, end, action_id):
+                self.statistics['blocks'] += 1
+                yield from self._read_block(view, self.blocks[number], action_id, earliest,
+                                            latest)
+        finally:
+            view.release()
+
+    def find_blocks(self, start: Optional[float] = None, end: Optional[float] = None,
+                    action_id: Optional[int] = None) -> list[int]:
+        """
+        Return the numbers of the blocks which could have messages of the time range and
+        of the action ID, with a binary search of the start in the timestamps.
+
+        :type start: Optional[float]
+        :param start: The first timestamp, None from the start of the archive.
+
+        :type end: Optional[float]
+        :param end: The last timestamp, None until the end of the archive.
+
+        :type action_id: Optional[int]
+        :param action_id: Only the blocks with this ID, None for all of them.
+
+        :rtype: list[int]
+        :return: The numbers of the blocks, in order of the file.
+        """
+        first = bisect_left(self._latest, start) if start is not None else 0
+        numbers = range(first, len(self.blocks))
+        if action_id is not None:
+            blocks = self.actions.get(action_id, [])
+            numbers = blocks[bisect_left(blocks, first):]
+
+        found = []
+        for number in numbers:
+            if end is not None and self._earliest[number] > end:
+                break
+            entry = self.blocks[number]
+            if ((start is None or entry.latest >= start)
+                    and (end is None or entry.earliest <= end)):
+                found.append(number)
+
+        return found
+
+    def get_statistics(self) -> dict:
+        """
+        Return the counters of the reads.
+
+        :rtype: dict
+        :return: The read blocks and messages, and if the index was built again.
+        """
+        return dict(self.statistics)
+
+    def close(self) -> None:
+        """
+        Close the memory map.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        close_map(self.map)
+        self.map = None
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def _read_block(self, view: memoryview, entry: BlockEntry, action_id: Optional[int],
+                    earliest: float, latest: float) -> Iterator[ArchiveRecord]:
+        """
+        Walk the messages of one block and return the ones of the time range and of the
+        action ID.
+
+        :type view: memoryview
+        :param view: The mapped file.
+
+        :type entry: BlockEntry
+        :param entry: The block.
+
+        :type action_id: Optional[int]
+        :param action_id: Only the messages of this ID, None for all of them.
+
+        :type earliest: float
+        :param earliest: The first timestamp.
+
+        :type latest: float
+        :param latest: The last timestamp.
+
+        :rtype: Iterator[ArchiveRecord]
+        :return: The messages, their data are views of the map.
+        """
+        offset = entry.offset + BLOCK_HEADER.size
+        limit = offset + entry.size
+        while offset < limit:
+            size, timestamp, code, flow_id, message_id = MESSAGE_HEADER.unpack_from(view, offset)
+            offset += MESSAGE_HEADER.size + size
+            if ((action_id is not None and message_id != action_id)
+                    or not earliest <= timestamp <= latest):
+                continue
+            self.statistics['messages'] += 1
+            yield ArchiveRecord(timestamp, DIRECTIONS[code], self.flows.get(flow_id), message_id,
+                                view[offset - size:offset])
+
+    def _read_index(self, offset: int) -> None:
+        """
+        Read the blocks, the action IDs and the flows of the index.
+
+        :type offset: int
+        :param offset: Position of the index.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        blocks, actions, flows = INDEX_HEADER.unpack_from(self.map, offset)
+        offset += INDEX_HEADER.size
+        self.blocks = [
+            BlockEntry(*BLOCK_ENTRY.unpack_from(self.map, offset + number * BLOCK_ENTRY.size))
+            for number in range(blocks)
+        ]
+        offset += blocks * BLOCK_ENTRY.size
+        for _ in range(actions):
+            action_id, count = ACTION_ENTRY.unpack_from(self.map, offset)
+            offset += ACTION_ENTRY.size
+            self.actions[action_id] = array('I', self.map[offset:offset + count * 4]).tolist()
+            offset += count * 4
+        for _ in range(flows):
+            flow_id, protocol, src_ip, src_port, dst_ip, dst_port = FLOW_ENTRY.unpack_from(
+                self.map, offset)
+            offset += FLOW_ENTRY.size
+            self.flows[flow_id] = Flow(PROTOCOLS[protocol], str(IPv4Address(src_ip)), src_port,
+                                       str(IPv4Address(dst_ip)), dst_port)
+
+    def _scan_blocks(self) -> None:
+        """
+        Build the index of the blocks and of the action IDs again with the headers, the
+        last block is skipped if it was not written entirely. The flows are not known.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        size = len(self.map)
+        offset = len(ARCHIVE_MAGIC)
+        while offset + BLOCK_HEADER.size <= size:
+            magic, block_size, count, earliest, latest = BLOCK_HEADER.unpack_from(self.map,
+                                                                                  offset)
+            limit = offset + BLOCK_HEADER.size + block_size
+            if magic != BLOCK_MAGIC or limit > size:
+                break
+
+            number = len(self.blocks)
+            self.blocks.append(BlockEntry(offset, block_size, count, earliest, latest))
+            position = offset + BLOCK_HEADER.size
+            while position < limit:
+                message_size, _, _, _, action_id = MESSAGE_HEADER.unpack_from(self.map, position)
+                position += MESSAGE_HEADER.size + message_size
+                blocks = self.actions.setdefault(action_id, [])
+                if not blocks or blocks[-1] != number:
+                    blocks.append(number)
+            offset = limit
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+Decode many payloads at once for the offline analysis of a capture.
+
+The messages are grouped by their action ID and every group is decoded in only one call
+to NumPy, into one array by field. Without NumPy, the messages are unpacked one by one
+into lists.
+"""
+from re import compile as compile_regex
+from types import MappingProxyType
+from typing import Any, Iterable, NamedTuple, Optional, Union
+
+# pylint: disable=import-error
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from .direction import Direction
+from .parser import ProtocolParser
+from .schema import CompiledAction
+
+# 'Python struct symbol': 'NumPy dtype', the structs of the actions are little-endian.
+NUMPY_TYPES = MappingProxyType({
+    'c': 'S1',
+    'b': 'i1',
+    'B': 'u1',
+    '?': '?',
+    'h': '<i2',
+    'H': '<u2',
+    'i': '<i4',
+    'I': '<u4',
+    'q': '<i8',
+    'Q': '<u8',
+    'e': '<f2',
+    'f': '<f4',
+    'd': '<f8',
+})
+STRUCT_TOKEN = compile_regex(r'(\d*)([a-zA-Z?])')
+
+
+class BatchColumn(NamedTuple):
+    """
+    One struct of an action, with the position of its first value in the unpacked values.
+
+    The chars are one value of `count` bytes, the other types are `count` values.
+    """
+    name: str
+    symbol: str
+    count: int
+    start: int
+
+
+def get_columns(action: CompiledAction) -> list[BatchColumn]:
+    """
+    Return the columns of the action, one by struct of the settings.
+
+    A struct without name is named by its position, and a name used twice gets the
+    position too.
+
+    :type action: CompiledAction
+    :param action: The compiled action.
+
+    :rtype: list[BatchColumn]
+    :return: The columns.
+    """
+    columns = []
+    names = set()
+    start = 0
+    for index, (count, symbol) in enumerate(STRUCT_TOKEN.findall(action.struct.format)):
+        count = int(count or 1)
+        name = action.fields[start].name or f'field_{index}'
+        if name in names:
+            name = f'{name}_{index}'
+        names.add(name)
+        columns.append(BatchColumn(name, symbol, count, start))
+        start += 1 if symbol == 's' else count
+
+    return columns
+
+
+def get_dtype(columns: list[BatchColumn]) -> Any:
+    """
+    Return the NumPy structured dtype of the columns, it has the same layout than the
+    struct of the action.
+
+    :type columns: list[BatchColumn]
+    :param columns: The columns of the action.
+
+    :rtype: numpy.dtype
+    :return: The dtype.
+    """
+    dtype = []
+    for column in columns:
+        if column.symbol == 's':
+            dtype.append((column.name, f'S{column.count}'))
+        elif column.count == 1:
+            dtype.append((column.name, NUMPY_TYPES[column.symbol]))
+        else:
+            dtype.append((column.name, NUMPY_TYPES[column.symbol], (column.count,)))
+
+    return numpy.dtype(dtype)
+
+
+class BatchDecoder:
+    """
+    Decode the messages of many payloads into columns, for the offline analysis.
+
+    The payloads are cut into messages with the rules of the parser, every payload alone,
+    then the data of every known action is decoded into one column by struct, without the
+    reference and the output formatting. With NumPy, a column is an array and a repeated
+    struct is a 2D array, without NumPy it is a list and a repeated struct is a tuple.
+    """
+
+    def __init__(self, parser: ProtocolParser, use_numpy: bool = True) -> None:
+        """
+        Decode the messages of many payloads into columns.
+
+        :type parser: ProtocolParser
+        :param parser: The parser with the compiled settings.
+
+        :type use_numpy: bool
+        :param use_numpy: Decode with NumPy if it is installed.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        self.parser = parser
+        self.use_numpy = use_numpy and numpy is not None
+        self.statistics = {'messages': 0, 'unknown': 0, 'errors': 0, 'leftover': 0}
+
+    # pylint: disable=too-many-locals
+    def decode(self, payloads: Iterable[Union[bytes, memoryview]], direction: Direction,
+               profile: Optional[str] = None) -> dict[int, dict[str, Any]]:
+        """
+        Decode the messages of the payloads, grouped by action ID.
+
+        :type payloads: Iterable[Union[bytes, memoryview]]
+        :param payloads: The data of the packets or the reassembled streams.
+
+        :type direction: Direction
+        :param direction: Who sent the data, the host or the node.
+
+        :type profile: Optional[str]
+        :param profile: The profile of the server.
+
+        :rtype: dict[int, dict[str, Any]]
+        :return: The columns of every action by their name.
+        """
+        request = self.parser.get_request(direction, profile)
+        id_size = self.parser.id_struct.size
+        groups: dict[int, list[memoryview]] = {}
+        for payload in payloads:
+            view = memoryview(payload)
+            messages, leftover = self.parser.split(view, direction, profile)
+            self.statistics['leftover'] += leftover
+            for action_id, start, end in messages:
+                action = request.dispatch[action_id]
+                if action is None:
+                    self.statistics['unknown'] += 1
+                    continue
+                start += id_size
+                if end - start < action.size:
+                    self.statistics['errors'] += 1
+                    continue
+                groups.setdefault(action.action_id, []).append(view[start:start + action.size])
+                self.statistics['messages'] += 1
+
+        decode = self._decode_numpy if self.use_numpy else self._decode_scalar
+        return {action_id: decode(request.actions[action_id], chunks)
+                for action_id, chunks in groups.items()}
+
+    @staticmethod
+    def _decode_numpy(action: CompiledAction, chunks: list[memoryview]) -> dict[str, Any]:
+        """
+        Decode the data of the messages of one action in one call.
+
+        :type action: CompiledAction
+        :param action: The compiled action.
+
+        :type chunks: list[memoryview]
+        :param chunks: The data of every message, without the ID.
+
+        :rtype: dict[str, numpy.ndarray]
+        :return: The array of every column.
+        """
+        columns = get_columns(action)
+        if not columns:
+            return {}
+
+        records = numpy.frombuffer(b''.join(chunks), dtype=get_dtype(columns))
+
+        return {column.name: records[column.name] for column in columns}
+
+    @staticmethod
+    def _decode_scalar(action: CompiledAction, chunks: list[memoryview]) -> dict[str, Any]:
+        """
+        Unpack the data of the messages of one action one by one.
+
+        :type action: CompiledAction
+        :param action: The compiled action.
+
+        :type chunks: list[memoryview]
+        :param chunks: The data of every message, without the ID.
+
+        :rtype: dict[str, list]
+        :return: The list of every column.
+        """
+        columns = get_columns(action)
+        values: dict[str, list] = {column.name: [] for column in columns}
+        for chunk in chunks:
+            variables = action.struct.unpack(chunk)
+            for column in columns:
+                if column.symbol == 's' or column.count == 1:
+                    values[column.name].append(variables[column.start])
+                else:
+                    values[column.name].append(variables[column.start:column.start + column.count])
+
+        return values
+
+    def get_statistics(self) -> dict:
+        """
+        Return the counters of the decoded payloads.
+
+        :rtype: dict
+        :return: The decoded messages, the messages of IDs which are only in the lengths
+            table, the messages shorter than their action and the bytes which were not cut.
+        """
+        return dict(self.statistics)
@@ -0,0 +1,458 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+Capture the frames with a raw socket and decode their headers without scapy.
+"""
+import mmap
+import select
+import socket
+from struct import Struct
+from typing import Iterator, NamedTuple, Optional
+
+from scapy.arch.linux import attach_filter
+
+ETH_P_ALL = 0x0003
+ETH_P_IP = 0x0800
+ETH_P_8021Q = 0x8100
+ETH_P_8021AD = 0x88a8
+ETHERNET_HEADER_SIZE = 14
+VLAN_HEADER_SIZE = 4
+IPV4_HEADER_SIZE = 20
+TCP_HEADER_SIZE = 20
+UDP_HEADER_SIZE = 8
+IPPROTO_TCP = 6
+IPPROTO_UDP = 17
+ARPHRD_LOOPBACK = 772
+PACKET_OUTGOING = 4
+SOL_PACKET = 263
+PACKET_RX_RING = 5
+PACKET_STATISTICS = 6
+PACKET_VERSION = 10
+TPACKET_V3 = 2
+TP_STATUS_KERNEL = 0
+TP_STATUS_USER = 1
+TPACKET_FRAME_SIZE = 2048
+TPACKET3_HEADER_SIZE = 48
+
+ETHER_TYPE = Struct('!H')
+IPV4_HEADER = Struct('!BxHxxHxB2x4s4s')
+PORTS = Struct('!HH')
+TCP_SEQUENCE = Struct('!I')
+TPACKET_STATISTICS = Struct('=II')
+TPACKET_STATISTICS_V3 = Struct('=III')
+TPACKET_REQUEST_V3 = Struct('=7I')
+BLOCK_HEADER = Struct('=III')
+BLOCK_STATUS = Struct('=I')
+PACKET_HEADER = Struct('=I8xI8xH')
+PACKET_ADDRESS = Struct('=HB')
+
+
+class Flow(NamedTuple):
+    """
+    The addresses of the sender and the receiver of one packet.
+    """
+    protocol: str
+    src_ip: str
+    src_port: int
+    dst_ip: str
+    dst_port: int
+
+
+def decode_frame(frame: bytes) -> Optional[tuple[Flow, memoryview, int]]:
+    """
+    Decode the Ethernet, VLAN, IPv4 and TCP or UDP headers of the frame.
+
+    :type frame: bytes
+    :param frame: The Ethernet frame.
+
+    :rtype: Optional[tuple[Flow, memoryview, int]]
+    :return: The flow, a view of the payload and the TCP sequence number, zero for UDP, or
+        None if it is not a TCP or UDP packet over IPv4, or it is not the first fragment.
+    """
+    view = memoryview(frame)
+    offset = decode_ethernet(view)
+    if offset is None:
+        return None
+
+    ipv4 = decode_ipv4(view, offset)
+    if ipv4 is None:
+        return None
+
+    protocol, src_ip, dst_ip, offset, end = ipv4
+    ports = decode_transport(view, protocol, offset, end)
+    if ports is None:
+        return None
+
+    protocol_name, src_port, dst_port, sequence, offset = ports
+
+    return Flow(protocol_name, src_ip, src_port, dst_ip, dst_port), view[offset:end], sequence
+
+
+def decode_ethernet(view: memoryview) -> Optional[int]:
+    """
+    Decode the Ethernet header and the VLAN tags.
+
+    :type view: memoryview
+    :param view: The Ethernet frame.
+
+    :rtype: Optional[int]
+    :return: Position of the IPv4 header, or None if the frame does not carry IPv4.
+    """
+    offset = ETHERNET_HEADER_SIZE
+    if len(view) < offset:
+        return None
+
+    ether_type, = ETHER_TYPE.unpack_from(view, offset - 2)
+    while ether_type in (ETH_P_8021Q, ETH_P_8021AD):
+        offset += VLAN_HEADER_SIZE
+        if len(view) < offset:
+            return None
+        ether_type, = ETHER_TYPE.unpack_from(view, offset - 2)
+
+    return offset if ether_type == ETH_P_IP else None
+
+
+def decode_ipv4(view: memoryview, offset: int) -> Optional[tuple[int, str, str, int, int]]:
+    """
+    Decode the IPv4 header.
+
+    :type view: memoryview
+    :param view: The Ethernet frame.
+
+    :type offset: int
+    :param offset: Position of the IPv4 header.
+
+    :rtype: Optional[tuple[int, str, str, int, int]]
+    :return: The protocol, the source and destination IPs, the position of the transport
+        header and the end of the IPv4 packet, without the Ethernet padding.
+    """
+    if len(view) < offset + IPV4_HEADER_SIZE:
+        return None
+
+    version_length, total_length, fragment, protocol, src_ip, dst_ip = \
+        IPV4_HEADER.unpack_from(view, offset)
+    if version_length >> 4 != 4 or fragment & 0x1fff:
+        return None
+
+    end = min(offset + total_length, len(view))
+    offset += (version_length & 0x0f) * 4
+
+    return protocol, socket.inet_ntoa(src_ip), socket.inet_ntoa(dst_ip), offset, end
+
+
+def decode_transport(view: memoryview, protocol: int, offset: int,
+                     end: int) -> Optional[tuple[str, int, int, int, int]]:
+    """
+    Decode the TCP or UDP header.
+
+    :type view: memoryview
+    :param view: The Ethernet frame.
+
+    :type protocol: int
+    :param protocol: The protocol number of the IPv4 header.
+
+    :type offset: int
+    :param offset: Position of the transport header.
+
+    :type end: int
+    :param end: The end of the IPv4 packet.
+
+    :rtype: Optional[tuple[str, int, int, int, int]]
+    :return: The name of the protocol, the source and destination ports, the TCP sequence
+        number and the position of the payload, or None if it is not a complete TCP or UDP
+        header.
+    """
+    if protocol == IPPROTO_TCP and end >= offset + TCP_HEADER_SIZE:
+        header_size = (view[offset + 12] >> 4) * 4
+        name = 'tcp'
+    elif protocol == IPPROTO_UDP and end >= offset + UDP_HEADER_SIZE:
+        header_size = UDP_HEADER_SIZE
+        name = 'udp'
+    else:
+        return None
+
+    if end < offset + header_size:
+        return None
+
+    src_port, dst_port = PORTS.unpack_from(view, offset)
+    sequence = TCP_SEQUENCE.unpack_from(view, offset + 4)[0] if name == 'tcp' else 0
+
+    return name, src_port, dst_port, sequence, offset + header_size
+
+
+def close_map(memory_map: Optional[mmap.mmap]) -> None:
+    """
+    Close a memory map, it is left to the garbage collector while a view of it is still
+    exported.
+
+    :type memory_map: Optional[mmap.mmap]
+    :param memory_map: The memory map, None if it is not open.
+
+    :rtype: None
+    :return: Nothing.
+    """
+    if memory_map is not None:
+        try:
+            memory_map.close()
+        except BufferError:
+            pass
+
+
+class RawSocketCapture:
+    """
+    Read the frames of the interface from an AF_PACKET socket with a kernel BPF filter.
+    """
+
+    def __init__(self, interface: str, bpf_filter: str, buffer_size: int = 65535) -> None:
+        """
+        Read the frames of the interface from an AF_PACKET socket with a kernel BPF filter.
+
+        :type interface: str
+        :param interface: The network interface.
+
+        :type bpf_filter: str
+        :param bpf_filter: The filter in the tcpdump syntax.
+
+        :type buffer_size: int
+        :param buffer_size: Maximum size of one frame.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        self.interface = interface
+        self.bpf_filter = bpf_filter
+        self.buffer_size = buffer_size
+        self.socket: Optional[socket.socket] = None
+        self.statistics = {'packets': 0, 'drops': 0}
+
+    def open(self) -> None:
+        """
+        Open the socket, bind it to the interface and attach the filter.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        raw_socket = socket.socket(socket.AF_PACKET, socket.SOCK_RAW, socket.htons(ETH_P_ALL))
+        try:
+            self._setup(raw_socket)
+            raw_socket.bind((self.interface, 0))
+            attach_filter(raw_socket, self.bpf_filter, self.interface)
+        except Exception:
+            raw_socket.close()
+            raise
+
+        self.socket = raw_socket
+
+    def _setup(self, raw_socket: socket.socket) -> None:
+        """
+        Configure the socket before it is bound to the interface.
+
+        :type raw_socket: socket.socket
+        :param raw_socket: The AF_PACKET socket.
+
+        :rtype: None
+        :return: Nothing.
+        """
+
+    def get_statistics(self) -> dict:
+        """
+        Read the counters of the kernel, they are reset every time that they are read, so
+        they are added to the previous ones.
+
+        :rtype: dict
+        :return: The received packets and the packets dropped by the kernel.
+        """
+        if self.socket is not None:
+            counters = TPACKET_STATISTICS.unpack(self.socket.getsockopt(
+                SOL_PACKET, PACKET_STATISTICS, TPACKET_STATISTICS.size))
+            self._add_statistics(counters)
+
+        return dict(self.statistics)
+
+    def _add_statistics(self, counters: tuple[int, ...]) -> None:
+        """
+        Add the counters of the kernel to the statistics.
+
+        :type counters: tuple[int, ...]
+        :param counters: The counters in the same order than the statistics.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        for name, counter in zip(self.statistics, counters):
+            self.statistics[name] += counter
+
+    def frames(self) -> Iterator[bytes]:
+        """
+        Read the frames until the socket is closed.
+
+        The frames sent by a loopback interface are read twice by the kernel, the outgoing
+        copy is skipped.
+
+        :rtype: Iterator[bytes]
+        :return: The Ethernet frames.
+        """
+        if self.socket is None:
+            self.open()
+
+        raw_socket = self.socket
+        buffer_size = self.buffer_size
+        while True:
+            frame, address = raw_socket.recvfrom(buffer_size)
+            if address[2] == PACKET_OUTGOING and address[3] == ARPHRD_LOOPBACK:
+                continue
+            yield frame
+
+    def close(self) -> None:
+        """
+        Close the socket.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        if self.socket is not None:
+            self.socket.close()
+            self.socket = None
+
+
+# pylint: disable=too-many-instance-attributes
+class RingCapture(RawSocketCapture):
+    """
+    Read the frames from a TPACKET_V3 ring buffer shared with the kernel.
+
+    The kernel fills whole blocks of frames, the blocks are walked in the memory map and
+    returned to the kernel when all their frames were read. The frames are views of the
+    memory map, they must be processed before the next frame is read.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, interface: str, bpf_filter: str, block_size: int = 1 << 20,
+                 block_count: int = 64, block_timeout: int = 100) -> None:
+        """
+        Read the frames from a TPACKET_V3 ring buffer shared with the kernel.
+
+        :type interface: str
+        :param interface: The network interface.
+
+        :type bpf_filter: str
+        :param bpf_filter: The filter in the tcpdump syntax.
+
+        :type block_size: int
+        :param block_size: Size in bytes of one block, it must be a multiple of the page size.
+
+        :type block_count: int
+        :param block_count: Number of blocks of the ring.
+
+        :type block_timeout: int
+        :param block_timeout: Milliseconds after the kernel returns a block which is not full.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        super().__init__(interface, bpf_filter, block_size)
+        self.block_size = block_size
+        self.block_count = block_count
+        self.block_timeout = block_timeout
+        self.statistics = {'packets': 0, 'drops': 0, 'freeze_queue': 0}
+        self.ring: Optional[mmap.mmap] = None
+
+    def _setup(self, raw_socket: socket.socket) -> None:
+        """
+        Set the TPACKET_V3 version, request the ring and map it.
+
+        :type raw_socket: socket.socket
+        :param raw_socket: The AF_PACKET socket.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        ring_size = self.block_size * self.block_count
+        raw_socket.setsockopt(SOL_PACKET, PACKET_VERSION, TPACKET_V3)
+        raw_socket.setsockopt(SOL_PACKET, PACKET_RX_RING, TPACKET_REQUEST_V3.pack(
+            self.block_size, self.block_count, TPACKET_FRAME_SIZE,
+            ring_size // TPACKET_FRAME_SIZE, self.block_timeout, 0, 0))
+        self.ring = mmap.mmap(raw_socket.fileno(), ring_size, mmap.MAP_SHARED,
+                              mmap.PROT_READ | mmap.PROT_WRITE)
+
+    def frames(self) -> Iterator[memoryview]:
+        """
+        Walk the frames of the blocks filled by the kernel.
+
+        :rtype: Iterator[memoryview]
+        :return: The Ethernet frames.
+        """
+        if self.socket is None:
+            self.open()
+
+        poll = select.poll()
+        poll.register(self.socket.fileno(), select.POLLIN | select.POLLERR)
+        ring = memoryview(self.ring)
+        block_size = self.block_size
+        block_count = self.block_count
+        index = 0
+        try:
+            while True:
+                block = index * block_size
+                status, count, offset = BLOCK_HEADER.unpack_from(ring, block + 8)
+                if not status & TP_STATUS_USER:
+                    poll.poll()
+                    continue
+
+                offset += block
+                for _ in range(count):
+                    next_offset, size, mac, hatype, pkttype = self._read_frame_header(ring, offset)
+                    if pkttype != PACKET_OUTGOING or hatype != ARPHRD_LOOPBACK:
+                        yield ring[offset + mac:offset + mac + size]
+                    offset += next_offset
+
+                BLOCK_STATUS.pack_into(ring, block + 8, TP_STATUS_KERNEL)
+                index = (index + 1) % block_count
+        finally:
+            ring.release()
+
+    @staticmethod
+    def _read_frame_header(ring: memoryview, offset: int) -> tuple[int, int, int, int, int]:
+        """
+        Read the header of one frame and the address of the sender.
+
+        :type ring: memoryview
+        :param ring: The memory map of the ring.
+
+        :type offset: int
+        :param offset: Position of the frame header.
+
+        :rtype: tuple[int, int, int, int, int]
+        :return: The offset of the next frame, the captured size, the position of the
+            Ethernet header, the hardware type and the packet type.
+        """
+        next_offset, size, mac = PACKET_HEADER.unpack_from(ring, offset)
+        hatype, pkttype = PACKET_ADDRESS.unpack_from(ring, offset + TPACKET3_HEADER_SIZE + 8)
+
+        return next_offset, size, mac, hatype, pkttype
+
+    def get_statistics(self) -> dict:
+        """
+        Read the counters of the kernel, they are reset every time that they are read, so
+        they are added to the previous ones.
+
+        :rtype: dict
+        :return: The received packets, the packets dropped by the kernel and the times that
+            the queue was frozen because the ring was full.
+        """
+        if self.socket is not None:
+            counters = TPACKET_STATISTICS_V3.unpack(self.socket.getsockopt(
+                SOL_PACKET, PACKET_STATISTICS, TPACKET_STATISTICS_V3.size))
+            self._add_statistics(counters)
+
+        return dict(self.statistics)
+
+    def close(self) -> None:
+        """
+        Close the memory map and the socket.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        close_map(self.ring)
+        self.ring = None
+        super().close()
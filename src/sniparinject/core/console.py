@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+Print the parsed messages in the console.
+"""
+from typing import Iterable, Optional
+
+# pylint: disable=import-error
+from .direction import Direction
+from .parser import Record
+from .renderer import Renderer
+from .writer import ConsoleWriter
+
+DEFAULT_RENDERER = Renderer()
+
+
+class Console:
+    """
+    Print the parsed messages in the console.
+
+    The lines of a payload are printed at once, or put in the buffer of the writer. They
+    are rendered with the default colors if there is no renderer of the Style settings.
+    """
+
+    @staticmethod
+    def print_records(records: Iterable[Record], payload: bytes,
+                      writer: Optional[ConsoleWriter] = None,
+                      renderer: Optional[Renderer] = None) -> None:
+        """
+        Print the messages which are displayed, the unknown IDs and the errors, only the
+        messages which are displayed are rendered.
+
+        :type records: Iterable[Record]
+        :param records: The parsed messages.
+
+        :type payload: bytes
+        :param payload: The data of the packet.
+
+        :type writer: Optional[ConsoleWriter]
+        :param writer: The writer of the output, None to print the lines now.
+
+        :type renderer: Optional[Renderer]
+        :param renderer: The renderer of the Style settings.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        Console.write_lines(Console.format_records(records, payload, renderer), writer)
+
+    @staticmethod
+    def format_records(records: Iterable[Record], payload: bytes,
+                       renderer: Optional[Renderer] = None) -> list[str]:
+        """
+        Return the lines of the messages which are displayed, the unknown IDs and the errors.
+
+        :type records: Iterable[Record]
+        :param records: The parsed messages.
+
+        :type payload: bytes
+        :param payload: The data of the packet.
+
+        :type renderer: Optional[Renderer]
+        :param renderer: The renderer of the Style settings.
+
+        :rtype: list[str]
+        :return: The lines, without the line break.
+        """
+        renderer = renderer or DEFAULT_RENDERER
+        lines = []
+        for record in records:
+            if record.error is not None:
+                message, location = record.error
+                lines += Console.format_error(record.direction, message, location, payload,
+                                              record.data, renderer)
+            elif not record.display:
+                continue
+            elif record.action is None:
+                lines.append(f'{record.direction.value.upper()}'
+                             f' | ID {hex(record.action_id)}'
+                             f' | {record.data.hex()}')
+                lines.append(f'     |-> {payload.hex()}')
+            else:
+                lines.append(renderer.render_message(record))
+
+        return lines
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    @staticmethod
+    def print_error(direction: Direction, error: str, location: str, payload: bytes,
+                    data: bytes, writer: Optional[ConsoleWriter] = None,
+                    renderer: Optional[Renderer] = None) -> None:
+        """
+        Print the error.
+
+        :type direction: Direction
+        :param direction: Who sent the data, the host or the node.
+
+        :type error: str
+        :param error: Error message.
+
+        :type location: str
+        :param location: The cascade classes and functions where the error occurred.
+
+        :type payload: bytes
+        :param payload: The data of the packet.
+
+        :type data: bytes
+        :param data: The data which was not parsed.
+
+        :type writer: Optional[ConsoleWriter]
+        :param writer: The writer of the output, None to print the lines now.
+
+        :type renderer: Optional[Renderer]
+        :param renderer: The renderer of the Style settings.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        Console.write_lines(
+            Console.format_error(direction, error, location, payload, data, renderer), writer)
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    @staticmethod
+    def format_error(direction: Direction, error: str, location: str, payload: bytes,
+                     data: bytes, renderer: Optional[Renderer] = None) -> list[str]:
+        """
+        Return the lines of the error, the last one is empty.
+
+        :type direction: Direction
+        :param direction: Who sent the data, the host or the node.
+
+        :type error: str
+        :param error: Error message.
+
+        :type location: str
+        :param location: The cascade classes and functions where the error occurred.
+
+        :type payload: bytes
+        :param payload: The data of the packet.
+
+        :type data: bytes
+        :param data: The data which was not parsed.
+
+        :type renderer: Optional[Renderer]
+        :param renderer: The renderer of the Style settings.
+
+        :rtype: list[str]
+        :return: The lines, without the line break.
+        """
+        renderer = renderer or DEFAULT_RENDERER
+
+        return [
+            renderer.error_format(f'Error {direction.value.upper()}: {error}'),
+            renderer.error_format(f'Location: {location}'),
+            renderer.error_format(f'Data: {payload.hex()}'),
+            renderer.error_format(f'Data Error: {data.hex()}'),
+            '',
+        ]
+
+    @staticmethod
+    def write_lines(lines: list[str], writer: Optional[ConsoleWriter] = None) -> None:
+        """
+        Put the lines in the buffer of the writer, or print them in only one call.
+
+        :type lines: list[str]
+        :param lines: The lines, without the line break.
+
+        :type writer: Optional[ConsoleWriter]
+        :param writer: The writer of the output, None to print the lines now.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        if not lines:
+            return
+        if writer is not None:
+            writer.write(lines)
+        else:
+            print('\n'.join(lines))
@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+Enumeration with the direction of the data.
+"""
+from enum import Enum
+
+
+class Direction(Enum):
+    """
+    Enumeration with the sender of the data.
+    """
+    HOST = 'host'
+    NODE = 'node'
+
+    @classmethod
+    def from_host(cls, is_host: bool) -> 'Direction':
+        """
+        Return the direction given the sender of the data.
+
+        :type is_host: bool
+        :param is_host: Is this response by the host?
+
+        :rtype: Direction
+        :return: The direction.
+        """
+        return cls.HOST if is_host else cls.NODE
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+Remember who sent the packets of every flow, so they are classified only once.
+"""
+from collections import OrderedDict
+from time import monotonic
+from typing import Callable, Optional
+
+# pylint: disable=import-error
+from .capture import Flow
+from .direction import Direction
+
+
+# pylint: disable=too-few-public-methods
+class FlowState:
+    """
+    The classification of one flow and the last time that a packet of it was seen.
+
+    `direction` is None if the flow is not of a server.
+    """
+    __slots__ = ('direction', 'profile', 'last_seen')
+
+    def __init__(self, direction: Optional[Direction], profile: Optional[str],
+                 last_seen: float) -> None:
+        """
+        The classification of one flow.
+
+        :type direction: Optional[Direction]
+        :param direction: Who sent the packets, None if the flow is not of a server.
+
+        :type profile: Optional[str]
+        :param profile: The profile of the server, None for the Game settings.
+
+        :type last_seen: float
+        :param last_seen: The monotonic time of the last packet.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        self.direction = direction
+        self.profile = profile
+        self.last_seen = last_seen
+
+
+class FlowTable:
+    """
+    The flows seen by the capture, in order of their last packet.
+
+    The first packet of a flow is classified, the next ones only need one lookup in the
+    dictionary. When there are more than `max_flows` flows, the least recently used one
+    is forgotten, and a flow without packets for `idle_timeout` seconds is forgotten too.
+    The `on_evict` callback receives every forgotten flow, e.g. to drop its TCP stream.
+    """
+
+    def __init__(self, classify: Callable[[Flow], Optional[tuple[Direction, Optional[str]]]],
+                 max_flows: int = 4096, idle_timeout: float = 300.0,
+                 on_evict: Optional[Callable[[Flow], None]] = None) -> None:
+        """
+        The flows seen by the capture.
+
+        :type classify: Callable[[Flow], Optional[tuple[Direction, Optional[str]]]]
+        :param classify: Return the direction and the profile of a new flow, or None if it
+            is not of a server.
+
+        :type max_flows: int
+        :param max_flows: Maximum number of flows.
+
+        :type idle_timeout: float
+        :param idle_timeout: Seconds without packets before a flow is forgotten.
+
+        :type on_evict: Optional[Callable[[Flow], None]]
+        :param on_evict: Called with every forgotten flow.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        self.classify = classify
+        self.max_flows = max_flows
+        self.idle_timeout = idle_timeout
+        self.on_evict = on_evict
+        self.flows: OrderedDict[Flow, FlowState] = OrderedDict()
+        self.statistics = {'hits': 0, 'misses': 0, 'evicted': 0, 'expired': 0}
+
+    def get(self, flow: Flow) -> FlowState:
+        """
+        Return the state of the flow, classify it if it is new or it was forgotten.
+
+        :type flow: Flow
+        :param flow: The addresses of the packet.
+
+        :rtype: FlowState
+        :return: The classification of the flow.
+        """
+        now = monotonic()
+        state = self.flows.get(flow)
+        if state is not None and now - state.last_seen <= self.idle_timeout:
+            self.statistics['hits'] += 1
+            state.last_seen = now
+            self.flows.move_to_end(flow)
+            return state
+
+        self.statistics['misses'] += 1
+        self._expire(now)
+        if len(self.flows) >= self.max_flows:
+            self.statistics['evicted'] += 1
+            self._forget(next(iter(self.flows)))
+
+        classification = self.classify(flow)
+        direction, profile = classification if classification is not None else (None, None)
+        state = FlowState(direction, profile, now)
+        self.flows[flow] = state
+
+        return state
+
+    def get_statistics(self) -> dict:
+        """
+        Return the counters of the table.
+
+        :rtype: dict
+        :return: The packets of known flows, of new flows, the flows forgotten because the
+            table was full or they were idle, and the flows in the table.
+        """
+        return dict(self.statistics, flows=len(self.flows))
+
+    def _expire(self, now: float) -> None:
+        """
+        Forget the idle flows, they are the first ones because the table is in order of
+        the last packet.
+
+        :type now: float
+        :param now: The monotonic time.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        while self.flows:
+            flow, state = next(iter(self.flows.items()))
+            if now - state.last_seen <= self.idle_timeout:
+                break
+            self.statistics['expired'] += 1
+            self._forget(flow)
+
+    def _forget(self, flow: Flow) -> None:
+        """
+        Remove the flow and tell the callback.
+
+        :type flow: Flow
+        :param flow: The flow to forget.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        del self.flows[flow]
+        if self.on_evict is not None:
+            self.on_evict(flow)
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+Parse the payloads of the game with the compiled settings.
+"""
+from struct import Struct
+from typing import NamedTuple, Optional, Sequence, Union
+
+# pylint: disable=import-error
+from .direction import Direction
+from .schema import CompiledAction, CompiledRequest, ProtocolSchema
+
+
+class Record(NamedTuple):
+    """
+    One message parsed from the payload.
+
+    `values` are the values of the fields of the action, with their reference and output
+    formatting, they are rendered only when the message is displayed. If the ID is not in
+    the settings, `action` is None. If the message could not be parsed, `error` has the
+    message and the location, and the parse of the payload stops. In both cases `data` is
+    a view of the data which was not parsed, it is not copied.
+    """
+    direction: Direction
+    action_id: Optional[int]
+    action: Optional[CompiledAction] = None
+    values: tuple = ()
+    display: bool = True
+    data: Union[bytes, memoryview] = b''
+    error: Optional[tuple[str, str]] = None
+    timestamp: float = 0.0
+
+
+class ParseResult(list):
+    """
+    The records parsed from one payload.
+
+    `parsed` is the number of messages which were parsed and `leftover` is the number of
+    bytes which were not parsed, because of an unknown ID, an error or a limit. When a
+    stream is parsed, `incomplete` is the number of bytes at the end of the leftover which
+    are the start of a message that continues in the next data of the stream, or which
+    were not parsed because of a limit, they are parsed with the next data. `spans`
+    are the ID, the start and the end of every message which was cut, e.g. to archive
+    their raw bytes.
+    """
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def __init__(self, records: list[Record], parsed: int, leftover: int,
+                 incomplete: int = 0, spans: Sequence[tuple[int, int, int]] = ()) -> None:
+        """
+        The records parsed from one payload.
+
+        :type records: list[Record]
+        :param records: The parsed messages.
+
+        :type parsed: int
+        :param parsed: Number of messages which were parsed.
+
+        :type leftover: int
+        :param leftover: Number of bytes which were not parsed.
+
+        :type incomplete: int
+        :param incomplete: Number of bytes of the last message which is not complete, or
+            after a limit, which are kept for the next data of the stream.
+
+        :type spans: Sequence[tuple[int, int, int]]
+        :param spans: The ID, the start and the end of every cut message.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        super().__init__(records)
+        self.parsed = parsed
+        self.leftover = leftover
+        self.incomplete = incomplete
+        self.spans = spans
+
+
+class ProtocolParser:
+    """
+    Parse the payloads of the game.
+
+    The parser is built once from the compiled settings and it does not keep any state
+    between payloads, so the same instance is used for every packet. The length of a
+    message in the lengths table is an unsigned short with the same endian than the IDs.
+    """
+
+    def __init__(self, schema: ProtocolSchema) -> None:
+        """
+        Parse the payloads of the game.
+
+        :type schema: ProtocolSchema
+        :param schema: The compiled settings.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        self.schema = schema
+        self.max_messages = schema.max_messages
+        self.max_bytes = schema.max_bytes
+        self.id_struct = schema.id_struct
+        self.length_struct = Struct(f'{self.id_struct.format[0]}H')
+        self._requests = {(None, Direction.HOST): schema.host, (None, Direction.NODE): schema.node}
+        for name, (host, node) in schema.profiles.items():
+            self._requests[name, Direction.HOST] = host
+            self._requests[name, Direction.NODE] = node
+
+    @classmethod
+    def from_settings(cls, settings: dict) -> 'ProtocolParser':
+        """
+        Validate and compile the settings, then build the parser.
+
+        :type settings: dict
+        :param settings: The settings read from the YAML file.
+
+        :rtype: ProtocolParser
+        :return: The parser.
+        """
+        return cls(ProtocolSchema.from_settings(settings))
+
+    # pylint: disable=too-many-locals,too-many-arguments,too-many-positional-arguments
+    def parse(self, payload: bytes, direction: Direction, stream: bool = False,
+              profile: Optional[str] = None, decode_hidden: bool = True,
+              timestamp: float = 0.0) -> ParseResult:
+        """
+        Parse all the messages of the payload.
+
+        The payload is cut into messages first, with the lengths table or the size of the
+        actions, then every message is decoded. A message which ID is only in the lengths
+        table is skipped as unknown and the next messages are parsed. The parse stops at
+        the first ID which length is not known or an error, after `max_messages` messages,
+        or when the next message starts after the first `max_bytes` bytes. If the payload
+        is part of a stream, a message which is cut at the end is not an error, its bytes
+        are reported as incomplete, like the bytes after a limit. The messages are not
+        rendered, the values of a message which is not displayed are not even decoded
+        without `decode_hidden`.
+
+        :type payload: bytes
+        :param payload: The data of the packet.
+
+        :type direction: Direction
+        :param direction: Who sent the data, the host or the node.
+
+        :type stream: bool
+        :param stream: Is the payload the reassembled data of a TCP stream?
+
+        :type profile: Optional[str]
+        :param profile: The profile of the server, the Game settings are used if it is None
+            or it is not in the settings.
+
+        :type decode_hidden: bool
+        :param decode_hidden: Decode the values of the messages which are not displayed.
+
+        :type timestamp: float
+        :param timestamp: The time of the payload, for every record.
+
+        :rtype: ParseResult
+        :return: The parsed messages.
+        """
+        request = self.get_request(direction, profile)
+        view = memoryview(payload)
+        size = len(view)
+        limit = min(size, self.max_bytes) if self.max_bytes else size
+        max_messages = self.max_messages or -1
+        messages, offset, incomplete, error = self._split(view, request, limit, max_messages,
+                                                          stream)
+        records = []
+        for action_id, start, end in messages:
+            record = self._parse_message(view, request, direction, action_id, start, end,
+                                         decode_hidden, timestamp)
+            records.append(record)
+            if record.error is not None:
+                return ParseResult(records, len(records) - 1, size - start, 0, messages)
+
+        parsed = len(records)
+        if error is not None:
+            action_id, = self.id_struct.unpack_from(view, offset)
+            records.append(Record(direction, action_id, data=view[offset + self.id_struct.size:],
+                                  error=(error, 'Class ProtocolParser -> parse() -> _split()'),
+                                  timestamp=timestamp))
+        elif not incomplete and offset < limit and parsed != max_messages:
+            records.append(self._parse_message(view, request, direction, None, offset, size,
+                                               decode_hidden, timestamp))
+
+        return ParseResult(records, parsed, size - offset, incomplete, messages)
+
+    def get_request(self, direction: Direction, profile: Optional[str] = None) -> CompiledRequest:
+        """
+        Return the compiled actions of the sender.
+
+        :type direction: Direction
+        :param direction: Who sent the data, the host or the node.
+
+        :type profile: Optional[str]
+        :param profile: The profile of the server, the Game settings are used if it is None
+            or it is not in the settings.
+
+        :rtype: CompiledRequest
+        :return: The compiled actions and lengths.
+        """
+        return self._requests.get((profile, direction)) or self._requests[None, direction]
+
+    def split(self, payload: Union[bytes, memoryview], direction: Direction,
+              profile: Optional[str] = None) -> tuple[list[tuple[int, int, int]], int]:
+        """
+        Cut the payload into messages without decoding them, with the same rules and limits
+        than parse().
+
+        :type payload: Union[bytes, memoryview]
+        :param payload: The data of the packet.
+
+        :type direction: Direction
+        :param direction: Who sent the data, the host or the node.
+
+        :type profile: Optional[str]
+        :param profile: The profile of the server.
+
+        :rtype: tuple[list[tuple[int, int, int]], int]
+        :return: The ID, the start and the end of every message, and the number of bytes
+            which were not cut.
+        """
+        view = memoryview(payload)
+        size = len(view)
+        limit = min(size, self.max_bytes) if self.max_bytes else size
+        messages, offset, _, _ = self._split(view, self.get_request(direction, profile), limit,
+                                             self.max_messages or -1, False)
+
+        return messages, size - offset
+
+    # pylint: disable=too-many-arguments
+    def _split(self, view: memoryview, request: CompiledRequest, limit: int, max_messages: int,
+               stream: bool) -> tuple[list[tuple[int, int, int]], int, int, Optional[str]]:
+        """
+        Cut the data into messages, nothing is decoded except the IDs and the lengths.
+
+        :type view: memoryview
+        :param view: The data of the packet.
+
+        :type request: CompiledRequest
+        :param request: The compiled actions and lengths of the sender.
+
+        :type limit: int
+        :param limit: A message which starts at this position is not cut.
+
+        :type max_messages: int
+        :param max_messages: Maximum number of messages, -1 means that there is no limit.
+
+        :type stream: bool
+        :param stream: Is the data part of a stream?
+
+        :rtype: tuple[list[tuple[int, int, int]], int, int, Optional[str]]
+        :return: The ID, the start and the end of every message, the position where the cut
+            stopped, the number of bytes of an incomplete message, or after a limit in a
+            stream, and the error of a length which is not valid.
+        """
+        actions = request.dispatch
+        lengths = request.length_table
+        unpack_id = self.id_struct.unpack_from
+        id_size = self.id_struct.size
+        unpack_length = self.length_struct.unpack_from
+        length_size = self.length_struct.size
+        size = len(view)
+        messages = []
+        offset = 0
+        while offset < limit and len(messages) != max_messages:
+            if size - offset < id_size:
+                return messages, offset, size - offset if stream else 0, None
+
+            action_id, = unpack_id(view, offset)
+            length = lengths[action_id]
+            if length is None:
+                action = actions[action_id]
+                if action is None:
+                    break
+                end = offset + id_size + action.size
+            elif length.offset is None:
+                end = offset + length.size
+            elif size - offset < length.offset + length_size:
+                end = size + 1
+            else:
+                end = offset + unpack_length(view, offset + length.offset)[0]
+                if end < offset + length.offset + length_size:
+                    return messages, offset, 0, f'The length ({end - offset}) of the message' \
+                                                f' {hex(action_id)} is too short.'
+
+            if end > size:
+                return messages, offset, size - offset if stream else 0, None
+
+            messages.append((action_id, offset, end))
+            offset = end
+        else:
+            # A limit stopped the cut, the rest of a stream is parsed with its next data.
+            return messages, offset, size - offset if stream else 0, None
+
+        return messages, offset, 0, None
+
+    # pylint: disable=broad-except,too-many-positional-arguments
+    def _parse_message(self, view: memoryview, request: CompiledRequest, direction: Direction,
+                       action_id: Optional[int], start: int, end: int,
+                       decode_hidden: bool = True, timestamp: float = 0.0) -> Record:
+        """
+        Decode one message.
+
+        :type view: memoryview
+        :param view: The data of the packet.
+
+        :type request: CompiledRequest
+        :param request: The compiled actions of the sender.
+
+        :type direction: Direction
+        :param direction: Who sent the data, the host or the node.
+
+        :type action_id: Optional[int]
+        :param action_id: The ID of the message, None if it was not read by the cut.
+
+        :type start: int
+        :param start: Position of the ID of the message.
+
+        :type end: int
+        :param end: The end of the message.
+
+        :type decode_hidden: bool
+        :param decode_hidden: Decode the values if the message is not displayed.
+
+        :type timestamp: float
+        :param timestamp: The time of the payload.
+
+        :rtype: Record
+        :return: The parsed message, an unknown ID or an error.
+        """
+        offset = start
+        try:
+            if action_id is None:
+                action_id, = self.id_struct.unpack_from(view, offset)
+            offset += self.id_struct.size
+            action = request.dispatch[action_id]
+            if action is None:
+                return Record(direction, action_id, display=request.display_message,
+                              data=view[offset:end], timestamp=timestamp)
+
+            if end - offset < action.size and end < len(view):
+                raise RuntimeError(f'The length ({end - start}) of the message is shorter than'
+                                   f' the action ({action.size + self.id_struct.size}).', '')
+
+            display = action.display_message
+            if display is None:
+                display = request.display_message
+            values = self._decode(action, view, offset) if display or decode_hidden else ()
+        except Exception as error:
+            message, location = error.args if len(error.args) == 2 else (str(error), '')
+            location = f'Class ProtocolParser -> parse(){location}'
+            return Record(direction, action_id, data=view[offset:], error=(message, location),
+                          timestamp=timestamp)
+
+        return Record(direction, action_id, action, values, display, timestamp=timestamp)
+
+    @staticmethod
+    def _decode(action: CompiledAction, view: memoryview, offset: int) -> tuple:
+        """
+        Unpack the data with the precompiled struct, or the generated decode function of
+        the action, and format the values.
+
+        :type action: CompiledAction
+        :param action: The compiled action.
+
+        :type view: memoryview
+        :param view: The data of the packet.
+
+        :type offset: int
+        :param offset: Position of the data of the action, after the ID.
+
+        :rtype: tuple
+        :return: The formatted value of every field.
+        """
+        if action.decode is not None:
+            return action.decode(view, offset)
+
+        return tuple(field.format(variable) for field, variable
+                     in zip(action.fields, action.struct.unpack_from(view, offset)))
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+Move the parse and the print of the payloads out of the capture with a bounded queue.
+"""
+from collections import deque
+from threading import Condition, Thread
+from typing import Any, Callable
+
+# pylint: disable=import-error
+from .utility import Utility
+
+OVERFLOW_POLICIES = ('block', 'drop_oldest', 'drop_render')
+
+
+# pylint: disable=too-many-instance-attributes
+class ParsePipeline(Thread):
+    """
+    Parse and print the payloads in a background thread, the capture only puts them in a
+    bounded queue.
+
+    When the queue is full, the overflow policy decides what happens:
+
+    - `block`: the capture waits until there is room in the queue.
+    - `drop_oldest`: the oldest payload of the queue is dropped.
+    - `drop_render`: the capture does not wait, the payloads are queued up to twice the
+      size of the queue and parsed without printing them until the queue is empty, so the
+      statistics are still counted. Beyond that, the oldest payload is dropped.
+    """
+
+    def __init__(self, handler: Callable[[Any, bool], None], queue_size: int = 4096,
+                 overflow: str = 'block') -> None:
+        """
+        Parse and print the payloads in a background thread.
+
+        :type handler: Callable[[Any, bool], None]
+        :param handler: Parse one item of the queue, the flag tells if it is printed.
+
+        :type queue_size: int
+        :param queue_size: Maximum number of items in the queue.
+
+        :type overflow: str
+        :param overflow: The policy when the queue is full: block, drop_oldest or drop_render.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise RuntimeError(
+                f'Error: The overflow ({overflow}) is not block, drop_oldest or drop_render.')
+
+        super().__init__(name='ParsePipeline', daemon=True)
+        self.handler = handler
+        self.queue_size = queue_size
+        self.overflow = overflow
+        self.statistics = {'enqueued': 0, 'processed': 0, 'dropped': 0, 'unrendered': 0,
+                           'errors': 0, 'max_depth': 0}
+        self._limit = queue_size * 2 if overflow == 'drop_render' else queue_size
+        self._items: deque = deque()
+        self._condition = Condition()
+        self._overloaded = False
+        self._stopped = False
+
+    def put(self, item: Any) -> None:
+        """
+        Put one item in the queue, apply the overflow policy if the queue is full.
+
+        :type item: Any
+        :param item: The data which will be passed to the handler.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        with self._condition:
+            if len(self._items) >= self.queue_size:
+                if self.overflow == 'block':
+                    while len(self._items) >= self.queue_size and not self._stopped:
+                        self._condition.wait()
+                else:
+                    self._overloaded = self.overflow == 'drop_render'
+                    if len(self._items) >= self._limit:
+                        self._items.popleft()
+                        self.statistics['dropped'] += 1
+
+            self._items.append(item)
+            self.statistics['enqueued'] += 1
+            self.statistics['max_depth'] = max(self.statistics['max_depth'], len(self._items))
+            self._condition.notify_all()
+
+    # pylint: disable=broad-except
+    def run(self) -> None:
+        """
+        Pass the items to the handler until the pipeline is stopped and the queue is empty.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        while True:
+            with self._condition:
+                while not self._items and not self._stopped:
+                    self._condition.wait()
+                if not self._items:
+                    return
+
+                item = self._items.popleft()
+                render = not self._overloaded
+                if not self._items:
+                    self._overloaded = False
+                self._condition.notify_all()
+
+            try:
+                self.handler(item, render)
+            except Exception as error:
+                self.statistics['errors'] += 1
+                print(Utility.text_error_format(f'Error Pipeline: {error}'))
+                print(Utility.text_error_format('Location: ParsePipeline -> run()'))
+                print()
+
+            self.statistics['processed'] += 1
+            if not render:
+                self.statistics['unrendered'] += 1
+
+    def stop(self) -> None:
+        """
+        Stop the pipeline after the items of the queue are processed.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+
+        if self.is_alive():
+            self.join()
+
+    def get_statistics(self) -> dict:
+        """
+        Return the depth of the queue and the counters of the items.
+
+        :rtype: dict
+        :return: The items in the queue, enqueued, processed, dropped, parsed without
+            printing them and with an error, and the maximum depth of the queue.
+        """
+        with self._condition:
+            return dict(self.statistics, depth=len(self._items))
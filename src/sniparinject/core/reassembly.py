@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+Reassemble the TCP segments of every flow into the ordered bytes of the stream.
+"""
+from typing import Hashable
+
+SEQUENCE_MASK = 0xffffffff
+SEQUENCE_HALF = 0x80000000
+
+
+def sequence_distance(start: int, end: int) -> int:
+    """
+    Return how many bytes the end sequence number is after the start, the numbers wrap
+    around at 32 bits.
+
+    :type start: int
+    :param start: The first sequence number.
+
+    :type end: int
+    :param end: The second sequence number.
+
+    :rtype: int
+    :return: The distance, negative if the end is before the start.
+    """
+    distance = (end - start) & SEQUENCE_MASK
+    return distance - (1 << 32) if distance >= SEQUENCE_HALF else distance
+
+
+# pylint: disable=too-few-public-methods
+class TcpStream:
+    """
+    The state of one direction of a TCP connection.
+
+    `next_sequence` is the sequence number of the next byte in order, `segments` are the
+    segments received after a hole and `tail` is the start of a message which continues
+    in the next segments.
+    """
+
+    def __init__(self, next_sequence: int) -> None:
+        """
+        The state of one direction of a TCP connection.
+
+        :type next_sequence: int
+        :param next_sequence: The sequence number of the first byte.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        self.next_sequence = next_sequence
+        self.segments: dict[int, bytes] = {}
+        self.buffered = 0
+        self.tail = b''
+
+
+class StreamReassembler:
+    """
+    Put the TCP segments of every flow in order and return the bytes which follow the
+    previous ones, so a message split in many segments is parsed as only one.
+
+    The retransmitted bytes are dropped, the segments after a hole wait until the hole is
+    filled. A flow keeps at most `max_bytes` bytes, when there are more, the hole is
+    skipped and the stream continues from the next segment. When there are more than
+    `max_flows` flows, the least recently used one is forgotten: a flow is moved to the end
+    of the streams at every segment, so the first one is the one idle for the longest time.
+    """
+
+    def __init__(self, max_bytes: int = 1 << 20, max_flows: int = 4096) -> None:
+        """
+        Put the TCP segments of every flow in order.
+
+        :type max_bytes: int
+        :param max_bytes: Maximum bytes kept for one flow.
+
+        :type max_flows: int
+        :param max_flows: Maximum number of flows.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        self.max_bytes = max_bytes
+        self.max_flows = max_flows
+        self.streams: dict[Hashable, TcpStream] = {}
+        self.statistics = {'segments': 0, 'retransmits': 0, 'out_of_order': 0, 'gaps': 0}
+
+    def add(self, flow: Hashable, sequence: int, payload: bytes) -> bytes:
+        """
+        Add one segment and return the data which is ready to be parsed.
+
+        The data starts with the tail kept by `keep()` and continues with the bytes in order,
+        it is empty if the segment is a retransmit or it is after a hole.
+
+        :type flow: Hashable
+        :param flow: The flow of the segment, one per direction.
+
+        :type sequence: int
+        :param sequence: The sequence number of the first byte of the payload.
+
+        :type payload: bytes
+        :param payload: The data of the segment.
+
+        :rtype: bytes
+        :return: The data in order.
+        """
+        self.statistics['segments'] += 1
+        stream = self.streams.pop(flow, None)
+        if stream is None:
+            stream = self._new_stream(flow, sequence)
+        else:
+            self.streams[flow] = stream
+
+        distance = sequence_distance(stream.next_sequence, sequence)
+        if distance > 0:
+            if not self._store(stream, sequence, bytes(payload)):
+                return b''
+
+            chunks = []
+            self._drain(stream, chunks)
+            return b''.join(chunks)
+
+        if -distance >= len(payload):
+            self.statistics['retransmits'] += 1
+            return b''
+
+        chunks = [stream.tail, payload[-distance:]]
+        stream.next_sequence = (sequence + len(payload)) & SEQUENCE_MASK
+        stream.tail = b''
+        if stream.segments:
+            self._drain(stream, chunks)
+
+        return b''.join(chunks)
+
+    def keep(self, flow: Hashable, tail: bytes) -> None:
+        """
+        Keep the start of a message which continues in the next segments of the flow.
+
+        :type flow: Hashable
+        :param flow: The flow of the data.
+
+        :type tail: bytes
+        :param tail: The bytes of the incomplete message.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        stream = self.streams.get(flow)
+        if stream is None:
+            return
+
+        if len(tail) + stream.buffered > self.max_bytes:
+            self.statistics['gaps'] += 1
+            tail = b''
+        stream.tail = bytes(tail)
+
+    def discard(self, flow: Hashable) -> None:
+        """
+        Forget the stream of the flow, e.g. when the connection is idle.
+
+        :type flow: Hashable
+        :param flow: The flow of the stream.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        self.streams.pop(flow, None)
+
+    def get_statistics(self) -> dict:
+        """
+        Return the counters of the segments.
+
+        :rtype: dict
+        :return: The segments, the retransmits, the segments out of order and the holes
+            which were skipped.
+        """
+        return dict(self.statistics, flows=len(self.streams))
+
+    def _new_stream(self, flow: Hashable, sequence: int) -> TcpStream:
+        """
+        Start a stream at the first segment seen of the flow, forget the least recently used
+        flow if there are too many.
+
+        :type flow: Hashable
+        :param flow: The flow of the segment.
+
+        :type sequence: int
+        :param sequence: The sequence number of the first segment.
+
+        :rtype: TcpStream
+        :return: The new stream.
+        """
+        if len(self.streams) >= self.max_flows:
+            del self.streams[next(iter(self.streams))]
+
+        stream = TcpStream(sequence)
+        self.streams[flow] = stream
+
+        return stream
+
+    def _store(self, stream: TcpStream, sequence: int, payload: bytes) -> bool:
+        """
+        Keep a segment which is after a hole, skip the hole if the flow has too many bytes,
+        then the tail is dropped because the next data does not continue it.
+
+        :type stream: TcpStream
+        :param stream: The stream of the segment.
+
+        :type sequence: int
+        :param sequence: The sequence number of the segment.
+
+        :type payload: bytes
+        :param payload: The data of the segment.
+
+        :rtype: bool
+        :return: True if the hole was skipped.
+        """
+        self.statistics['out_of_order'] += 1
+        previous = stream.segments.get(sequence, b'')
+        if len(payload) <= len(previous):
+            return False
+
+        stream.segments[sequence] = payload
+        stream.buffered += len(payload) - len(previous)
+        if stream.buffered + len(stream.tail) <= self.max_bytes:
+            return False
+
+        self.statistics['gaps'] += 1
+        stream.next_sequence = min(
+            stream.segments, key=lambda start: sequence_distance(stream.next_sequence, start))
+        stream.tail = b''
+
+        return True
+
+    def _drain(self, stream: TcpStream, chunks: list) -> None:
+        """
+        Move the segments which are no longer after a hole to the data in order.
+
+        :type stream: TcpStream
+        :param stream: The stream with the waiting segments.
+
+        :type chunks: list
+        :param chunks: The data in order, the segments are appended to it.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        for start in sorted(stream.segments,
+                            key=lambda start: sequence_distance(stream.next_sequence, start)):
+            distance = sequence_distance(stream.next_sequence, start)
+            if distance > 0:
+                break
+
+            payload = stream.segments.pop(start)
+            stream.buffered -= len(payload)
+            if -distance < len(payload):
+                chunks.append(payload[-distance:])
+                stream.next_sequence = (start + len(payload)) & SEQUENCE_MASK
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+Render the records of the parser as the text of the console.
+"""
+from types import MappingProxyType
+from typing import Optional
+
+# pylint: disable=import-error
+from .direction import Direction
+from .parser import Record
+from .schema import CompiledAction
+from .text_style import TextStyle
+
+# 'Name in the Style settings': 'Default ANSI code'
+STYLE_CODES = MappingProxyType({
+    'title': '00;93',
+    'normal': '00;30',
+    'bold': '00;37',
+    'light': '00;96',
+    'error': '00;37;41',
+    'host': '44',
+    'node': '100',
+})
+STYLE_END = '\x1b[0m'
+
+
+class Renderer:
+    """
+    Render the records of the parser as the text of the console.
+
+    The parser only decodes the values, a record is rendered when it is displayed. The
+    escape sequences of every direction and style are built once with the Style settings,
+    and the first message of an action builds its template, so the next messages of the
+    action are rendered with only one call to `format`. Without color, the templates are
+    plain text, e.g. to redirect the output to a file.
+    """
+
+    def __init__(self, color: bool = True, styles: Optional[dict] = None) -> None:
+        """
+        Build the escape sequences of every direction and style.
+
+        :type color: bool
+        :param color: Use the ANSI escape sequences, otherwise the text is plain.
+
+        :type styles: Optional[dict]
+        :param styles: The ANSI codes by their name in the Style settings, the missing
+            ones are the default codes.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        codes = dict(STYLE_CODES, **{name: str(code) for name, code in (styles or {}).items()})
+        self.color = color
+        self.end = STYLE_END if color else ''
+        self.prefixes = {
+            (direction, style): (
+                f'\x1b[{codes[style.name.lower()]};{codes[direction.value]}m' if color else '')
+            for direction in Direction
+            for style in TextStyle
+            if style is not TextStyle.ERROR
+        }
+        self.error_prefix = f'\x1b[{codes["error"]}m' if color else ''
+        self.settings: Optional[dict] = None
+        self._templates: dict[tuple[Direction, int], tuple[CompiledAction, str]] = {}
+
+    @classmethod
+    def from_settings(cls, settings: dict) -> 'Renderer':
+        """
+        Create the renderer with the Style settings.
+
+        :type settings: dict
+        :param settings: The settings read from the YAML file.
+
+        :rtype: Renderer
+        :return: The renderer, its `settings` are the ones which built it.
+        """
+        style_settings = dict(settings.get('Style') or {})
+        color = style_settings.pop('color', True) is not False
+        renderer = cls(color, style_settings)
+        renderer.settings = settings
+
+        return renderer
+
+    def render_message(self, record: Record) -> str:
+        """
+        Convert the values of the record into the styled message of its action.
+
+        :type record: Record
+        :param record: A parsed message of a known action.
+
+        :rtype: str
+        :return: Message of this action.
+        """
+        key = (record.direction, id(record.action))
+        compiled = self._templates.get(key)
+        if compiled is None or compiled[0] is not record.action:
+            compiled = (record.action, self.compile_template(record.direction, record.action))
+            self._templates[key] = compiled
+
+        return compiled[1].format(*record.values)
+
+    def compile_template(self, direction: Direction, action: CompiledAction) -> str:
+        """
+        Build the template of the messages of the action, with one replacement field by
+        value.
+
+        :type direction: Direction
+        :param direction: Who sent the messages, the host or the node.
+
+        :type action: CompiledAction
+        :param action: The compiled action.
+
+        :rtype: str
+        :return: The template for `str.format`.
+        """
+        arrow = '<--' if direction is Direction.HOST else '-->'
+        template = self.text_format(f'{arrow} {escape(action.title)}', direction, TextStyle.TITLE)
+        separator = self.text_format(' |', direction)
+        template += separator
+        for field in action.fields:
+            if field.name:
+                template += self.text_format(f' {escape(field.name)}', direction, TextStyle.BOLD)
+            template += self.text_format(' {}', direction, TextStyle.LIGHT)
+            template += separator
+
+        return template
+
+    def text_format(self, text: str, direction: Direction, style: TextStyle = TextStyle.NORMAL
+                    ) -> str:
+        """
+        Prints the text format for the output of the host or the node.
+
+        :type text: str
+        :param text: The text which will be format.
+
+        :type direction: Direction
+        :param direction: Who sent the data, the host or the node.
+
+        :type style: TextStyle
+        :param style: Set the style of the text.
+
+        :rtype: str
+        :return: The format code.
+        """
+        return f'{self.prefixes[direction, style]}{text}{self.end}'
+
+    def error_format(self, text: str) -> str:
+        """
+        Prints the text format for the errors.
+
+        :type text: str
+        :param text: The text which will be format.
+
+        :rtype: str
+        :return: The format code.
+        """
+        return f'{self.error_prefix}{text}{self.end}'
+
+
+def escape(text: str) -> str:
+    """
+    Escape the braces of the text, so it is kept as it is in a template.
+
+    :type text: str
+    :param text: The text of the settings.
+
+    :rtype: str
+    :return: The escaped text.
+    """
+    return text.replace('{', '{{').replace('}', '}}')
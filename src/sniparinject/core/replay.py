@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+Replay the frames of a pcap or pcapng file which is mapped in memory.
+"""
+import mmap
+from struct import Struct
+from time import monotonic, sleep
+from typing import Iterator, Optional
+
+# pylint: disable=import-error
+from .capture import close_map
+
+LINKTYPE_ETHERNET = 1
+PCAP_MAGIC = {
+    b'\xd4\xc3\xb2\xa1': ('<', 1e-6),
+    b'\xa1\xb2\xc3\xd4': ('>', 1e-6),
+    b'\x4d\x3c\xb2\xa1': ('<', 1e-9),
+    b'\xa1\xb2\x3c\x4d': ('>', 1e-9),
+}
+PCAPNG_MAGIC = b'\x0a\x0d\x0d\x0a'
+PCAPNG_BYTE_ORDER = {
+    b'\x4d\x3c\x2b\x1a': '<',
+    b'\x1a\x2b\x3c\x4d': '>',
+}
+PCAP_HEADER_SIZE = 24
+PCAPNG_INTERFACE = 1
+PCAPNG_SIMPLE_PACKET = 3
+PCAPNG_ENHANCED_PACKET = 6
+PCAPNG_OPTION_END = 0
+PCAPNG_OPTION_TSRESOL = 9
+
+
+class PcapReplay:
+    """
+    Read the frames of a pcap or pcapng file without loading the whole file.
+
+    The file is mapped in memory and the frames are views of the map, they must be
+    processed before the next frame is read. Only the Ethernet frames are returned, the
+    other link types are counted as skipped. With the original timing, the frames are
+    returned at the same pace than they were captured, otherwise as fast as possible.
+    """
+
+    def __init__(self, capture_file: str, original_timing: bool = False) -> None:
+        """
+        Read the frames of a pcap or pcapng file without loading the whole file.
+
+        :type capture_file: str
+        :param capture_file: The pcap or pcapng file.
+
+        :type original_timing: bool
+        :param original_timing: Wait between the frames as they were captured.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        self.capture_file = capture_file
+        self.original_timing = original_timing
+        self.map: Optional[mmap.mmap] = None
+        self.statistics = {'packets': 0, 'skipped': 0}
+
+    def open(self) -> None:
+        """
+        Map the file in memory.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        with open(self.capture_file, 'rb') as file:
+            self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def frames(self) -> Iterator[tuple[float, memoryview]]:
+        """
+        Return the Ethernet frames with their capture time, wait between them if the
+        original timing is used.
+
+        :rtype: Iterator[tuple[float, memoryview]]
+        :return: The timestamp in seconds and the Ethernet frame.
+        """
+        start = None
+        for timestamp, frame in self.records():
+            if self.original_timing:
+                if start is None:
+                    start = monotonic() - timestamp
+                delay = start + timestamp - monotonic()
+                if delay > 0:
+                    sleep(delay)
+            yield timestamp, frame
+
+    def records(self) -> Iterator[tuple[float, memoryview]]:
+        """
+        Walk the records of the file, the format is detected with its magic number.
+
+        :rtype: Iterator[tuple[float, memoryview]]
+        :return: The timestamp in seconds and the Ethernet frame.
+        """
+        if self.map is None:
+            self.open()
+
+        view = memoryview(self.map)
+        try:
+            magic = bytes(view[:4])
+            if magic == PCAPNG_MAGIC:
+                yield from self._read_pcapng(view)
+            elif magic in PCAP_MAGIC:
+                yield from self._read_pcap(view, *PCAP_MAGIC[magic])
+            else:
+                raise ValueError(
+                    f'Error: The file ({self.capture_file}) is not a pcap or pcapng file.')
+        finally:
+            view.release()
+
+    def _read_pcap(self, view: memoryview, byte_order: str,
+                   resolution: float) -> Iterator[tuple[float, memoryview]]:
+        """
+        Walk the records of a pcap file.
+
+        :type view: memoryview
+        :param view: The mapped file.
+
+        :type byte_order: str
+        :param byte_order: The struct symbol of the byte order of the file.
+
+        :type resolution: float
+        :param resolution: Seconds of one unit of the fraction of the timestamps.
+
+        :rtype: Iterator[tuple[float, memoryview]]
+        :return: The timestamp in seconds and the Ethernet frame.
+        """
+        if len(view) < PCAP_HEADER_SIZE:
+            return
+
+        link_type, = Struct(f'{byte_order}I').unpack_from(view, 20)
+        record_header = Struct(f'{byte_order}IIII')
+        size = len(view)
+        offset = PCAP_HEADER_SIZE
+        while offset + record_header.size <= size:
+            seconds, fraction, captured, _ = record_header.unpack_from(view, offset)
+            offset += record_header.size
+            if offset + captured > size:
+                break
+
+            if self._count(link_type):
+                yield seconds + fraction * resolution, view[offset:offset + captured]
+            offset += captured
+
+    # pylint: disable=too-many-locals
+    def _read_pcapng(self, view: memoryview) -> Iterator[tuple[float, memoryview]]:
+        """
+        Walk the blocks of a pcapng file, the packets are read from the enhanced and the
+        simple packet blocks, the other blocks are skipped. A packet which interface is not
+        described before it is counted as skipped.
+
+        :type view: memoryview
+        :param view: The mapped file.
+
+        :rtype: Iterator[tuple[float, memoryview]]
+        :return: The timestamp in seconds and the Ethernet frame.
+        """
+        byte_order = '<'
+        block_header = Struct('<II')
+        packet_header = Struct('<IIIII')
+        packet_length = Struct('<I')
+        interfaces: list[tuple[int, float]] = []
+        timestamp = 0.0
+        size = len(view)
+        offset = 0
+        while offset + 12 <= size:
+            if view[offset:offset + 4] == PCAPNG_MAGIC:
+                byte_order = PCAPNG_BYTE_ORDER.get(bytes(view[offset + 8:offset + 12]))
+                if byte_order is None:
+                    raise ValueError(
+                        f'Error: The byte order of the file ({self.capture_file}) is invalid.')
+                block_header = Struct(f'{byte_order}II')
+                packet_header = Struct(f'{byte_order}IIIII')
+                packet_length = Struct(f'{byte_order}I')
+                interfaces = []
+
+            block_type, block_size = block_header.unpack_from(view, offset)
+            if block_size < 12 or offset + block_size > size:
+                break
+
+            body = view[offset + 8:offset + block_size - 4]
+            offset += block_size
+            if block_type == PCAPNG_ENHANCED_PACKET:
+                interface, high, low, captured, _ = packet_header.unpack_from(body)
+                link_type, resolution = (interfaces[interface] if interface < len(interfaces)
+                                         else (None, None))
+                timestamp = ((high << 32) | low) * resolution if resolution else timestamp
+                if self._count(link_type):
+                    yield timestamp, body[packet_header.size:packet_header.size + captured]
+            elif block_type == PCAPNG_SIMPLE_PACKET:
+                length, = packet_length.unpack_from(body)
+                if self._count(interfaces[0][0] if interfaces else None):
+                    yield timestamp, body[packet_length.size:packet_length.size + length]
+            elif block_type == PCAPNG_INTERFACE:
+                interfaces.append(self._read_interface(body, byte_order))
+
+    @staticmethod
+    def _read_interface(body: memoryview, byte_order: str) -> tuple[int, float]:
+        """
+        Read the link type and the resolution of the timestamps of an interface.
+
+        :type body: memoryview
+        :param body: The body of the interface description block.
+
+        :type byte_order: str
+        :param byte_order: The struct symbol of the byte order of the section.
+
+        :rtype: tuple[int, float]
+        :return: The link type and the seconds of one unit of the timestamps.
+        """
+        option = Struct(f'{byte_order}HH')
+        link_type, = Struct(f'{byte_order}H').unpack_from(body)
+        resolution = 1e-6
+        offset = 8
+        while offset + option.size <= len(body):
+            code, length = option.unpack_from(body, offset)
+            offset += option.size
+            if code == PCAPNG_OPTION_END:
+                break
+            if code == PCAPNG_OPTION_TSRESOL and length >= 1:
+                value = body[offset]
+                resolution = 2 ** -(value & 0x7f) if value & 0x80 else 10 ** -value
+            offset += (length + 3) & ~3
+
+        return link_type, resolution
+
+    def _count(self, link_type: Optional[int]) -> bool:
+        """
+        Count the record as a packet if it is an Ethernet frame, otherwise as skipped.
+
+        :type link_type: Optional[int]
+        :param link_type: The link type of the record, None if its interface is unknown.
+
+        :rtype: bool
+        :return: True if the record is an Ethernet frame.
+        """
+        if link_type == LINKTYPE_ETHERNET:
+            self.statistics['packets'] += 1
+            return True
+
+        self.statistics['skipped'] += 1
+        return False
+
+    def get_statistics(self) -> dict:
+        """
+        Return how many records were read and skipped.
+
+        :rtype: dict
+        :return: The Ethernet frames and the records of other link types.
+        """
+        return dict(self.statistics)
+
+    def close(self) -> None:
+        """
+        Close the memory map.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        close_map(self.map)
+        self.map = None
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+Write the text files of the sinks through a buffer, with their rotation by size or by time.
+"""
+import gzip
+from os import remove, replace
+from os.path import exists, splitext
+from shutil import copyfileobj
+from threading import Thread
+from time import monotonic
+
+
+def compress_file(path: str) -> None:
+    """
+    Compress the file with gzip into `path.gz`, then remove it.
+
+    :type path: str
+    :param path: The rotated file.
+
+    :rtype: None
+    :return: Nothing.
+    """
+    with open(path, 'rb') as source, gzip.open(f'{path}.gz', 'wb') as target:
+        copyfileobj(source, target)
+    remove(path)
+
+
+# pylint: disable=too-many-instance-attributes
+class RotatingFile:
+    """
+    A text file written through a buffer, which is rotated by size or by time.
+
+    The texts are kept in a list and written in one call when they have `buffer_size`
+    bytes. The current file is always `path`. When it has `max_bytes` bytes, or it was
+    opened `rotate_seconds` seconds ago, it is renamed with the next free number before
+    its suffix, e.g. `messages.1.jsonl`, and optionally compressed with gzip in a
+    background thread. The `header` is written at the start of every file.
+    """
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def __init__(self, path: str, max_bytes: int = 0, rotate_seconds: float = 0.0,
+                 compress: bool = False, buffer_size: int = 65536, header: str = '') -> None:
+        """
+        Open the file, the previous one with the same path is rotated.
+
+        :type path: str
+        :param path: The path of the current file.
+
+        :type max_bytes: int
+        :param max_bytes: The size which rotates the file, zero to disable it.
+
+        :type rotate_seconds: float
+        :param rotate_seconds: The age which rotates the file, zero to disable it.
+
+        :type compress: bool
+        :param compress: Compress the rotated files with gzip.
+
+        :type buffer_size: int
+        :param buffer_size: The size in bytes of the write buffer.
+
+        :type header: str
+        :param header: The text at the start of every file.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.rotate_seconds = rotate_seconds
+        self.compress = compress
+        self.buffer_size = buffer_size
+        self.header = header
+        self.statistics = {'bytes': 0, 'rotations': 0}
+        self._compressions: list[Thread] = []
+        self._buffer: list[str] = []
+        self._buffered = 0
+        self._size = 0
+        self._opened = 0.0
+        if exists(path):
+            self._archive()
+        self._open()
+
+    def write(self, text: str) -> None:
+        """
+        Put the text in the buffer, the file is rotated before if it is full or old.
+
+        :type text: str
+        :param text: The text, its length is counted as bytes.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        size = len(text)
+        if ((self.max_bytes and self._size + size > self.max_bytes
+             and self._size > len(self.header))
+                or (self.rotate_seconds and monotonic() - self._opened >= self.rotate_seconds)):
+            self.rotate()
+        self._buffer.append(text)
+        self._buffered += size
+        self._size += size
+        if self._buffered >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write the buffer into the file in only one call.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        if self._buffer:
+            self._file.write(''.join(self._buffer))
+            self.statistics['bytes'] += self._buffered
+            self._buffer.clear()
+            self._buffered = 0
+
+    def rotate(self) -> None:
+        """
+        Write the buffer, close the current file, rename it and open a new one.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        self.flush()
+        self._file.close()
+        self._archive()
+        self.statistics['rotations'] += 1
+        self._open()
+
+    def close(self) -> None:
+        """
+        Write the buffer, close the file and wait for the compressions.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        self.flush()
+        self._file.close()
+        for compression in self._compressions:
+            compression.join()
+        self._compressions.clear()
+
+    def _open(self) -> None:
+        """
+        Open a new file and put its header in the buffer.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        # pylint: disable=consider-using-with
+        self._file = open(self.path, 'w', encoding='utf-8', newline='')
+        self._opened = monotonic()
+        self._size = 0
+        if self.header:
+            self._buffer.append(self.header)
+            self._buffered += len(self.header)
+            self._size += len(self.header)
+
+    def _archive(self) -> None:
+        """
+        Rename the current file with the next free number, then compress it.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        stem, suffix = splitext(self.path)
+        number = 1
+        while exists(f'{stem}.{number}{suffix}') or exists(f'{stem}.{number}{suffix}.gz'):
+            number += 1
+        archived = f'{stem}.{number}{suffix}'
+        replace(self.path, archived)
+
+        if self.compress:
+            compression = Thread(target=compress_file, args=(archived,), name='RotatingFile',
+                                 daemon=True)
+            compression.start()
+            self._compressions = [thread for thread in self._compressions if thread.is_alive()]
+            self._compressions.append(compression)
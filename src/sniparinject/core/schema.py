@@ -0,0 +1,554 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+Compile the Game settings into immutable objects which are ready to parse the data.
+"""
+from dataclasses import dataclass, field as dataclass_field
+from functools import partial
+from linecache import cache as linecache
+from struct import Struct
+from types import MappingProxyType
+from typing import Any, Callable, Mapping, Optional, Union
+
+# pylint: disable=import-error
+from .settings import validate_settings
+
+ACTION_ID = Struct('<h')
+# 'ID': ('Python struct symbol', Size in bytes)
+STRUCT_TYPES = MappingProxyType({
+    'char': ('c', 1),
+    'signed char': ('b', 1),
+    'unsigned char': ('B', 1),
+    'bool': ('?', 1),
+    'short': ('h', 2),
+    'unsigned short': ('H', 2),
+    'int': ('i', 4),
+    'unsigned int': ('I', 4),
+    'long': ('q', 8),
+    'unsigned long': ('Q', 8),
+    'half precision': ('e', 2),
+    'float': ('f', 4),
+    'double': ('d', 8),
+    'chars': ('s', 1),
+})
+
+
+def get_struct(struct_type: str, repeat_count: int = 1) -> tuple[str, int]:
+    """
+    Map of the structs with the correlated symbol.
+
+    :type struct_type: str
+    :param struct_type: Full name description.
+
+    :type repeat_count: int
+    :param repeat_count: Times that the symbol will repeat.
+
+    :rtype: tuple[str, int]
+    :return: The struct symbol and its size.
+    """
+    struct_info = STRUCT_TYPES.get(str(struct_type).lower())
+    if struct_info is None:
+        raise RuntimeError(
+            f'The struct type ({struct_type}) is not defined in the map of structs.',
+            ' -> get_struct()')
+
+    symbol, size = struct_info
+    if repeat_count > 1:
+        size *= repeat_count
+        symbol = f'{repeat_count}{symbol}'
+
+    return symbol, size
+
+
+def to_hex(variable: Any) -> str:
+    """
+    Convert the variable in its hexadecimal representation.
+
+    :type variable: Any
+    :param variable: Number or bytes.
+
+    :rtype: str
+    :return: The hexadecimal text.
+    """
+    return variable.hex() if isinstance(variable, bytes) else hex(variable)
+
+
+def zero_fill(size: int, variable: Any) -> str:
+    """
+    Add zeros to the left of the variable.
+
+    :type size: int
+    :param size: The final size of the text.
+
+    :type variable: Any
+    :param variable: The variable which will be formatted.
+
+    :rtype: str
+    :return: The formatted text.
+    """
+    return str(variable).zfill(size)
+
+
+def fill(size: int, variable: Any) -> str:
+    """
+    Add blank spaces to the right of the variable.
+
+    :type size: int
+    :param size: The final size of the text.
+
+    :type variable: Any
+    :param variable: The variable which will be formatted.
+
+    :rtype: str
+    :return: The formatted text.
+    """
+    return str(variable).ljust(size)
+
+
+def fill_left(size: int, variable: Any) -> str:
+    """
+    Add blank spaces to the left of the variable.
+
+    :type size: int
+    :param size: The final size of the text.
+
+    :type variable: Any
+    :param variable: The variable which will be formatted.
+
+    :rtype: str
+    :return: The formatted text.
+    """
+    return str(variable).rjust(size)
+
+
+@dataclass(frozen=True)
+class CompiledField:
+    """
+    One value of an action with its output formatting steps.
+    """
+    name: Optional[str]
+    struct_type: str
+    reference: Optional[Mapping]
+    steps: tuple[Callable[[Any], Any], ...]
+
+    def format(self, variable: Any) -> Any:
+        """
+        Apply the reference or the output formatting steps to the variable.
+
+        :type variable: Any
+        :param variable: The unpacked value.
+
+        :rtype: Any
+        :return: Variable with the format.
+        """
+        reference = self.reference
+        if reference is not None and variable in reference:
+            return reference[variable]
+
+        for step in self.steps:
+            variable = step(variable)
+
+        return variable
+
+
+# pylint: disable=too-many-instance-attributes
+@dataclass(frozen=True)
+class CompiledAction:
+    """
+    An action of the settings with its precompiled struct.
+
+    When the settings are compiled with `codegen`, `decode` is a function generated for
+    this action, which unpacks the data after the ID and returns the formatted values,
+    and `source` is its Python code.
+    """
+    action_id: int
+    title: str
+    display_message: Optional[bool]
+    struct: Struct
+    size: int
+    fields: tuple[CompiledField, ...]
+    decode: Optional[Callable[[Union[bytes, memoryview], int], tuple]] = dataclass_field(
+        default=None, repr=False, compare=False)
+    source: str = dataclass_field(default='', repr=False, compare=False)
+
+
+@dataclass(frozen=True)
+class MessageLength:
+    """
+    The length of a message in bytes, with its ID.
+
+    The length is fixed with `size`, or it is read from an unsigned short at `offset`
+    bytes from the start of the message.
+    """
+    size: int = 0
+    offset: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class CompiledRequest:
+    """
+    The compiled actions for the data sent by the host or by the node.
+
+    The lengths are the table used to cut the data into messages, an ID which is not in
+    the table has the length of its action. The actions and the lengths are also put in
+    two dense tuples with one entry for every ID of `id_size` bytes, None if the ID is
+    unknown, so the parser finds a message with one index. A negative ID, when the IDs
+    are signed, indexes from the end, which is the position of its unsigned value.
+    """
+    request: str
+    display_message: bool
+    actions: Mapping[int, CompiledAction]
+    lengths: Mapping[int, MessageLength] = dataclass_field(
+        default_factory=lambda: MappingProxyType({}))
+    id_size: int = ACTION_ID.size
+    dispatch: tuple[Optional[CompiledAction], ...] = dataclass_field(
+        init=False, repr=False, compare=False)
+    length_table: tuple[Optional[MessageLength], ...] = dataclass_field(
+        init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """
+        Build the dense tuples of the actions and the lengths.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        mask = (1 << 8 * self.id_size) - 1
+        dispatch: list[Optional[CompiledAction]] = [None] * (mask + 1)
+        for action_id, action in self.actions.items():
+            dispatch[action_id & mask] = action
+        length_table: list[Optional[MessageLength]] = [None] * (mask + 1)
+        for action_id, length in self.lengths.items():
+            length_table[action_id & mask] = length
+
+        object.__setattr__(self, 'dispatch', tuple(dispatch))
+        object.__setattr__(self, 'length_table', tuple(length_table))
+
+
+@dataclass(frozen=True)
+class ProtocolSchema:
+    """
+    The compiled Game settings for the host and the node.
+
+    The limits are the maximum messages and bytes parsed of one payload, zero means that
+    there is no limit. The profiles are the host and the node of every section of
+    `Profiles`, for the servers which do not use the Game settings. The ID of every
+    message is read with `id_struct`.
+    """
+    settings: dict
+    host: CompiledRequest
+    node: CompiledRequest
+    max_messages: int = 0
+    max_bytes: int = 0
+    profiles: Mapping[str, tuple[CompiledRequest, CompiledRequest]] = dataclass_field(
+        default_factory=lambda: MappingProxyType({}))
+    id_struct: Struct = ACTION_ID
+
+    @classmethod
+    def from_settings(cls, settings: dict) -> 'ProtocolSchema':
+        """
+        Validate and compile the settings, this is done once per settings load.
+
+        :type settings: dict
+        :param settings: The settings read from the YAML file.
+
+        :rtype: ProtocolSchema
+        :return: The compiled settings.
+        """
+        validate_settings(settings)
+        game_settings = settings.get('Game')
+        id_struct = compile_id(game_settings.get('id') or {})
+        codegen = game_settings.get('codegen') is True
+        profiles = {
+            name: (compile_request(f'{name} host', profile.get('host') or {}, id_struct, codegen),
+                   compile_request(f'{name} node', profile.get('node') or {}, id_struct, codegen))
+            for name, profile in (settings.get('Profiles') or {}).items()
+        }
+
+        return cls(
+            settings=settings,
+            host=compile_request('host', game_settings.get('host') or {}, id_struct, codegen),
+            node=compile_request('node', game_settings.get('node') or {}, id_struct, codegen),
+            max_messages=game_settings.get('max_messages') or 0,
+            max_bytes=game_settings.get('max_bytes') or 0,
+            profiles=MappingProxyType(profiles),
+            id_struct=id_struct,
+        )
+
+    def get_request(self, is_host: bool) -> CompiledRequest:
+        """
+        Return the compiled actions of the host or the node.
+
+        :type is_host: bool
+        :param is_host: Is this response by the host?
+
+        :rtype: CompiledRequest
+        :return: The compiled actions.
+        """
+        return self.host if is_host else self.node
+
+
+def compile_id(settings: dict) -> Struct:
+    """
+    Compile the struct of the message IDs, by default a signed little-endian short.
+
+    :type settings: dict
+    :param settings: The size in bytes, the sign and the endian of the IDs.
+
+    :rtype: Struct
+    :return: The struct of the IDs.
+    """
+    symbol = 'h' if int(settings.get('size') or ACTION_ID.size) == 2 else 'b'
+    if settings.get('signed') is False:
+        symbol = symbol.upper()
+    endian = '>' if str(settings.get('endian') or 'little').lower() == 'big' else '<'
+
+    return Struct(f'{endian}{symbol}')
+
+
+def compile_request(request: str, settings: dict, id_struct: Struct = ACTION_ID,
+                    codegen: bool = False) -> CompiledRequest:
+    """
+    Compile all the actions of the host or the node.
+
+    :type request: str
+    :param request: The name of the request, `host` or `node`.
+
+    :type settings: dict
+    :param settings: The settings of the request.
+
+    :type id_struct: Struct
+    :param id_struct: The struct of the message IDs, every ID must fit in it.
+
+    :type codegen: bool
+    :param codegen: Generate the decode function of every action.
+
+    :rtype: CompiledRequest
+    :return: The compiled actions.
+    """
+    count = 1 << 8 * id_struct.size
+    ids = list(settings.get('actions') or {}) + list(settings.get('lengths') or {})
+    for action_id in ids:
+        if not -(count >> 1) <= action_id < count:
+            raise RuntimeError(f'The ID ({hex(action_id)}) does not fit in {id_struct.size}'
+                               f' bytes.', f' -> compile_request({request})')
+
+    actions = {}
+    for action_id, action in (settings.get('actions') or {}).items():
+        try:
+            actions[action_id] = compile_action(action_id, action or {}, codegen, request)
+        except RuntimeError as error:
+            message, location = error.args
+            raise RuntimeError(
+                message, f' -> compile_request({request}, {hex(action_id)}){location}'
+            ) from error
+
+    lengths = {}
+    for action_id, length in (settings.get('lengths') or {}).items():
+        if isinstance(length, dict):
+            lengths[action_id] = MessageLength(offset=length.get('offset'))
+        else:
+            lengths[action_id] = MessageLength(size=length)
+
+    return CompiledRequest(
+        request=request,
+        display_message=settings.get('display_message') is not (None or False),
+        actions=MappingProxyType(actions),
+        lengths=MappingProxyType(lengths),
+        id_size=id_struct.size,
+    )
+
+
+def compile_action(action_id: int, action: dict, codegen: bool = False,
+                   request: str = 'host') -> CompiledAction:
+    """
+    Compile one action, its structs are joined in only one struct.
+
+    :type action_id: int
+    :param action_id: The ID of the action.
+
+    :type action: dict
+    :param action: Properties of the actions.
+
+    :type codegen: bool
+    :param codegen: Generate the decode function of the action.
+
+    :type request: str
+    :param request: The name of the request of the action, with its profile.
+
+    :rtype: CompiledAction
+    :return: The compiled action.
+    """
+    if len(action.keys()) == 0:
+        raise RuntimeError('The action is empty.', ' -> compile_action()')
+
+    structs_format = ''
+    fields = []
+    for struct in action.get('structs') or []:
+        struct_type = struct.get('type') or None
+        if struct_type is None:
+            raise RuntimeError(
+                f'The struct type is missing. Struct -> {struct}.', ' -> compile_action()')
+
+        repeat_count = int(struct.get('size') or 0)
+        symbol, _ = get_struct(struct_type, repeat_count)
+        structs_format += symbol
+
+        field = compile_field(struct)
+        is_chars = symbol.endswith('s')
+        fields.extend([field] * (1 if is_chars else max(repeat_count, 1)))
+
+    struct = Struct(f'<{structs_format}')
+    decode, source = (generate_decoder(action_id, struct, fields, request) if codegen
+                      else (None, ''))
+
+    return CompiledAction(
+        action_id=action_id,
+        title=action.get('title') or '',
+        display_message=action.get('display_message'),
+        struct=struct,
+        size=struct.size,
+        fields=tuple(fields),
+        decode=decode,
+        source=source,
+    )
+
+
+def compile_field(struct: dict) -> CompiledField:
+    """
+    Compile the output formatting steps of one struct.
+
+    :type struct: dict
+    :param struct: The struct settings.
+
+    :rtype: CompiledField
+    :return: The compiled field.
+    """
+    output: dict = struct.get('output') or {}
+    steps = []
+
+    output_type: str = output.get('type') or None
+    if output_type and output_type.lower() == 'hex':
+        steps.append(to_hex)
+
+    output_zero_fill: int = output.get('zero_fill') or 0
+    if output_zero_fill > 0:
+        steps.append(partial(zero_fill, output_zero_fill))
+
+    if output.get('auto_zero_fill'):
+        _, struct_size = get_struct(struct.get('type') or '')
+        steps.append(partial(zero_fill, struct_size * 2 + 2))
+
+    output_fill: int = output.get('fill') or 0
+    if output_fill > 0:
+        steps.append(partial(fill, output_fill))
+
+    output_fill_left: int = output.get('fill_left') or 0
+    if output_fill_left > 0:
+        steps.append(partial(fill_left, output_fill_left))
+
+    reference = struct.get('reference') or None
+
+    return CompiledField(
+        name=struct.get('name') or None,
+        struct_type=struct.get('type'),
+        reference=MappingProxyType(reference) if reference else None,
+        steps=tuple(steps),
+    )
+
+
+# pylint: disable=too-many-locals
+def generate_decoder(action_id: int, struct: Struct, fields: list[CompiledField],
+                     request: str = 'host'
+                     ) -> tuple[Callable[[Union[bytes, memoryview], int], tuple], str]:
+    """
+    Generate the Python code of one function which unpacks the data of the action and
+    formats every value, with only the reference and the output steps of its fields.
+
+    The code is registered in the line cache with the request and the ID of the action, so
+    the tracebacks of the function show it, even when another request has the same ID.
+
+    :type action_id: int
+    :param action_id: The ID of the action.
+
+    :type struct: Struct
+    :param struct: The joined struct of the action.
+
+    :type fields: list[CompiledField]
+    :param fields: The field of every unpacked value.
+
+    :type request: str
+    :param request: The name of the request of the action, with its profile.
+
+    :rtype: tuple[Callable[[Union[bytes, memoryview], int], tuple], str]
+    :return: The function, which receives the data and the offset after the ID, and its code.
+    """
+    name = f'decode_{action_id:x}'.replace('-', '_')
+    namespace: dict[str, Any] = {'unpack_from': struct.unpack_from}
+    variables = [f'v{index}' for index in range(len(fields))]
+    values = ', '.join(variables) + (',' if len(variables) == 1 else '')
+    lines = [f'def {name}(data, offset):']
+    if variables:
+        lines.append(f'    {values} = unpack_from(data, offset)')
+    for index, (field, variable) in enumerate(zip(fields, variables)):
+        expression = variable
+        for step_index, step in enumerate(field.steps):
+            expression = generate_step(step, expression, field.struct_type,
+                                       f'step_{index}_{step_index}', namespace)
+        if field.reference is not None:
+            namespace[f'reference_{index}'] = field.reference
+            if expression == variable:
+                lines.append(f'    {variable} = reference_{index}.get({variable}, {variable})')
+                continue
+            lines.append(f'    if {variable} in reference_{index}:')
+            lines.append(f'        {variable} = reference_{index}[{variable}]')
+            lines.append('    else:')
+            lines.append(f'        {variable} = {expression}')
+        elif expression != variable:
+            lines.append(f'    {variable} = {expression}')
+    lines.append(f'    return {values or "()"}')
+    source = '\n'.join(lines) + '\n'
+
+    filename = f'<{request} action {hex(action_id)}>'
+    linecache[filename] = (len(source), None, source.splitlines(True), filename)
+    # pylint: disable=exec-used
+    exec(compile(source, filename, 'exec'), namespace)
+
+    return namespace[name], source
+
+
+def generate_step(step: Callable[[Any], Any], expression: str, struct_type: str, name: str,
+                  namespace: dict) -> str:
+    """
+    Return the expression of one output step, a step which is not known is called.
+
+    :type step: Callable[[Any], Any]
+    :param step: The output step of the field.
+
+    :type expression: str
+    :param expression: The expression of the value before the step.
+
+    :type struct_type: str
+    :param struct_type: The struct type of the field, the chars are converted to hex with
+        bytes.hex().
+
+    :type name: str
+    :param name: The name of the step in the namespace, if it is called.
+
+    :type namespace: dict
+    :param namespace: The names used by the generated code.
+
+    :rtype: str
+    :return: The expression of the value after the step.
+    """
+    symbol = (STRUCT_TYPES.get(str(struct_type).lower()) or ('', 0))[0]
+    if step is to_hex and symbol:
+        return f'{expression}.hex()' if symbol in ('c', 's') else f'hex({expression})'
+
+    methods = {zero_fill: 'zfill', fill: 'ljust', fill_left: 'rjust'}
+    if isinstance(step, partial) and step.func in methods and len(step.args) == 1 \
+            and not step.keywords:
+        return f'str({expression}).{methods[step.func]}({int(step.args[0])})'
+
+    namespace[name] = step
+    return f'{name}({expression})'
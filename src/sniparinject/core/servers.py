@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+The servers of the game, their kernel filter and who sent every packet.
+"""
+from typing import NamedTuple, Optional, Union
+
+# pylint: disable=import-error
+from .capture import Flow
+from .direction import Direction
+
+
+class ServerEndpoint(NamedTuple):
+    """
+    One server of the game, the IP or the port could be missing, then any of them matches.
+
+    `profile` is the name of the section of `Profiles` which parses its messages, None for
+    the `Game` section.
+    """
+    protocol: str
+    ip: Optional[str] = None
+    port: Optional[Union[int, str]] = None
+    name: Optional[str] = None
+    profile: Optional[str] = None
+
+
+class ServerTable:
+    """
+    The endpoints of the servers indexed by protocol, IP and port.
+
+    A packet sent from an endpoint is of the host, a packet sent to an endpoint is of the
+    node. Both checks are at most three lookups in a dictionary, the exact IP and port,
+    only the IP and only the port, so the cost does not grow with the number of servers.
+    """
+
+    def __init__(self, endpoints: list[ServerEndpoint]) -> None:
+        """
+        Index the endpoints of the servers.
+
+        :type endpoints: list[ServerEndpoint]
+        :param endpoints: The servers, the first one of the same address is used.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        self.endpoints = endpoints
+        self.profiles: tuple[Optional[str], ...] = (None, *sorted(
+            {endpoint.profile for endpoint in endpoints if endpoint.profile is not None}))
+        self._endpoints: dict[tuple, ServerEndpoint] = {}
+        for endpoint in endpoints:
+            key = (endpoint.protocol, endpoint.ip, endpoint.port)
+            self._endpoints.setdefault(key, endpoint)
+
+    @classmethod
+    def from_settings(cls, server_settings: dict, profiles: Optional[dict] = None
+                      ) -> 'ServerTable':
+        """
+        Read the endpoints of the Server settings, the `endpoints` list or the Server itself.
+
+        Every endpoint uses the protocol of the Server if it does not have its own.
+
+        :type server_settings: dict
+        :param server_settings: The Server settings.
+
+        :type profiles: Optional[dict]
+        :param profiles: The Profiles settings, every profile of an endpoint must be there.
+
+        :rtype: ServerTable
+        :return: The servers.
+        """
+        protocol = str(server_settings.get('protocol') or 'tcp').lower()
+        endpoints_settings = server_settings.get('endpoints')
+        if endpoints_settings is None:
+            endpoints_settings = [server_settings]
+        if not isinstance(endpoints_settings, list) or len(endpoints_settings) < 1:
+            raise RuntimeError('Error: The Server endpoints are not a list of servers.')
+
+        endpoints = []
+        for endpoint in endpoints_settings:
+            if not isinstance(endpoint, dict):
+                raise RuntimeError(f'Error: The Server endpoint ({endpoint}) is invalid.')
+            profile = endpoint.get('profile')
+            if profile is not None and profile not in (profiles or {}):
+                raise RuntimeError(f'Error: The Server profile ({profile}) is not in Profiles.')
+            endpoints.append(ServerEndpoint(
+                protocol=str(endpoint.get('protocol') or protocol).lower(),
+                ip=endpoint.get('ip') or None,
+                port=get_port(endpoint.get('port')),
+                name=endpoint.get('name'),
+                profile=profile,
+            ))
+
+        return cls(endpoints)
+
+    def get_filter(self) -> str:
+        """
+        Build one BPF expression which captures the packets of all the servers.
+
+        :rtype: str
+        :return: The kernel filter.
+        """
+        expressions = []
+        for endpoint in self.endpoints:
+            expression = endpoint.protocol
+            if endpoint.ip:
+                expression += f' and host {endpoint.ip}'
+            if endpoint.port:
+                expression += f' and port {endpoint.port}'
+            if expression not in expressions:
+                expressions.append(expression)
+
+        if len(expressions) == 1:
+            return expressions[0]
+
+        return ' or '.join(f'({expression})' for expression in expressions)
+
+    def find(self, protocol: str, ip: str, port: int) -> Optional[ServerEndpoint]:
+        """
+        Return the endpoint of the server which has this address.
+
+        :type protocol: str
+        :param protocol: The protocol of the packet.
+
+        :type ip: str
+        :param ip: The IP of the address.
+
+        :type port: int
+        :param port: The port of the address.
+
+        :rtype: Optional[ServerEndpoint]
+        :return: The endpoint, or None if it is not a server.
+        """
+        endpoints = self._endpoints
+
+        return endpoints.get((protocol, ip, port)) or endpoints.get((protocol, ip, None)) \
+            or endpoints.get((protocol, None, port))
+
+    def classify(self, flow: Flow) -> Optional[tuple[Direction, Optional[str]]]:
+        """
+        Return who sent the packet and the profile of its server.
+
+        An endpoint without IP and port matches every packet of its protocol, they are of
+        the node because the host could not be known.
+
+        :type flow: Flow
+        :param flow: The addresses of the packet.
+
+        :rtype: Optional[tuple[Direction, Optional[str]]]
+        :return: The direction and the profile, or None if the packet is not of a server.
+        """
+        endpoint = self.find(flow.protocol, flow.src_ip, flow.src_port)
+        if endpoint is not None:
+            return Direction.HOST, endpoint.profile
+
+        endpoint = self.find(flow.protocol, flow.dst_ip, flow.dst_port) \
+            or self._endpoints.get((flow.protocol, None, None))
+        if endpoint is not None:
+            return Direction.NODE, endpoint.profile
+
+        return None
+
+
+def get_port(port: Optional[Union[int, str]]) -> Optional[Union[int, str]]:
+    """
+    Convert the port of the settings to the number of the packets.
+
+    :type port: Optional[Union[int, str]]
+    :param port: The port, it could be a text.
+
+    :rtype: Optional[Union[int, str]]
+    :return: The number, the same text if it is not a number, or None if it is missing.
+    """
+    if not port:
+        return None
+
+    return int(port) if str(port).isdigit() else port
@@ -3,8 +3,207 @@
 """
 Given a YAML file it get the settings and return a dictionary with them.
 """
+from os import stat
+from re import compile as compile_regex
+from time import monotonic
+from typing import Callable, Optional
+
 from yaml import load, FullLoader
 
+STYLE_NAMES = ('title', 'normal', 'bold', 'light', 'error', 'host', 'node')
+ANSI_CODE = compile_regex(r'\d+(;\d+)*')
+
+
+def get_file_signature(config_file: str) -> Optional[tuple[int, int, int]]:
+    """
+    Get the values which identify a version of the file.
+
+    :type config_file: str
+    :param config_file: The file which will be checked.
+
+    :rtype: Optional[tuple[int, int, int]]
+    :return: The modification time, size and inode; None if the file cannot be checked.
+    """
+    try:
+        file_stat = stat(config_file)
+    except OSError:
+        return None
+
+    return file_stat.st_mtime_ns, file_stat.st_size, file_stat.st_ino
+
+
+def validate_settings(settings: dict) -> dict:
+    """
+    Validate the structure of the settings before they are used by the parser.
+
+    :type settings: dict
+    :param settings: The settings read from the YAML file.
+
+    :rtype: dict
+    :return: The same settings, if they are valid.
+    """
+    if not isinstance(settings, dict):
+        raise ValueError('The settings are not a dictionary.')
+
+    game_settings = settings.get('Game')
+    if not isinstance(game_settings, dict) or len(game_settings) < 1:
+        raise ValueError('The Game settings are missing.')
+
+    for limit in ('max_messages', 'max_bytes'):
+        value = game_settings.get(limit)
+        if value is not None and (not isinstance(value, int) or value < 0):
+            raise ValueError(f'The Game {limit} ({value}) is not a positive number.')
+
+    codegen = game_settings.get('codegen')
+    if codegen is not None and not isinstance(codegen, bool):
+        raise ValueError(f'The Game codegen ({codegen}) is not Yes or No.')
+
+    id_settings = game_settings.get('id') or {}
+    validate_id(id_settings)
+    id_size = id_settings.get('size') or 2
+
+    for request in ('host', 'node'):
+        validate_request(request, game_settings.get(request) or {}, id_size)
+
+    validate_profiles(settings.get('Profiles') or {}, id_size)
+    validate_style(settings.get('Style') or {})
+
+    return settings
+
+
+def validate_id(id_settings: dict) -> None:
+    """
+    Validate the size, the sign and the endian of the message IDs.
+
+    :type id_settings: dict
+    :param id_settings: The settings of the IDs.
+
+    :rtype: None
+    :return: Nothing.
+    """
+    if not isinstance(id_settings, dict):
+        raise ValueError('The Game id settings are not a dictionary.')
+
+    size = id_settings.get('size')
+    if size is not None and (isinstance(size, bool) or size not in (1, 2)):
+        raise ValueError(f'The Game id size ({size}) is not 1 or 2 bytes.')
+
+    signed = id_settings.get('signed')
+    if signed is not None and not isinstance(signed, bool):
+        raise ValueError(f'The Game id signed ({signed}) is not Yes or No.')
+
+    endian = id_settings.get('endian')
+    if endian is not None and str(endian).lower() not in ('little', 'big'):
+        raise ValueError(f'The Game id endian ({endian}) is not little or big.')
+
+
+def validate_style(style_settings: dict) -> None:
+    """
+    Validate the color switch and the ANSI codes of the styles of the output.
+
+    :type style_settings: dict
+    :param style_settings: The settings of the styles.
+
+    :rtype: None
+    :return: Nothing.
+    """
+    if not isinstance(style_settings, dict):
+        raise ValueError('The Style settings are not a dictionary.')
+
+    for name, code in style_settings.items():
+        if name == 'color':
+            if not isinstance(code, bool):
+                raise ValueError(f'The Style color ({code}) is not Yes or No.')
+        elif name not in STYLE_NAMES:
+            raise ValueError(f'The Style {name} is not {", ".join(STYLE_NAMES)} or color.')
+        elif isinstance(code, bool) or not ANSI_CODE.fullmatch(str(code)):
+            raise ValueError(f'The Style {name} ({code}) is not an ANSI code.')
+
+
+def validate_profiles(profiles: dict, id_size: int = 2) -> None:
+    """
+    Validate the profiles, every one has the host and the node like the Game settings.
+
+    :type profiles: dict
+    :param profiles: The settings of every profile by its name.
+
+    :type id_size: int
+    :param id_size: The size in bytes of the message IDs.
+
+    :rtype: None
+    :return: Nothing.
+    """
+    if not isinstance(profiles, dict):
+        raise ValueError('The Profiles settings are not a dictionary.')
+
+    for name, profile in profiles.items():
+        if not isinstance(profile, dict):
+            raise ValueError(f'The Profiles {name} settings are not a dictionary.')
+        for request in ('host', 'node'):
+            validate_request(f'{name} {request}', profile.get(request) or {}, id_size)
+
+
+def validate_request(request: str, request_settings: dict, id_size: int = 2) -> None:
+    """
+    Validate the settings of the host or the node.
+
+    :type request: str
+    :param request: The name of the request, `host` or `node`.
+
+    :type request_settings: dict
+    :param request_settings: The settings of the request.
+
+    :type id_size: int
+    :param id_size: The size in bytes of the message IDs.
+
+    :rtype: None
+    :return: Nothing.
+    """
+    if not isinstance(request_settings, dict):
+        raise ValueError(f'The Game {request} settings are not a dictionary.')
+
+    actions = request_settings.get('actions') or {}
+    if not isinstance(actions, dict):
+        raise ValueError(f'The Game {request} actions are not a dictionary.')
+
+    for action_id, action in actions.items():
+        if not isinstance(action_id, int):
+            raise ValueError(f'The Game {request} action ID ({action_id}) is not a number.')
+        if action is not None and not isinstance(action, dict):
+            raise ValueError(f'The Game {request} action ({hex(action_id)}) is invalid.')
+
+    validate_lengths(request, request_settings.get('lengths') or {}, id_size)
+
+
+def validate_lengths(request: str, lengths: dict, id_size: int = 2) -> None:
+    """
+    Validate the table with the length of the messages of the host or the node, every
+    length and offset is at least the size of the ID.
+
+    :type request: str
+    :param request: The name of the request, `host` or `node`.
+
+    :type lengths: dict
+    :param lengths: The length of every message ID, in bytes or as an offset.
+
+    :type id_size: int
+    :param id_size: The size in bytes of the message IDs.
+
+    :rtype: None
+    :return: Nothing.
+    """
+    if not isinstance(lengths, dict):
+        raise ValueError(f'The Game {request} lengths are not a dictionary.')
+
+    for action_id, length in lengths.items():
+        if not isinstance(action_id, int):
+            raise ValueError(f'The Game {request} length ID ({action_id}) is not a number.')
+        if isinstance(length, dict):
+            length = length.get('offset')
+        if not isinstance(length, int) or isinstance(length, bool) or length < id_size:
+            raise ValueError(f'The Game {request} length ({hex(action_id)}) is not a number'
+                             f' of bytes or an offset after the ID.')
+
 
 # pylint: disable=too-few-public-methods
 class Settings:
@@ -38,3 +237,119 @@ class Settings:
                 raise ValueError(f'Error: Not found settings in the file `{self.config_file}`.')
 
             return settings
+
+
+# pylint: disable=too-many-instance-attributes
+class SettingsCache:
+    """
+    Keep the parsed settings in memory and reload them only when the file changes.
+
+    The file is checked with `stat` at most once every `check_interval` seconds,
+    and it is parsed again only if its modification time, size or inode changed.
+    The optional loader, e.g. the compiler of the settings, runs once per reload.
+    """
+    _instances: dict = {}
+
+    def __init__(self, config_file: str, check_interval: float = 1.0,
+                 loader: Optional[Callable[[dict], object]] = None) -> None:
+        """
+        Keep the parsed settings in memory and reload them only when the file changes.
+
+        :type config_file: str
+        :param config_file: Configuration file in YAML format.
+
+        :type check_interval: float
+        :param check_interval: Minimum seconds between two checks of the file.
+
+        :type loader: Optional[Callable[[dict], object]]
+        :param loader: Transform the settings once per reload.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        self.config_file = config_file
+        self.check_interval = check_interval
+        self.loader = loader
+        self.reloads = 0
+        self.hits = 0
+        self._settings = None
+        self._value = None
+        self._signature = None
+        self._next_check = 0.0
+
+    @classmethod
+    def get_instance(cls, config_file: str, check_interval: Optional[float] = None,
+                     loader: Optional[Callable[[dict], object]] = None) -> 'SettingsCache':
+        """
+        Return the shared cache for this file and loader, create it if it does not exist.
+
+        :type config_file: str
+        :param config_file: Configuration file in YAML format.
+
+        :type check_interval: Optional[float]
+        :param check_interval: Update the check interval of the cache, if it is set.
+
+        :type loader: Optional[Callable[[dict], object]]
+        :param loader: Transform the settings once per reload.
+
+        :rtype: SettingsCache
+        :return: The shared cache.
+        """
+        key = (config_file, loader)
+        cache = cls._instances.get(key)
+        if cache is None:
+            cache = cls(config_file, loader=loader)
+            cls._instances[key] = cache
+
+        if check_interval is not None:
+            cache.check_interval = check_interval
+
+        return cache
+
+    def get_dictionary(self) -> dict:
+        """
+        Return the cached settings, reload them if the file has changed.
+
+        :rtype: dict
+        :return: The settings for Python usage.
+        """
+        self.get()
+
+        return self._settings
+
+    def get(self) -> object:
+        """
+        Return the cached value, reload it if the file has changed.
+
+        If the file cannot be checked with `stat`, the settings are read every time.
+
+        :rtype: object
+        :return: The value returned by the loader, or the settings if there is no loader.
+        """
+        now = monotonic()
+        if self._signature is not None and now < self._next_check:
+            self.hits += 1
+            return self._value
+
+        self._next_check = now + self.check_interval
+        signature = get_file_signature(self.config_file)
+        if signature is not None and signature == self._signature:
+            self.hits += 1
+            return self._value
+
+        settings = Settings(self.config_file).get_dictionary()
+        self._value = self.loader(settings) if self.loader else settings
+        self._settings = settings
+        self._signature = signature
+        self.reloads += 1
+
+        return self._value
+
+    def get_statistics(self) -> dict:
+        """
+        Return how many times the settings were reloaded or served from the cache.
+
+        :rtype: dict
+        :return: The counters of the cache.
+        """
+        return {'reloads': self.reloads, 'hits': self.hits}
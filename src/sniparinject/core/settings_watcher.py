@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+Watch the settings file in a background thread and publish every valid change.
+"""
+import ctypes
+import os
+from select import select
+from struct import calcsize, unpack_from
+from threading import Event, Thread
+from typing import Callable, Optional
+
+# pylint: disable=import-error
+from .settings import Settings, get_file_signature, validate_settings
+from .utility import Utility
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+INOTIFY_EVENT_FORMAT = '@iIII'
+INOTIFY_EVENT_SIZE = calcsize(INOTIFY_EVENT_FORMAT)
+
+
+class Inotify:
+    """
+    Minimal access to the Linux inotify API through the C library.
+    """
+
+    def __init__(self, file_descriptor: int) -> None:
+        """
+        Minimal access to the Linux inotify API through the C library.
+
+        :type file_descriptor: int
+        :param file_descriptor: The inotify instance.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        self.file_descriptor = file_descriptor
+
+    @classmethod
+    def watch(cls, directory: str) -> Optional['Inotify']:
+        """
+        Watch the files written or moved into the directory.
+
+        :type directory: str
+        :param directory: The directory which will be watched.
+
+        :rtype: Optional[Inotify]
+        :return: The inotify instance or None if inotify is not available.
+        """
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            file_descriptor = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        except (OSError, AttributeError):
+            return None
+
+        if file_descriptor < 0:
+            return None
+
+        mask = IN_CLOSE_WRITE | IN_MOVED_TO
+        if libc.inotify_add_watch(file_descriptor, os.fsencode(directory), mask) < 0:
+            os.close(file_descriptor)
+            return None
+
+        return cls(file_descriptor)
+
+    def read_names(self) -> set[str]:
+        """
+        Read the pending events and return the name of the files which changed.
+
+        :rtype: set[str]
+        :return: The file names.
+        """
+        names = set()
+        try:
+            data = os.read(self.file_descriptor, 4096)
+        except BlockingIOError:
+            return names
+
+        offset = 0
+        while offset + INOTIFY_EVENT_SIZE <= len(data):
+            _, _, _, name_size = unpack_from(INOTIFY_EVENT_FORMAT, data, offset)
+            offset += INOTIFY_EVENT_SIZE
+            names.add(os.fsdecode(data[offset:offset + name_size].rstrip(b'\x00')))
+            offset += name_size
+
+        return names
+
+    def close(self) -> None:
+        """
+        Close the inotify instance.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        os.close(self.file_descriptor)
+
+
+# pylint: disable=too-many-instance-attributes
+class SettingsWatcher(Thread):
+    """
+    Watch the settings file and publish every valid change.
+
+    The new settings are parsed and validated in this thread, then published with a
+    single assignment to `current`, so the readers do not need any lock. If the file
+    has an error, the last valid settings are kept and the error is reported.
+    """
+
+    def __init__(self, config_file: str, poll_interval: float = 1.0, use_inotify: bool = True,
+                 loader: Callable[[dict], object] = validate_settings) -> None:
+        """
+        Watch the settings file and publish every valid change.
+
+        :type config_file: str
+        :param config_file: Configuration file in YAML format.
+
+        :type poll_interval: float
+        :param poll_interval: Seconds between two checks of the file when inotify is not used.
+
+        :type use_inotify: bool
+        :param use_inotify: Use inotify if it is available, otherwise check the file with stat.
+
+        :type loader: Callable[[dict], object]
+        :param loader: Validate the settings and return the value which will be published.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        super().__init__(name='SettingsWatcher', daemon=True)
+        self.config_file = config_file
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.loader = loader
+        self.statistics = {'reloads': 0, 'errors': 0}
+        self.last_error: Optional[Exception] = None
+        self._stop_event = Event()
+        self._wake_read: Optional[int] = None
+        self._wake_write: Optional[int] = None
+        self._signature = get_file_signature(config_file)
+        self.current = self.loader(Settings(config_file).get_dictionary())
+
+    def start(self) -> None:
+        """
+        Start to watch the file in the background.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        self._wake_read, self._wake_write = os.pipe()
+        super().start()
+
+    def run(self) -> None:
+        """
+        Watch the file until the watcher is stopped.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        inotify = None
+        if self.use_inotify:
+            inotify = Inotify.watch(os.path.dirname(os.path.abspath(self.config_file)))
+
+        if inotify:
+            self._watch_inotify(inotify)
+        else:
+            self._watch_polling()
+
+    def stop(self) -> None:
+        """
+        Stop the watcher.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        self._stop_event.set()
+        if self._wake_write is None:
+            return
+
+        os.write(self._wake_write, b'\x00')
+        self.join()
+        os.close(self._wake_read)
+        os.close(self._wake_write)
+        self._wake_read = self._wake_write = None
+
+    # pylint: disable=broad-except
+    def reload(self) -> bool:
+        """
+        Parse and validate the file, then publish the new settings.
+
+        :rtype: bool
+        :return: True if the new settings were published.
+        """
+        self._signature = get_file_signature(self.config_file)
+        try:
+            value = self.loader(Settings(self.config_file).get_dictionary())
+        except Exception as error:
+            self.statistics['errors'] += 1
+            self.last_error = error
+            message, location = error.args if len(error.args) == 2 else (str(error), '')
+            print(Utility.text_error_format(f'Error Settings: {message}'))
+            print(Utility.text_error_format(
+                f'Location: SettingsWatcher -> reload() -> {self.config_file}{location}'))
+            print(Utility.text_error_format('The last valid settings are still in use.'))
+            print()
+            return False
+
+        self.current = value
+        self.last_error = None
+        self.statistics['reloads'] += 1
+
+        return True
+
+    def _watch_inotify(self, inotify: Inotify) -> None:
+        """
+        Reload the settings every time that inotify reports a change in the file.
+
+        :type inotify: Inotify
+        :param inotify: The inotify instance watching the directory of the file.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        file_name = os.path.basename(self.config_file)
+        try:
+            while not self._stop_event.is_set():
+                readable, _, _ = select([inotify.file_descriptor, self._wake_read], [], [])
+                if inotify.file_descriptor in readable and file_name in inotify.read_names():
+                    self.reload()
+        finally:
+            inotify.close()
+
+    def _watch_polling(self) -> None:
+        """
+        Reload the settings when the modification time, size or inode of the file changes.
+
+        The change must be the same in two consecutive checks, so a file which is still
+        being written is not read.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        pending_signature = self._signature
+        while not self._stop_event.wait(self.poll_interval):
+            signature = get_file_signature(self.config_file)
+            if signature != self._signature and signature == pending_signature:
+                self.reload()
+            pending_signature = signature
@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+Parse the payloads in many processes, every flow is always parsed by the same process.
+"""
+from multiprocessing import get_context
+from queue import Empty
+from signal import SIGINT, SIG_IGN, signal
+from threading import Thread
+from time import time
+from typing import Optional, Union
+
+# pylint: disable=import-error
+from .capture import Flow
+from .console import Console
+from .direction import Direction
+from .parser import ProtocolParser
+from .reassembly import StreamReassembler
+from .renderer import Renderer
+from .shared_ring import SLOT_OBJECT, SLOT_PAYLOAD, SLOT_STOP, SharedRing
+from .utility import Utility
+from .writer import ConsoleWriter
+
+PARSER_STATISTICS = ('payloads', 'messages', 'leftover')
+REASSEMBLY_STATISTICS = ('segments', 'retransmits', 'out_of_order', 'gaps', 'flows')
+# Seconds to wait for a worker before checking that it is still alive.
+WAIT_TIMEOUT = 1.0
+
+
+def shard_key(flow: Flow) -> tuple:
+    """
+    Return the same key for both directions of a connection.
+
+    :type flow: Flow
+    :param flow: The addresses of the packet.
+
+    :rtype: tuple
+    :return: The protocol and the two endpoints in order.
+    """
+    source = (flow.src_ip, flow.src_port)
+    destination = (flow.dst_ip, flow.dst_port)
+
+    return (flow.protocol, *sorted((source, destination)))
+
+
+# pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals
+def parse_shard(settings: dict, ring: SharedRing, lane: int, outbox, max_stream_bytes: int,
+                profiles: tuple[Optional[str], ...] = (None,), max_flows: int = 4096) -> None:
+    """
+    Parse the payloads of one lane of the ring until the stop slot is read.
+
+    The worker compiles its own parser from the settings and reassembles its own TCP
+    streams. The payloads are parsed in place in the shared memory, the printed messages
+    and, at the end, the counters are sent to the outbox. An object in the ring is new
+    settings, or a flow which was forgotten by the capture. Ctrl+C is ignored, the worker
+    parses the payloads of its lane until the stop slot sent by `ShardedParser.stop()`.
+
+    :type settings: dict
+    :param settings: The settings read from the YAML file.
+
+    :type ring: SharedRing
+    :param ring: The ring written by the capture.
+
+    :type lane: int
+    :param lane: The lane of this worker.
+
+    :type outbox: multiprocessing.Queue
+    :param outbox: The lines printed for every payload and the counters.
+
+    :type max_stream_bytes: int
+    :param max_stream_bytes: Maximum bytes kept for one TCP flow, zero to disable the
+        reassembly.
+
+    :type profiles: tuple[Optional[str], ...]
+    :param profiles: The names of the profiles by their index in the ring.
+
+    :type max_flows: int
+    :param max_flows: Maximum number of TCP flows kept by the worker.
+
+    :rtype: None
+    :return: Nothing.
+    """
+    signal(SIGINT, SIG_IGN)
+    parser = ProtocolParser.from_settings(settings)
+    renderer = Renderer.from_settings(settings)
+    reassembler = StreamReassembler(max_stream_bytes, max_flows) if max_stream_bytes else None
+    statistics = dict.fromkeys(PARSER_STATISTICS, 0)
+
+    while True:
+        kind, flow, direction, profile, sequence, data = ring.get(lane)
+        if kind == SLOT_OBJECT and isinstance(data, Flow):
+            if reassembler is not None:
+                reassembler.discard(data)
+        elif kind == SLOT_OBJECT:
+            parser = ProtocolParser.from_settings(data)
+            renderer = Renderer.from_settings(data)
+        elif kind == SLOT_PAYLOAD:
+            lines = parse_payload(parser, reassembler, statistics, flow,
+                                  (direction, profiles[profile]), sequence, data, renderer)
+            if lines:
+                outbox.put(lines)
+        data = None
+        ring.release(lane)
+        if kind == SLOT_STOP:
+            break
+
+    ring.close()
+    outbox.put((lane, statistics, reassembler.get_statistics() if reassembler else None))
+
+
+# pylint: disable=too-many-arguments,too-many-positional-arguments
+def parse_payload(parser: ProtocolParser, reassembler: Optional[StreamReassembler],
+                  statistics: dict, flow: Flow,
+                  classification: tuple[Direction, Optional[str]], sequence: int,
+                  payload: Union[bytes, memoryview],
+                  renderer: Optional[Renderer] = None) -> list[str]:
+    """
+    Parse one payload of a worker and return the printed lines.
+
+    :type parser: ProtocolParser
+    :param parser: The parser of the worker.
+
+    :type reassembler: Optional[StreamReassembler]
+    :param reassembler: The TCP streams of the worker, None to parse every segment alone.
+
+    :type statistics: dict
+    :param statistics: The counters of the worker.
+
+    :type flow: Flow
+    :param flow: The addresses of the packet.
+
+    :type classification: tuple[Direction, Optional[str]]
+    :param classification: Who sent the data, the host or the node, and the profile of its
+        server.
+
+    :type sequence: int
+    :param sequence: The TCP sequence number of the payload.
+
+    :type payload: Union[bytes, memoryview]
+    :param payload: The data of the packet, it is not used after the return.
+
+    :type renderer: Optional[Renderer]
+    :param renderer: The renderer of the Style settings of the worker.
+
+    :rtype: list[str]
+    :return: The lines of the messages.
+    """
+    stream = reassembler is not None and flow.protocol == 'tcp'
+    if stream:
+        payload = reassembler.add(flow, sequence, payload)
+        if not payload:
+            return []
+
+    direction, profile = classification
+    records = parser.parse(payload, direction, stream, profile, False, time())
+    if stream and records.incomplete:
+        reassembler.keep(flow, payload[len(payload) - records.incomplete:])
+    statistics['payloads'] += 1
+    statistics['messages'] += records.parsed
+    statistics['leftover'] += records.leftover - records.incomplete
+
+    return Console.format_records(records, payload, renderer)
+
+
+# pylint: disable=too-many-instance-attributes
+class ShardedParser:
+    """
+    Parse the payloads in `workers` processes, so the parse is not limited to one core.
+
+    Both directions of a connection are sent to the same worker, and one worker receives
+    its payloads in order through its own lane of a ring in shared memory, so the messages
+    of a flow keep their order and the payloads are not pickled. The output of the workers
+    is printed by one thread of this process, and their counters are added when they stop.
+
+    A worker which died is found when its lane stays full or its counters do not come, then
+    its payloads are counted as lost instead of waiting for it.
+    """
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def __init__(self, settings: dict, workers: int, max_stream_bytes: int = 0,
+                 queue_size: int = 4096, slot_size: int = 2048,
+                 profiles: tuple[Optional[str], ...] = (None,),
+                 writer: Optional[ConsoleWriter] = None, max_flows: int = 4096) -> None:
+        """
+        Parse the payloads in many processes.
+
+        :type settings: dict
+        :param settings: The settings read from the YAML file.
+
+        :type workers: int
+        :param workers: Number of processes.
+
+        :type max_stream_bytes: int
+        :param max_stream_bytes: Maximum bytes kept for one TCP flow, zero to disable the
+            reassembly.
+
+        :type queue_size: int
+        :param queue_size: Maximum number of payloads waiting for one worker, the capture
+            waits when the lane is full.
+
+        :type slot_size: int
+        :param slot_size: Size in bytes of one slot of the ring, a bigger payload is
+            pickled.
+
+        :type profiles: tuple[Optional[str], ...]
+        :param profiles: The names of the profiles, the first one is None for the Game
+            settings.
+
+        :type writer: Optional[ConsoleWriter]
+        :param writer: The writer of the output, None to print the lines of the workers.
+
+        :type max_flows: int
+        :param max_flows: Maximum number of TCP flows kept by one worker.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        if workers < 1:
+            raise RuntimeError(f'Error: The workers ({workers}) must be at least 1.')
+
+        context = get_context('spawn')
+        self.settings = settings
+        self.workers = workers
+        self.writer = writer
+        self.profiles = {profile: index for index, profile in enumerate(profiles)}
+        self.statistics = {'workers': workers, 'enqueued': 0, 'lost': 0}
+        self.parser_statistics = dict.fromkeys(PARSER_STATISTICS, 0)
+        self.reassembly_statistics: Optional[dict] = None
+        self.ring = SharedRing(workers, queue_size, slot_size)
+        self._outbox = context.Queue()
+        self._processes = [
+            context.Process(target=parse_shard, name=f'ShardedParser-{lane}', daemon=True,
+                            args=(settings, self.ring, lane, self._outbox, max_stream_bytes,
+                                  profiles, max_flows))
+            for lane in range(workers)
+        ]
+        self._collector = Thread(target=self._collect, name='ShardedParser', daemon=True)
+        self._dead: set[int] = set()
+
+    def start(self) -> None:
+        """
+        Start the workers and the thread which prints their output.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        for process in self._processes:
+            process.start()
+        self._collector.start()
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def put(self, flow: Flow, direction: Direction, profile: Optional[str], sequence: int,
+            payload: bytes) -> None:
+        """
+        Send the payload to the worker of its flow, it is lost if the worker died.
+
+        :type flow: Flow
+        :param flow: The addresses of the packet.
+
+        :type direction: Direction
+        :param direction: Who sent the packet.
+
+        :type profile: Optional[str]
+        :param profile: The profile of the server, None for the Game settings.
+
+        :type sequence: int
+        :param sequence: The TCP sequence number of the payload.
+
+        :type payload: bytes
+        :param payload: The data of the packet.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        if not self._send(hash(shard_key(flow)) % self.workers, self.ring.put, flow, direction,
+                          sequence, payload, self.profiles.get(profile, 0)):
+            self.statistics['lost'] += 1
+            return
+
+        self.statistics['enqueued'] += 1
+
+    def update_settings(self, settings: dict) -> None:
+        """
+        Send new settings to every worker, they are used for the next payloads.
+
+        :type settings: dict
+        :param settings: The settings read from the YAML file.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        if settings is self.settings:
+            return
+
+        self.settings = settings
+        for lane in range(self.workers):
+            self._send(lane, self.ring.put_object, settings)
+
+    def discard(self, flow: Flow) -> None:
+        """
+        Tell the worker of the flow to forget its TCP stream, e.g. when the connection is
+        idle, in order with the payloads of its lane.
+
+        :type flow: Flow
+        :param flow: The flow forgotten by the capture.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        self._send(hash(shard_key(flow)) % self.workers, self.ring.put_object, flow)
+
+    def stop(self) -> None:
+        """
+        Stop the workers after they parse their payloads, then add their counters. A worker
+        which does not stop in time is terminated.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        for lane in range(self.workers):
+            self._send(lane, self.ring.put_stop)
+        if self._collector.is_alive():
+            self._collector.join()
+        for process in self._processes:
+            if process.pid is not None:
+                process.join(WAIT_TIMEOUT)
+                if process.is_alive():
+                    process.terminate()
+                    process.join()
+        self.ring.unlink()
+
+    def get_statistics(self) -> dict:
+        """
+        Return the counters of the shards.
+
+        :rtype: dict
+        :return: The workers, the payloads sent to them, in place in the ring or pickled.
+        """
+        return dict(self.statistics, **self.ring.get_statistics())
+
+    def _send(self, lane: int, method, *args) -> bool:
+        """
+        Write into the lane of a worker, wait while the worker is alive and its lane is full.
+
+        :type lane: int
+        :param lane: The worker.
+
+        :type method: Callable[..., bool]
+        :param method: The method of the ring which writes into the lane.
+
+        :type args: Any
+        :param args: The arguments of the method after the lane.
+
+        :rtype: bool
+        :return: False if the worker died.
+        """
+        while lane not in self._dead:
+            if method(lane, *args, timeout=WAIT_TIMEOUT):
+                return True
+
+            process = self._processes[lane]
+            if process.exitcode is not None:
+                self._dead.add(lane)
+                print(Utility.text_error_format(f'Error Shards: The worker ({lane}) died with '
+                                                f'the exit code ({process.exitcode}).'))
+                print(Utility.text_error_format('Location: ShardedParser -> _send()'))
+                print()
+
+        return False
+
+    def _collect(self) -> None:
+        """
+        Print the output of the workers until all of them sent their counters or died.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        finished: set[int] = set()
+        while len(finished) < self.workers:
+            try:
+                output = self._outbox.get(timeout=WAIT_TIMEOUT)
+            except Empty:
+                finished.update(lane for lane, process in enumerate(self._processes)
+                                if process.exitcode not in (None, 0))
+                continue
+
+            if isinstance(output, list):
+                Console.write_lines(output, self.writer)
+                continue
+
+            lane, parser_statistics, reassembly_statistics = output
+            finished.add(lane)
+            for name, value in parser_statistics.items():
+                self.parser_statistics[name] += value
+            if reassembly_statistics is not None:
+                if self.reassembly_statistics is None:
+                    self.reassembly_statistics = dict.fromkeys(REASSEMBLY_STATISTICS, 0)
+                for name, value in reassembly_statistics.items():
+                    self.reassembly_statistics[name] += value
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+Pass the payloads from the capture to the parser processes through shared memory.
+"""
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+from socket import inet_aton, inet_ntoa
+from struct import Struct
+from typing import Any, Optional, Union
+
+# pylint: disable=import-error
+from .capture import Flow
+from .direction import Direction
+
+# Kind, protocol, sent by the node, source IP, source port, destination IP, destination port,
+# TCP sequence number, size of the payload and index of the profile.
+SLOT_HEADER = Struct('<BBB4sH4sHIIH')
+PROTOCOLS = ('tcp', 'udp')
+SLOT_PAYLOAD = 0
+SLOT_QUEUED = 1
+SLOT_OBJECT = 2
+SLOT_STOP = 3
+
+
+# pylint: disable=too-many-instance-attributes
+class SharedRing:
+    """
+    A ring of fixed size slots in shared memory, with one producer and one consumer per
+    lane, so one capture feeds many parser processes.
+
+    The producer writes the header and the payload in the next free slot of the lane, the
+    consumer reads them in place through a memoryview and releases the slot after the
+    payload is parsed. Two semaphores per lane count the slots which are ready and free,
+    the indexes are only known by the process which moves them. A payload bigger than the
+    slot, and any other object, goes through the queue of the lane, and its slot only keeps
+    the order.
+    """
+
+    def __init__(self, lanes: int, slots: int = 1024, slot_size: int = 2048) -> None:
+        """
+        Create the shared memory of the ring.
+
+        :type lanes: int
+        :param lanes: Number of consumers.
+
+        :type slots: int
+        :param slots: Number of slots of one lane.
+
+        :type slot_size: int
+        :param slot_size: Size in bytes of one slot, with its header.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        if slot_size <= SLOT_HEADER.size:
+            raise RuntimeError(
+                f'Error: The slot size ({slot_size}) must be bigger than {SLOT_HEADER.size}.')
+
+        context = get_context('spawn')
+        self.lanes = lanes
+        self.slots = slots
+        self.slot_size = slot_size
+        self.statistics = {'in_place': 0, 'queued': 0}
+        self.memory = SharedMemory(create=True, size=lanes * slots * slot_size)
+        self._ready = [context.Semaphore(0) for _ in range(lanes)]
+        self._free = [context.Semaphore(slots) for _ in range(lanes)]
+        self._queues = [context.Queue() for _ in range(lanes)]
+        self._heads = [0] * lanes
+        self._tails = [0] * lanes
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def put(self, lane: int, flow: Flow, direction: Direction, sequence: int,
+            payload: bytes, profile: int = 0, timeout: Optional[float] = None) -> bool:
+        """
+        Write one payload in the next slot of the lane, wait if the lane is full.
+
+        :type lane: int
+        :param lane: The consumer.
+
+        :type flow: Flow
+        :param flow: The addresses of the packet.
+
+        :type direction: Direction
+        :param direction: Who sent the data, the host or the node.
+
+        :type sequence: int
+        :param sequence: The TCP sequence number of the payload.
+
+        :type payload: bytes
+        :param payload: The data of the packet.
+
+        :type profile: int
+        :param profile: The index of the profile of the server, up to 65535.
+
+        :type timeout: Optional[float]
+        :param timeout: Maximum seconds to wait for a free slot, None to wait until there is
+            one.
+
+        :rtype: bool
+        :return: False if the lane was still full after the timeout.
+        """
+        size = len(payload)
+        offset = self._acquire(lane, timeout)
+        if offset is None:
+            return False
+
+        if size > self.slot_size - SLOT_HEADER.size:
+            kind = SLOT_QUEUED
+            self._queues[lane].put(bytes(payload))
+            self.statistics['queued'] += 1
+        else:
+            kind = SLOT_PAYLOAD
+            start = offset + SLOT_HEADER.size
+            self.memory.buf[start:start + size] = payload
+            self.statistics['in_place'] += 1
+
+        SLOT_HEADER.pack_into(
+            self.memory.buf, offset, kind, PROTOCOLS.index(flow.protocol),
+            direction is Direction.NODE, inet_aton(flow.src_ip), flow.src_port,
+            inet_aton(flow.dst_ip), flow.dst_port, sequence, size, profile)
+        self._ready[lane].release()
+
+        return True
+
+    def put_object(self, lane: int, value: Any, timeout: Optional[float] = None) -> bool:
+        """
+        Send any object to the consumer of the lane, in order with the payloads.
+
+        :type lane: int
+        :param lane: The consumer.
+
+        :type value: Any
+        :param value: The object, it is pickled.
+
+        :type timeout: Optional[float]
+        :param timeout: Maximum seconds to wait for a free slot, None to wait until there is
+            one.
+
+        :rtype: bool
+        :return: False if the lane was still full after the timeout.
+        """
+        if not self._put_kind(lane, SLOT_OBJECT, timeout):
+            return False
+
+        self._queues[lane].put(value)
+
+        return True
+
+    def put_stop(self, lane: int, timeout: Optional[float] = None) -> bool:
+        """
+        Tell the consumer of the lane that there are no more items.
+
+        :type lane: int
+        :param lane: The consumer.
+
+        :type timeout: Optional[float]
+        :param timeout: Maximum seconds to wait for a free slot, None to wait until there is
+            one.
+
+        :rtype: bool
+        :return: False if the lane was still full after the timeout.
+        """
+        return self._put_kind(lane, SLOT_STOP, timeout)
+
+    # pylint: disable=too-many-locals
+    def get(self, lane: int) -> tuple[int, Optional[Flow], Direction, int, int, Any]:
+        """
+        Wait for the next slot of the lane and read it, the slot must be released after
+        its payload is used.
+
+        :type lane: int
+        :param lane: The consumer.
+
+        :rtype: tuple[int, Optional[Flow], Direction, int, int, Any]
+        :return: The kind of the slot, the flow, the direction, the index of the profile,
+            the TCP sequence number and the payload, which is a view of the shared memory if
+            it is in place, or the object.
+        """
+        self._ready[lane].acquire()
+        offset = (lane * self.slots + self._tails[lane] % self.slots) * self.slot_size
+        kind, protocol, node, src_ip, src_port, dst_ip, dst_port, sequence, size, profile = \
+            SLOT_HEADER.unpack_from(self.memory.buf, offset)
+        direction = Direction.NODE if node else Direction.HOST
+        if kind == SLOT_PAYLOAD:
+            start = offset + SLOT_HEADER.size
+            data: Union[memoryview, Any] = self.memory.buf[start:start + size]
+        elif kind in (SLOT_QUEUED, SLOT_OBJECT):
+            data = self._queues[lane].get()
+        else:
+            return kind, None, direction, profile, sequence, None
+
+        if kind == SLOT_OBJECT:
+            return kind, None, direction, profile, sequence, data
+
+        flow = Flow(PROTOCOLS[protocol], inet_ntoa(src_ip), src_port, inet_ntoa(dst_ip),
+                    dst_port)
+
+        return SLOT_PAYLOAD, flow, direction, profile, sequence, data
+
+    def release(self, lane: int) -> None:
+        """
+        Free the slot read by the last `get()`, its view must not be used anymore.
+
+        :type lane: int
+        :param lane: The consumer.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        self._tails[lane] += 1
+        self._free[lane].release()
+
+    def get_statistics(self) -> dict:
+        """
+        Return the counters of the producer.
+
+        :rtype: dict
+        :return: The payloads written in the slots and the payloads sent through the queues.
+        """
+        return dict(self.statistics)
+
+    def close(self) -> None:
+        """
+        Close the shared memory in this process.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        self.memory.close()
+
+    def unlink(self) -> None:
+        """
+        Close and destroy the shared memory, only the process which created it calls it.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        self.memory.close()
+        self.memory.unlink()
+
+    def _acquire(self, lane: int, timeout: Optional[float] = None) -> Optional[int]:
+        """
+        Wait for a free slot of the lane and move its head.
+
+        :type lane: int
+        :param lane: The consumer.
+
+        :type timeout: Optional[float]
+        :param timeout: Maximum seconds to wait, None to wait until a slot is free.
+
+        :rtype: Optional[int]
+        :return: The offset of the slot in the shared memory, None if no slot was freed
+            before the timeout.
+        """
+        if not self._free[lane].acquire(timeout=timeout):
+            return None
+
+        offset = (lane * self.slots + self._heads[lane] % self.slots) * self.slot_size
+        self._heads[lane] += 1
+
+        return offset
+
+    def _put_kind(self, lane: int, kind: int, timeout: Optional[float] = None) -> bool:
+        """
+        Write a slot without a payload.
+
+        :type lane: int
+        :param lane: The consumer.
+
+        :type kind: int
+        :param kind: The kind of the slot.
+
+        :type timeout: Optional[float]
+        :param timeout: Maximum seconds to wait for a free slot, None to wait until there is
+            one.
+
+        :rtype: bool
+        :return: False if the lane was still full after the timeout.
+        """
+        offset = self._acquire(lane, timeout)
+        if offset is None:
+            return False
+
+        SLOT_HEADER.pack_into(self.memory.buf, offset, kind, 0, 0, bytes(4), 0, bytes(4), 0, 0, 0,
+                              0)
+        self._ready[lane].release()
+
+        return True
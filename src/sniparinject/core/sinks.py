@@ -0,0 +1,904 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+Write the parsed messages into files as JSON Lines or CSV, or into a SQLite database, for
+the analysis tools.
+"""
+from abc import ABC, abstractmethod
+from collections import deque
+from csv import writer as csv_writer
+from io import StringIO
+from json import JSONEncoder
+from os.path import splitext
+from sqlite3 import DatabaseError, connect
+from threading import Event, Thread
+from types import MappingProxyType
+from typing import Any, Iterable, Optional
+
+# pylint: disable=import-error
+from .batch import BatchColumn, get_columns
+from .direction import Direction
+from .parser import Record
+from .rotating_file import RotatingFile
+from .schema import CompiledAction
+
+FILE_FORMATS = ('jsonl', 'csv')
+SINK_FORMATS = (*FILE_FORMATS, 'sqlite')
+NUMBER_SYMBOLS = frozenset('bBhHiIlLqQnNefd')
+SQL_TYPES = MappingProxyType({
+    **{symbol: 'INTEGER' for symbol in 'bBhHiIlLqQnN'},
+    **{symbol: 'REAL' for symbol in 'efd'},
+})
+UNKNOWN_INSERT = 'INSERT INTO unknown (timestamp, direction, action_id, data) VALUES (?, ?, ?, ?)'
+
+
+def encode_value(value: Any) -> Any:
+    """
+    Convert the value which JSON and CSV do not have, the bytes are written in hex.
+
+    :type value: Any
+    :param value: A decoded value.
+
+    :rtype: Any
+    :return: The value to write.
+    """
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).hex()
+
+    raise TypeError(f'The value ({value!r}) could not be written.')
+
+
+JSON_ENCODER = JSONEncoder(separators=(',', ':'), default=encode_value)
+
+
+def is_number(action: CompiledAction, column: BatchColumn) -> bool:
+    """
+    Tell if the values of the column are numbers written as they are, without reference
+    and output formatting.
+
+    :type action: CompiledAction
+    :param action: The compiled action.
+
+    :type column: BatchColumn
+    :param column: One column of the action.
+
+    :rtype: bool
+    :return: True if the column is one number.
+    """
+    field = action.fields[column.start]
+
+    return (column.symbol in NUMBER_SYMBOLS and column.count == 1 and field.reference is None
+            and not field.steps)
+
+
+def escape(text: str) -> str:
+    """
+    Escape the percent signs of the text, so it is kept as it is in a template.
+
+    :type text: str
+    :param text: The text of the settings.
+
+    :rtype: str
+    :return: The escaped text.
+    """
+    return text.replace('%', '%%')
+
+
+def get_column_names(columns: list[BatchColumn]) -> list[str]:
+    """
+    Return the names of the columns in a SQL table, the names only differ by their case
+    in SQL, so a name used twice or named timestamp gets the position of its column.
+
+    :type columns: list[BatchColumn]
+    :param columns: The columns of the action.
+
+    :rtype: list[str]
+    :return: The names after the timestamp.
+    """
+    names = []
+    used = {'timestamp'}
+    for index, column in enumerate(columns):
+        name = column.name
+        if name.lower() in used:
+            name = f'{name}_{index}'
+        used.add(name.lower())
+        names.append(name)
+
+    return names
+
+
+def quote(name: str) -> str:
+    """
+    Quote the name of a SQL table or column.
+
+    :type name: str
+    :param name: The name.
+
+    :rtype: str
+    :return: The quoted name.
+    """
+    return '"' + name.replace('"', '""') + '"'
+
+
+class Sink(ABC):
+    """
+    The base of the sinks, a sink could take only one direction or only some actions.
+    """
+
+    def __init__(self, direction: Optional[Direction] = None,
+                 actions: Optional[Iterable[int]] = None) -> None:
+        """
+        Take the messages of the direction and of the actions.
+
+        :type direction: Optional[Direction]
+        :param direction: Write only the messages of this direction, None for both.
+
+        :type actions: Optional[Iterable[int]]
+        :param actions: Write only the messages of these IDs, None for all of them.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        self.direction = direction
+        self.actions = frozenset(actions) if actions is not None else None
+        self.statistics = {'records': 0}
+
+    def accepts(self, record: Record) -> bool:
+        """
+        Tell if the message is written by this sink.
+
+        :type record: Record
+        :param record: A parsed message.
+
+        :rtype: bool
+        :return: True if its direction and its ID are the ones of the sink.
+        """
+        return ((self.direction is None or record.direction is self.direction)
+                and (self.actions is None or record.action_id in self.actions))
+
+    @abstractmethod
+    def write(self, record: Record, profile: Optional[str] = None) -> None:
+        """
+        Write one message.
+
+        :type record: Record
+        :param record: A parsed message.
+
+        :type profile: Optional[str]
+        :param profile: The profile of the server, None for the Game settings.
+
+        :rtype: None
+        :return: Nothing.
+        """
+
+    @abstractmethod
+    def close(self) -> None:
+        """
+        Write the pending messages and close the sink.
+
+        :rtype: None
+        :return: Nothing.
+        """
+
+    def get_statistics(self) -> dict:
+        """
+        Return the counters of the sink.
+
+        :rtype: dict
+        :return: The written messages.
+        """
+        return dict(self.statistics)
+
+
+class FileSink(Sink):
+    """
+    Write the parsed messages as JSON Lines or CSV, with the fields named after the
+    `name` of their struct.
+
+    A JSON line has the timestamp, the profile, the direction, the ID, the title and the
+    fields of the message, the data in hex if the ID is unknown. The CSV messages are
+    written in one file by profile, direction and action, because every action has its
+    own columns, e.g. `moves.csv` writes the action 0x85 of the node into
+    `moves.node.0085.csv`, the same action of the profile `Login` into
+    `moves.Login.node.0085.csv` and the unknown IDs into `moves.node.unknown.csv`.
+    """
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def __init__(self, path: str, sink_format: str = 'jsonl',
+                 direction: Optional[Direction] = None,
+                 actions: Optional[Iterable[int]] = None, **file_options: Any) -> None:
+        """
+        Write the parsed messages into files.
+
+        :type path: str
+        :param path: The path of the file, or the template of the files of every action.
+
+        :type sink_format: str
+        :param sink_format: The format of the file: jsonl or csv.
+
+        :type direction: Optional[Direction]
+        :param direction: Write only the messages of this direction, None for both.
+
+        :type actions: Optional[Iterable[int]]
+        :param actions: Write only the messages of these IDs, None for all of them.
+
+        :type file_options: Any
+        :param file_options: The rotation options of the RotatingFile.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        if sink_format not in FILE_FORMATS:
+            raise RuntimeError(f'Error: The Sink format ({sink_format}) is not jsonl or csv.')
+
+        super().__init__(direction, actions)
+        self.path = path
+        self.sink_format = sink_format
+        self.file_options = file_options
+        self._files: dict[Optional[tuple[Optional[str], Direction, Optional[int]]],
+                          RotatingFile] = {}
+        self._writers: dict[tuple[Optional[str], Direction, Optional[int]], Any] = {}
+        self._templates: dict[int, tuple[CompiledAction, list[BatchColumn], Optional[str],
+                                         Direction, Optional[str], RotatingFile]] = {}
+        self._write = self._write_json if sink_format == 'jsonl' else self._write_csv
+        if sink_format == 'jsonl':
+            self._files[None] = RotatingFile(path, **file_options)
+
+    def write(self, record: Record, profile: Optional[str] = None) -> None:
+        """
+        Write one message, the errors are not written.
+
+        :type record: Record
+        :param record: A parsed message.
+
+        :type profile: Optional[str]
+        :param profile: The profile of the server, None for the Game settings.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        if record.error is not None:
+            return
+
+        compiled = self._templates.get(id(record.action))
+        if (compiled is not None and compiled[2] is not None and compiled[0] is record.action
+                and compiled[3:5] == (record.direction, profile)
+                and len(record.values) == len(record.action.fields)):
+            compiled[5].write(compiled[2] % (record.timestamp, *record.values))
+        else:
+            self._write(record, profile)
+        self.statistics['records'] += 1
+
+    def close(self) -> None:
+        """
+        Write the buffers and close the files.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        for rotating_file in self._files.values():
+            rotating_file.close()
+
+    def get_statistics(self) -> dict:
+        """
+        Return the counters of the sink.
+
+        :rtype: dict
+        :return: The written messages, bytes and the rotations of the files.
+        """
+        statistics = dict(super().get_statistics(), bytes=0, rotations=0)
+        for rotating_file in self._files.values():
+            statistics['bytes'] += rotating_file.statistics['bytes']
+            statistics['rotations'] += rotating_file.statistics['rotations']
+
+        return statistics
+
+    def _get_template(self, record: Record, profile: Optional[str]) -> tuple[
+            CompiledAction, list[BatchColumn], Optional[str], Direction, Optional[str],
+            RotatingFile]:
+        """
+        Return the columns of the action of the message and its template, they are built
+        with the first message of the action.
+
+        The template writes a message with only one `%` formatting when all the columns
+        are numbers without reference and output formatting, otherwise it is None. The
+        next messages of the action are written with the template by `write`.
+
+        :type record: Record
+        :param record: A parsed message of a known action, its file is opened.
+
+        :type profile: Optional[str]
+        :param profile: The profile of the server, None for the Game settings.
+
+        :rtype: tuple[CompiledAction, list[BatchColumn], Optional[str], Direction,
+            Optional[str], RotatingFile]
+        :return: The action, its columns, its template, the direction and the profile of
+            the template and the file of the action.
+        """
+        compiled = self._templates.get(id(record.action))
+        if (compiled is not None and compiled[0] is record.action
+                and compiled[3:5] == (record.direction, profile)):
+            return compiled
+
+        action = record.action
+        columns = get_columns(action)
+        template = None
+        if all(is_number(action, column) for column in columns):
+            if self.sink_format == 'jsonl':
+                head = JSON_ENCODER.encode(dict(
+                    self._get_head(record, profile), action=action.title))
+                template = ('{"timestamp":%r,' + escape(head[1:-1]) + ',"fields":{'
+                            + ','.join(f'{escape(JSON_ENCODER.encode(column.name))}:%r'
+                                       for column in columns)
+                            + '}}\n')
+            else:
+                head = StringIO()
+                csv_writer(head).writerow([record.direction.value, record.action_id,
+                                           action.title])
+                template = ('%r,' + escape(head.getvalue()[:-2])
+                            + ''.join(',%r' for _ in columns) + '\r\n')
+
+        rotating_file = self._files[None if self.sink_format == 'jsonl'
+                                    else (profile, record.direction, record.action_id)]
+        compiled = (action, columns, template, record.direction, profile, rotating_file)
+        self._templates[id(action)] = compiled
+
+        return compiled
+
+    @staticmethod
+    def _get_head(record: Record, profile: Optional[str]) -> dict[str, Any]:
+        """
+        Return the keys of a JSON line before the title of the message.
+
+        :type record: Record
+        :param record: A parsed message.
+
+        :type profile: Optional[str]
+        :param profile: The profile of the server, it is only written when it is not None.
+
+        :rtype: dict[str, Any]
+        :return: The profile, the direction and the ID.
+        """
+        head: dict[str, Any] = {} if profile is None else {'profile': profile}
+        head['direction'] = record.direction.value
+        head['action_id'] = record.action_id
+
+        return head
+
+    @staticmethod
+    def _get_fields(record: Record, columns: list[BatchColumn]) -> dict[str, Any]:
+        """
+        Return the values of the message by the name of their column.
+
+        :type record: Record
+        :param record: A parsed message of a known action.
+
+        :type columns: list[BatchColumn]
+        :param columns: The columns of the action.
+
+        :rtype: dict[str, Any]
+        :return: The values, a repeated struct is a list.
+        """
+        values = record.values
+        return {
+            column.name: (values[column.start] if column.symbol == 's' or column.count == 1
+                          else list(values[column.start:column.start + column.count]))
+            for column in columns
+        }
+
+    def _write_json(self, record: Record, profile: Optional[str]) -> None:
+        """
+        Write the message as one JSON line.
+
+        :type record: Record
+        :param record: A parsed message.
+
+        :type profile: Optional[str]
+        :param profile: The profile of the server, None for the Game settings.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        columns: list[BatchColumn] = []
+        if record.action is not None:
+            _, columns, template, _, _, rotating_file = self._get_template(record, profile)
+            if template is not None and len(record.values) == len(record.action.fields):
+                rotating_file.write(template % (record.timestamp, *record.values))
+                return
+
+        message = dict({'timestamp': record.timestamp}, **self._get_head(record, profile))
+        if record.action is None:
+            message['data'] = record.data.hex()
+        else:
+            message['action'] = record.action.title
+            message['fields'] = self._get_fields(record, columns) if record.values else {}
+        self._files[None].write(JSON_ENCODER.encode(message) + '\n')
+
+    def _write_csv(self, record: Record, profile: Optional[str]) -> None:
+        """
+        Write the message as one CSV row in the file of its profile, direction and action.
+
+        :type record: Record
+        :param record: A parsed message.
+
+        :type profile: Optional[str]
+        :param profile: The profile of the server, None for the Game settings.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        key = (profile, record.direction, None if record.action is None else record.action_id)
+        writer = self._writers.get(key)
+        if writer is None:
+            writer = self._open_csv(record, key)
+
+        columns: list[BatchColumn] = []
+        if record.action is not None:
+            _, columns, template, _, _, rotating_file = self._get_template(record, profile)
+            if template is not None and len(record.values) == len(record.action.fields):
+                rotating_file.write(template % (record.timestamp, *record.values))
+                return
+
+        row = [record.timestamp, record.direction.value, record.action_id]
+        if record.action is None:
+            row.append(record.data.hex())
+        else:
+            row.append(record.action.title)
+            if record.values:
+                row.extend(
+                    value.hex() if isinstance(value, bytes)
+                    else JSON_ENCODER.encode(value) if isinstance(value, list) else value
+                    for value in self._get_fields(record, columns).values())
+        writer.writerow(row)
+
+    def _open_csv(self, record: Record,
+                  key: tuple[Optional[str], Direction, Optional[int]]) -> Any:
+        """
+        Open the CSV file of the profile, the direction and the action of the message, with
+        its header, which is quoted like the rows.
+
+        :type record: Record
+        :param record: A parsed message.
+
+        :type key: tuple[Optional[str], Direction, Optional[int]]
+        :param key: The profile, the direction and the ID of the file, None for the unknown
+            IDs.
+
+        :rtype: csv.writer
+        :return: The CSV writer of the file.
+        """
+        profile, direction, action_id = key
+        stem, suffix = splitext(self.path)
+        if profile is not None:
+            stem = f'{stem}.{profile}'
+        if action_id is None:
+            path = f'{stem}.{direction.value}.unknown{suffix}'
+            columns = ['timestamp', 'direction', 'action_id', 'data']
+        else:
+            path = f'{stem}.{direction.value}.{action_id & 0xffff:04x}{suffix}'
+            columns = ['timestamp', 'direction', 'action_id', 'action']
+            columns.extend(column.name for column in get_columns(record.action))
+
+        header = StringIO()
+        csv_writer(header).writerow(columns)
+        rotating_file = RotatingFile(path, header=header.getvalue(), **self.file_options)
+        self._files[key] = rotating_file
+        self._writers[key] = csv_writer(rotating_file)
+
+        return self._writers[key]
+
+
+# pylint: disable=too-many-instance-attributes
+class SQLiteSink(Sink):
+    """
+    Insert the parsed messages into a SQLite database, with one table by action.
+
+    The table of an action is named after its profile, its direction and its ID, e.g.
+    `node_0085` or `Login_node_0085` for the profile `Login`, with the timestamp and one
+    column by struct. The messages of the unknown IDs go into the `unknown` table with
+    their data, and the `actions` table has the title of every table. The messages are
+    only queued by `write`, a background thread inserts them with `executemany` in one
+    transaction every `commit_interval` seconds, or as soon as `batch_size` messages are
+    queued. The queue holds at most `max_rows` messages, the next ones are dropped and
+    counted until the database catches up, so the capture never waits for the disk.
+    """
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def __init__(self, path: str, direction: Optional[Direction] = None,
+                 actions: Optional[Iterable[int]] = None, batch_size: int = 1000,
+                 commit_interval: float = 1.0, max_rows: int = 262144) -> None:
+        """
+        Open the database in WAL mode and start the thread of the inserts.
+
+        :type path: str
+        :param path: The path of the database, the tables are created if they do not exist.
+
+        :type direction: Optional[Direction]
+        :param direction: Write only the messages of this direction, None for both.
+
+        :type actions: Optional[Iterable[int]]
+        :param actions: Write only the messages of these IDs, None for all of them.
+
+        :type batch_size: int
+        :param batch_size: Number of queued messages which are inserted at once.
+
+        :type commit_interval: float
+        :param commit_interval: Maximum seconds that a message waits in the queue.
+
+        :type max_rows: int
+        :param max_rows: Maximum number of messages in the queue, the next ones are dropped.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        if batch_size < 1 or max_rows < batch_size:
+            raise RuntimeError(f'Error: The Sink batch_size ({batch_size}) must be between 1'
+                               f' and max_rows ({max_rows}).')
+
+        super().__init__(direction, actions)
+        self.path = path
+        self.batch_size = batch_size
+        self.commit_interval = commit_interval
+        self.max_rows = max_rows
+        self.statistics.update(dropped=0, rows=0, errors=0, transactions=0, tables=0,
+                               max_backlog=0)
+        self._queue: deque[tuple[Record, Optional[str]]] = deque()
+        self._ready = Event()
+        self._stopped = False
+        self._inserts: dict[int, tuple[CompiledAction, Direction, Optional[str], str,
+                                       list[BatchColumn]]] = {}
+        self._tables: set[str] = set()
+        self._connection = connect(path, isolation_level=None, check_same_thread=False)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        self._create_tables()
+        self._thread = Thread(target=self._run, name='SQLiteSink', daemon=True)
+        self._thread.start()
+
+    def write(self, record: Record, profile: Optional[str] = None) -> None:
+        """
+        Queue one message, the errors are not written and the message is dropped if the
+        queue is full.
+
+        :type record: Record
+        :param record: A parsed message.
+
+        :type profile: Optional[str]
+        :param profile: The profile of the server, None for the Game settings.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        if record.error is not None:
+            return
+
+        queue = self._queue
+        if len(queue) >= self.max_rows:
+            self.statistics['dropped'] += 1
+            return
+
+        if record.action is None:
+            record = record._replace(data=bytes(record.data))
+        queue.append((record, profile))
+        self.statistics['records'] += 1
+        if len(queue) == self.batch_size:
+            self._ready.set()
+
+    def close(self) -> None:
+        """
+        Insert the queued messages, stop the thread and close the database.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        if self._thread.is_alive():
+            self._stopped = True
+            self._ready.set()
+            self._thread.join()
+        self._connection.close()
+
+    def get_statistics(self) -> dict:
+        """
+        Return the counters of the sink.
+
+        :rtype: dict
+        :return: The queued messages, the dropped ones, the inserted rows, the rows lost by
+            a database error, the transactions, the tables, the maximum size of the queue
+            and the messages in the queue.
+        """
+        return dict(super().get_statistics(), backlog=len(self._queue))
+
+    def _run(self) -> None:
+        """
+        Insert the queued messages in one transaction when enough of them are queued or
+        the first one waited enough, until the sink is closed and the queue is empty.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        while True:
+            self._ready.wait(self.commit_interval)
+            self._ready.clear()
+            stopped = self._stopped
+            backlog = len(self._queue)
+            self.statistics['max_backlog'] = max(self.statistics['max_backlog'], backlog)
+            if backlog:
+                self._insert([self._queue.popleft() for _ in range(backlog)])
+            if stopped:
+                return
+
+    def _insert(self, records: list[tuple[Record, Optional[str]]]) -> None:
+        """
+        Insert the messages in one transaction, with one `executemany` by table.
+
+        :type records: list[tuple[Record, Optional[str]]]
+        :param records: The queued messages with their profile.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        try:
+            rows = self._get_rows(records)
+            self._connection.execute('BEGIN')
+            for statement, parameters in rows.items():
+                self._connection.executemany(statement, parameters)
+            self._connection.execute('COMMIT')
+        except DatabaseError:
+            if self._connection.in_transaction:
+                self._connection.execute('ROLLBACK')
+            self.statistics['errors'] += len(records)
+            return
+
+        self.statistics['rows'] += len(records)
+        self.statistics['transactions'] += 1
+
+    def _get_rows(self, records: list[tuple[Record, Optional[str]]]) -> dict[str, list[tuple]]:
+        """
+        Convert the messages into the rows of their table, grouped by insert statement.
+
+        :type records: list[tuple[Record, Optional[str]]]
+        :param records: The queued messages with their profile.
+
+        :rtype: dict[str, list[tuple]]
+        :return: The rows of every statement, a repeated struct is written in JSON and
+            the values which were not decoded are NULL.
+        """
+        rows: dict[str, list[tuple]] = {}
+        for record, profile in records:
+            if record.action is None:
+                rows.setdefault(UNKNOWN_INSERT, []).append(
+                    (record.timestamp, record.direction.value, record.action_id, record.data))
+                continue
+
+            statement, columns = self._get_insert(record, profile)
+            values = record.values or (None,) * len(record.action.fields)
+            rows.setdefault(statement, []).append((record.timestamp, *(
+                values[column.start] if column.symbol == 's' or column.count == 1
+                else JSON_ENCODER.encode(values[column.start:column.start + column.count])
+                for column in columns)))
+
+        return rows
+
+    def _get_insert(self, record: Record, profile: Optional[str]) -> tuple[str, list[BatchColumn]]:
+        """
+        Return the insert statement of the action of the message and its columns, the
+        table is created with the first message of the action.
+
+        :type record: Record
+        :param record: A parsed message of a known action.
+
+        :type profile: Optional[str]
+        :param profile: The profile of the server, None for the Game settings.
+
+        :rtype: tuple[str, list[BatchColumn]]
+        :return: The statement and the columns of the action.
+        """
+        compiled = self._inserts.get(id(record.action))
+        if (compiled is not None and compiled[0] is record.action
+                and compiled[1] is record.direction and compiled[2] == profile):
+            return compiled[3], compiled[4]
+
+        action = record.action
+        table = f'{record.direction.value}_{record.action_id & 0xffff:04x}'
+        if profile is not None:
+            table = f'{profile}_{table}'
+        columns = get_columns(action)
+        names = get_column_names(columns)
+        self._create_table(table, [
+            (name, SQL_TYPES.get(column.symbol, '') if is_number(action, column) else '')
+            for name, column in zip(names, columns)
+        ])
+        self._connection.execute(
+            'INSERT OR REPLACE INTO actions (name, direction, action_id, title)'
+            ' VALUES (?, ?, ?, ?)',
+            (table, record.direction.value, record.action_id, action.title))
+        statement = (f'INSERT INTO {quote(table)} (timestamp'
+                     + ''.join(f', {quote(name)}' for name in names)
+                     + ') VALUES (?' + ', ?' * len(names) + ')')
+        self._inserts[id(action)] = (action, record.direction, profile, statement, columns)
+
+        return statement, columns
+
+    def _create_tables(self) -> None:
+        """
+        Create the tables of the titles and of the unknown IDs, with their indexes.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        self._connection.executescript(
+            'CREATE TABLE IF NOT EXISTS actions (name TEXT PRIMARY KEY, direction TEXT,'
+            ' action_id INTEGER, title TEXT);'
+            'CREATE INDEX IF NOT EXISTS actions_action_id ON actions (action_id);'
+            'CREATE TABLE IF NOT EXISTS unknown (timestamp REAL, direction TEXT,'
+            ' action_id INTEGER, data BLOB);'
+            'CREATE INDEX IF NOT EXISTS unknown_timestamp ON unknown (timestamp);'
+            'CREATE INDEX IF NOT EXISTS unknown_action_id ON unknown (action_id);'
+        )
+
+    def _create_table(self, table: str, columns: list[tuple[str, str]]) -> None:
+        """
+        Create the table of an action with its index on the timestamp. If the table exists
+        with other columns, e.g. the settings were changed, the missing columns are added.
+
+        :type table: str
+        :param table: The name of the table.
+
+        :type columns: list[tuple[str, str]]
+        :param columns: The name and the SQL type of every column, after the timestamp.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        self._connection.execute(f'CREATE TABLE IF NOT EXISTS {quote(table)} (timestamp REAL'
+                                 + ''.join(f', {quote(name)} {sql_type}'.rstrip()
+                                           for name, sql_type in columns) + ')')
+        self._connection.execute(f'CREATE INDEX IF NOT EXISTS {quote(table + "_timestamp")}'
+                                 f' ON {quote(table)} (timestamp)')
+        existing = {row[1].lower() for row in
+                    self._connection.execute(f'PRAGMA table_info({quote(table)})')}
+        for name, sql_type in columns:
+            if name.lower() not in existing:
+                self._connection.execute(
+                    f'ALTER TABLE {quote(table)} ADD COLUMN {quote(name)} {sql_type}'.rstrip())
+        if table not in self._tables:
+            self._tables.add(table)
+            self.statistics['tables'] += 1
+
+
+class SinkTable:
+    """
+    The sinks of the settings, every message is written by all the sinks which accept it.
+    """
+
+    def __init__(self, sinks: list[Sink]) -> None:
+        """
+        The sinks of the settings.
+
+        :type sinks: list[Sink]
+        :param sinks: The sinks.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        self.sinks = sinks
+        self._routes: dict[tuple[Direction, Optional[int]], tuple[Sink, ...]] = {}
+
+    @classmethod
+    def from_settings(cls, sink_settings: list) -> 'SinkTable':
+        """
+        Open the sinks of the Sinks settings.
+
+        :type sink_settings: list
+        :param sink_settings: The settings of every sink.
+
+        :rtype: SinkTable
+        :return: The sinks.
+        """
+        if not isinstance(sink_settings, list) or not sink_settings:
+            raise RuntimeError('Error: The Sinks are not a list of sinks.')
+
+        sinks: list[Sink] = []
+        try:
+            for sink in sink_settings:
+                sinks.append(cls._create_sink(sink))
+        except RuntimeError:
+            for created in sinks:
+                created.close()
+            raise
+
+        return cls(sinks)
+
+    @staticmethod
+    def _create_sink(sink: Any) -> Sink:
+        """
+        Open one sink of the Sinks settings.
+
+        :type sink: Any
+        :param sink: The settings of the sink.
+
+        :rtype: Sink
+        :return: The file sink, or the SQLite sink.
+        """
+        if not isinstance(sink, dict) or not sink.get('path'):
+            raise RuntimeError(f'Error: The Sink ({sink}) has no path.')
+        sink_format = str(sink.get('format') or 'jsonl').lower()
+        if sink_format not in SINK_FORMATS:
+            raise RuntimeError(f'Error: The Sink format ({sink_format}) is not jsonl, csv or'
+                               f' sqlite.')
+        direction = sink.get('direction')
+        if direction is not None and str(direction).lower() not in ('host', 'node'):
+            raise RuntimeError(f'Error: The Sink direction ({direction}) is not host or node.')
+        actions = sink.get('actions')
+        if actions is not None and (not isinstance(actions, list) or not all(
+                isinstance(action_id, int) for action_id in actions)):
+            raise RuntimeError(f'Error: The Sink actions ({actions}) are not a list of IDs.')
+
+        direction = Direction(str(direction).lower()) if direction is not None else None
+        if sink_format == 'sqlite':
+            return SQLiteSink(
+                str(sink.get('path')),
+                direction,
+                actions,
+                batch_size=int(sink.get('batch_size') or 1000),
+                commit_interval=float(sink.get('commit_interval') or 1.0),
+                max_rows=int(sink.get('max_rows') or 262144),
+            )
+
+        return FileSink(
+            str(sink.get('path')),
+            sink_format,
+            direction,
+            actions,
+            max_bytes=int(sink.get('max_bytes') or 0),
+            rotate_seconds=float(sink.get('rotate_seconds') or 0),
+            compress=sink.get('compress') is True,
+            buffer_size=int(sink.get('buffer_size') or 65536),
+        )
+
+    def write(self, records: Iterable[Record], profile: Optional[str] = None) -> None:
+        """
+        Write every message with the sinks which accept it.
+
+        :type records: Iterable[Record]
+        :param records: The parsed messages.
+
+        :type profile: Optional[str]
+        :param profile: The profile of the server of the messages, None for the Game
+            settings.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        for record in records:
+            key = (record.direction, record.action_id)
+            sinks = self._routes.get(key)
+            if sinks is None:
+                sinks = tuple(sink for sink in self.sinks if sink.accepts(record))
+                self._routes[key] = sinks
+            for sink in sinks:
+                sink.write(record, profile)
+
+    def close(self) -> None:
+        """
+        Close the files of all the sinks.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        for sink in self.sinks:
+            sink.close()
+
+    def get_statistics(self) -> dict:
+        """
+        Return the counters of all the sinks.
+
+        :rtype: dict
+        :return: The sinks, the written messages, bytes and the rotations of the files.
+        """
+        statistics = {'sinks': len(self.sinks), 'records': 0, 'bytes': 0, 'rotations': 0}
+        for sink in self.sinks:
+            for name, value in sink.get_statistics().items():
+                statistics[name] = statistics.get(name, 0) + value
+
+        return statistics
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+Write the output of the parser from a background thread, so the parse does not wait for
+the terminal.
+"""
+import sys
+from threading import Condition, Thread
+from typing import Iterable, Optional, TextIO
+
+
+# pylint: disable=too-many-instance-attributes
+class ConsoleWriter(Thread):
+    """
+    Collect the rendered lines in a buffer and write them from a background thread.
+
+    The buffer is written in only one call when it has `buffer_lines` lines, or when its
+    first line waited `flush_interval` seconds. The buffer holds at most `max_lines` lines,
+    the next ones are dropped and counted until the terminal catches up, so the parse never
+    waits for the output.
+    """
+
+    def __init__(self, buffer_lines: int = 256, flush_interval: float = 0.05,
+                 max_lines: int = 65536, stream: Optional[TextIO] = None) -> None:
+        """
+        Write the rendered lines from a background thread.
+
+        :type buffer_lines: int
+        :param buffer_lines: Number of lines which are written at once.
+
+        :type flush_interval: float
+        :param flush_interval: Maximum seconds that a line waits in the buffer.
+
+        :type max_lines: int
+        :param max_lines: Maximum number of lines in the buffer, the next ones are dropped.
+
+        :type stream: Optional[TextIO]
+        :param stream: Where the lines are written, None for the standard output.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        if buffer_lines < 1 or max_lines < buffer_lines:
+            raise RuntimeError(f'Error: The Output buffer_lines ({buffer_lines}) must be'
+                               f' between 1 and max_lines ({max_lines}).')
+
+        super().__init__(name='ConsoleWriter', daemon=True)
+        self.buffer_lines = buffer_lines
+        self.flush_interval = flush_interval
+        self.max_lines = max_lines
+        self.stream = stream
+        self.statistics = {'lines': 0, 'flushes': 0, 'dropped': 0, 'max_backlog': 0}
+        self._lines: list[str] = []
+        self._condition = Condition()
+        self._stopped = False
+
+    @classmethod
+    def from_settings(cls, settings: Optional[dict]) -> 'ConsoleWriter':
+        """
+        Create the writer with the Output settings.
+
+        :type settings: Optional[dict]
+        :param settings: The Output settings, None for the default values.
+
+        :rtype: ConsoleWriter
+        :return: The writer, it is not started.
+        """
+        settings = settings or {}
+
+        return cls(
+            buffer_lines=int(settings.get('buffer_lines') or 256),
+            flush_interval=float(settings.get('flush_interval') or 0.05),
+            max_lines=int(settings.get('max_lines') or 65536),
+        )
+
+    def write(self, lines: Iterable[str]) -> None:
+        """
+        Put the lines in the buffer, the lines which do not fit are dropped.
+
+        :type lines: Iterable[str]
+        :param lines: The rendered lines, without the line break.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        with self._condition:
+            was_empty = not self._lines
+            room = self.max_lines - len(self._lines)
+            for line in lines:
+                if room <= 0:
+                    self.statistics['dropped'] += 1
+                    continue
+                self._lines.append(line)
+                room -= 1
+
+            backlog = len(self._lines)
+            self.statistics['max_backlog'] = max(self.statistics['max_backlog'], backlog)
+            if (was_empty and backlog) or backlog >= self.buffer_lines:
+                self._condition.notify_all()
+
+    def run(self) -> None:
+        """
+        Write the buffer when it is full or its first line waited enough, until the writer
+        is stopped and the buffer is empty.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        while True:
+            with self._condition:
+                while not self._lines and not self._stopped:
+                    self._condition.wait()
+                if len(self._lines) < self.buffer_lines and not self._stopped:
+                    self._condition.wait(self.flush_interval)
+                if not self._lines:
+                    return
+
+                lines = self._lines
+                self._lines = []
+
+            self._flush(lines)
+
+    def stop(self) -> None:
+        """
+        Stop the writer after the lines of the buffer are written, they are written now if
+        the writer was not started.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        alive = self.is_alive()
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+            lines, self._lines = ([], self._lines) if alive else (self._lines, [])
+
+        if alive:
+            self.join()
+        elif lines:
+            self._flush(lines)
+
+    def get_statistics(self) -> dict:
+        """
+        Return the size of the buffer and the counters of the lines.
+
+        :rtype: dict
+        :return: The lines in the buffer, written, the writes, the dropped lines and the
+            maximum size of the buffer.
+        """
+        with self._condition:
+            return dict(self.statistics, backlog=len(self._lines))
+
+    def _flush(self, lines: list[str]) -> None:
+        """
+        Write the lines in only one call.
+
+        :type lines: list[str]
+        :param lines: The lines taken from the buffer.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        stream = self.stream or sys.stdout
+        stream.write('\n'.join(lines) + '\n')
+        stream.flush()
+        self.statistics['lines'] += len(lines)
+        self.statistics['flushes'] += 1
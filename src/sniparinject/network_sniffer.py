@@ -3,17 +3,33 @@
 """
 Start the sniff of the network packets.
 """
+from time import time
+from typing import Callable, Optional, Union
+
 from scapy.layers.inet import TCP, UDP, IP
 from scapy.layers.l2 import Ether
 from scapy.packet import Raw
 from scapy.sendrecv import sniff
 
 # pylint: disable=import-error
-from .core.game import Game
-from .core.settings import Settings
+from .core.archive import ArchiveReader, ArchiveWriter
+from .core.capture import Flow, RawSocketCapture, RingCapture, decode_frame
+from .core.console import Console
+from .core.direction import Direction
+from .core.flows import FlowState, FlowTable
+from .core.parser import ProtocolParser
+from .core.pipeline import ParsePipeline
+from .core.reassembly import StreamReassembler
+from .core.renderer import Renderer
+from .core.servers import ServerTable
+from .core.replay import PcapReplay
+from .core.settings_watcher import SettingsWatcher
+from .core.sharding import ShardedParser
+from .core.sinks import SinkTable
+from .core.writer import ConsoleWriter
 
 
-# pylint: disable=too-few-public-methods
+# pylint: disable=too-few-public-methods,too-many-instance-attributes
 class NetworkSniffer:
     """
     Init the sniff of the network for spy the packets.
@@ -32,22 +48,123 @@ class NetworkSniffer:
         self.settings_path = settings_path
         print()
         print('=== Settings ===')
-        settings = Settings(settings_path).get_dictionary()
+        self.settings_watcher = SettingsWatcher(settings_path, loader=ProtocolParser.from_settings)
+        settings = self.settings_watcher.current.schema.settings
         print(settings)
 
+        settings_options = settings.get('Settings') or {}
+        self.settings_watcher.poll_interval = float(settings_options.get('check_interval', 1.0))
+        self.settings_watcher.use_inotify = settings_options.get('inotify') is not False
+
         self.interface = settings.get('Network').get('interface')
+        capture = settings.get('Network').get('capture') or 'scapy'
+        self.capture = capture.lower()
+        if self.capture not in ('scapy', 'socket', 'ring'):
+            raise RuntimeError(f'Error: The capture ({capture}) is not scapy, socket or ring.')
         protocol = settings.get('Server').get('protocol') or 'tcp'
         self.protocol = protocol.lower()
         self.host_ip = settings.get('Server').get('ip') or None
         self.host_port = settings.get('Server').get('port') or None
+        self.servers = ServerTable.from_settings(settings.get('Server'), settings.get('Profiles'))
+        has_tcp = any(endpoint.protocol == 'tcp' for endpoint in self.servers.endpoints)
+        max_flows = int(settings.get('Server').get('max_flows') or 4096)
+        self.reassembler: Optional[StreamReassembler] = None
+        max_stream_bytes = 0
+        if has_tcp and settings.get('Server').get('reassembly') is not False:
+            max_stream_bytes = int(settings.get('Server').get('max_stream_bytes') or 1 << 20)
+            self.reassembler = StreamReassembler(max_stream_bytes, max_flows)
+        self.renderer = Renderer.from_settings(settings)
+        self.writer: Optional[ConsoleWriter] = (
+            ConsoleWriter.from_settings(settings.get('Output')) if 'Output' in settings else None)
+        self.sinks: Optional[SinkTable] = (
+            SinkTable.from_settings(settings.get('Sinks')) if 'Sinks' in settings else None)
+        self.archive: Optional[ArchiveWriter] = (
+            ArchiveWriter.from_settings(settings.get('Archive')) if 'Archive' in settings else None)
+        self.pipeline: Optional[ParsePipeline] = None
+        self.shards: Optional[ShardedParser] = None
+        self._create_workers(settings, max_stream_bytes, max_flows)
+        self.flows = FlowTable(
+            self.servers.classify,
+            max_flows=max_flows,
+            idle_timeout=float(settings.get('Server').get('flow_timeout') or 300),
+            on_evict=self._get_on_evict(max_stream_bytes),
+        )
+        self.statistics = {'payloads': 0, 'messages': 0, 'leftover': 0, 'skipped': 0}
         print()
         print('=== Network Sniffer ===')
         print(f'Interface: {self.interface}')
+        print(f'Capture:   {self.capture}')
         print(f'Protocol:  {self.protocol}')
         print(f'Host IP:   {self.host_ip}')
         print(f'Host Port: {self.host_port}')
+        if settings.get('Server').get('endpoints') is not None:
+            for endpoint in self.servers.endpoints:
+                print(f'Server:    {endpoint.name or ""} {endpoint.protocol}'
+                      f' {endpoint.ip or "*"}:{endpoint.port or "*"} {endpoint.profile or "Game"}')
         print()
 
+    def _create_workers(self, settings: dict, max_stream_bytes: int, max_flows: int) -> None:
+        """
+        Create the parse pipeline or the sharded parser of the Pipeline settings.
+
+        :type settings: dict
+        :param settings: The settings read from the YAML file.
+
+        :type max_stream_bytes: int
+        :param max_stream_bytes: Maximum bytes kept for one TCP flow, zero without the
+            reassembly.
+
+        :type max_flows: int
+        :param max_flows: Maximum number of TCP flows kept by one worker.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        pipeline_settings = settings.get('Pipeline') or {}
+        if pipeline_settings.get('workers'):
+            for name, output in (('Sinks are', self.sinks), ('Archive is', self.archive)):
+                if output is not None:
+                    self._close_outputs()
+                    raise RuntimeError(f'Error: The {name} not written by the Pipeline workers.')
+            self.reassembler = None
+            self.shards = ShardedParser(
+                settings,
+                int(pipeline_settings.get('workers')),
+                max_stream_bytes=max_stream_bytes,
+                queue_size=int(pipeline_settings.get('queue_size') or 4096),
+                slot_size=int(pipeline_settings.get('slot_size') or 2048),
+                profiles=self.servers.profiles,
+                writer=self.writer,
+                max_flows=max_flows,
+            )
+        elif pipeline_settings:
+            self.pipeline = ParsePipeline(
+                self._parse_item,
+                queue_size=int(pipeline_settings.get('queue_size') or 4096),
+                overflow=str(pipeline_settings.get('overflow') or 'block').lower(),
+            )
+
+    def _get_on_evict(self, max_stream_bytes: int) -> Optional[Callable[[Flow], None]]:
+        """
+        Return the callback which forgets the TCP stream of a flow forgotten by the table.
+
+        :type max_stream_bytes: int
+        :param max_stream_bytes: Maximum bytes kept for one TCP flow, zero without the
+            reassembly.
+
+        :rtype: Optional[Callable[[Flow], None]]
+        :return: The callback, None without the reassembly.
+        """
+        if self.shards is not None:
+            # Every worker forgets the streams of its flows in order with its payloads.
+            return self.shards.discard if max_stream_bytes else None
+        if self.reassembler is None:
+            return None
+
+        # The streams belong to the thread of the pipeline, it forgets them in order with
+        # the queued segments.
+        return self.reassembler.discard if self.pipeline is None else self.pipeline.put
+
     def start(self) -> None:
         """
         Start the sniffer.
@@ -55,22 +172,262 @@ class NetworkSniffer:
         :rtype: None
         :return: Nothing.
         """
-        sniffer_filter = self.protocol
-        if self.host_ip:
-            sniffer_filter += f' and host {self.host_ip}'
-        if self.host_port:
-            sniffer_filter += f' and port {self.host_port}'
+        sniffer_filter = self.servers.get_filter()
+
+        self._start_workers()
+        try:
+            if self.capture in ('socket', 'ring'):
+                self._capture_socket(sniffer_filter)
+            else:
+                sniff(
+                    iface=self.interface,
+                    filter=sniffer_filter,
+                    count=0,
+                    prn=self._sniff_data
+                )
+        finally:
+            self._stop_workers()
+
+    def replay(self, capture_file: str, original_timing: bool = False) -> None:
+        """
+        Replay the frames of a pcap or pcapng file, it does not need root permissions.
+
+        The frames are filtered with the protocol, the IP and the port of the servers, then
+        their payloads are parsed as in the live capture.
+
+        :type capture_file: str
+        :param capture_file: The pcap or pcapng file.
+
+        :type original_timing: bool
+        :param original_timing: Wait between the frames as they were captured, otherwise
+            they are parsed as fast as possible.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        self._start_workers()
+        try:
+            self._read_frames(PcapReplay(capture_file, original_timing))
+        finally:
+            self._stop_workers()
+
+    def replay_archive(self, archive_file: str, start: Optional[float] = None,
+                       end: Optional[float] = None, action_id: Optional[int] = None) -> None:
+        """
+        Parse the messages of an archive again, only the blocks of the time range and of
+        the action ID are read.
+
+        :type archive_file: str
+        :param archive_file: The archive written by the sniffer.
+
+        :type start: Optional[float]
+        :param start: The first timestamp, None from the start of the archive.
+
+        :type end: Optional[float]
+        :param end: The last timestamp, None until the end of the archive.
+
+        :type action_id: Optional[int]
+        :param action_id: Only the messages of this ID, None for all of them.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        self._start_workers()
+        reader = ArchiveReader(archive_file)
+        try:
+            for record in reader.records(start, end, action_id):
+                profile = self.flows.get(record.flow).profile if record.flow is not None else None
+                self._parse_payload(record.data, record.direction, profile=profile,
+                                    timestamp=record.timestamp)
+        finally:
+            statistics = reader.get_statistics()
+            reader.close()
+            self._print_statistics('Replay', statistics)
+            self._stop_workers()
+
+    def _start_workers(self) -> None:
+        """
+        Start the settings watcher, the writer of the output and the parse pipeline.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        self.settings_watcher.start()
+        if self.writer is not None:
+            self.writer.start()
+        if self.pipeline is not None:
+            self.pipeline.start()
+        if self.shards is not None:
+            self.shards.start()
+
+    def _stop_workers(self) -> None:
+        """
+        Parse the payloads left in the pipeline, write the buffered output, close the
+        sinks and the archive, stop the settings watcher and print the statistics.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        if self.pipeline is not None:
+            self.pipeline.stop()
+        if self.shards is not None:
+            self.shards.stop()
+        if self.writer is not None:
+            self.writer.stop()
+        self._close_outputs()
+        self.settings_watcher.stop()
+        self._print_worker_statistics()
+
+    def _close_outputs(self) -> None:
+        """
+        Close the sinks and the archive.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        if self.sinks is not None:
+            self.sinks.close()
+        if self.archive is not None:
+            self.archive.close()
+
+    def _print_worker_statistics(self) -> None:
+        """
+        Print the statistics of the workers, the flows, the output and the parser.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        if self.pipeline is not None:
+            self._print_statistics('Pipeline', self.pipeline.get_statistics())
+        if self.shards is not None:
+            self._print_statistics('Shards', self.shards.get_statistics())
+            for name, value in self.shards.parser_statistics.items():
+                self.statistics[name] += value
+            if self.shards.reassembly_statistics is not None:
+                self._print_statistics('Reassembly', self.shards.reassembly_statistics)
+        if self.reassembler is not None:
+            self._print_statistics('Reassembly', self.reassembler.get_statistics())
+        self._print_statistics('Flows', self.flows.get_statistics())
+        if self.writer is not None:
+            self._print_statistics('Output', self.writer.get_statistics())
+        if self.sinks is not None:
+            self._print_statistics('Sinks', self.sinks.get_statistics())
+        if self.archive is not None:
+            self._print_statistics('Archive', self.archive.get_statistics())
+        self._print_statistics('Parser', self.statistics)
+
+    def _capture_socket(self, sniffer_filter: str) -> None:
+        """
+        Read the frames from a raw socket or its ring, their headers are decoded without scapy.
+
+        :type sniffer_filter: str
+        :param sniffer_filter: The BPF filter.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        self._read_frames(self._create_capture(sniffer_filter))
+
+    def _read_frames(self, capture: Union[RawSocketCapture, PcapReplay]) -> None:
+        """
+        Process all the frames of the capture, then print its statistics.
+
+        A file does not have a kernel filter, so its frames which are not of the Server are
+        skipped, and its messages keep the time when they were captured.
+
+        :type capture: Union[RawSocketCapture, PcapReplay]
+        :param capture: The raw socket, the ring or the file.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        try:
+            if isinstance(capture, PcapReplay):
+                for timestamp, frame in capture.frames():
+                    self._capture_frame(frame, True, timestamp)
+            else:
+                for frame in capture.frames():
+                    self._capture_frame(frame)
+        finally:
+            statistics = capture.get_statistics()
+            capture.close()
+            self._print_statistics('Capture', statistics)
 
-        sniff(
-            iface=self.interface,
-            filter=sniffer_filter,
-            count=0,
-            prn=self._sniff_data
+    @staticmethod
+    def _print_statistics(title: str, statistics: dict) -> None:
+        """
+        Print the counters with their names.
+
+        :type title: str
+        :param title: The title of the counters.
+
+        :type statistics: dict
+        :param statistics: The counters.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        print()
+        print(f'=== {title} Statistics ===')
+        for name, value in statistics.items():
+            print(f'{name.replace("_", " ").capitalize() + ":":<14} {value}')
+
+    def _create_capture(self, sniffer_filter: str) -> RawSocketCapture:
+        """
+        Create the raw socket capture or the ring capture with the Network settings.
+
+        :type sniffer_filter: str
+        :param sniffer_filter: The BPF filter.
+
+        :rtype: RawSocketCapture
+        :return: The capture.
+        """
+        if self.capture == 'socket':
+            return RawSocketCapture(self.interface, sniffer_filter)
+
+        network = self.settings_watcher.current.schema.settings.get('Network')
+        return RingCapture(
+            self.interface,
+            sniffer_filter,
+            block_size=int(network.get('block_size') or 1 << 20),
+            block_count=int(network.get('block_count') or 64),
+            block_timeout=int(network.get('block_timeout') or 100),
         )
 
+    def _capture_frame(self, frame: bytes, match_flow: bool = False,
+                       timestamp: Optional[float] = None) -> None:
+        """
+        Process one frame read from the raw socket or the file.
+
+        :type frame: bytes
+        :param frame: The Ethernet frame.
+
+        :type match_flow: bool
+        :param match_flow: Skip the frame if it is not of the Server.
+
+        :type timestamp: Optional[float]
+        :param timestamp: The capture time of the frame in a file, None for the current time.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        decoded = decode_frame(frame)
+        if decoded is None:
+            self.statistics['skipped'] += 1
+            return
+
+        flow, payload, sequence = decoded
+        state = self.flows.get(flow)
+        if match_flow and state.direction is None:
+            return
+
+        if payload:
+            self._process_segment(flow, sequence, payload, state, timestamp)
+
     def _sniff_data(self, packet: Ether) -> None:
         """
-        Process data provided by the Sniffer.
+        Process data provided by the Sniffer, the packets without IP, TCP or UDP layers are
+        counted and skipped.
 
         :type packet: Ether
         :param packet: The sniffed packet.
@@ -79,18 +436,186 @@ class NetworkSniffer:
         :return: Nothing.
         """
         ip_layer = packet.getlayer(IP)
-        if not ip_layer:
-            raise RuntimeError('Error: The IP layer not exists in this package.')
+        layer_type = packet.getlayer(TCP) or packet.getlayer(UDP)
+        if ip_layer is None or layer_type is None:
+            self.statistics['skipped'] += 1
+            return
+
+        raw_layer = packet.getlayer(Raw)
+        if raw_layer is not None:
+            protocol = 'tcp' if isinstance(layer_type, TCP) else 'udp'
+            flow = Flow(protocol, ip_layer.src, layer_type.sport, ip_layer.dst, layer_type.dport)
+            self._process_segment(flow, getattr(layer_type, 'seq', 0), raw_layer.load,
+                                  self.flows.get(flow))
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def _process_segment(self, flow: Flow, sequence: int, payload: bytes, state: FlowState,
+                         timestamp: Optional[float] = None) -> None:
+        """
+        Parse the payload now, or send it to the pipeline or to the workers.
+
+        The payload is copied, because the frames of the ring and the file are views which
+        are reused after this call. The packets of a flow which is not of a server are of
+        the node and they use the Game settings.
 
-        if not (packet.haslayer(TCP) or packet.haslayer(UDP)):
-            raise RuntimeError('Error: The protocol layer (TCP or UDP) not exists in this package.')
+        :type flow: Flow
+        :param flow: The addresses of the packet.
 
-        layer_type = packet.getlayer(UDP) if self.protocol == 'udp' else packet.getlayer(TCP)
+        :type sequence: int
+        :param sequence: The TCP sequence number of the payload.
 
-        if self.host_ip and self.host_port:
-            is_host = self.host_ip == ip_layer.src and self.host_port == layer_type.sport
+        :type payload: bytes
+        :param payload: The data of the packet.
+
+        :type state: FlowState
+        :param state: The classification of the flow.
+
+        :type timestamp: Optional[float]
+        :param timestamp: The capture time of the payload, None for the time of its parse.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        direction = state.direction or Direction.NODE
+        if self.shards is not None:
+            self.shards.update_settings(self.settings_watcher.current.schema.settings)
+            self.shards.put(flow, direction, state.profile, sequence, payload)
+        elif self.pipeline is None:
+            self._parse_segment(flow, direction, state.profile, sequence, payload,
+                                timestamp=timestamp)
         else:
-            is_host = self.host_ip == ip_layer.src or self.host_port == layer_type.sport
+            self.pipeline.put((flow, direction, state.profile, sequence, bytes(payload),
+                               timestamp))
+
+    def _parse_item(self, item: Union[tuple[Flow, Direction, Optional[str], int, bytes,
+                                            Optional[float]], Flow], render: bool) -> None:
+        """
+        Parse one item of the pipeline, or forget the TCP stream of a flow which was
+        forgotten by the capture.
+
+        :type item: Union[tuple[Flow, Direction, Optional[str], int, bytes, Optional[float]],
+            Flow]
+        :param item: The flow, who sent the packet, the profile of its server, the TCP
+            sequence number, the payload and its capture time, or only the forgotten flow.
 
-        if packet.haslayer(Raw):
-            Game(self.settings_path, is_host, packet).start()
+        :type render: bool
+        :param render: Print the messages.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        if isinstance(item, Flow):
+            self.reassembler.discard(item)
+            return
+
+        *segment, timestamp = item
+        self._parse_segment(*segment, render, timestamp)
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def _parse_segment(self, flow: Flow, direction: Direction, profile: Optional[str],
+                       sequence: int, payload: bytes, render: bool = True,
+                       timestamp: Optional[float] = None) -> None:
+        """
+        Parse the payload of one packet, the TCP segments are reassembled first, so only the
+        data in order of the stream is parsed.
+
+        :type flow: Flow
+        :param flow: The addresses of the packet.
+
+        :type direction: Direction
+        :param direction: Who sent the packet.
+
+        :type profile: Optional[str]
+        :param profile: The profile of the server, None for the Game settings.
+
+        :type sequence: int
+        :param sequence: The TCP sequence number of the payload.
+
+        :type payload: bytes
+        :param payload: The data of the packet.
+
+        :type render: bool
+        :param render: Print the messages.
+
+        :type timestamp: Optional[float]
+        :param timestamp: The capture time of the payload, None for the current time.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        if self.reassembler is None or flow.protocol != 'tcp':
+            self._parse_payload(payload, direction, render=render, profile=profile, source=flow,
+                                timestamp=timestamp)
+            return
+
+        data = self.reassembler.add(flow, sequence, payload)
+        if data:
+            self._parse_payload(data, direction, flow, render, profile, timestamp=timestamp)
+
+    def _get_renderer(self, settings: dict) -> Renderer:
+        """
+        Return the renderer of the current settings, it is built again when they change.
+
+        :type settings: dict
+        :param settings: The settings of the current parser.
+
+        :rtype: Renderer
+        :return: The renderer.
+        """
+        if settings is not self.renderer.settings:
+            self.renderer = Renderer.from_settings(settings)
+
+        return self.renderer
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def _parse_payload(self, payload: bytes, direction: Direction, flow: Optional[Flow] = None,
+                       render: bool = True, profile: Optional[str] = None,
+                       source: Optional[Flow] = None, timestamp: Optional[float] = None) -> None:
+        """
+        Parse the payload with the current parser, write the messages into the sinks and
+        the archive and print them.
+
+        :type payload: bytes
+        :param payload: The data of the packet.
+
+        :type direction: Direction
+        :param direction: Who sent the data, the host or the node.
+
+        :type flow: Optional[Flow]
+        :param flow: The TCP flow if the payload is the data of the stream, the incomplete
+            message at the end is kept until the next segments.
+
+        :type render: bool
+        :param render: Print the messages, otherwise they are only counted.
+
+        :type profile: Optional[str]
+        :param profile: The profile of the server, None for the Game settings.
+
+        :type source: Optional[Flow]
+        :param source: The flow of a payload which is not the data of a TCP stream, it is
+            archived with the messages.
+
+        :type timestamp: Optional[float]
+        :param timestamp: The time of the payload, e.g. the one of an archived message, None
+            for now.
+
+        :rtype: None
+        :return: Nothing.
+        """
+        parser = self.settings_watcher.current
+        if timestamp is None:
+            timestamp = time()
+        records = parser.parse(payload, direction, flow is not None, profile,
+                               self.sinks is not None, timestamp)
+        self.statistics['payloads'] += 1
+        self.statistics['messages'] += records.parsed
+        self.statistics['leftover'] += records.leftover - records.incomplete
+        if self.sinks is not None:
+            self.sinks.write(records, profile)
+        if self.archive is not None:
+            self.archive.write(payload, records, direction, flow or source, timestamp)
+        if render:
+            Console.print_records(records, payload, self.writer,
+                                  self._get_renderer(parser.schema.settings))
+        if records.incomplete:
+            self.reassembler.keep(flow, payload[len(payload) - records.incomplete:])
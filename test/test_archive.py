@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+Unit Test.
+"""
+from pytest import raises
+
+from src.sniparinject.core.archive import UNCUT, ArchiveReader, ArchiveWriter, ArchiveRecord
+from src.sniparinject.core.capture import Flow
+from src.sniparinject.core.direction import Direction
+from src.sniparinject.core.parser import ProtocolParser
+
+
+def build_archive(path: str, block_size: int = 16, close: bool = True) -> ArchiveWriter:
+    parser = ProtocolParser.from_settings({'Game': {
+        'host': {'actions': {0x0a: {'title': 'Heal', 'structs': [{'name': 'HP', 'type': 'unsigned char'}]}}},
+        'node': {'actions': {0x0b: {'title': 'Move'}}},
+    }})
+    flow = Flow('tcp', '12.218.12.2', 541, '10.0.0.7', 50000)
+    archive = ArchiveWriter(path, block_size)
+    payloads = [
+        (b'\x0a\x00\x07\x0a\x00\x08', Direction.HOST, flow, 10.0),
+        (b'\x0b\x00', Direction.NODE, None, 11.0),
+        (b'\x0a\x00\x09\x7f\x00\x01', Direction.HOST, flow, 12.0),
+        (b'\x0b\x00\x0a', Direction.NODE, None, 13.0),
+    ]
+    for payload, direction, payload_flow, timestamp in payloads:
+        archive.write(payload, parser.parse(payload, direction, payload_flow is not None), direction,
+                      payload_flow, timestamp)
+    if close:
+        archive.close()
+
+    return archive
+
+
+def read(reader: ArchiveReader, *args) -> list[tuple]:
+    return [(record.timestamp, record.action_id, bytes(record.data)) for record in reader.records(*args)]
+
+
+class TestArchiveWriter:
+    def test___init___exists(self, tmp_path):
+        # Arrange
+        (tmp_path / 'session.arc').write_bytes(b'')
+
+        # Act
+        with raises(RuntimeError) as error:
+            ArchiveWriter(str(tmp_path / 'session.arc'))
+
+        # Assert
+        assert error.value.args == (f'Error: The Archive ({tmp_path / "session.arc"}) already exists.',)
+
+    def test_from_settings(self, tmp_path):
+        # Act
+        archive = ArchiveWriter.from_settings({'path': str(tmp_path / 'session.arc'), 'block_size': 4096})
+        archive.close()
+        with raises(RuntimeError) as error:
+            ArchiveWriter.from_settings({'block_size': 4096})
+
+        # Assert
+        assert archive.block_size == 4096
+        assert error.value.args == ("Error: The Archive ({'block_size': 4096}) has no path.",)
+
+    def test_write(self, tmp_path):
+        # Act
+        archive = build_archive(str(tmp_path / 'session.arc'))
+
+        # Assert
+        assert archive.get_statistics() == {'messages': 7, 'uncut': 2, 'blocks': 4, 'bytes': 312, 'flows': 1}
+        assert (tmp_path / 'session.arc').read_bytes()[:8] == b'SNIPARC\x01'
+        assert (tmp_path / 'session.arc').read_bytes()[-16:] == (312).to_bytes(8, 'little') + b'SNIPIDX\x01'
+
+    def test_write_out_of_order(self, tmp_path):
+        # Arrange
+        parser = ProtocolParser.from_settings({'Game': {'node': {'actions': {0x0b: {'title': 'Move'}}}}})
+        archive = ArchiveWriter(str(tmp_path / 'session.arc'), 4096)
+
+        # Act
+        archive.write(b'\x0b\x00', parser.parse(b'\x0b\x00', Direction.NODE), Direction.NODE, None, 12.0)
+        archive.write(b'\x0b\x00', parser.parse(b'\x0b\x00', Direction.NODE), Direction.NODE, None, 10.0)
+        archive.write(b'\x0b\x00', parser.parse(b'\x0b\x00', Direction.NODE), Direction.NODE, None, 11.0)
+        archive.write(b'', parser.parse(b'', Direction.NODE), Direction.NODE, None, 5.0)
+        archive.close()
+        archive.close()
+
+        # Assert
+        reader = ArchiveReader(str(tmp_path / 'session.arc'))
+        reader.open()
+        reader.close()
+        assert (reader.blocks[0].earliest, reader.blocks[0].latest) == (10.0, 12.0)
+        assert archive.get_statistics()['messages'] == 3
+
+
+class TestArchiveReader:
+    def test_records(self, tmp_path):
+        # Arrange
+        build_archive(str(tmp_path / 'session.arc'))
+
+        # Act
+        reader = ArchiveReader(str(tmp_path / 'session.arc'))
+        records = list(reader.records())
+        record = records[0]._replace(data=bytes(records[0].data))
+        values = read(reader)
+        reader.close()
+
+        # Assert
+        assert record == ArchiveRecord(10.0, Direction.HOST, Flow('tcp', '12.218.12.2', 541, '10.0.0.7', 50000),
+                                       0x0a, b'\x0a\x00\x07')
+        assert records[2].flow is None
+        assert records[2].direction is Direction.NODE
+        assert values == [
+            (10.0, 0x0a, b'\x0a\x00\x07'),
+            (10.0, 0x0a, b'\x0a\x00\x08'),
+            (11.0, 0x0b, b'\x0b\x00'),
+            (12.0, 0x0a, b'\x0a\x00\x09'),
+            (12.0, UNCUT, b'\x7f\x00\x01'),
+            (13.0, 0x0b, b'\x0b\x00'),
+            (13.0, UNCUT, b'\x0a'),
+        ]
+        assert reader.get_statistics() == {'blocks': 8, 'messages': 14, 'recovered': False}
+        assert reader.map is None
+
+    def test_records_time_range_and_action(self, tmp_path):
+        # Arrange
+        build_archive(str(tmp_path / 'session.arc'))
+
+        # Act
+        reader = ArchiveReader(str(tmp_path / 'session.arc'))
+        time_range = read(reader, 11.0, 12.0)
+        blocks = reader.get_statistics()['blocks']
+        action = read(reader, None, None, 0x0b)
+        reader.close()
+
+        # Assert
+        assert time_range == [(11.0, 0x0b, b'\x0b\x00'), (12.0, 0x0a, b'\x0a\x00\x09'), (12.0, UNCUT, b'\x7f\x00\x01')]
+        assert blocks == 2
+        assert action == [(11.0, 0x0b, b'\x0b\x00'), (13.0, 0x0b, b'\x0b\x00')]
+        assert reader.find_blocks(12.5) == [3]
+        assert reader.find_blocks(end=10.5) == [0]
+        assert reader.find_blocks(action_id=0x0a) == [0, 2]
+        assert reader.find_blocks(11.5, 20.0, 0x0b) == [3]
+        assert reader.find_blocks(action_id=0x0c) == []
+
+    def test_records_without_index(self, tmp_path):
+        # Arrange
+        archive = build_archive(str(tmp_path / 'session.arc'), close=False)
+        archive._file.flush()
+        (tmp_path / 'crash.arc').write_bytes((tmp_path / 'session.arc').read_bytes()[:-5])
+        archive.close()
+
+        # Act
+        reader = ArchiveReader(str(tmp_path / 'crash.arc'))
+        action = read(reader, None, None, 0x0a)
+        reader.close()
+
+        # Assert
+        assert action == [(10.0, 0x0a, b'\x0a\x00\x07'), (10.0, 0x0a, b'\x0a\x00\x08'), (12.0, 0x0a, b'\x0a\x00\x09')]
+        assert reader.flows == {}
+        assert len(reader.blocks) == 3
+        assert reader.actions == {0x0a: [0, 2], 0x0b: [1], UNCUT: [2]}
+        assert reader.get_statistics()['recovered'] is True
+
+    def test_records_without_index_complete_blocks(self, tmp_path):
+        # Arrange
+        archive = build_archive(str(tmp_path / 'session.arc'), close=False)
+        archive._file.flush()
+        (tmp_path / 'crash.arc').write_bytes((tmp_path / 'session.arc').read_bytes())
+        archive.close()
+
+        # Act
+        reader = ArchiveReader(str(tmp_path / 'crash.arc'))
+        values = read(reader)
+        reader.close()
+
+        # Assert
+        assert len(reader.blocks) == 4
+        assert len(values) == 7
+        assert values[-1] == (13.0, UNCUT, b'\x0a')
+        assert reader.get_statistics()['recovered'] is True
+
+    def test_find_blocks_out_of_order(self, tmp_path):
+        # Arrange
+        parser = ProtocolParser.from_settings({'Game': {'node': {'actions': {0x0b: {'title': 'Move'}}}}})
+        archive = ArchiveWriter(str(tmp_path / 'session.arc'), 1)
+        for timestamp in (10.0, 5.0, 20.0):
+            archive.write(b'\x0b\x00', parser.parse(b'\x0b\x00', Direction.NODE), Direction.NODE, None, timestamp)
+        archive.close()
+
+        # Act
+        reader = ArchiveReader(str(tmp_path / 'session.arc'))
+        values = read(reader, 8.0)
+        reader.close()
+
+        # Assert
+        assert reader.find_blocks(8.0) == [0, 2]
+        assert values == [(10.0, 0x0b, b'\x0b\x00'), (20.0, 0x0b, b'\x0b\x00')]
+
+    def test_open_invalid(self, tmp_path):
+        # Arrange
+        (tmp_path / 'capture.pcap').write_bytes(b'\xd4\xc3\xb2\xa1' + bytes(20))
+
+        # Act
+        reader = ArchiveReader(str(tmp_path / 'capture.pcap'))
+        with raises(ValueError) as error:
+            reader.open()
+
+        # Assert
+        assert error.value.args == (f'Error: The file ({tmp_path / "capture.pcap"}) is not an archive.',)
+        assert reader.map is None
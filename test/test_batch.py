@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+Unit Test.
+"""
+from importlib import reload
+from sys import modules
+from unittest.mock import patch
+
+from pytest import importorskip
+
+from src.sniparinject.core import batch
+from src.sniparinject.core.batch import BatchColumn, BatchDecoder, get_columns, get_dtype
+from src.sniparinject.core.direction import Direction
+from src.sniparinject.core.parser import ProtocolParser
+
+
+class TestBatchDecoder:
+    settings = {'Game': {'host': {
+        'actions': {
+            0x78: {'title': 'NPC Info', 'structs': [
+                {'name': 'ID', 'type': 'unsigned int', 'output': {'type': 'hex'}},
+                {'type': 'chars', 'size': 2},
+                {'name': 'HP', 'type': 'short', 'size': 2},
+                {'name': 'HP', 'type': 'char'},
+            ]},
+            0x7d: {'title': 'Scenario change'},
+        },
+        'lengths': {0x90: 4},
+    }}}
+    payloads = [
+        b'\x78\x00\x0f\x00\x00\x00ab\x64\x00\xf6\xffz\x7d\x00\x90\x00\x00\x00',
+        memoryview(b'\x78\x00\x10\x00\x00\x00cd\xc8\x00\x0a\x00y\xff'),
+    ]
+
+    def test_get_columns(self):
+        # Arrange
+        parser = ProtocolParser.from_settings(self.settings)
+
+        # Act
+        columns = get_columns(parser.schema.host.actions[0x78])
+
+        # Assert
+        assert columns == [
+            BatchColumn('ID', 'I', 1, 0),
+            BatchColumn('field_1', 's', 2, 1),
+            BatchColumn('HP', 'h', 2, 2),
+            BatchColumn('HP_3', 'c', 1, 4),
+        ]
+
+    def test_get_dtype(self):
+        # Arrange
+        numpy = importorskip('numpy')
+        action = ProtocolParser.from_settings(self.settings).schema.host.actions[0x78]
+
+        # Act
+        dtype = get_dtype(get_columns(action))
+
+        # Assert
+        assert dtype == numpy.dtype([('ID', '<u4'), ('field_1', 'S2'), ('HP', '<i2', (2,)), ('HP_3', 'S1')])
+        assert dtype.itemsize == action.size
+
+    def test_decode_scalar(self):
+        # Arrange
+        batch_decoder = BatchDecoder(ProtocolParser.from_settings(self.settings), use_numpy=False)
+
+        # Act
+        columns = batch_decoder.decode(self.payloads, Direction.HOST)
+
+        # Assert
+        assert columns == {
+            0x78: {'ID': [15, 16], 'field_1': [b'ab', b'cd'], 'HP': [(100, -10), (200, 10)], 'HP_3': [b'z', b'y']},
+            0x7d: {},
+        }
+        assert batch_decoder.get_statistics() == {'messages': 3, 'unknown': 1, 'errors': 0, 'leftover': 1}
+
+    def test_decode_numpy(self):
+        # Arrange
+        importorskip('numpy')
+        batch_decoder = BatchDecoder(ProtocolParser.from_settings(self.settings))
+
+        # Act
+        columns = batch_decoder.decode(self.payloads, Direction.HOST)
+
+        # Assert
+        assert batch_decoder.use_numpy is True
+        assert columns[0x78]['ID'].tolist() == [15, 16]
+        assert columns[0x78]['field_1'].tolist() == [b'ab', b'cd']
+        assert columns[0x78]['HP'].tolist() == [[100, -10], [200, 10]]
+        assert columns[0x78]['HP_3'].tolist() == [b'z', b'y']
+        assert columns[0x7d] == {}
+        assert batch_decoder.get_statistics() == {'messages': 3, 'unknown': 1, 'errors': 0, 'leftover': 1}
+
+    def test___init___without_numpy(self):
+        # Act
+        try:
+            with patch.dict(modules, {'numpy': None}):
+                without_numpy = reload(batch)
+                batch_decoder = without_numpy.BatchDecoder(ProtocolParser.from_settings(self.settings))
+                columns = batch_decoder.decode(self.payloads[1:], Direction.HOST)
+                numpy = without_numpy.numpy
+        finally:
+            reload(batch)
+
+        # Assert
+        assert numpy is None
+        assert batch_decoder.use_numpy is False
+        assert columns[0x78]['ID'] == [16]
+
+    def test_decode_short_message(self):
+        # Arrange
+        settings = {'Game': {'node': {'actions': {0x85: {'title': 'Move', 'structs': [{'type': 'int'}]}},
+                                      'lengths': {0x85: 4}}}}
+        batch_decoder = BatchDecoder(ProtocolParser.from_settings(settings), use_numpy=False)
+
+        # Act
+        columns = batch_decoder.decode([b'\x85\x00\x01\x00'], Direction.NODE)
+
+        # Assert
+        assert columns == {}
+        assert batch_decoder.get_statistics()['errors'] == 1
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+Unit Test.
+"""
+import mmap
+import select
+import socket
+from struct import pack_into, unpack_from
+from unittest.mock import MagicMock, patch
+
+from pytest import raises
+from scapy.layers.inet import IP, TCP, UDP, ICMP
+from scapy.layers.inet6 import IPv6
+from scapy.layers.l2 import ARP, Dot1AD, Dot1Q, Ether
+from scapy.packet import Raw
+
+from src.sniparinject.core.capture import Flow, RawSocketCapture, RingCapture, decode_frame
+
+
+class TestDecodeFrame:
+    def test_decode_frame_tcp(self):
+        # Arrange
+        frame = bytes(Ether() / IP(src='10.0.0.1', dst='10.0.0.2') /
+                      TCP(sport=5122, dport=40000, seq=0xfedcba98, options=[('NOP', None)] * 4) /
+                      Raw(b'\x7d\x00'))
+
+        # Act
+        flow, payload, sequence = decode_frame(frame)
+
+        # Assert
+        assert flow == Flow('tcp', '10.0.0.1', 5122, '10.0.0.2', 40000)
+        assert isinstance(payload, memoryview)
+        assert payload == b'\x7d\x00'
+        assert sequence == 0xfedcba98
+
+    def test_decode_frame_udp_with_vlan_tags(self):
+        # Arrange
+        frame = bytes(Ether() / Dot1AD(vlan=5) / Dot1Q(vlan=7) / IP(src='10.0.0.2', dst='10.0.0.1') /
+                      UDP(sport=6666, dport=7777) / Raw(b'\x01\x02\x03'))
+
+        # Act
+        flow, payload, sequence = decode_frame(frame)
+
+        # Assert
+        assert flow == Flow('udp', '10.0.0.2', 6666, '10.0.0.1', 7777)
+        assert payload == b'\x01\x02\x03'
+        assert sequence == 0
+
+    def test_decode_frame_ip_options_and_padding(self):
+        # Arrange
+        frame = bytes(Ether() / IP(options=b'\x01\x01\x01\x00') / UDP(sport=1, dport=2) / Raw(b'\x09'))
+
+        # Act
+        flow, payload, _ = decode_frame(frame + b'\x00' * 20)
+
+        # Assert
+        assert flow.src_port == 1
+        assert payload == b'\x09'
+
+    def test_decode_frame_without_payload(self):
+        # Act
+        _, payload, _ = decode_frame(bytes(Ether() / IP() / TCP()))
+
+        # Assert
+        assert payload == b''
+
+    def test_decode_frame_not_supported(self):
+        # Arrange
+        frames = [
+            b'\x00' * 13,
+            bytes(Ether() / ARP()),
+            bytes(Ether() / Dot1Q())[:16],
+            bytes(Ether() / IPv6() / UDP()),
+            bytes(Ether() / IP())[:30],
+            bytes(Ether() / IP(version=6) / UDP()),
+            bytes(Ether() / IP(frag=10) / Raw(b'\x01\x02')),
+            bytes(Ether() / IP() / ICMP()),
+            bytes(Ether() / IP() / TCP())[:40],
+            bytes(Ether() / IP(proto=17) / Raw(b'\x01')),
+            bytes(Ether() / IP() / TCP(dataofs=15)),
+        ]
+
+        # Act
+        decoded = [decode_frame(frame) for frame in frames]
+
+        # Assert
+        assert decoded == [None] * len(frames)
+
+
+class TestRawSocketCapture:
+    def test___init__(self):
+        # Act
+        capture = RawSocketCapture('eth0', 'tcp and port 5122')
+
+        # Assert
+        assert capture.interface == 'eth0'
+        assert capture.bpf_filter == 'tcp and port 5122'
+        assert capture.buffer_size == 65535
+        assert capture.socket is None
+
+    @patch('src.sniparinject.core.capture.attach_filter')
+    @patch('src.sniparinject.core.capture.socket.socket')
+    def test_open(self, mock_socket: MagicMock, mock_attach_filter: MagicMock):
+        # Act
+        capture = RawSocketCapture('eth0', 'udp')
+        capture.open()
+
+        # Assert
+        mock_socket.assert_called_once_with(socket.AF_PACKET, socket.SOCK_RAW, socket.htons(3))
+        mock_socket.return_value.bind.assert_called_once_with(('eth0', 0))
+        mock_attach_filter.assert_called_once_with(mock_socket.return_value, 'udp', 'eth0')
+        assert capture.socket is mock_socket.return_value
+
+    @patch('src.sniparinject.core.capture.attach_filter')
+    @patch('src.sniparinject.core.capture.socket.socket')
+    def test_open_filter_error(self, mock_socket: MagicMock, mock_attach_filter: MagicMock):
+        # Arrange
+        mock_attach_filter.side_effect = OSError('libpcap is not available.')
+
+        # Act
+        capture = RawSocketCapture('eth0', 'udp')
+        with raises(OSError):
+            capture.open()
+
+        # Assert
+        mock_socket.return_value.close.assert_called_once_with()
+        assert capture.socket is None
+
+    @patch('src.sniparinject.core.capture.attach_filter')
+    @patch('src.sniparinject.core.capture.socket.socket')
+    def test_frames(self, mock_socket: MagicMock, _mock_attach_filter: MagicMock):
+        # Arrange
+        mock_socket.return_value.recvfrom.side_effect = [
+            (b'outgoing loopback', ('lo', 2048, 4, 772, b'')),
+            (b'incoming loopback', ('lo', 2048, 0, 772, b'')),
+            (b'outgoing ethernet', ('eth0', 2048, 4, 1, b'')),
+        ]
+
+        # Act
+        capture = RawSocketCapture('lo', 'udp')
+        capture.open()
+        frames = capture.frames()
+        received = [next(frames), next(frames)]
+        capture.close()
+        capture.close()
+
+        # Assert
+        assert received == [b'incoming loopback', b'outgoing ethernet']
+        mock_socket.return_value.recvfrom.assert_called_with(65535)
+        mock_socket.return_value.close.assert_called_once_with()
+        assert capture.socket is None
+
+    @patch('src.sniparinject.core.capture.attach_filter')
+    @patch('src.sniparinject.core.capture.socket.socket')
+    def test_frames_open_the_socket(self, mock_socket: MagicMock, mock_attach_filter: MagicMock):
+        # Arrange
+        mock_socket.return_value.recvfrom.return_value = (b'frame', ('eth0', 2048, 0, 1, b''))
+
+        # Act
+        capture = RawSocketCapture('eth0', 'tcp')
+        frame = next(capture.frames())
+
+        # Assert
+        assert frame == b'frame'
+        mock_attach_filter.assert_called_once_with(mock_socket.return_value, 'tcp', 'eth0')
+
+    @patch('src.sniparinject.core.capture.attach_filter')
+    @patch('src.sniparinject.core.capture.socket.socket')
+    def test_get_statistics(self, mock_socket: MagicMock, _mock_attach_filter: MagicMock):
+        # Arrange
+        mock_socket.return_value.getsockopt.side_effect = [b'\x05\x00\x00\x00\x01\x00\x00\x00',
+                                                          b'\x02\x00\x00\x00\x00\x00\x00\x00']
+
+        # Act
+        capture = RawSocketCapture('eth0', 'tcp')
+        closed_statistics = capture.get_statistics()
+        capture.open()
+        capture.get_statistics()
+        statistics = capture.get_statistics()
+
+        # Assert
+        assert closed_statistics == {'packets': 0, 'drops': 0}
+        assert statistics == {'packets': 7, 'drops': 1}
+        mock_socket.return_value.getsockopt.assert_called_with(263, 6, 8)
+
+
+new_map = mmap.mmap
+
+
+def write_frame(ring, offset: int, next_offset: int, frame: bytes, hatype: int = 1,
+                pkttype: int = 0) -> None:
+    pack_into('=IIIIIIHH', ring, offset, next_offset, 0, 0, len(frame), len(frame), 1, 82, 96)
+    pack_into('=HB', ring, offset + 56, hatype, pkttype)
+    ring[offset + 82:offset + 82 + len(frame)] = frame
+
+
+class TestRingCapture:
+    block_size = 4096
+
+    def test___init__(self):
+        # Act
+        capture = RingCapture('eth0', 'udp')
+
+        # Assert
+        assert capture.block_size == 1 << 20
+        assert capture.block_count == 64
+        assert capture.block_timeout == 100
+        assert capture.statistics == {'packets': 0, 'drops': 0, 'freeze_queue': 0}
+        assert capture.ring is None
+
+    @patch('src.sniparinject.core.capture.mmap.mmap')
+    @patch('src.sniparinject.core.capture.attach_filter')
+    @patch('src.sniparinject.core.capture.socket.socket')
+    def test_open(self, mock_socket: MagicMock, _mock_attach_filter: MagicMock, mock_mmap: MagicMock):
+        # Act
+        capture = RingCapture('eth0', 'udp', block_size=8192, block_count=4, block_timeout=10)
+        capture.open()
+
+        # Assert
+        mock_socket.return_value.setsockopt.assert_any_call(263, 10, 2)
+        mock_socket.return_value.setsockopt.assert_any_call(
+            263, 5, b''.join(value.to_bytes(4, 'little') for value in (8192, 4, 2048, 16, 10, 0, 0)))
+        mock_mmap.assert_called_once_with(mock_socket.return_value.fileno.return_value, 8192 * 4,
+                                          mmap.MAP_SHARED, mmap.PROT_READ | mmap.PROT_WRITE)
+        assert capture.ring is mock_mmap.return_value
+
+    @patch('src.sniparinject.core.capture.select.poll')
+    @patch('src.sniparinject.core.capture.mmap.mmap')
+    @patch('src.sniparinject.core.capture.attach_filter')
+    @patch('src.sniparinject.core.capture.socket.socket')
+    def test_frames(self, mock_socket: MagicMock, _mock_attach_filter: MagicMock,
+                    mock_mmap: MagicMock, mock_poll: MagicMock):
+        # Arrange
+        ring = new_map(-1, self.block_size * 2)
+        mock_mmap.return_value = ring
+        pack_into('=III', ring, 8, 1, 3, 48)
+        write_frame(ring, 48, 160, b'first frame')
+        write_frame(ring, 208, 160, b'outgoing loopback', hatype=772, pkttype=4)
+        write_frame(ring, 368, 0, b'incoming loopback', hatype=772, pkttype=0)
+
+        def fill_second_block(_timeout=None):
+            pack_into('=III', ring, self.block_size + 8, 1, 1, 48)
+            write_frame(ring, self.block_size + 48, 0, b'second block')
+
+        mock_poll.return_value.poll.side_effect = fill_second_block
+
+        # Act
+        capture = RingCapture('lo', 'udp', block_size=self.block_size, block_count=2)
+        frames = capture.frames()
+        received = [bytes(next(frames)) for _ in range(3)]
+        frames.close()
+        first_block_status = unpack_from('=I', ring, 8)
+        capture.close()
+
+        # Assert
+        assert received == [b'first frame', b'incoming loopback', b'second block']
+        mock_poll.return_value.register.assert_called_once_with(
+            mock_socket.return_value.fileno.return_value, select.POLLIN | select.POLLERR)
+        mock_poll.return_value.poll.assert_called_once_with()
+        assert first_block_status == (0,)
+        assert ring.closed is True
+        assert capture.ring is None
+        assert capture.socket is None
+
+    @patch('src.sniparinject.core.capture.select.poll')
+    @patch('src.sniparinject.core.capture.mmap.mmap')
+    @patch('src.sniparinject.core.capture.attach_filter')
+    @patch('src.sniparinject.core.capture.socket.socket')
+    def test_frames_wrap_around(self, _mock_socket: MagicMock, _mock_attach_filter: MagicMock,
+                                mock_mmap: MagicMock, mock_poll: MagicMock):
+        # Arrange
+        ring = new_map(-1, self.block_size)
+        mock_mmap.return_value = ring
+        pack_into('=III', ring, 8, 1, 1, 48)
+        write_frame(ring, 48, 0, b'only block')
+
+        def refill_block(_timeout=None):
+            pack_into('=III', ring, 8, 1, 1, 48)
+            write_frame(ring, 48, 0, b'same block')
+
+        mock_poll.return_value.poll.side_effect = refill_block
+
+        # Act
+        capture = RingCapture('eth0', 'udp', block_size=self.block_size, block_count=1)
+        capture.open()
+        frames = capture.frames()
+        first = bytes(next(frames))
+        second = next(frames)
+        capture.close()
+
+        # Assert
+        assert first == b'only block'
+        assert second == b'same block'
+        assert ring.closed is False
+        assert capture.ring is None
+
+    @patch('src.sniparinject.core.capture.attach_filter')
+    @patch('src.sniparinject.core.capture.socket.socket')
+    def test_get_statistics(self, mock_socket: MagicMock, _mock_attach_filter: MagicMock):
+        # Arrange
+        mock_socket.return_value.getsockopt.return_value = b'\x09\x00\x00\x00\x02\x00\x00\x00\x01\x00\x00\x00'
+
+        # Act
+        capture = RingCapture('eth0', 'udp')
+        closed_statistics = capture.get_statistics()
+        with patch('src.sniparinject.core.capture.mmap.mmap'):
+            capture.open()
+        statistics = capture.get_statistics()
+
+        # Assert
+        assert closed_statistics == {'packets': 0, 'drops': 0, 'freeze_queue': 0}
+        assert statistics == {'packets': 9, 'drops': 2, 'freeze_queue': 1}
+        mock_socket.return_value.getsockopt.assert_called_once_with(263, 6, 12)
+
+    def test_close_not_opened(self):
+        # Arrange
+        capture = RingCapture('eth0', 'udp')
+
+        # Act
+        capture.close()
+
+        # Assert
+        assert capture.ring is None
+        assert capture.socket is None
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+Unit Test.
+"""
+from unittest.mock import MagicMock, patch
+
+from src.sniparinject.core.console import Console
+from src.sniparinject.core.direction import Direction
+from src.sniparinject.core.parser import Record
+from src.sniparinject.core.schema import compile_action
+
+
+class TestConsole:
+    style_error = '\x1b[00;37;41m'
+    style_end = '\x1b[0m'
+
+    @patch('builtins.print')
+    @patch('src.sniparinject.core.console.Renderer.render_message')
+    def test_print_records(self, mock_render_message: MagicMock, mock_print: MagicMock):
+        # Arrange
+        action = compile_action(1, {'title': 'Ji'})
+        records = [
+            Record(Direction.NODE, 1, action, (), True),
+            Record(Direction.NODE, 1, action, (), False),
+            Record(Direction.NODE, 0xa, data=b'\x12\x34'),
+        ]
+        mock_render_message.return_value = 'Ji'
+
+        # Act
+        Console.print_records(records, b'\x01\x00\x01\x00\x0a\x00\x12\x34')
+
+        # Assert
+        mock_render_message.assert_called_once_with(records[0])
+        mock_print.assert_called_once_with('Ji\nNODE | ID 0xa | 1234\n     |-> 010001000a001234')
+
+    @patch('builtins.print')
+    def test_print_records_unknown_action_display_false(self, mock_print: MagicMock):
+        # Act
+        Console.print_records([Record(Direction.HOST, 0xa, display=False)], b'\x0a\x00')
+
+        # Assert
+        mock_print.assert_not_called()
+
+    @patch('builtins.print')
+    def test_print_records_error(self, mock_print: MagicMock):
+        # Arrange
+        record = Record(Direction.HOST, None, display=False, data=b'\x0a',
+                        error=('S.o.S', 'Phone cabin'))
+
+        # Act
+        Console.print_records([record], b'\x01\x00\x0a')
+
+        # Assert
+        mock_print.assert_called_once_with(f'{self.style_error}Error HOST: S.o.S{self.style_end}\n'
+                                           f'{self.style_error}Location: Phone cabin{self.style_end}\n'
+                                           f'{self.style_error}Data: 01000a{self.style_end}\n'
+                                           f'{self.style_error}Data Error: 0a{self.style_end}\n')
+
+    @patch('builtins.print')
+    def test_print_records_writer(self, mock_print: MagicMock):
+        # Arrange
+        writer = MagicMock()
+
+        # Act
+        Console.print_records([Record(Direction.HOST, 0xa, data=b'')], b'\x0a\x00', writer)
+        Console.print_records([Record(Direction.HOST, 0xa, display=False)], b'\x0a\x00', writer)
+
+        # Assert
+        writer.write.assert_called_once_with(['HOST | ID 0xa | ', '     |-> 0a00'])
+        mock_print.assert_not_called()
+
+    @patch('builtins.print')
+    def test_print_error(self, mock_print: MagicMock):
+        # Act
+        Console.print_error(Direction.NODE, 'ShellBoom!', 'Class Game', b'\x01\x02', b'')
+
+        # Assert
+        mock_print.assert_called_once_with(f'{self.style_error}Error NODE: ShellBoom!{self.style_end}\n'
+                                           f'{self.style_error}Location: Class Game{self.style_end}\n'
+                                           f'{self.style_error}Data: 0102{self.style_end}\n'
+                                           f'{self.style_error}Data Error: {self.style_end}\n')
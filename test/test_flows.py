@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+Unit Test.
+"""
+from unittest.mock import patch, MagicMock
+
+from src.sniparinject.core.capture import Flow
+from src.sniparinject.core.direction import Direction
+from src.sniparinject.core.flows import FlowTable
+
+
+class TestFlowTable:
+    flows = [Flow('tcp', '10.0.0.2', 5122, f'10.0.0.{index}', 40000) for index in range(3, 6)]
+
+    def test_get(self):
+        # Arrange
+        classify = MagicMock(return_value=(Direction.HOST, 'map'))
+        flow_table = FlowTable(classify)
+
+        # Act
+        first = flow_table.get(self.flows[0])
+        second = flow_table.get(self.flows[0])
+
+        # Assert
+        assert first is second
+        assert (first.direction, first.profile) == (Direction.HOST, 'map')
+        classify.assert_called_once_with(self.flows[0])
+        assert flow_table.get_statistics() == {'hits': 1, 'misses': 1, 'evicted': 0, 'expired': 0,
+                                               'flows': 1}
+
+    def test_get_not_server(self):
+        # Arrange
+        flow_table = FlowTable(lambda flow: None)
+
+        # Act
+        state = flow_table.get(self.flows[0])
+
+        # Assert
+        assert (state.direction, state.profile) == (None, None)
+
+    def test_get_evict_least_recently_used(self):
+        # Arrange
+        on_evict = MagicMock()
+        flow_table = FlowTable(lambda flow: (Direction.NODE, None), max_flows=2, on_evict=on_evict)
+
+        # Act
+        flow_table.get(self.flows[0])
+        flow_table.get(self.flows[1])
+        flow_table.get(self.flows[0])
+        flow_table.get(self.flows[2])
+
+        # Assert
+        assert list(flow_table.flows) == [self.flows[0], self.flows[2]]
+        on_evict.assert_called_once_with(self.flows[1])
+        assert flow_table.get_statistics()['evicted'] == 1
+
+    def test_get_evict_without_callback(self):
+        # Arrange
+        flow_table = FlowTable(lambda flow: (Direction.NODE, None), max_flows=1)
+
+        # Act
+        flow_table.get(self.flows[0])
+        flow_table.get(self.flows[1])
+
+        # Assert
+        assert list(flow_table.flows) == [self.flows[1]]
+        assert flow_table.get_statistics()['evicted'] == 1
+
+    @patch('src.sniparinject.core.flows.monotonic')
+    def test_get_expire_idle_flows(self, mock_monotonic: MagicMock):
+        # Arrange
+        on_evict = MagicMock()
+        classify = MagicMock(return_value=(Direction.NODE, None))
+        flow_table = FlowTable(classify, idle_timeout=10, on_evict=on_evict)
+        mock_monotonic.side_effect = [0, 5, 16, 20]
+
+        # Act
+        flow_table.get(self.flows[0])
+        flow_table.get(self.flows[1])
+        flow_table.get(self.flows[2])
+        flow_table.get(self.flows[1])
+
+        # Assert
+        assert list(flow_table.flows) == [self.flows[2], self.flows[1]]
+        assert [args[0][0] for args in on_evict.call_args_list] == [self.flows[0], self.flows[1]]
+        assert classify.call_count == 4
+        assert flow_table.get_statistics() == {'hits': 0, 'misses': 4, 'evicted': 0, 'expired': 2,
+                                               'flows': 2}
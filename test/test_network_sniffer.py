@@ -3,13 +3,17 @@
 """
 Unit Test.
 """
-from unittest.mock import patch, MagicMock
+from unittest.mock import ANY, patch, MagicMock, call
 
 from pytest import raises
 from scapy.layers.inet import TCP, IP, UDP
-from scapy.layers.l2 import Ether
+from scapy.layers.l2 import ARP, Ether
 from scapy.packet import Raw
+from scapy.utils import wrpcap
 
+from src.sniparinject.core.capture import Flow
+from src.sniparinject.core.direction import Direction
+from src.sniparinject.core.text_style import TextStyle
 from src.sniparinject.network_sniffer import NetworkSniffer
 
 
@@ -17,7 +21,7 @@ class TestNetworkSniffer:
     style_error = '\x1b[00;37;41m'
     style_end = '\x1b[0m'
 
-    @patch('src.sniparinject.network_sniffer.Settings.get_dictionary')
+    @patch('src.sniparinject.core.settings.Settings.get_dictionary')
     def test___init__(self, mock_settings: MagicMock):
         # Arrange
         expected_settings_path = 'my-non-settings.yml'
@@ -26,6 +30,7 @@ class TestNetworkSniffer:
         expected_port = '1234567890'
         mock_settings.return_value = {
             'Network': {'interface': expected_interface},
+            'Game': {'node': {}},
             'Server': {'ip': expected_ip, 'port': expected_port},
         }
 
@@ -37,8 +42,45 @@ class TestNetworkSniffer:
         assert network_sniffer.interface == expected_interface
         assert network_sniffer.host_ip == expected_ip
         assert network_sniffer.host_port == expected_port
+        assert network_sniffer.capture == 'scapy'
 
-    @patch('src.sniparinject.network_sniffer.Settings.get_dictionary')
+    @patch('src.sniparinject.core.settings.Settings.get_dictionary')
+    def test___init___capture_invalid(self, mock_settings: MagicMock):
+        # Arrange
+        mock_settings.return_value = {
+            'Network': {'interface': 'Iceberg', 'capture': 'Pigeon'},
+            'Game': {'node': {}},
+            'Server': {'port': 5122},
+        }
+
+        # Act
+        with raises(RuntimeError) as error:
+            NetworkSniffer('')
+
+        # Assert
+        assert error.value.args == ('Error: The capture (Pigeon) is not scapy, socket or ring.',)
+
+    @patch('src.sniparinject.core.settings.Settings.get_dictionary')
+    def test___init___settings_watcher(self, mock_settings: MagicMock):
+        # Arrange
+        expected_check_interval = 0.25
+        mock_settings.return_value = {
+            'Settings': {'check_interval': expected_check_interval, 'inotify': False},
+            'Network': {'interface': 'Iceberg'},
+            'Game': {'node': {}},
+            'Server': {'port': 5122},
+        }
+
+        # Act
+        network_sniffer = NetworkSniffer('my-cached-settings.yml')
+
+        # Assert
+        assert network_sniffer.settings_watcher.config_file == 'my-cached-settings.yml'
+        assert network_sniffer.settings_watcher.current.schema.settings == mock_settings.return_value
+        assert network_sniffer.settings_watcher.poll_interval == expected_check_interval
+        assert network_sniffer.settings_watcher.use_inotify is False
+
+    @patch('src.sniparinject.core.settings.Settings.get_dictionary')
     @patch('src.sniparinject.network_sniffer.sniff')
     def test_start(self, mock_sniff: MagicMock, mock_settings: MagicMock):
         # Arrange
@@ -48,6 +90,7 @@ class TestNetworkSniffer:
         expected_port = '9990666'
         mock_settings.return_value = {
             'Network': {'interface': expected_interface},
+            'Game': {'node': {}},
             'Server': {
                 'protocol': expected_protocol,
                 'ip': expected_ip,
@@ -67,7 +110,7 @@ class TestNetworkSniffer:
             prn=network_sniffer._sniff_data
         )
 
-    @patch('src.sniparinject.network_sniffer.Settings.get_dictionary')
+    @patch('src.sniparinject.core.settings.Settings.get_dictionary')
     @patch('src.sniparinject.network_sniffer.sniff')
     def test_start_only_protocol(self, mock_sniff: MagicMock, mock_settings: MagicMock):
         # Arrange
@@ -75,6 +118,7 @@ class TestNetworkSniffer:
         expected_protocol = 'hologram'
         mock_settings.return_value = {
             'Network': {'interface': expected_interface},
+            'Game': {'node': {}},
             'Server': {
                 'protocol': expected_protocol,
             },
@@ -92,7 +136,7 @@ class TestNetworkSniffer:
             prn=network_sniffer._sniff_data
         )
 
-    @patch('src.sniparinject.network_sniffer.Settings.get_dictionary')
+    @patch('src.sniparinject.core.settings.Settings.get_dictionary')
     @patch('src.sniparinject.network_sniffer.sniff')
     def test_start_only_host_port(self, mock_sniff: MagicMock, mock_settings: MagicMock):
         # Arrange
@@ -101,6 +145,7 @@ class TestNetworkSniffer:
         expected_host_port = '68543'
         mock_settings.return_value = {
             'Network': {'interface': expected_interface},
+            'Game': {'node': {}},
             'Server': {
                 'protocol': expected_protocol,
                 'port': expected_host_port,
@@ -119,7 +164,7 @@ class TestNetworkSniffer:
             prn=network_sniffer._sniff_data
         )
 
-    @patch('src.sniparinject.network_sniffer.Settings.get_dictionary')
+    @patch('src.sniparinject.core.settings.Settings.get_dictionary')
     @patch('src.sniparinject.network_sniffer.sniff')
     def test_start_only_host_ip(self, mock_sniff: MagicMock, mock_settings: MagicMock):
         # Arrange
@@ -128,6 +173,7 @@ class TestNetworkSniffer:
         expected_host_ip = '1285.15.248.1'
         mock_settings.return_value = {
             'Network': {'interface': expected_interface},
+            'Game': {'node': {}},
             'Server': {
                 'protocol': expected_protocol,
                 'ip': expected_host_ip,
@@ -146,12 +192,13 @@ class TestNetworkSniffer:
             prn=network_sniffer._sniff_data
         )
 
-    @patch('src.sniparinject.network_sniffer.Settings.get_dictionary')
-    @patch('src.sniparinject.network_sniffer.Game')
-    def test__sniff_data_request_without_data(self, mock_game: MagicMock, mock_settings: MagicMock):
+    @patch('src.sniparinject.core.settings.Settings.get_dictionary')
+    @patch('src.sniparinject.network_sniffer.NetworkSniffer._parse_payload')
+    def test__sniff_data_request_without_data(self, mock__parse_payload: MagicMock, mock_settings: MagicMock):
         # Arrange
         mock_settings.return_value = {
             'Network': {'interface': ''},
+            'Game': {'node': {}},
             'Server': {'ip': '123', 'port': 5},
         }
 
@@ -160,37 +207,36 @@ class TestNetworkSniffer:
         network_sniffer._sniff_data(TCP() / IP())
 
         # Assert
-        mock_game.assert_not_called()
+        mock__parse_payload.assert_not_called()
 
-    @patch('src.sniparinject.network_sniffer.Settings.get_dictionary')
-    @patch('src.sniparinject.network_sniffer.Game')
-    def test__sniff_data_request_without_tcp(self, mock_game: MagicMock, mock_settings: MagicMock):
+    @patch('src.sniparinject.core.settings.Settings.get_dictionary')
+    @patch('src.sniparinject.network_sniffer.NetworkSniffer._parse_payload')
+    def test__sniff_data_request_without_tcp(self, mock__parse_payload: MagicMock, mock_settings: MagicMock):
         # Arrange
-        expected_message = 'Error: The protocol layer (TCP or UDP) not exists in this package.'
         mock_settings.return_value = {
             'Network': {'interface': ''},
+            'Game': {'node': {}},
             'Server': {'ip': '987', 'port': 98},
         }
 
         # Act
         network_sniffer = NetworkSniffer('')
-        with raises(RuntimeError) as error:
-            network_sniffer._sniff_data(IP() / Raw(b'\xff'))
+        network_sniffer._sniff_data(IP() / Raw(b'\xff'))
 
         # Assert
-        assert error.type == RuntimeError
-        assert error.value.args == (expected_message,)
-        mock_game.assert_not_called()
+        assert network_sniffer.statistics['skipped'] == 1
+        mock__parse_payload.assert_not_called()
 
-    @patch('src.sniparinject.network_sniffer.Settings.get_dictionary')
-    @patch('src.sniparinject.network_sniffer.Game')
-    def test__sniff_data_class_game(self, mock_game: MagicMock, mock_settings: MagicMock):
+    @patch('src.sniparinject.core.settings.Settings.get_dictionary')
+    @patch('src.sniparinject.network_sniffer.NetworkSniffer._parse_payload')
+    def test__sniff_data_class_game(self, mock__parse_payload: MagicMock, mock_settings: MagicMock):
         # Arrange
         expected_settings_path = 'hello-from-the-other-side.yml'
         expected_host = False
         expected_packet: Ether = TCP() / IP() / Raw(b'\x00\x01\x02')
         mock_settings.return_value = {
             'Network': {'interface': ''},
+            'Game': {'node': {}},
             'Server': {'ip': 'goliath.com', 'port': 987},
         }
 
@@ -199,12 +245,12 @@ class TestNetworkSniffer:
         network_sniffer._sniff_data(expected_packet)
 
         # Assert
-        mock_game.assert_called_once_with(
-            expected_settings_path, expected_host, expected_packet)
+        mock__parse_payload.assert_called_once_with(b'\x00\x01\x02', Direction.from_host(expected_host), ANY, True, None,
+                                                    timestamp=None)
 
-    @patch('src.sniparinject.network_sniffer.Settings.get_dictionary')
-    @patch('src.sniparinject.network_sniffer.Game')
-    def test__sniff_data_host_true_when_only_has_port(self, mock_game: MagicMock, mock_settings: MagicMock):
+    @patch('src.sniparinject.core.settings.Settings.get_dictionary')
+    @patch('src.sniparinject.network_sniffer.NetworkSniffer._parse_payload')
+    def test__sniff_data_host_true_when_only_has_port(self, mock__parse_payload: MagicMock, mock_settings: MagicMock):
         # Arrange
         expected_settings_path = 'hello-from-the-other-side.yml'
         expected_host = True
@@ -212,6 +258,7 @@ class TestNetworkSniffer:
         expected_packet: Ether = TCP(sport=host_port) / IP() / Raw(b'\x00\x01\x02')
         mock_settings.return_value = {
             'Network': {'interface': ''},
+            'Game': {'node': {}},
             'Server': {'port': host_port},
         }
 
@@ -220,12 +267,12 @@ class TestNetworkSniffer:
         network_sniffer._sniff_data(expected_packet)
 
         # Assert
-        mock_game.assert_called_once_with(
-            expected_settings_path, expected_host, expected_packet)
+        mock__parse_payload.assert_called_once_with(b'\x00\x01\x02', Direction.from_host(expected_host), ANY, True, None,
+                                                    timestamp=None)
 
-    @patch('src.sniparinject.network_sniffer.Settings.get_dictionary')
-    @patch('src.sniparinject.network_sniffer.Game')
-    def test__sniff_data_host_true_when_only_has_ip(self, mock_game: MagicMock, mock_settings: MagicMock):
+    @patch('src.sniparinject.core.settings.Settings.get_dictionary')
+    @patch('src.sniparinject.network_sniffer.NetworkSniffer._parse_payload')
+    def test__sniff_data_host_true_when_only_has_ip(self, mock__parse_payload: MagicMock, mock_settings: MagicMock):
         # Arrange
         expected_settings_path = 'hello-from-the-other-side.yml'
         expected_host = True
@@ -233,6 +280,7 @@ class TestNetworkSniffer:
         expected_packet: Ether = TCP() / IP(src=host_ip) / Raw(b'\x00\x01\x02')
         mock_settings.return_value = {
             'Network': {'interface': ''},
+            'Game': {'node': {}},
             'Server': {'ip': host_ip},
         }
 
@@ -241,12 +289,12 @@ class TestNetworkSniffer:
         network_sniffer._sniff_data(expected_packet)
 
         # Assert
-        mock_game.assert_called_once_with(
-            expected_settings_path, expected_host, expected_packet)
+        mock__parse_payload.assert_called_once_with(b'\x00\x01\x02', Direction.from_host(expected_host), ANY, True, None,
+                                                    timestamp=None)
 
-    @patch('src.sniparinject.network_sniffer.Settings.get_dictionary')
-    @patch('src.sniparinject.network_sniffer.Game')
-    def test__sniff_data_with_udp_protocol(self, mock_game: MagicMock, mock_settings: MagicMock):
+    @patch('src.sniparinject.core.settings.Settings.get_dictionary')
+    @patch('src.sniparinject.network_sniffer.NetworkSniffer._parse_payload')
+    def test__sniff_data_with_udp_protocol(self, mock__parse_payload: MagicMock, mock_settings: MagicMock):
         # Arrange
         expected_settings_path = 'hello-from-the-other-side.yml'
         expected_host = True
@@ -255,6 +303,7 @@ class TestNetworkSniffer:
         expected_packet: Ether = UDP(sport=host_port) / IP(src=host_ip) / Raw(b'\x00\x01\x02')
         mock_settings.return_value = {
             'Network': {'interface': ''},
+            'Game': {'node': {}},
             'Server': {'protocol': 'udp', 'ip': host_ip, 'port': host_port},
         }
 
@@ -263,26 +312,624 @@ class TestNetworkSniffer:
         network_sniffer._sniff_data(expected_packet)
 
         # Assert
-        mock_game.assert_called_once_with(
-            expected_settings_path, expected_host, expected_packet)
+        mock__parse_payload.assert_called_once_with(b'\x00\x01\x02', Direction.from_host(expected_host), render=True, profile=None,
+                                                    source=Flow('udp', host_ip, host_port, '127.0.0.1', 53), timestamp=None)
 
-    @patch('src.sniparinject.network_sniffer.Settings.get_dictionary')
-    @patch('src.sniparinject.network_sniffer.Game')
-    def test__sniff_data_raise_exception_ip_layer_missing(self, mock_game: MagicMock, mock_settings: MagicMock):
+    @patch('src.sniparinject.core.settings.Settings.get_dictionary')
+    @patch('src.sniparinject.network_sniffer.NetworkSniffer._parse_payload')
+    def test__sniff_data_skip_ip_layer_missing(self, mock__parse_payload: MagicMock, mock_settings: MagicMock):
         # Arrange
-        expected_message = 'Error: The IP layer not exists in this package.'
         expected_packet: Ether = UDP() / Raw()
         mock_settings.return_value = {
             'Network': {'interface': ''},
+            'Game': {'node': {}},
             'Server': {'protocol': 'udp', 'ip': '12.218.12.2', 'port': 541},
         }
 
         # Act
         network_sniffer = NetworkSniffer('')
+        network_sniffer._sniff_data(expected_packet)
+
+        # Assert
+        assert network_sniffer.statistics['skipped'] == 1
+        mock__parse_payload.assert_not_called()
+
+    @patch('builtins.print')
+    @patch('src.sniparinject.core.settings.Settings.get_dictionary')
+    def test__parse_payload(self, mock_settings: MagicMock, mock_print: MagicMock):
+        # Arrange
+        mock_settings.return_value = {
+            'Network': {'interface': ''},
+            'Game': {'node': {'actions': {0x7d: {'title': 'Scenario change'}}}},
+            'Server': {'ip': '12.218.12.2', 'port': 541},
+        }
+
+        # Act
+        network_sniffer = NetworkSniffer('')
+        mock_print.reset_mock()
+        network_sniffer._parse_payload(b'\x7d\x00\x0a\x00\xff', Direction.NODE)
+
+        # Assert
+        mock_print.assert_called_once_with('\x1b[00;93;100m--> Scenario change\x1b[0m\x1b[00;30;100m |\x1b[0m\n'
+                                           'NODE | ID 0xa | ff\n'
+                                           '     |-> 7d000a00ff')
+
+    @patch('src.sniparinject.core.settings.Settings.get_dictionary')
+    @patch('src.sniparinject.network_sniffer.sniff')
+    @patch('src.sniparinject.network_sniffer.RawSocketCapture')
+    def test_start_capture_socket(self, mock_capture: MagicMock, mock_sniff: MagicMock,
+                                  mock_settings: MagicMock):
+        # Arrange
+        mock_settings.return_value = {
+            'Network': {'interface': 'eth7', 'capture': 'Socket'},
+            'Game': {'node': {}},
+            'Server': {'ip': '12.218.12.2', 'port': 541},
+        }
+        frame = bytes(Ether() / IP(src='12.218.12.2') / TCP(sport=541) / Raw(b'\x0a\x00'))
+        mock_capture.return_value.frames.return_value = [frame]
+
+        # Act
+        network_sniffer = NetworkSniffer('')
+        with patch.object(network_sniffer, '_parse_payload') as mock__parse_payload:
+            network_sniffer.start()
+
+        # Assert
+        mock_sniff.assert_not_called()
+        mock_capture.assert_called_once_with('eth7', 'tcp and host 12.218.12.2 and port 541')
+        mock_capture.return_value.close.assert_called_once_with()
+        mock__parse_payload.assert_called_once_with(b'\x0a\x00', Direction.HOST, ANY, True, None,
+                                                    timestamp=None)
+
+    @patch('src.sniparinject.core.settings.Settings.get_dictionary')
+    @patch('src.sniparinject.network_sniffer.RingCapture')
+    @patch('builtins.print')
+    def test_start_capture_ring(self, mock_print: MagicMock, mock_capture: MagicMock,
+                                mock_settings: MagicMock):
+        # Arrange
+        mock_settings.return_value = {
+            'Network': {'interface': 'eth7', 'capture': 'ring', 'block_size': 4096, 'block_count': 8},
+            'Game': {'node': {}},
+            'Server': {'protocol': 'udp', 'port': 541},
+        }
+        mock_capture.return_value.frames.return_value = []
+        mock_capture.return_value.get_statistics.return_value = {'packets': 9, 'drops': 2, 'freeze_queue': 1}
+
+        # Act
+        network_sniffer = NetworkSniffer('')
+        network_sniffer.start()
+
+        # Assert
+        mock_capture.assert_called_once_with('eth7', 'udp and port 541', block_size=4096, block_count=8,
+                                             block_timeout=100)
+        mock_capture.return_value.close.assert_called_once_with()
+        mock_print.assert_has_calls([
+            call('=== Capture Statistics ==='),
+            call('Packets:       9'),
+            call('Drops:         2'),
+            call('Freeze queue:  1'),
+        ])
+
+    @patch('src.sniparinject.core.settings.Settings.get_dictionary')
+    @patch('builtins.print')
+    def test_replay(self, mock_print: MagicMock, mock_settings: MagicMock, tmp_path):
+        # Arrange
+        mock_settings.return_value = {
+            'Network': {'interface': 'eth7'},
+            'Game': {'node': {}},
+            'Server': {'ip': '12.218.12.2', 'port': 541},
+        }
+        wrpcap(str(tmp_path / 'capture.pcap'), [
+            Ether() / IP(src='12.218.12.2') / TCP(sport=541) / Raw(b'\x0a\x00'),
+            Ether() / IP(dst='12.218.12.2') / TCP(dport=541) / Raw(b'\x0b\x00'),
+            Ether() / IP(src='12.218.12.2') / UDP(sport=541) / Raw(b'\x0c\x00'),
+            Ether() / IP(src='12.218.12.3') / TCP(sport=541) / Raw(b'\x0d\x00'),
+            Ether() / IP(src='12.218.12.2') / TCP(sport=542) / Raw(b'\x0e\x00'),
+        ])
+
+        # Act
+        network_sniffer = NetworkSniffer('')
+        with patch.object(network_sniffer, '_parse_payload') as mock__parse_payload:
+            network_sniffer.replay(str(tmp_path / 'capture.pcap'))
+
+        # Assert
+        assert mock__parse_payload.call_args_list == [
+            call(b'\x0a\x00', Direction.HOST, ANY, True, None, timestamp=ANY),
+            call(b'\x0b\x00', Direction.NODE, ANY, True, None, timestamp=ANY),
+        ]
+        mock_print.assert_has_calls([
+            call('=== Capture Statistics ==='),
+            call('Packets:       5'),
+            call('Skipped:       0'),
+        ])
+
+    @patch('src.sniparinject.core.settings.Settings.get_dictionary')
+    def test___init___reassembly(self, mock_settings: MagicMock):
+        # Arrange
+        settings = [
+            {'Server': {'port': 541, 'max_stream_bytes': 4096}},
+            {'Server': {'port': 541, 'reassembly': False}},
+            {'Server': {'port': 541, 'protocol': 'udp'}},
+        ]
+        mock_settings.side_effect = [dict(server, Network={'interface': ''}, Game={'node': {}})
+                                     for server in settings]
+
+        # Act
+        reassemblers = [NetworkSniffer('').reassembler for _ in settings]
+
+        # Assert
+        assert reassemblers[0].max_bytes == 4096
+        assert reassemblers[1:] == [None, None]
+
+    @patch('src.sniparinject.core.settings.Settings.get_dictionary')
+    @patch('builtins.print')
+    def test__capture_frame_reassembly(self, mock_print: MagicMock, mock_settings: MagicMock):
+        # Arrange
+        mock_settings.return_value = {
+            'Network': {'interface': ''},
+            'Game': {'node': {'actions': {0x0a: {'title': 'Heal', 'structs': [{'type': 'unsigned short'}]}}}},
+            'Server': {'port': 541},
+        }
+        segments = [(100, b'\x0a\x00\x01'), (105, b'\x00\x03\x00'), (103, b'\x00\x0a'), (108, b'\x0a')]
+
+        # Act
+        network_sniffer = NetworkSniffer('')
+        mock_print.reset_mock()
+        for sequence, payload in segments:
+            network_sniffer._capture_frame(bytes(Ether() / IP() / TCP(dport=541, seq=sequence) / Raw(payload)))
+
+        # Assert
+        mock_print.assert_called_once_with(
+            '\x1b[00;93;100m--> Heal\x1b[0m\x1b[00;30;100m |\x1b[0m\x1b[00;96;100m 1\x1b[0m\x1b[00;30;100m |\x1b[0m\n'
+            '\x1b[00;93;100m--> Heal\x1b[0m\x1b[00;30;100m |\x1b[0m\x1b[00;96;100m 3\x1b[0m\x1b[00;30;100m |\x1b[0m')
+        assert network_sniffer.reassembler.streams[
+            Flow('tcp', '127.0.0.1', 20, '127.0.0.1', 541)].tail == b'\x0a'
+
+    @patch('src.sniparinject.core.settings.Settings.get_dictionary')
+    @patch('src.sniparinject.network_sniffer.NetworkSniffer._parse_payload')
+    def test__capture_frame(self, mock__parse_payload: MagicMock, mock_settings: MagicMock):
+        # Arrange
+        mock_settings.return_value = {
+            'Network': {'interface': ''},
+            'Game': {'node': {}},
+            'Server': {'protocol': 'udp', 'port': 541},
+        }
+
+        # Act
+        network_sniffer = NetworkSniffer('')
+        network_sniffer._capture_frame(bytes(Ether() / IP() / UDP(sport=80) / Raw(b'\x01\x00')))
+        network_sniffer._capture_frame(bytes(Ether() / IP() / UDP(sport=541)))
+        network_sniffer._capture_frame(bytes(Ether() / ARP()))
+
+        # Assert
+        mock__parse_payload.assert_called_once_with(b'\x01\x00', Direction.NODE, render=True, profile=None,
+                                                    source=Flow('udp', '127.0.0.1', 80, '127.0.0.1', 53), timestamp=None)
+
+    @patch('src.sniparinject.core.settings.Settings.get_dictionary')
+    def test___init___pipeline(self, mock_settings: MagicMock):
+        # Arrange
+        settings = [
+            {'Pipeline': {'queue_size': 16, 'overflow': 'Drop_Render'}},
+            {'Pipeline': {'queue_size': 16}},
+            {},
+        ]
+        mock_settings.side_effect = [dict(pipeline, Network={'interface': ''}, Game={'node': {}},
+                                          Server={'port': 541}) for pipeline in settings]
+
+        # Act
+        pipelines = [NetworkSniffer('').pipeline for _ in settings]
+
+        # Assert
+        assert (pipelines[0].queue_size, pipelines[0].overflow) == (16, 'drop_render')
+        assert pipelines[1].overflow == 'block'
+        assert pipelines[2] is None
+
+    @patch('src.sniparinject.core.settings.Settings.get_dictionary')
+    @patch('src.sniparinject.network_sniffer.NetworkSniffer._parse_payload')
+    def test__capture_frame_flows(self, mock__parse_payload: MagicMock, mock_settings: MagicMock):
+        # Arrange
+        mock_settings.return_value = {
+            'Network': {'interface': ''},
+            'Game': {'node': {}},
+            'Server': {'ip': '12.218.12.2', 'port': 541, 'max_flows': 1, 'flow_timeout': 60},
+        }
+        frames = [
+            bytes(Ether() / IP(src='12.218.12.2', dst='10.0.0.1') / TCP(sport=541, seq=1) / Raw(b'\x0a')),
+            bytes(Ether() / IP(src='12.218.12.2', dst='10.0.0.1') / TCP(sport=541, seq=2) / Raw(b'\x0b')),
+            bytes(Ether() / IP(src='12.218.12.3', dst='10.0.0.1') / TCP(sport=541, seq=1) / Raw(b'\x0c')),
+            bytes(Ether() / ARP()),
+        ]
+
+        # Act
+        network_sniffer = NetworkSniffer('')
+        for frame in frames:
+            network_sniffer._capture_frame(frame, match_flow=True)
+
+        # Assert
+        assert (network_sniffer.flows.max_flows, network_sniffer.flows.idle_timeout) == (1, 60)
+        assert network_sniffer.flows.get_statistics() == {'hits': 1, 'misses': 2, 'evicted': 1,
+                                                          'expired': 0, 'flows': 1}
+        assert network_sniffer.reassembler.streams == {}
+        assert network_sniffer.statistics['skipped'] == 1
+        assert mock__parse_payload.call_count == 2
+
+    @patch('src.sniparinject.core.settings.Settings.get_dictionary')
+    @patch('src.sniparinject.network_sniffer.NetworkSniffer._parse_payload')
+    def test__capture_frame_flows_pipeline(self, mock__parse_payload: MagicMock, mock_settings: MagicMock):
+        # Arrange
+        mock_settings.return_value = {
+            'Network': {'interface': ''},
+            'Game': {'node': {}},
+            'Server': {'port': 541, 'max_flows': 1},
+            'Pipeline': {'queue_size': 16},
+        }
+        first = Flow('tcp', '12.218.12.2', 541, '10.0.0.1', 80)
+        second = Flow('tcp', '12.218.12.3', 541, '10.0.0.1', 80)
+        frames = [
+            bytes(Ether() / IP(src='12.218.12.2', dst='10.0.0.1') / TCP(sport=541, seq=1) / Raw(b'\x0a')),
+            bytes(Ether() / IP(src='12.218.12.3', dst='10.0.0.1') / TCP(sport=541, seq=1) / Raw(b'\x0c')),
+        ]
+
+        # Act
+        network_sniffer = NetworkSniffer('')
+        for frame in frames:
+            network_sniffer._capture_frame(frame)
+        items = list(network_sniffer.pipeline._items)
+        network_sniffer.pipeline.start()
+        network_sniffer.pipeline.stop()
+
+        # Assert
+        assert items == [(first, Direction.HOST, None, 1, b'\x0a', None), first,
+                         (second, Direction.HOST, None, 1, b'\x0c', None)]
+        assert list(network_sniffer.reassembler.streams) == [second]
+        assert mock__parse_payload.call_count == 2
+
+    @patch('src.sniparinject.core.settings.Settings.get_dictionary')
+    @patch('builtins.print')
+    def test_replay_pipeline(self, mock_print: MagicMock, mock_settings: MagicMock, tmp_path):
+        # Arrange
+        mock_settings.return_value = {
+            'Network': {'interface': 'eth7'},
+            'Game': {'node': {}, 'host': {'actions': {0x0a: {'title': 'Heal'}}}},
+            'Server': {'ip': '12.218.12.2', 'port': 541},
+            'Pipeline': {'queue_size': 1},
+        }
+        wrpcap(str(tmp_path / 'capture.pcap'), [
+            Ether() / IP(src='12.218.12.2') / TCP(sport=541, seq=1) / Raw(b'\x0a\x00'),
+            Ether() / IP(src='12.218.12.2') / TCP(sport=541, seq=3) / Raw(b'\x0a\x00\x0b'),
+        ])
+
+        # Act
+        network_sniffer = NetworkSniffer('')
+        network_sniffer.replay(str(tmp_path / 'capture.pcap'))
+
+        # Assert
+        assert not network_sniffer.pipeline.is_alive()
+        assert network_sniffer.pipeline.get_statistics()['processed'] == 2
+        assert network_sniffer.statistics == {'payloads': 2, 'messages': 2, 'leftover': 0, 'skipped': 0}
+        assert call('=== Pipeline Statistics ===') in mock_print.call_args_list
+        mock_print.assert_has_calls([
+            call('=== Parser Statistics ==='),
+            call('Payloads:      2'),
+            call('Messages:      2'),
+            call('Leftover:      0'),
+        ])
+
+    @patch('src.sniparinject.core.settings.Settings.get_dictionary')
+    @patch('builtins.print')
+    def test_replay_output(self, mock_print: MagicMock, mock_settings: MagicMock, tmp_path):
+        # Arrange
+        mock_settings.return_value = {
+            'Network': {'interface': 'eth7'},
+            'Game': {'node': {}, 'host': {'actions': {0x0a: {'title': 'Heal'}}}},
+            'Server': {'ip': '12.218.12.2', 'port': 541},
+            'Output': {'buffer_lines': 2, 'flush_interval': 10},
+        }
+        wrpcap(str(tmp_path / 'capture.pcap'), [
+            Ether() / IP(src='12.218.12.2') / TCP(sport=541, seq=1) / Raw(b'\x0a\x00'),
+            Ether() / IP(src='12.218.12.2') / TCP(sport=541, seq=3) / Raw(b'\x0a\x00\x0a\x00'),
+        ])
+        stream = MagicMock()
+
+        # Act
+        network_sniffer = NetworkSniffer('')
+        network_sniffer.writer.stream = stream
+        network_sniffer.replay(str(tmp_path / 'capture.pcap'))
+
+        # Assert
+        heal = '\x1b[00;93;44m<-- Heal\x1b[0m\x1b[00;30;44m |\x1b[0m'
+        assert not network_sniffer.writer.is_alive()
+        assert ''.join(args[0] for args, _ in stream.write.call_args_list) == f'{heal}\n' * 3
+        assert network_sniffer.writer.max_lines == 65536
+        assert network_sniffer.writer.get_statistics()['lines'] == 3
+        mock_print.assert_has_calls([
+            call('=== Output Statistics ==='),
+            call('Lines:         3'),
+        ])
+        assert call(heal) not in mock_print.call_args_list
+
+    @patch('src.sniparinject.core.settings.Settings.get_dictionary')
+    @patch('builtins.print')
+    def test_replay_sinks(self, mock_print: MagicMock, mock_settings: MagicMock, tmp_path):
+        # Arrange
+        mock_settings.return_value = {
+            'Network': {'interface': 'eth7'},
+            'Game': {'node': {}, 'host': {'actions': {0x0a: {'title': 'Heal', 'display_message': False,
+                                                             'structs': [{'name': 'HP', 'type': 'unsigned char'}]}}}},
+            'Server': {'ip': '12.218.12.2', 'port': 541},
+            'Sinks': [{'path': str(tmp_path / 'messages.jsonl'), 'direction': 'host'}],
+        }
+        packets = [
+            Ether() / IP(src='12.218.12.2') / TCP(sport=541, seq=1) / Raw(b'\x0a\x00\x07'),
+            Ether() / IP(dst='12.218.12.2') / TCP(dport=541, seq=1) / Raw(b'\x0a\x00\x07'),
+        ]
+        for packet, timestamp in zip(packets, (1700000000.25, 1700000001.5)):
+            packet.time = timestamp
+        wrpcap(str(tmp_path / 'capture.pcap'), packets)
+
+        # Act
+        network_sniffer = NetworkSniffer('')
+        network_sniffer.replay(str(tmp_path / 'capture.pcap'))
+
+        # Assert
+        assert (tmp_path / 'messages.jsonl').read_text().splitlines() == [
+            '{"timestamp":1700000000.25,"direction":"host","action_id":10,"action":"Heal","fields":{"HP":7}}',
+        ]
+        mock_print.assert_has_calls([
+            call('=== Sinks Statistics ==='),
+            call('Sinks:         1'),
+            call('Records:       1'),
+        ])
+
+    @patch('src.sniparinject.core.settings.Settings.get_dictionary')
+    def test___init___sinks_workers(self, mock_settings: MagicMock, tmp_path):
+        # Arrange
+        mock_settings.return_value = {
+            'Network': {'interface': ''},
+            'Game': {'node': {}},
+            'Server': {'port': 541},
+            'Pipeline': {'workers': 2},
+            'Sinks': [{'path': str(tmp_path / 'messages.jsonl')}],
+        }
+
+        # Act
+        with raises(RuntimeError) as error:
+            NetworkSniffer('')
+
+        # Assert
+        assert error.value.args == ('Error: The Sinks are not written by the Pipeline workers.',)
+
+    @patch('src.sniparinject.core.settings.Settings.get_dictionary')
+    @patch('builtins.print')
+    def test__get_renderer(self, mock_print: MagicMock, mock_settings: MagicMock):
+        # Arrange
+        mock_settings.return_value = {
+            'Network': {'interface': ''},
+            'Game': {'node': {'actions': {0x0a: {'title': 'Heal'}}}},
+            'Server': {'protocol': 'udp', 'port': 541},
+            'Style': {'color': False},
+        }
+        settings = dict(mock_settings.return_value, Style={'node': 40})
+
+        # Act
+        network_sniffer = NetworkSniffer('')
+        renderer = network_sniffer.renderer
+        mock_print.reset_mock()
+        network_sniffer._parse_payload(b'\x0a\x00', Direction.NODE)
+        same_renderer = network_sniffer._get_renderer(network_sniffer.settings_watcher.current.schema.settings)
+        new_renderer = network_sniffer._get_renderer(settings)
+
+        # Assert
+        mock_print.assert_called_once_with('--> Heal |')
+        assert same_renderer is renderer
+        assert new_renderer is not renderer
+        assert new_renderer.color is True
+        assert new_renderer.prefixes[Direction.NODE, TextStyle.TITLE] == '\x1b[00;93;40m'
+
+    @patch('src.sniparinject.core.settings.Settings.get_dictionary')
+    @patch('src.sniparinject.network_sniffer.Console.print_records')
+    def test__parse_item_without_render(self, mock_print_records: MagicMock, mock_settings: MagicMock):
+        # Arrange
+        mock_settings.return_value = {
+            'Network': {'interface': ''},
+            'Game': {'node': {}, 'host': {'actions': {0x0a: {'title': 'Heal'}}}},
+            'Server': {'protocol': 'udp', 'port': 541},
+        }
+        flow = Flow('udp', '127.0.0.1', 541, '127.0.0.1', 80)
+
+        # Act
+        network_sniffer = NetworkSniffer('')
+        network_sniffer._parse_item((flow, Direction.HOST, None, 0, b'\x0a\x00', None), False)
+        network_sniffer._parse_item((flow, Direction.HOST, None, 0, b'\x0a\x00\x0a\x00', None), True)
+
+        # Assert
+        mock_print_records.assert_called_once_with(ANY, b'\x0a\x00\x0a\x00', None, network_sniffer.renderer)
+        assert network_sniffer.statistics == {'payloads': 2, 'messages': 3, 'leftover': 0, 'skipped': 0}
+
+    @patch('src.sniparinject.core.settings.Settings.get_dictionary')
+    @patch('builtins.print')
+    def test_replay_shards(self, mock_print: MagicMock, mock_settings: MagicMock, tmp_path):
+        # Arrange
+        mock_settings.return_value = {
+            'Network': {'interface': 'eth7'},
+            'Game': {'node': {}, 'host': {'actions': {0x0a: {'title': 'Heal'}}}},
+            'Server': {'ip': '12.218.12.2', 'port': 541, 'max_stream_bytes': 4096},
+            'Pipeline': {'workers': 2, 'queue_size': 1},
+        }
+        wrpcap(str(tmp_path / 'capture.pcap'), [
+            Ether() / IP(src='12.218.12.2', dst='10.0.0.1') / TCP(sport=541, seq=1) / Raw(b'\x0a\x00'),
+            Ether() / IP(src='12.218.12.2', dst='10.0.0.2') / TCP(sport=541, seq=1) / Raw(b'\x0a\x00\x0b'),
+        ])
+
+        # Act
+        network_sniffer = NetworkSniffer('')
+        network_sniffer.replay(str(tmp_path / 'capture.pcap'))
+
+        # Assert
+        assert network_sniffer.reassembler is None
+        assert network_sniffer.shards.workers == 2
+        assert network_sniffer.flows.on_evict == network_sniffer.shards.discard
+        assert network_sniffer.statistics == {'payloads': 2, 'messages': 2, 'leftover': 0, 'skipped': 0}
+        mock_print.assert_has_calls([
+            call('=== Shards Statistics ==='),
+            call('Workers:       2'),
+            call('Enqueued:      2'),
+            call('Lost:          0'),
+            call('In place:      2'),
+            call('Queued:        0'),
+            call(),
+            call('=== Reassembly Statistics ==='),
+            call('Segments:      2'),
+        ])
+
+    @patch('src.sniparinject.core.settings.Settings.get_dictionary')
+    @patch('builtins.print')
+    def test_replay_shards_udp(self, mock_print: MagicMock, mock_settings: MagicMock, tmp_path):
+        # Arrange
+        mock_settings.return_value = {
+            'Network': {'interface': 'eth7'},
+            'Game': {'node': {}, 'host': {'actions': {0x0a: {'title': 'Heal'}}}},
+            'Server': {'ip': '12.218.12.2', 'port': 541, 'protocol': 'udp'},
+            'Pipeline': {'workers': 1},
+        }
+        wrpcap(str(tmp_path / 'capture.pcap'), [
+            Ether() / IP(src='12.218.12.2', dst='10.0.0.1') / UDP(sport=541) / Raw(b'\x0a\x00'),
+        ])
+
+        # Act
+        network_sniffer = NetworkSniffer('')
+        network_sniffer.replay(str(tmp_path / 'capture.pcap'))
+
+        # Assert
+        assert network_sniffer.shards.reassembly_statistics is None
+        assert network_sniffer.flows.on_evict is None
+        assert network_sniffer.statistics == {'payloads': 1, 'messages': 1, 'leftover': 0, 'skipped': 0}
+        mock_print.assert_has_calls([call('=== Shards Statistics ==='), call('Workers:       1')])
+        assert call('=== Reassembly Statistics ===') not in mock_print.call_args_list
+
+    @patch('src.sniparinject.core.settings.Settings.get_dictionary')
+    @patch('src.sniparinject.network_sniffer.sniff')
+    def test_start_endpoints(self, mock_sniff: MagicMock, mock_settings: MagicMock):
+        # Arrange
+        mock_settings.return_value = {
+            'Network': {'interface': 'eth7'},
+            'Game': {'node': {}},
+            'Profiles': {'login': {}},
+            'Server': {'endpoints': [
+                {'name': 'login', 'ip': '12.218.12.2', 'port': 6900, 'profile': 'login'},
+                {'name': 'map', 'protocol': 'udp', 'port': 5122},
+            ]},
+        }
+
+        # Act
+        network_sniffer = NetworkSniffer('')
+        network_sniffer.start()
+
+        # Assert
+        assert network_sniffer.reassembler is not None
+        mock_sniff.assert_called_once_with(
+            iface='eth7',
+            filter='(tcp and host 12.218.12.2 and port 6900) or (udp and port 5122)',
+            count=0,
+            prn=network_sniffer._sniff_data
+        )
+
+    @patch('src.sniparinject.core.settings.Settings.get_dictionary')
+    @patch('builtins.print')
+    def test_replay_endpoints(self, mock_print: MagicMock, mock_settings: MagicMock, tmp_path):
+        # Arrange
+        mock_settings.return_value = {
+            'Network': {'interface': 'eth7'},
+            'Game': {'node': {}, 'host': {'actions': {0x0a: {'title': 'Heal'}}}},
+            'Profiles': {'login': {'host': {'actions': {0x0a: {'title': 'Login'}}}}},
+            'Server': {'endpoints': [
+                {'name': 'login', 'ip': '12.218.12.2', 'port': 6900, 'profile': 'login'},
+                {'name': 'map', 'protocol': 'udp', 'port': 5122},
+            ]},
+        }
+        wrpcap(str(tmp_path / 'capture.pcap'), [
+            Ether() / IP(src='12.218.12.2') / TCP(sport=6900, seq=1) / Raw(b'\x0a\x00'),
+            Ether() / IP(src='12.218.12.3') / UDP(sport=5122) / Raw(b'\x0a\x00'),
+            Ether() / IP(src='12.218.12.3') / TCP(sport=5122) / Raw(b'\x0a\x00'),
+        ])
+
+        # Act
+        network_sniffer = NetworkSniffer('')
+        network_sniffer.replay(str(tmp_path / 'capture.pcap'))
+
+        # Assert
+        mock_print.assert_has_calls([
+            call('Server:    login tcp 12.218.12.2:6900 login'),
+            call('Server:    map udp *:5122 Game'),
+        ])
+        mock_print.assert_has_calls([
+            call('\x1b[00;93;44m<-- Login\x1b[0m\x1b[00;30;44m |\x1b[0m'),
+            call('\x1b[00;93;44m<-- Heal\x1b[0m\x1b[00;30;44m |\x1b[0m'),
+        ])
+        assert network_sniffer.statistics['payloads'] == 2
+
+    @patch('src.sniparinject.core.settings.Settings.get_dictionary')
+    @patch('builtins.print')
+    def test_replay_archive(self, mock_print: MagicMock, mock_settings: MagicMock, tmp_path):
+        # Arrange
+        settings = {
+            'Network': {'interface': 'eth7'},
+            'Game': {'node': {}, 'host': {'actions': {0x0a: {'title': 'Heal',
+                                                             'structs': [{'name': 'HP', 'type': 'unsigned char'}]}}}},
+            'Server': {'ip': '12.218.12.2', 'port': 541},
+        }
+        mock_settings.side_effect = [dict(settings, Archive={'path': str(tmp_path / 'session.arc')}),
+                                     dict(settings, Sinks=[{'path': str(tmp_path / 'messages.jsonl')}])]
+        packets = [
+            Ether() / IP(src='12.218.12.2') / TCP(sport=541, seq=1) / Raw(b'\x0a\x00\x07\x0a\x00'),
+            Ether() / IP(dst='12.218.12.2') / TCP(dport=541, seq=1) / Raw(b'\x0b\x00'),
+            Ether() / IP(src='12.218.12.2') / TCP(sport=541, seq=6) / Raw(b'\x08'),
+        ]
+        for packet, timestamp in zip(packets, (1700000000.5, 1700000001.5, 1700000002.5)):
+            packet.time = timestamp
+        wrpcap(str(tmp_path / 'capture.pcap'), packets)
+        NetworkSniffer('').replay(str(tmp_path / 'capture.pcap'))
+
+        # Act
+        network_sniffer = NetworkSniffer('')
+        with patch.object(network_sniffer, '_parse_payload',
+                          wraps=network_sniffer._parse_payload) as mock__parse_payload:
+            network_sniffer.replay_archive(str(tmp_path / 'session.arc'), action_id=0x0a)
+
+        # Assert
+        assert mock__parse_payload.call_args_list == [
+            call(b'\x0a\x00\x07', Direction.HOST, profile=None, timestamp=1700000000.5),
+            call(b'\x0a\x00\x08', Direction.HOST, profile=None, timestamp=1700000002.5),
+        ]
+        assert (tmp_path / 'messages.jsonl').read_text().splitlines() == [
+            '{"timestamp":1700000000.5,"direction":"host","action_id":10,"action":"Heal","fields":{"HP":7}}',
+            '{"timestamp":1700000002.5,"direction":"host","action_id":10,"action":"Heal","fields":{"HP":8}}',
+        ]
+        mock_print.assert_has_calls([
+            call('=== Archive Statistics ==='),
+            call('Messages:      3'),
+            call('Uncut:         1'),
+        ])
+        mock_print.assert_has_calls([
+            call('=== Replay Statistics ==='),
+            call('Blocks:        1'),
+            call('Messages:      2'),
+        ])
+
+    @patch('src.sniparinject.core.settings.Settings.get_dictionary')
+    def test___init___archive_workers(self, mock_settings: MagicMock, tmp_path):
+        # Arrange
+        mock_settings.return_value = {
+            'Network': {'interface': ''},
+            'Game': {'node': {}},
+            'Server': {'port': 541},
+            'Pipeline': {'workers': 2},
+            'Archive': {'path': str(tmp_path / 'session.arc')},
+        }
+
+        # Act
         with raises(RuntimeError) as error:
-            network_sniffer._sniff_data(expected_packet)
+            NetworkSniffer('')
 
         # Assert
-        assert error.type == RuntimeError
-        assert error.value.args == (expected_message,)
-        mock_game.assert_not_called()
+        assert error.value.args == ('Error: The Archive is not written by the Pipeline workers.',)
+        assert (tmp_path / 'session.arc').read_bytes()[-8:] == b'SNIPIDX\x01'
@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+Unit Test.
+"""
+from struct import Struct
+
+from src.sniparinject.core.direction import Direction
+from src.sniparinject.core.parser import ParseResult, ProtocolParser, Record
+from src.sniparinject.core.schema import CompiledAction, CompiledField, CompiledRequest, \
+    ProtocolSchema
+
+
+class TestProtocolParser:
+    settings = {'Game': {
+        'host': {'actions': {0x7d: {'title': 'Scenario change'}}},
+        'node': {'actions': {
+            0x7d: {'title': 'Scenario change', 'display_message': False},
+            0x85: {'title': 'Player move to', 'structs': [
+                {'name': 'X', 'type': 'unsigned short'},
+                {'type': 'unsigned char', 'reference': {1: 'Up'}},
+            ]},
+        }},
+    }}
+
+    def test___init__(self):
+        # Arrange
+        schema = ProtocolSchema.from_settings(self.settings)
+
+        # Act
+        parser = ProtocolParser(schema)
+
+        # Assert
+        assert parser.schema is schema
+        assert parser.max_messages == 0
+        assert parser.max_bytes == 0
+
+    def test_from_settings(self):
+        # Act
+        parser = ProtocolParser.from_settings(self.settings)
+
+        # Assert
+        assert parser.schema.settings is self.settings
+        assert list(parser.schema.node.actions) == [0x7d, 0x85]
+
+    def test_parse(self):
+        # Arrange
+        parser = ProtocolParser.from_settings(self.settings)
+        payload = b'\x85\x00\x0c\x00\x01\x7d\x00'
+
+        # Act
+        records = parser.parse(payload, Direction.NODE)
+
+        # Assert
+        assert [record.action_id for record in records] == [0x85, 0x7d]
+        assert records[0].action is parser.schema.node.actions[0x85]
+        assert records[0].values == (12, 'Up')
+        assert records[0].display is True
+        assert records[1].display is False
+        assert records[1].error is None
+        assert isinstance(records, ParseResult)
+        assert records.parsed == 2
+        assert records.leftover == 0
+        assert records.spans == [(0x85, 0, 5), (0x7d, 5, 7)]
+
+    def test_parse_host(self):
+        # Arrange
+        parser = ProtocolParser.from_settings(self.settings)
+
+        # Act
+        records = parser.parse(b'\x7d\x00', Direction.HOST)
+
+        # Assert
+        assert records == [Record(Direction.HOST, 0x7d, parser.schema.host.actions[0x7d])]
+
+    def test_parse_without_hidden_values(self):
+        # Arrange
+        settings = {'Game': {'node': {'actions': {
+            0x85: dict(self.settings['Game']['node']['actions'][0x85], display_message=False),
+        }}}}
+        parser = ProtocolParser.from_settings(settings)
+
+        # Act
+        hidden = parser.parse(b'\x85\x00\x0c\x00\x01', Direction.NODE, decode_hidden=False, timestamp=7.5)
+        decoded = parser.parse(b'\x85\x00\x0c\x00\x01', Direction.NODE)
+
+        # Assert
+        assert hidden == [Record(Direction.NODE, 0x85, parser.schema.node.actions[0x85], (), False, timestamp=7.5)]
+        assert decoded[0].values == (12, 'Up')
+        assert decoded[0].timestamp == 0.0
+
+    def test_parse_profile(self):
+        # Arrange
+        settings = dict(self.settings, Profiles={'login': {'host': {'actions': {0x7d: {'title': 'Login'}}}}})
+        parser = ProtocolParser.from_settings(settings)
+
+        # Act
+        login = parser.parse(b'\x7d\x00', Direction.HOST, profile='login')
+        login_node = parser.parse(b'\x7d\x00', Direction.NODE, profile='login')
+        unknown = parser.parse(b'\x7d\x00', Direction.HOST, profile='map')
+
+        # Assert
+        assert login[0].action is parser.schema.profiles['login'][0].actions[0x7d]
+        assert login_node[0].action is None
+        assert unknown[0].action is parser.schema.host.actions[0x7d]
+
+    def test_parse_id_settings(self):
+        # Arrange
+        actions = {0x7d: {'title': 'One byte'}, 0xff85: {'title': 'Signed'}, 0x0185: {'title': 'Big'}}
+        one_byte = ProtocolParser.from_settings({'Game': {'id': {'size': 1, 'signed': False},
+                                                          'host': {'actions': {0x7d: actions[0x7d]}}}})
+        signed = ProtocolParser.from_settings({'Game': {'host': {'actions': {0xff85: actions[0xff85]}}}})
+        big = ProtocolParser.from_settings({'Game': {'id': {'endian': 'Big'},
+                                                     'host': {'actions': {0x0185: actions[0x0185]}}}})
+
+        # Act
+        one_byte_records = one_byte.parse(b'\x7d\x7d\x7e', Direction.HOST)
+        signed_records = signed.parse(b'\x85\xff', Direction.HOST)
+        big_records = big.parse(b'\x01\x85', Direction.HOST)
+
+        # Assert
+        assert [record.action_id for record in one_byte_records] == [0x7d, 0x7d, 0x7e]
+        assert one_byte_records.parsed == 2
+        assert one_byte_records.leftover == 1
+        assert signed_records[0].action_id == -0x7b
+        assert signed_records[0].action is signed.schema.host.actions[0xff85]
+        assert big_records[0].action is big.schema.host.actions[0x0185]
+
+    def test_parse_codegen(self):
+        # Arrange
+        interpreted = ProtocolParser.from_settings(self.settings)
+        generated = ProtocolParser.from_settings({'Game': dict(self.settings['Game'], codegen=True)})
+        payload = b'\x85\x00\x0c\x00\x01\x85\x00\x0d\x00\x02\x7d\x00'
+
+        # Act
+        records = generated.parse(payload, Direction.NODE)
+
+        # Assert
+        assert generated.schema.node.actions[0x85].decode is not None
+        assert [record.values for record in records] == [
+            record.values for record in interpreted.parse(payload, Direction.NODE)]
+
+    def test_split(self):
+        # Arrange
+        parser = ProtocolParser.from_settings(self.settings)
+
+        # Act
+        messages, leftover = parser.split(b'\x85\x00\x0c\x00\x01\x7d\x00\xff\x00\x01', Direction.NODE)
+
+        # Assert
+        assert messages == [(0x85, 0, 5), (0x7d, 5, 7)]
+        assert leftover == 3
+        assert parser.get_request(Direction.NODE, 'map') is parser.schema.node
+
+    def test_parse_empty_payload(self):
+        # Arrange
+        parser = ProtocolParser.from_settings(self.settings)
+
+        # Act
+        records = parser.parse(b'', Direction.NODE)
+
+        # Assert
+        assert records == []
+        assert records.parsed == 0
+        assert records.leftover == 0
+
+    def test_parse_unknown_action(self):
+        # Arrange
+        parser = ProtocolParser.from_settings(self.settings)
+        payload = b'\x7d\x00\x0a\x00\x12\x34\x7d\x00'
+
+        # Act
+        records = parser.parse(payload, Direction.NODE)
+
+        # Assert
+        assert records[1] == Record(Direction.NODE, 0xa, display=True, data=b'\x12\x34\x7d\x00')
+        assert len(records) == 2
+        assert isinstance(records[1].data, memoryview)
+        assert records[1].data.obj is payload
+        assert records.parsed == 1
+        assert records.leftover == 6
+
+    def test_parse_unknown_action_display_false(self):
+        # Arrange
+        settings = {'Game': {'node': {'display_message': False}}}
+        parser = ProtocolParser.from_settings(settings)
+
+        # Act
+        records = parser.parse(b'\x0a\x00', Direction.NODE)
+
+        # Assert
+        assert records == [Record(Direction.NODE, 0xa, display=False)]
+
+    def test_parse_not_enough_data(self):
+        # Arrange
+        parser = ProtocolParser.from_settings(self.settings)
+
+        # Act
+        records = parser.parse(b'\x7d\x00\x85\x00\x0c', Direction.NODE)
+
+        # Assert
+        assert len(records) == 2
+        assert records[1].action_id == 0x85
+        assert records[1].data == b'\x0c'
+        assert records[1].error == ('unpack_from requires a buffer of at least 7 bytes for '
+                                    'unpacking 3 bytes at offset 4 (actual buffer size is 5)',
+                                    'Class ProtocolParser -> parse()')
+        assert records.parsed == 1
+        assert records.leftover == 3
+
+    def test_parse_not_enough_data_for_the_id(self):
+        # Arrange
+        parser = ProtocolParser.from_settings(self.settings)
+
+        # Act
+        records = parser.parse(b'\x7d', Direction.NODE)
+
+        # Assert
+        assert records[0].action_id is None
+        assert records[0].data == b'\x7d'
+        assert records[0].error[1] == 'Class ProtocolParser -> parse()'
+
+    def test_parse_error_in_output_format(self):
+        # Arrange
+        settings = {'Game': {'node': {'actions': {1: {'structs': [
+            {'type': 'float', 'output': {'type': 'hex'}},
+        ]}}}}}
+        parser = ProtocolParser.from_settings(settings)
+
+        # Act
+        records = parser.parse(b'\x01\x00\x00\x00\x00\x00', Direction.NODE)
+
+        # Assert
+        assert records[0].error == ("'float' object cannot be interpreted as an integer",
+                                    'Class ProtocolParser -> parse()')
+
+    def test_parse_error_from_output_step(self):
+        # Arrange
+        def broken_step(variable):
+            raise RuntimeError(f'The variable {variable} is broken.', ' -> broken_step()')
+
+        field = CompiledField('HP', 'unsigned char', None, (broken_step,))
+        action = CompiledAction(1, 'Broken', None, Struct('<B'), 1, (field,))
+        request = CompiledRequest('node', True, {1: action})
+        parser = ProtocolParser(ProtocolSchema({}, request, request))
+
+        # Act
+        records = parser.parse(b'\x01\x00\x07', Direction.NODE)
+
+        # Assert
+        assert records == [Record(Direction.NODE, 1, data=b'\x07', error=(
+            'The variable 7 is broken.', 'Class ProtocolParser -> parse() -> broken_step()'))]
+
+    def test_parse_many_messages(self):
+        # Arrange
+        parser = ProtocolParser.from_settings(self.settings)
+        payload = b'\x7d\x00' * 5000
+
+        # Act
+        records = parser.parse(payload, Direction.NODE)
+
+        # Assert
+        assert len(records) == 5000
+        assert records.parsed == 5000
+        assert records.leftover == 0
+
+    def test_parse_max_messages(self):
+        # Arrange
+        settings = {'Game': {'max_messages': 2, 'node': self.settings['Game']['node']}}
+        parser = ProtocolParser.from_settings(settings)
+
+        # Act
+        records = parser.parse(b'\x7d\x00' * 3 + b'\x0a', Direction.NODE)
+
+        # Assert
+        assert len(records) == 2
+        assert records.parsed == 2
+        assert records.leftover == 3
+
+    def test_parse_max_bytes(self):
+        # Arrange
+        settings = {'Game': {'max_bytes': 3, 'node': self.settings['Game']['node']}}
+        parser = ProtocolParser.from_settings(settings)
+
+        # Act
+        records = parser.parse(b'\x7d\x00\x85\x00\x0c\x00\x01\x7d\x00', Direction.NODE)
+
+        # Assert
+        assert [record.action_id for record in records] == [0x7d, 0x85]
+        assert records.parsed == 2
+        assert records.leftover == 2
+
+    def test_parse_stream_incomplete(self):
+        # Arrange
+        parser = ProtocolParser.from_settings(self.settings)
+
+        # Act
+        cut_message = parser.parse(b'\x7d\x00\x85\x00\x0c\x00', Direction.NODE, stream=True)
+        cut_id = parser.parse(b'\x7d\x00\x85', Direction.NODE, stream=True)
+        complete = parser.parse(b'\x85\x00\x0c\x00\x01', Direction.NODE, stream=True)
+        packet = parser.parse(b'\x85\x00\x0c\x00', Direction.NODE)
+
+        # Assert
+        assert [record.action_id for record in cut_message] == [0x7d]
+        assert (cut_message.parsed, cut_message.leftover, cut_message.incomplete) == (1, 4, 4)
+        assert (cut_id.parsed, cut_id.leftover, cut_id.incomplete) == (1, 1, 1)
+        assert (complete.parsed, complete.leftover, complete.incomplete) == (1, 0, 0)
+        assert packet[0].error is not None
+        assert packet.incomplete == 0
+
+    def test_parse_stream_limits(self):
+        # Arrange
+        max_messages = ProtocolParser.from_settings({'Game': {'max_messages': 2,
+                                                              'node': self.settings['Game']['node']}})
+        max_bytes = ProtocolParser.from_settings({'Game': {'max_bytes': 3, 'node': self.settings['Game']['node']}})
+
+        # Act
+        messages = max_messages.parse(b'\x7d\x00' * 3 + b'\x85\x00', Direction.NODE, stream=True)
+        size = max_bytes.parse(b'\x7d\x00\x85\x00\x0c\x00\x01\x7d\x00', Direction.NODE, stream=True)
+
+        # Assert
+        assert (len(messages), messages.parsed, messages.leftover, messages.incomplete) == (2, 2, 4, 4)
+        assert (len(size), size.parsed, size.leftover, size.incomplete) == (2, 2, 2, 2)
+
+    def test_parse_lengths(self):
+        # Arrange
+        settings = {'Game': {'node': dict(self.settings['Game']['node'], lengths={
+            0x7d: 4, 0x1f0: {'offset': 2}, 0x33: 3})}}
+        parser = ProtocolParser.from_settings(settings)
+        payload = b'\x33\x00\xaa\xf0\x01\x06\x00\xbb\xcc\x7d\x00\x00\x00\x85\x00\x0c\x00\x01'
+
+        # Act
+        records = parser.parse(payload, Direction.NODE)
+
+        # Assert
+        assert [record.action_id for record in records] == [0x33, 0x1f0, 0x7d, 0x85]
+        assert [record.action for record in records[:2]] == [None, None]
+        assert [bytes(record.data) for record in records[:2]] == [b'\xaa', b'\x06\x00\xbb\xcc']
+        assert records[2].action is parser.schema.node.actions[0x7d]
+        assert records[3].action is parser.schema.node.actions[0x85]
+        assert (records.parsed, records.leftover, records.incomplete) == (4, 0, 0)
+
+    def test_parse_lengths_stop(self):
+        # Arrange
+        settings = {'Game': {'node': dict(self.settings['Game']['node'], lengths={
+            0x33: 3, 0x1f0: {'offset': 2}})}}
+        parser = ProtocolParser.from_settings(settings)
+
+        # Act
+        unknown = parser.parse(b'\x33\x00\xaa\x44\x00\x01', Direction.NODE)
+        too_short = parser.parse(b'\x33\x00\xaa\xf0\x01\x03\x00\x7d\x00', Direction.NODE)
+        cut = parser.parse(b'\x33\x00\xaa\xf0\x01\x08\x00\x7d', Direction.NODE)
+        cut_length = parser.parse(b'\x33\x00\xaa\xf0\x01\x08', Direction.NODE, stream=True)
+        cut_stream = parser.parse(b'\x33\x00\xaa\xf0\x01\x08\x00\x7d', Direction.NODE, stream=True)
+
+        # Assert
+        assert unknown[1] == Record(Direction.NODE, 0x44, display=True, data=b'\x01')
+        assert (unknown.parsed, unknown.leftover) == (1, 3)
+        assert too_short[1] == Record(Direction.NODE, 0x1f0, data=b'\x03\x00\x7d\x00', error=(
+            'The length (3) of the message 0x1f0 is too short.', 'Class ProtocolParser -> parse() -> _split()'))
+        assert (too_short.parsed, too_short.leftover) == (1, 6)
+        assert cut[1] == Record(Direction.NODE, 0x1f0, display=True, data=b'\x08\x00\x7d')
+        assert (cut.parsed, cut.leftover, cut.incomplete) == (1, 5, 0)
+        assert (len(cut_length), cut_length.parsed, cut_length.leftover, cut_length.incomplete) == (1, 1, 3, 3)
+        assert (len(cut_stream), cut_stream.parsed, cut_stream.leftover, cut_stream.incomplete) == (1, 1, 5, 5)
+
+    def test_parse_lengths_id_settings(self):
+        # Arrange
+        big = ProtocolParser.from_settings({'Game': {'id': {'endian': 'big'}, 'node': {'lengths': {
+            0x1f0: {'offset': 2}, 0x33: 3}}}})
+        one_byte = ProtocolParser.from_settings({'Game': {'id': {'size': 1, 'signed': False}, 'node': {
+            'lengths': {0x33: 1, 0xf0: {'offset': 1}}}}})
+
+        # Act
+        big_records = big.parse(b'\x01\xf0\x00\x06\xbb\xcc\x00\x33\xaa', Direction.NODE)
+        one_byte_records = one_byte.parse(b'\x33\xf0\x05\x00\xbb\xcc\x33', Direction.NODE)
+
+        # Assert
+        assert [record.action_id for record in big_records] == [0x1f0, 0x33]
+        assert [bytes(record.data) for record in big_records] == [b'\x00\x06\xbb\xcc', b'\xaa']
+        assert (big_records.parsed, big_records.leftover) == (2, 0)
+        assert [record.action_id for record in one_byte_records] == [0x33, 0xf0, 0x33]
+        assert [bytes(record.data) for record in one_byte_records] == [b'', b'\x05\x00\xbb\xcc', b'']
+        assert (one_byte_records.parsed, one_byte_records.leftover) == (3, 0)
+
+    def test_parse_lengths_shorter_than_action(self):
+        # Arrange
+        settings = {'Game': {'node': dict(self.settings['Game']['node'], lengths={0x85: 4})}}
+        parser = ProtocolParser.from_settings(settings)
+
+        # Act
+        records = parser.parse(b'\x85\x00\x0c\x00\x7d\x00', Direction.NODE)
+
+        # Assert
+        assert records == [Record(Direction.NODE, 0x85, data=b'\x0c\x00\x7d\x00', error=(
+            'The length (4) of the message is shorter than the action (5).', 'Class ProtocolParser -> parse()'))]
+        assert (records.parsed, records.leftover) == (0, 6)
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+Unit Test.
+"""
+from threading import Event
+from unittest.mock import patch, MagicMock, call
+
+from pytest import raises
+
+from src.sniparinject.core.pipeline import ParsePipeline
+
+
+class TestParsePipeline:
+    def test___init__(self):
+        # Act
+        pipeline = ParsePipeline(MagicMock())
+
+        # Assert
+        assert pipeline.queue_size == 4096
+        assert pipeline.overflow == 'block'
+        assert pipeline.daemon is True
+        assert pipeline.get_statistics() == {'enqueued': 0, 'processed': 0, 'dropped': 0, 'unrendered': 0,
+                                             'errors': 0, 'max_depth': 0, 'depth': 0}
+
+    def test___init___overflow_invalid(self):
+        # Act
+        with raises(RuntimeError) as error:
+            ParsePipeline(MagicMock(), overflow='Pigeon')
+
+        # Assert
+        assert error.value.args == ('Error: The overflow (Pigeon) is not block, drop_oldest or drop_render.',)
+
+    def test_stop_drain(self):
+        # Arrange
+        handler = MagicMock()
+        pipeline = ParsePipeline(handler, queue_size=8)
+        for item in range(5):
+            pipeline.put(item)
+
+        # Act
+        pipeline.start()
+        pipeline.stop()
+
+        # Assert
+        assert not pipeline.is_alive()
+        assert handler.call_args_list == [call(item, True) for item in range(5)]
+        assert pipeline.get_statistics() == {'enqueued': 5, 'processed': 5, 'dropped': 0, 'unrendered': 0,
+                                             'errors': 0, 'max_depth': 5, 'depth': 0}
+
+    def test_put_drop_oldest(self):
+        # Arrange
+        handler = MagicMock()
+        pipeline = ParsePipeline(handler, queue_size=2, overflow='drop_oldest')
+
+        # Act
+        for item in range(5):
+            pipeline.put(item)
+        pipeline.start()
+        pipeline.stop()
+
+        # Assert
+        assert handler.call_args_list == [call(3, True), call(4, True)]
+        assert pipeline.get_statistics()['dropped'] == 3
+        assert pipeline.get_statistics()['max_depth'] == 2
+
+    def test_put_block(self):
+        # Arrange
+        release = Event()
+        handler = MagicMock(side_effect=lambda item, render: release.wait(5))
+        pipeline = ParsePipeline(handler, queue_size=1)
+        pipeline.start()
+
+        # Act
+        pipeline.put(0)
+        pipeline.put(1)
+        release.set()
+        pipeline.put(2)
+        pipeline.stop()
+
+        # Assert
+        assert handler.call_args_list == [call(0, True), call(1, True), call(2, True)]
+        assert pipeline.get_statistics()['dropped'] == 0
+
+    def test_put_drop_render(self):
+        # Arrange
+        started = Event()
+        release = Event()
+        handler = MagicMock(side_effect=lambda item, render: started.set() or release.wait(5))
+        pipeline = ParsePipeline(handler, queue_size=2, overflow='drop_render')
+        pipeline.start()
+        pipeline.put(0)
+        started.wait(5)
+
+        # Act
+        for item in range(1, 6):
+            pipeline.put(item)
+        depth = pipeline.get_statistics()['depth']
+        release.set()
+        pipeline.stop()
+
+        # Assert
+        assert depth == 4
+        assert handler.call_args_list == [call(0, True), call(2, False), call(3, False), call(4, False),
+                                          call(5, False)]
+        assert pipeline.get_statistics() == {'enqueued': 6, 'processed': 5, 'dropped': 1, 'unrendered': 4,
+                                             'errors': 0, 'max_depth': 4, 'depth': 0}
+
+    def test_stop_not_started(self):
+        # Arrange
+        pipeline = ParsePipeline(MagicMock())
+
+        # Act
+        pipeline.stop()
+
+        # Assert
+        assert not pipeline.is_alive()
+        assert pipeline._stopped is True
+
+    @patch('builtins.print')
+    def test_run_error(self, mock_print: MagicMock):
+        # Arrange
+        handler = MagicMock(side_effect=[ValueError('Ocean'), None])
+        pipeline = ParsePipeline(handler)
+        pipeline.put(0)
+        pipeline.put(1)
+
+        # Act
+        pipeline.start()
+        pipeline.stop()
+
+        # Assert
+        assert handler.call_count == 2
+        assert pipeline.get_statistics()['errors'] == 1
+        assert pipeline.get_statistics()['processed'] == 2
+        mock_print.assert_has_calls([
+            call('\x1b[00;37;41mError Pipeline: Ocean\x1b[0m'),
+            call('\x1b[00;37;41mLocation: ParsePipeline -> run()\x1b[0m'),
+        ])
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+Unit Test.
+"""
+from src.sniparinject.core.reassembly import StreamReassembler, sequence_distance
+
+
+def test_sequence_distance():
+    # Act
+    # Assert
+    assert sequence_distance(10, 15) == 5
+    assert sequence_distance(15, 10) == -5
+    assert sequence_distance(0xfffffffe, 3) == 5
+    assert sequence_distance(3, 0xfffffffe) == -5
+
+
+class TestStreamReassembler:
+    def test___init__(self):
+        # Act
+        reassembler = StreamReassembler()
+
+        # Assert
+        assert reassembler.max_bytes == 1 << 20
+        assert reassembler.max_flows == 4096
+        assert reassembler.streams == {}
+        assert reassembler.get_statistics() == {
+            'segments': 0, 'retransmits': 0, 'out_of_order': 0, 'gaps': 0, 'flows': 0}
+
+    def test_add_in_order(self):
+        # Arrange
+        reassembler = StreamReassembler()
+
+        # Act
+        first = reassembler.add('flow', 1000, b'abc')
+        second = reassembler.add('flow', 1003, memoryview(b'def'))
+        other = reassembler.add('other', 5, b'xyz')
+
+        # Assert
+        assert (first, second, other) == (b'abc', b'def', b'xyz')
+        assert reassembler.streams['flow'].next_sequence == 1006
+
+    def test_add_out_of_order(self):
+        # Arrange
+        reassembler = StreamReassembler()
+        reassembler.add('flow', 100, b'ab')
+
+        # Act
+        after_hole = reassembler.add('flow', 106, b'gh')
+        duplicate = reassembler.add('flow', 106, b'g')
+        middle = reassembler.add('flow', 104, b'ef')
+        filled = reassembler.add('flow', 102, b'cd')
+
+        # Assert
+        assert (after_hole, duplicate, middle) == (b'', b'', b'')
+        assert filled == b'cdefgh'
+        assert reassembler.streams['flow'].segments == {}
+        assert reassembler.streams['flow'].buffered == 0
+        assert reassembler.get_statistics()['out_of_order'] == 3
+
+    def test_add_retransmit_and_overlap(self):
+        # Arrange
+        reassembler = StreamReassembler()
+        reassembler.add('flow', 0xfffffffe, b'abcd')
+        reassembler.add('flow', 4, b'ghij')
+
+        # Act
+        retransmit = reassembler.add('flow', 0xfffffffe, b'abcd')
+        overlap = reassembler.add('flow', 1, b'defgh')
+
+        # Assert
+        assert retransmit == b''
+        assert overlap == b'efghij'
+        assert reassembler.streams['flow'].next_sequence == 8
+        assert reassembler.get_statistics()['retransmits'] == 1
+
+    def test_keep(self):
+        # Arrange
+        reassembler = StreamReassembler(max_bytes=4)
+        reassembler.add('flow', 0, b'\x85\x00\x0c')
+
+        # Act
+        reassembler.keep('flow', memoryview(b'\x85\x00\x0c'))
+        reassembler.keep('unknown', b'\x85')
+        data = reassembler.add('flow', 3, b'\x00\x01')
+        reassembler.keep('flow', b'\x01\x02\x03\x04\x05')
+
+        # Assert
+        assert data == b'\x85\x00\x0c\x00\x01'
+        assert reassembler.streams['flow'].tail == b''
+        assert 'unknown' not in reassembler.streams
+        assert reassembler.get_statistics()['gaps'] == 1
+
+    def test_add_skip_hole(self):
+        # Arrange
+        reassembler = StreamReassembler(max_bytes=6)
+        reassembler.add('flow', 0, b'ab')
+        reassembler.keep('flow', b'b')
+
+        # Act
+        waiting = reassembler.add('flow', 10, b'klm')
+        skipped = reassembler.add('flow', 6, b'ghij')
+
+        # Assert
+        assert waiting == b''
+        assert skipped == b'ghijklm'
+        assert reassembler.streams['flow'].tail == b''
+        assert reassembler.streams['flow'].next_sequence == 13
+        assert reassembler.get_statistics()['gaps'] == 1
+
+    def test_add_max_flows(self):
+        # Arrange
+        reassembler = StreamReassembler(max_flows=2)
+
+        # Act
+        for flow in ('first', 'second', 'third'):
+            reassembler.add(flow, 0, b'a')
+        reassembler.add('second', 1, b'b')
+        reassembler.add('fourth', 0, b'a')
+
+        # Assert
+        assert list(reassembler.streams) == ['second', 'fourth']
+        assert reassembler.streams['second'].next_sequence == 2
+        assert reassembler.get_statistics()['flows'] == 2
+
+    def test_add_drain_old_segment_and_hole(self):
+        # Arrange
+        reassembler = StreamReassembler()
+        reassembler.add('flow', 0, b'ab')
+        reassembler.add('flow', 3, b'd')
+        reassembler.add('flow', 6, b'gh')
+        reassembler.add('flow', 10, b'k')
+
+        # Act
+        data = reassembler.add('flow', 2, b'cdef')
+
+        # Assert
+        assert data == b'cdefgh'
+        assert reassembler.streams['flow'].segments == {10: b'k'}
+        assert reassembler.streams['flow'].buffered == 1
+        assert reassembler.streams['flow'].next_sequence == 8
+
+    def test_discard(self):
+        # Arrange
+        reassembler = StreamReassembler()
+        reassembler.add('first', 0, b'a')
+        reassembler.add('second', 0, b'a')
+
+        # Act
+        reassembler.discard('first')
+        reassembler.discard('unknown')
+
+        # Assert
+        assert list(reassembler.streams) == ['second']
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+Unit Test.
+"""
+from src.sniparinject.core.direction import Direction
+from src.sniparinject.core.parser import ProtocolParser
+from src.sniparinject.core.renderer import Renderer
+from src.sniparinject.core.text_style import TextStyle
+
+
+class TestRenderer:
+    style_title = '\x1b[00;93;100m'
+    style_normal = '\x1b[00;30;100m'
+    style_light = '\x1b[00;96;100m'
+    style_bold = '\x1b[00;37;100m'
+    style_title_host = '\x1b[00;93;44m'
+    style_normal_host = '\x1b[00;30;44m'
+    style_end = '\x1b[0m'
+    settings = {'Game': {
+        'host': {'actions': {0x7d: {'title': 'Scenario change'}}},
+        'node': {'actions': {
+            0x85: {'title': 'Player move to', 'structs': [
+                {'name': 'X', 'type': 'unsigned short'},
+                {'type': 'unsigned char', 'reference': {1: 'Up'}},
+            ]},
+        }},
+    }}
+
+    def test_render_message(self):
+        # Arrange
+        parser = ProtocolParser.from_settings(self.settings)
+        record, = parser.parse(b'\x85\x00\x0c\x00\x01', Direction.NODE)
+
+        # Act
+        message = Renderer().render_message(record)
+
+        # Assert
+        assert message == f'{self.style_title}--> Player move to{self.style_end}' \
+                          f'{self.style_normal} |{self.style_end}' \
+                          f'{self.style_bold} X{self.style_end}' \
+                          f'{self.style_light} 12{self.style_end}' \
+                          f'{self.style_normal} |{self.style_end}' \
+                          f'{self.style_light} Up{self.style_end}' \
+                          f'{self.style_normal} |{self.style_end}'
+
+    def test_render_message_host(self):
+        # Arrange
+        parser = ProtocolParser.from_settings(self.settings)
+        record, = parser.parse(b'\x7d\x00', Direction.HOST)
+
+        # Act
+        message = Renderer().render_message(record)
+
+        # Assert
+        assert message == f'{self.style_title_host}<-- Scenario change{self.style_end}' \
+                          f'{self.style_normal_host} |{self.style_end}'
+
+    def test_text_format(self):
+        # Act
+        # Assert
+        assert Renderer().text_format('Conan', Direction.NODE) == \
+               f'{self.style_normal}Conan{self.style_end}'
+        assert Renderer().text_format('Conan', Direction.NODE, TextStyle.TITLE) == \
+               f'{self.style_title}Conan{self.style_end}'
+        assert Renderer().text_format('Conan', Direction.NODE, TextStyle.BOLD) == \
+               f'{self.style_bold}Conan{self.style_end}'
+        assert Renderer().text_format('Conan', Direction.NODE, TextStyle.LIGHT) == \
+               f'{self.style_light}Conan{self.style_end}'
+        assert Renderer().text_format('Conan', Direction.HOST) == \
+               f'{self.style_normal_host}Conan{self.style_end}'
+
+    def test_error_format(self):
+        # Act
+        # Assert
+        assert Renderer().error_format('Conan') == f'\x1b[00;37;41mConan{self.style_end}'
+        assert Renderer(False).error_format('Conan') == 'Conan'
+
+    def test_from_settings(self):
+        # Arrange
+        settings = dict(self.settings, Style={'title': '01;91', 'node': 40})
+        parser = ProtocolParser.from_settings(settings)
+        record, = parser.parse(b'\x85\x00\x0c\x00\x01', Direction.NODE)
+
+        # Act
+        renderer = Renderer.from_settings(settings)
+        message = renderer.render_message(record)
+
+        # Assert
+        assert renderer.settings is settings
+        assert renderer.color is True
+        assert message.startswith(f'\x1b[01;91;40m--> Player move to{self.style_end}\x1b[00;30;40m |')
+
+    def test_render_message_without_color(self):
+        # Arrange
+        settings = dict(self.settings, Style={'color': False})
+        parser = ProtocolParser.from_settings(settings)
+        records = parser.parse(b'\x85\x00\x0c\x00\x01\x85\x00\x0d\x00\x02', Direction.NODE)
+        renderer = Renderer.from_settings(settings)
+
+        # Act
+        messages = [renderer.render_message(record) for record in records]
+
+        # Assert
+        assert messages == ['--> Player move to | X 12 | Up |', '--> Player move to | X 13 | 2 |']
+        assert len(renderer._templates) == 1
+
+    def test_compile_template(self):
+        # Arrange
+        settings = {'Game': {'host': {'actions': {0x0a: {'title': 'Set {x}', 'structs': [
+            {'name': 'Map {name}', 'type': 'chars', 'size': 3},
+        ]}}}}}
+        parser = ProtocolParser.from_settings(settings)
+        record, = parser.parse(b'\x0a\x00{0}', Direction.HOST)
+        renderer = Renderer(False)
+
+        # Act
+        template = renderer.compile_template(Direction.HOST, record.action)
+
+        # Assert
+        assert template == '<-- Set {{x}} | Map {{name}} {} |'
+        assert renderer.render_message(record) == "<-- Set {x} | Map {name} b'{0}' |"
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+Unit Test.
+"""
+from struct import pack
+from unittest.mock import MagicMock, patch
+
+from pytest import raises
+from scapy.layers.inet import IP, UDP
+from scapy.layers.l2 import CookedLinux, Ether
+from scapy.packet import Raw
+from scapy.utils import wrpcap, wrpcapng
+
+from src.sniparinject.core.replay import PcapReplay
+
+
+def build_packets() -> list:
+    packets = [Ether() / IP() / UDP() / Raw(b'\x01'), Ether() / IP() / UDP() / Raw(b'\x02\x03')]
+    packets[0].time = 100.25
+    packets[1].time = 101.5
+    return packets
+
+
+def pcapng_block(block_type: int, body: bytes, byte_order: str = '<') -> bytes:
+    size = 12 + len(body)
+    return pack(f'{byte_order}II', block_type, size) + body + pack(f'{byte_order}I', size)
+
+
+class TestPcapReplay:
+    def test___init__(self):
+        # Act
+        replay = PcapReplay('capture.pcap')
+
+        # Assert
+        assert replay.capture_file == 'capture.pcap'
+        assert replay.original_timing is False
+        assert replay.map is None
+        assert replay.statistics == {'packets': 0, 'skipped': 0}
+
+    def test_records_pcap(self, tmp_path):
+        # Arrange
+        packets = build_packets()
+        wrpcap(str(tmp_path / 'capture.pcap'), packets)
+
+        # Act
+        replay = PcapReplay(str(tmp_path / 'capture.pcap'))
+        records = [(timestamp, bytes(frame)) for timestamp, frame in replay.records()]
+        replay.close()
+
+        # Assert
+        assert records == [(100.25, bytes(packets[0])), (101.5, bytes(packets[1]))]
+        assert replay.get_statistics() == {'packets': 2, 'skipped': 0}
+        assert replay.map is None
+
+    def test_records_pcap_nanoseconds_big_endian(self, tmp_path):
+        # Arrange
+        frame = bytes(build_packets()[0])
+        header = b'\xa1\xb2\x3c\x4d' + pack('>HHiIII', 2, 4, 0, 0, 65535, 1)
+        record = pack('>IIII', 7, 500_000_000, len(frame), len(frame)) + frame
+        (tmp_path / 'capture.pcap').write_bytes(header + record + record[:20])
+
+        # Act
+        replay = PcapReplay(str(tmp_path / 'capture.pcap'))
+        records = [(timestamp, bytes(frame)) for timestamp, frame in replay.records()]
+
+        # Assert
+        assert records == [(7.5, frame)]
+
+    def test_records_pcapng(self, tmp_path):
+        # Arrange
+        packets = build_packets()
+        wrpcapng(str(tmp_path / 'capture.pcapng'), packets)
+
+        # Act
+        replay = PcapReplay(str(tmp_path / 'capture.pcapng'))
+        records = [(round(timestamp, 6), bytes(frame)) for timestamp, frame in replay.records()]
+
+        # Assert
+        assert records == [(100.25, bytes(packets[0])), (101.5, bytes(packets[1]))]
+
+    def test_records_pcapng_blocks(self, tmp_path):
+        # Arrange
+        frame = bytes(build_packets()[1])
+        padding = b'\x00' * (-len(frame) % 4)
+        section = pcapng_block(0x0a0d0d0a, b'\x1a\x2b\x3c\x4d' + pack('>HHq', 1, 0, -1), '>')
+        ethernet = pcapng_block(1, pack('>HHI', 1, 0, 0) + pack('>HHB3x', 9, 1, 0x83) + pack('>HH', 0, 0), '>')
+        cooked = pcapng_block(1, pack('>HHI', 113, 0, 0), '>')
+        enhanced = pcapng_block(6, pack('>IIIII', 0, 0, 20, len(frame), len(frame)) + frame + padding, '>')
+        skipped = pcapng_block(6, pack('>IIIII', 1, 0, 0, 0, 0), '>')
+        simple = pcapng_block(3, pack('>I', len(frame)) + frame + padding, '>')
+        name_resolution = pcapng_block(4, b'\x00' * 4, '>')
+        content = section + ethernet + cooked + enhanced + skipped + simple + name_resolution
+        (tmp_path / 'capture.pcapng').write_bytes(content + enhanced[:30])
+
+        # Act
+        replay = PcapReplay(str(tmp_path / 'capture.pcapng'))
+        records = [(timestamp, bytes(frame)) for timestamp, frame in replay.records()]
+
+        # Assert
+        assert records == [(2.5, frame), (0.0, frame)]
+        assert replay.get_statistics() == {'packets': 2, 'skipped': 1}
+
+    def test_records_pcapng_unsupported_link_type(self, tmp_path):
+        # Arrange
+        frame = bytes(build_packets()[0])
+        padding = b'\x00' * (-len(frame) % 4)
+        section = pcapng_block(0x0a0d0d0a, b'\x4d\x3c\x2b\x1a' + pack('<HHq', 1, 0, -1))
+        cooked = pcapng_block(1, pack('<HHI', 113, 0, 0) + pack('<HH4s', 2, 4, b'eth0') + pack('<HH', 0, 0))
+        simple = pcapng_block(3, pack('<I', len(frame)) + frame + padding)
+        (tmp_path / 'capture.pcapng').write_bytes(section + cooked + simple)
+
+        # Act
+        replay = PcapReplay(str(tmp_path / 'capture.pcapng'))
+        replay.open()
+        records = list(replay.records())
+        replay.close()
+        replay.close()
+
+        # Assert
+        assert records == []
+        assert replay.get_statistics() == {'packets': 0, 'skipped': 1}
+        assert replay.map is None
+
+    def test_records_pcapng_unknown_interface(self, tmp_path):
+        # Arrange
+        frame = bytes(build_packets()[0])
+        padding = b'\x00' * (-len(frame) % 4)
+        section = pcapng_block(0x0a0d0d0a, b'\x4d\x3c\x2b\x1a' + pack('<HHq', 1, 0, -1))
+        interface = pcapng_block(1, pack('<HHI', 1, 0, 0))
+        simple = pcapng_block(3, pack('<I', len(frame)) + frame + padding)
+        enhanced = pcapng_block(6, pack('<IIIII', 1, 0, 2500000, len(frame), len(frame)) + frame + padding)
+        (tmp_path / 'capture.pcapng').write_bytes(section + simple + enhanced + interface + enhanced)
+
+        # Act
+        replay = PcapReplay(str(tmp_path / 'capture.pcapng'))
+        records = list(replay.records())
+
+        # Assert
+        assert records == []
+        assert replay.get_statistics() == {'packets': 0, 'skipped': 3}
+
+    def test_records_pcapng_invalid_byte_order(self, tmp_path):
+        # Arrange
+        section = pcapng_block(0x0a0d0d0a, b'\x00\x00\x00\x00' + pack('<HHq', 1, 0, -1))
+        (tmp_path / 'capture.pcapng').write_bytes(section)
+
+        # Act
+        replay = PcapReplay(str(tmp_path / 'capture.pcapng'))
+        with raises(ValueError) as error:
+            list(replay.records())
+
+        # Assert
+        assert error.value.args == (f'Error: The byte order of the file ({tmp_path / "capture.pcapng"}) is invalid.',)
+
+    def test_records_pcap_truncated(self, tmp_path):
+        # Arrange
+        (tmp_path / 'capture.pcap').write_bytes(b'\xd4\xc3\xb2\xa1' + pack('<HHiI', 2, 4, 0, 0))
+
+        # Act
+        replay = PcapReplay(str(tmp_path / 'capture.pcap'))
+        records = list(replay.records())
+
+        # Assert
+        assert records == []
+        assert replay.get_statistics() == {'packets': 0, 'skipped': 0}
+
+    def test_records_skip_link_type(self, tmp_path):
+        # Arrange
+        wrpcap(str(tmp_path / 'capture.pcap'), [CookedLinux() / IP() / UDP()])
+
+        # Act
+        replay = PcapReplay(str(tmp_path / 'capture.pcap'))
+        records = list(replay.records())
+
+        # Assert
+        assert records == []
+        assert replay.get_statistics() == {'packets': 0, 'skipped': 1}
+
+    def test_records_invalid_file(self, tmp_path):
+        # Arrange
+        (tmp_path / 'capture.txt').write_bytes(b'Not a capture')
+
+        # Act
+        replay = PcapReplay(str(tmp_path / 'capture.txt'))
+        with raises(ValueError) as error:
+            list(replay.records())
+
+        # Assert
+        assert error.value.args == (f'Error: The file ({tmp_path / "capture.txt"}) is not a pcap or pcapng file.',)
+
+    @patch('src.sniparinject.core.replay.sleep')
+    @patch('src.sniparinject.core.replay.monotonic')
+    def test_frames(self, mock_monotonic: MagicMock, mock_sleep: MagicMock, tmp_path):
+        # Arrange
+        wrpcap(str(tmp_path / 'capture.pcap'), build_packets())
+
+        # Act
+        replay = PcapReplay(str(tmp_path / 'capture.pcap'))
+        frames = [(timestamp, bytes(frame)) for timestamp, frame in replay.frames()]
+
+        # Assert
+        assert frames == [(float(packet.time), bytes(packet)) for packet in build_packets()]
+        mock_monotonic.assert_not_called()
+        mock_sleep.assert_not_called()
+
+    @patch('src.sniparinject.core.replay.sleep')
+    @patch('src.sniparinject.core.replay.monotonic')
+    def test_frames_original_timing(self, mock_monotonic: MagicMock, mock_sleep: MagicMock, tmp_path):
+        # Arrange
+        wrpcap(str(tmp_path / 'capture.pcap'), build_packets() * 2)
+        mock_monotonic.side_effect = [10.0, 10.0, 10.5, 12.0, 13.0]
+
+        # Act
+        replay = PcapReplay(str(tmp_path / 'capture.pcap'), original_timing=True)
+        frames = list(replay.frames())
+
+        # Assert
+        assert len(frames) == 4
+        mock_sleep.assert_called_once_with(0.75)
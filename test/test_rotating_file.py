@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+Unit Test.
+"""
+import gzip
+from unittest.mock import patch, MagicMock
+
+from src.sniparinject.core.rotating_file import RotatingFile
+
+
+class TestRotatingFile:
+    def test_write_max_bytes(self, tmp_path):
+        # Arrange
+        path = str(tmp_path / 'messages.csv')
+
+        # Act
+        rotating_file = RotatingFile(path, max_bytes=10, header='h\n')
+        for text in ('aaaa\n', 'bbbb\n', 'cccc\n'):
+            rotating_file.write(text)
+        rotating_file.close()
+
+        # Assert
+        assert (tmp_path / 'messages.1.csv').read_text() == 'h\naaaa\n'
+        assert (tmp_path / 'messages.2.csv').read_text() == 'h\nbbbb\n'
+        assert (tmp_path / 'messages.csv').read_text() == 'h\ncccc\n'
+        assert rotating_file.statistics == {'bytes': 21, 'rotations': 2}
+
+    def test_write_buffer_size(self, tmp_path):
+        # Arrange
+        path = str(tmp_path / 'messages.jsonl')
+
+        # Act
+        rotating_file = RotatingFile(path, buffer_size=4)
+        rotating_file.write('a\n')
+        buffered = rotating_file.statistics['bytes']
+        rotating_file.write('b\n')
+        flushed = rotating_file.statistics['bytes']
+        rotating_file.close()
+
+        # Assert
+        assert (buffered, flushed) == (0, 4)
+        assert (tmp_path / 'messages.jsonl').read_text() == 'a\nb\n'
+
+    @patch('src.sniparinject.core.rotating_file.monotonic')
+    def test_write_rotate_seconds(self, mock_monotonic: MagicMock, tmp_path):
+        # Arrange
+        path = str(tmp_path / 'messages.jsonl')
+        (tmp_path / 'messages.jsonl').write_text('old\n')
+        mock_monotonic.side_effect = [0, 5, 10, 11]
+
+        # Act
+        rotating_file = RotatingFile(path, rotate_seconds=10, compress=True)
+        rotating_file.write('a\n')
+        rotating_file.write('b\n')
+        rotating_file.close()
+
+        # Assert
+        with gzip.open(tmp_path / 'messages.1.jsonl.gz', 'rt') as archived:
+            assert archived.read() == 'old\n'
+        with gzip.open(tmp_path / 'messages.2.jsonl.gz', 'rt') as archived:
+            assert archived.read() == 'a\n'
+        assert not (tmp_path / 'messages.2.jsonl').exists()
+        assert (tmp_path / 'messages.jsonl').read_text() == 'b\n'
+        assert rotating_file.statistics == {'bytes': 4, 'rotations': 1}
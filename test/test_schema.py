@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+Unit Test.
+"""
+from functools import partial
+from linecache import getlines
+from struct import Struct
+
+from pytest import raises
+
+from src.sniparinject.core.schema import CompiledField, MessageLength, ProtocolSchema, compile_action, \
+    compile_field, compile_id, compile_request, fill, fill_left, generate_decoder, get_struct, \
+    to_hex, zero_fill
+
+
+class TestSchema:
+    def test_get_struct(self):
+        # Arrange
+        expected_symbol = 'B'
+        expected_size = 1
+        struct_type = 'unsigned char'
+
+        # Act
+        symbol, size = get_struct(struct_type)
+
+        # Assert
+        assert symbol == expected_symbol
+        assert size == expected_size
+
+    def test_get_struct_with_repeat_count(self):
+        # Arrange
+        expected_symbol = 'Q'
+        expected_size = 8
+        struct_type = 'Unsigned Long'
+        repeat_count = 32
+
+        # Act
+        symbol, size = get_struct(struct_type, repeat_count)
+
+        # Assert
+        assert symbol == f'{repeat_count}{expected_symbol}'
+        assert size == expected_size * repeat_count
+
+    def test_get_struct_exception_type_error(self):
+        # Arrange
+        struct_type = 'This type not exists'
+        expected_message = f'The struct type ({struct_type}) is not defined in the map of structs.'
+        expected_location = ' -> get_struct()'
+
+        # Act
+        with raises(RuntimeError) as error:
+            get_struct(struct_type)
+
+        # Assert
+        assert error.type == RuntimeError
+        assert error.value.args == (expected_message, expected_location)
+
+    def test_to_hex(self):
+        # Act
+        # Assert
+        assert to_hex(531) == hex(531)
+        assert to_hex(b'\x05\x07\x0b') == '05070b'
+
+    def test_zero_fill(self):
+        # Arrange
+        variable = ' How many Zeros?'
+
+        # Act
+        new_variable = zero_fill(len(variable) + 7, variable)
+
+        # Assert
+        assert new_variable == f'0000000{variable}'
+
+    def test_fill(self):
+        # Act
+        new_variable = fill(8, '0.0')
+
+        # Assert
+        assert new_variable == '0.0     '
+
+    def test_fill_left(self):
+        # Act
+        new_variable = fill_left(8, '0.0')
+
+        # Assert
+        assert new_variable == '     0.0'
+
+    def test_compile_field(self):
+        # Arrange
+        expected_name = 'Kardashian'
+        struct = {'name': expected_name, 'type': 'unsigned int'}
+
+        # Act
+        field = compile_field(struct)
+
+        # Assert
+        assert field.name == expected_name
+        assert field.struct_type == 'unsigned int'
+        assert field.reference is None
+        assert field.steps == ()
+        assert field.format(9821) == 9821
+
+    def test_compile_field_output_type(self):
+        # Act
+        field = compile_field({'type': 'int', 'output': {'type': 'HEX'}})
+
+        # Assert
+        assert field.format(531) == hex(531)
+        assert field.format(b'\x05\x07\x0b') == '05070b'
+
+    def test_compile_field_output_zero_fill(self):
+        # Act
+        field = compile_field({'type': 'int', 'output': {'type': 'hex', 'zero_fill': 8}})
+
+        # Assert
+        assert field.format(0x12) == '00000x12'
+
+    def test_compile_field_output_auto_zero_fill(self):
+        # Act
+        field = compile_field({'type': 'unsigned int', 'output': {'type': 'hex', 'auto_zero_fill': True}})
+
+        # Assert
+        assert field.format(5) == '00000000x5'
+        assert field.format(123456789) == '00x75bcd15'
+
+    def test_compile_field_output_fill(self):
+        # Act
+        field = compile_field({'type': 'float', 'output': {'fill': 8}})
+
+        # Assert
+        assert field.format(0.0) == '0.0     '
+
+    def test_compile_field_output_fill_left(self):
+        # Act
+        field = compile_field({'type': 'float', 'output': {'fill_left': 8}})
+
+        # Assert
+        assert field.format(0.0) == '     0.0'
+
+    def test_compile_field_output_without_steps(self):
+        # Act
+        field = compile_field({'type': 'int', 'output': {
+            'zero_fill': 0, 'auto_zero_fill': False, 'fill': 0, 'fill_left': 0}})
+
+        # Assert
+        assert field.steps == ()
+        assert field.format('Zero') == 'Zero'
+
+    def test_compile_field_output_all_steps_in_order(self):
+        # Act
+        field = compile_field({'type': 'unsigned short', 'output': {
+            'type': 'hex', 'zero_fill': 5, 'auto_zero_fill': True, 'fill': 8, 'fill_left': 10}})
+
+        # Assert
+        assert field.format(0xa) == '  0000xa  '
+
+    def test_compile_field_reference(self):
+        # Act
+        field = compile_field({
+            'name': 'ID',
+            'type': 'unsigned char',
+            'reference': {0x0: 'Buy', 0x1: 'Sell'},
+            'output': {'type': 'hex', 'auto_zero_fill': True},
+        })
+
+        # Assert
+        assert field.format(0) == 'Buy'
+        assert field.format(1) == 'Sell'
+        assert field.format(0x5a) == '0x5a'
+
+    def test_compile_action(self):
+        # Arrange
+        action = {
+            'title': 'NPC Info',
+            'display_message': False,
+            'structs': [
+                {'name': 'ID', 'type': 'unsigned int'},
+                {'type': 'chars', 'size': 3},
+                {'name': 'HP', 'type': 'unsigned short', 'size': 2},
+                {'type': 'double'},
+            ],
+        }
+
+        # Act
+        compiled = compile_action(0x78, action)
+
+        # Assert
+        assert compiled.action_id == 0x78
+        assert compiled.title == 'NPC Info'
+        assert compiled.display_message is False
+        assert compiled.struct.format == '<I3s2Hd'
+        assert compiled.size == 4 + 3 + 4 + 8
+        assert [field.name for field in compiled.fields] == ['ID', None, 'HP', 'HP', None]
+
+    def test_compile_action_without_structs(self):
+        # Act
+        compiled = compile_action(0x7d, {'title': 'Scenario change'})
+
+        # Assert
+        assert compiled.display_message is None
+        assert compiled.size == 0
+        assert compiled.fields == ()
+
+    def test_compile_action_codegen(self):
+        # Arrange
+        action = {
+            'title': 'NPC Info',
+            'structs': [
+                {'name': 'ID', 'type': 'unsigned int', 'output': {'type': 'hex', 'auto_zero_fill': True}},
+                {'type': 'chars', 'size': 2, 'output': {'type': 'hex', 'fill': 6}},
+                {'name': 'HP', 'type': 'unsigned short', 'size': 2, 'reference': {100: 'Full'}},
+                {'type': 'unsigned char', 'reference': {1: 'Up'}, 'output': {'fill_left': 4}},
+                {'type': 'float'},
+            ],
+        }
+        data = b'\x0f\x00\x00\x00\xf8\x64\x64\x00\xc8\x00\x02\x00\x00\xc0\x3f'
+
+        # Act
+        interpreted = compile_action(0x78, action)
+        generated = compile_action(0x78, action, codegen=True)
+
+        # Assert
+        assert interpreted.decode is None
+        assert (generated.title, generated.size) == (interpreted.title, interpreted.size)
+        assert generated.decode(data, 0) == tuple(
+            field.format(variable) for field, variable in zip(interpreted.fields, interpreted.struct.unpack(data)))
+        assert generated.decode(data, 0) == ('00000000xf', 'f864  ', 'Full', 200, '   2', 1.5)
+        assert generated.source == (
+            'def decode_78(data, offset):\n'
+            '    v0, v1, v2, v3, v4, v5 = unpack_from(data, offset)\n'
+            '    v0 = str(hex(v0)).zfill(10)\n'
+            '    v1 = str(v1.hex()).ljust(6)\n'
+            '    v2 = reference_2.get(v2, v2)\n'
+            '    v3 = reference_3.get(v3, v3)\n'
+            '    if v4 in reference_4:\n'
+            '        v4 = reference_4[v4]\n'
+            '    else:\n'
+            '        v4 = str(v4).rjust(4)\n'
+            '    return v0, v1, v2, v3, v4, v5\n'
+        )
+
+    def test_generate_decoder_unknown_step(self):
+        # Arrange
+        def broken_step(variable):
+            raise RuntimeError(f'The variable {variable} is broken.', ' -> broken_step()')
+
+        fields = [CompiledField(None, 'unsigned char', None, (partial(fill, 3), broken_step))]
+
+        # Act
+        decode, source = generate_decoder(-0x7b, Struct('<B'), fields)
+        with raises(RuntimeError) as error:
+            decode(b'\x07', 0)
+
+        # Assert
+        assert source == ('def decode__7b(data, offset):\n'
+                          '    v0, = unpack_from(data, offset)\n'
+                          '    v0 = step_0_1(str(v0).ljust(3))\n'
+                          '    return v0,\n')
+        assert error.value.args == ('The variable 7   is broken.', ' -> broken_step()')
+        assert error.traceback[1].statement.lines[0].strip() == 'v0 = step_0_1(str(v0).ljust(3))'
+        assert decode.__code__.co_filename == '<host action -0x7b>'
+
+    def test_generate_decoder_same_id(self):
+        # Arrange
+        fields = [CompiledField(None, 'unsigned char', None, (partial(fill, 3),))]
+
+        # Act
+        host_decode, host_source = generate_decoder(0x0a, Struct('<B'), [], 'host')
+        profile_decode, profile_source = generate_decoder(0x0a, Struct('<B'), fields, 'map node')
+
+        # Assert
+        assert host_decode.__code__.co_filename == '<host action 0xa>'
+        assert profile_decode.__code__.co_filename == '<map node action 0xa>'
+        assert ''.join(getlines('<host action 0xa>')) == host_source
+        assert ''.join(getlines('<map node action 0xa>')) == profile_source
+
+    def test_compile_action_exception_empty_action(self):
+        # Act
+        with raises(RuntimeError) as error:
+            compile_action(1, {})
+
+        # Assert
+        assert error.value.args == ('The action is empty.', ' -> compile_action()')
+
+    def test_compile_action_exception_missing_type(self):
+        # Arrange
+        struct = {'Knock-Knock': 'Boo!'}
+
+        # Act
+        with raises(RuntimeError) as error:
+            compile_action(1, {'structs': [struct]})
+
+        # Assert
+        assert error.value.args == (f'The struct type is missing. Struct -> {struct}.',
+                                    ' -> compile_action()')
+
+    def test_compile_request(self):
+        # Act
+        request = compile_request('host', {
+            'display_message': False,
+            'actions': {0x7d: {'title': 'Scenario change'}, 0x85: {'title': 'Player move to'}},
+        })
+
+        # Assert
+        assert request.request == 'host'
+        assert request.display_message is False
+        assert sorted(request.actions) == [0x7d, 0x85]
+        assert request.actions[0x85].title == 'Player move to'
+
+    def test_compile_request_lengths(self):
+        # Act
+        request = compile_request('node', {'lengths': {0x7d: 2, 0x1f0: {'offset': 2}}})
+        request_without_lengths = compile_request('node', {})
+
+        # Assert
+        assert dict(request.lengths) == {0x7d: MessageLength(size=2), 0x1f0: MessageLength(offset=2)}
+        assert dict(request_without_lengths.lengths) == {}
+
+    def test_compile_request_dispatch(self):
+        # Act
+        request = compile_request('node', {
+            'actions': {0x7d: {'title': 'Scenario change'}, -0x7b: {'title': 'Signed'}},
+            'lengths': {0x1f0: 4},
+        })
+        one_byte = compile_request('node', {'actions': {0x7d: {'title': 'Scenario change'}}},
+                                   compile_id({'size': 1}))
+
+        # Assert
+        assert len(request.dispatch) == len(request.length_table) == 0x10000
+        assert request.dispatch[0x7d] is request.actions[0x7d]
+        assert request.dispatch[-0x7b] is request.dispatch[0xff85] is request.actions[-0x7b]
+        assert request.length_table[0x1f0] == MessageLength(size=4)
+        assert sum(action is not None for action in request.dispatch) == 2
+        assert len(one_byte.dispatch) == 0x100
+        assert one_byte.dispatch[0x7d] is one_byte.actions[0x7d]
+
+    def test_compile_request_id_too_big(self):
+        # Act
+        errors = []
+        for settings, id_struct in (({'actions': {0x100: {'title': 'Big'}}}, compile_id({'size': 1})),
+                                    ({'lengths': {0x10000: 2}}, compile_id({}))):
+            with raises(RuntimeError) as error:
+                compile_request('node', settings, id_struct)
+            errors.append(error.value.args)
+
+        # Assert
+        assert errors == [
+            ('The ID (0x100) does not fit in 1 bytes.', ' -> compile_request(node)'),
+            ('The ID (0x10000) does not fit in 2 bytes.', ' -> compile_request(node)'),
+        ]
+
+    def test_compile_id(self):
+        # Act
+        # Assert
+        assert compile_id({}).format == '<h'
+        assert compile_id({'size': 1}).format == '<b'
+        assert compile_id({'size': 1, 'signed': False}).format == '<B'
+        assert compile_id({'signed': False, 'endian': 'BIG'}).format == '>H'
+
+    def test_compile_request_exception_location(self):
+        # Act
+        with raises(RuntimeError) as error:
+            compile_request('node', {'actions': {0x80: {'structs': [{'type': 'nothing'}]}}})
+
+        # Assert
+        assert error.value.args == (
+            'The struct type (nothing) is not defined in the map of structs.',
+            ' -> compile_request(node, 0x80) -> get_struct()')
+
+    def test_compile_request_empty_action(self):
+        # Act
+        with raises(RuntimeError) as error:
+            compile_request('node', {'actions': {0x80: None}})
+
+        # Assert
+        assert error.value.args == ('The action is empty.',
+                                    ' -> compile_request(node, 0x80) -> compile_action()')
+
+    def test_protocol_schema_from_settings(self):
+        # Arrange
+        settings = {'Game': {
+            'node': {'display_message': False, 'actions': {0x7d: {'title': 'Scenario change'}}},
+            'host': None,
+        }}
+
+        # Act
+        schema = ProtocolSchema.from_settings(settings)
+
+        # Assert
+        assert schema.settings is settings
+        assert schema.get_request(False) is schema.node
+        assert schema.get_request(True) is schema.host
+        assert schema.node.display_message is False
+        assert schema.host.display_message is True
+        assert list(schema.node.actions) == [0x7d]
+        assert list(schema.host.actions) == []
+        assert schema.max_messages == 0
+        assert schema.max_bytes == 0
+
+    def test_protocol_schema_from_settings_profiles(self):
+        # Arrange
+        settings = {'Game': {'node': {}}, 'Profiles': {'login': {'host': {'actions': {0x7d: {'title': 'Login'}}}}}}
+
+        # Act
+        schema = ProtocolSchema.from_settings(settings)
+
+        # Assert
+        host, node = schema.profiles['login']
+        assert (host.request, node.request) == ('login host', 'login node')
+        assert list(host.actions) == [0x7d]
+        assert list(node.actions) == []
+        assert ProtocolSchema.from_settings({'Game': {'node': {}}}).profiles == {}
+
+    def test_protocol_schema_from_settings_limits(self):
+        # Act
+        schema = ProtocolSchema.from_settings({'Game': {'max_messages': 8, 'max_bytes': 1500, 'node': {}}})
+
+        # Assert
+        assert schema.max_messages == 8
+        assert schema.max_bytes == 1500
+
+    def test_protocol_schema_from_settings_invalid(self):
+        # Act
+        with raises(ValueError) as error:
+            ProtocolSchema.from_settings({'Network': {}})
+
+        # Assert
+        assert error.value.args == ('The Game settings are missing.',)
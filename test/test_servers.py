@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+Unit Test.
+"""
+from pytest import raises
+
+from src.sniparinject.core.capture import Flow
+from src.sniparinject.core.direction import Direction
+from src.sniparinject.core.servers import ServerEndpoint, ServerTable, get_port
+
+
+def test_get_port():
+    # Act
+    # Assert
+    assert get_port(None) is None
+    assert get_port('5122') == 5122
+    assert get_port(6900) == 6900
+    assert get_port('login') == 'login'
+
+
+class TestServerTable:
+    settings = {
+        'protocol': 'TCP',
+        'endpoints': [
+            {'name': 'login', 'ip': '52.174.196.146', 'port': 6900, 'profile': 'login'},
+            {'name': 'char', 'ip': '52.174.196.146', 'port': '6121'},
+            {'name': 'map', 'ip': '52.174.196.147', 'profile': 'map'},
+            {'name': 'chat', 'protocol': 'UDP', 'port': 7000, 'profile': 'login'},
+        ],
+    }
+    profiles = {'login': {}, 'map': {}}
+
+    def test_from_settings(self):
+        # Act
+        servers = ServerTable.from_settings(self.settings, self.profiles)
+
+        # Assert
+        assert servers.endpoints == [
+            ServerEndpoint('tcp', '52.174.196.146', 6900, 'login', 'login'),
+            ServerEndpoint('tcp', '52.174.196.146', 6121, 'char'),
+            ServerEndpoint('tcp', '52.174.196.147', None, 'map', 'map'),
+            ServerEndpoint('udp', None, 7000, 'chat', 'login'),
+        ]
+        assert servers.profiles == (None, 'login', 'map')
+
+    def test_from_settings_single_server(self):
+        # Act
+        servers = ServerTable.from_settings({'ip': '52.174.196.146', 'port': 5122})
+
+        # Assert
+        assert servers.endpoints == [ServerEndpoint('tcp', '52.174.196.146', 5122)]
+        assert servers.profiles == (None,)
+
+    def test_from_settings_invalid(self):
+        # Arrange
+        settings = [
+            {'endpoints': []},
+            {'endpoints': {'ip': '52.174.196.146'}},
+            {'endpoints': ['52.174.196.146']},
+            {'endpoints': [{'port': 5122, 'profile': 'map'}]},
+        ]
+
+        # Act
+        errors = []
+        for server_settings in settings:
+            with raises(RuntimeError) as error:
+                ServerTable.from_settings(server_settings, {'login': {}})
+            errors.append(error.value.args)
+
+        # Assert
+        assert errors == [
+            ('Error: The Server endpoints are not a list of servers.',),
+            ('Error: The Server endpoints are not a list of servers.',),
+            ('Error: The Server endpoint (52.174.196.146) is invalid.',),
+            ('Error: The Server profile (map) is not in Profiles.',),
+        ]
+
+    def test_get_filter(self):
+        # Arrange
+        servers = ServerTable.from_settings(self.settings, self.profiles)
+
+        # Act
+        sniffer_filter = servers.get_filter()
+
+        # Assert
+        assert sniffer_filter == ('(tcp and host 52.174.196.146 and port 6900)'
+                                  ' or (tcp and host 52.174.196.146 and port 6121)'
+                                  ' or (tcp and host 52.174.196.147)'
+                                  ' or (udp and port 7000)')
+
+    def test_get_filter_single_server(self):
+        # Act
+        # Assert
+        assert ServerTable([ServerEndpoint('udp', port=7000)]).get_filter() == 'udp and port 7000'
+        assert ServerTable([ServerEndpoint('tcp'), ServerEndpoint('tcp')]).get_filter() == 'tcp'
+
+    def test_classify(self):
+        # Arrange
+        servers = ServerTable.from_settings(self.settings, self.profiles)
+
+        # Act
+        classifications = [servers.classify(flow) for flow in (
+            Flow('tcp', '52.174.196.146', 6900, '192.168.1.7', 40000),
+            Flow('tcp', '192.168.1.7', 40001, '52.174.196.146', 6121),
+            Flow('tcp', '52.174.196.147', 5122, '192.168.1.7', 40002),
+            Flow('udp', '192.168.1.7', 40003, '10.0.0.1', 7000),
+            Flow('udp', '52.174.196.146', 6900, '192.168.1.7', 40000),
+            Flow('tcp', '52.174.196.146', 5122, '192.168.1.7', 40000),
+        )]
+
+        # Assert
+        assert classifications == [
+            (Direction.HOST, 'login'),
+            (Direction.NODE, None),
+            (Direction.HOST, 'map'),
+            (Direction.NODE, 'login'),
+            None,
+            None,
+        ]
+
+    def test_classify_without_address(self):
+        # Arrange
+        servers = ServerTable([ServerEndpoint('tcp')])
+
+        # Act
+        # Assert
+        assert servers.classify(Flow('tcp', '52.174.196.146', 6900, '192.168.1.7', 40000)) == (
+            Direction.NODE, None)
+        assert servers.classify(Flow('udp', '52.174.196.146', 6900, '192.168.1.7', 40000)) is None
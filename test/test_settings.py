@@ -3,13 +3,13 @@
 """
 Unit Test.
 """
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 from mock_open import MockOpen
 from pytest import raises
 from yaml import dump
 
-from src.sniparinject.core.settings import Settings
+from src.sniparinject.core.settings import Settings, SettingsCache, validate_settings
 
 
 class TestSettings:
@@ -55,3 +55,365 @@ class TestSettings:
                     # Assert
                     error_expected = f'Error: Not found settings in the file `{file_name}`.'
                     assert str(error) == error_expected
+
+
+class TestSettingsCache:
+    @staticmethod
+    def _write_settings(path, content: dict) -> None:
+        with open(path, 'w', encoding='utf-8') as handle:
+            handle.write(dump(content))
+
+    def test___init__(self):
+        # Arrange
+        config_file_expected = 'cached.yml'
+        check_interval_expected = 3.5
+
+        # Act
+        cache = SettingsCache(config_file_expected, check_interval_expected)
+
+        # Assert
+        assert cache.config_file == config_file_expected
+        assert cache.check_interval == check_interval_expected
+        assert cache.get_statistics() == {'reloads': 0, 'hits': 0}
+
+    def test_get_instance(self):
+        # Arrange
+        file_name = '/hck/it/shared-instance.yml'
+
+        # Act
+        cache_one = SettingsCache.get_instance(file_name)
+        cache_two = SettingsCache.get_instance(file_name, 7.0)
+
+        # Assert
+        assert cache_one is cache_two
+        assert cache_two.check_interval == 7.0
+
+    def test_get_dictionary_cache_hit(self, tmp_path):
+        # Arrange
+        expected = {'Game': {'node': {'display_message': True}}}
+        file_name = tmp_path / 'settings.yml'
+        self._write_settings(file_name, expected)
+        cache = SettingsCache(str(file_name), check_interval=0)
+
+        # Act
+        first = cache.get_dictionary()
+        second = cache.get_dictionary()
+
+        # Assert
+        assert first == expected
+        assert second is first
+        assert cache.get_statistics() == {'reloads': 1, 'hits': 1}
+
+    def test_get_dictionary_cache_hit_inside_interval(self, tmp_path):
+        # Arrange
+        file_name = tmp_path / 'settings.yml'
+        self._write_settings(file_name, {'Game': 'old'})
+        cache = SettingsCache(str(file_name), check_interval=3600)
+
+        # Act
+        first = cache.get_dictionary()
+        self._write_settings(file_name, {'Game': 'new content'})
+        second = cache.get_dictionary()
+
+        # Assert
+        assert first == second == {'Game': 'old'}
+        assert cache.get_statistics() == {'reloads': 1, 'hits': 1}
+
+    def test_get_dictionary_reload_when_file_changes(self, tmp_path):
+        # Arrange
+        file_name = tmp_path / 'settings.yml'
+        self._write_settings(file_name, {'Game': 'old'})
+        cache = SettingsCache(str(file_name), check_interval=0)
+
+        # Act
+        cache.get_dictionary()
+        self._write_settings(file_name, {'Game': 'new content'})
+        settings = cache.get_dictionary()
+
+        # Assert
+        assert settings == {'Game': 'new content'}
+        assert cache.get_statistics() == {'reloads': 2, 'hits': 0}
+
+    @patch('src.sniparinject.core.settings.Settings.get_dictionary')
+    def test_get_dictionary_without_file_always_reload(self, mock_settings):
+        # Arrange
+        mock_settings.side_effect = [{'Game': 1}, {'Game': 2}]
+        cache = SettingsCache('/hck/it/invisible.yml', check_interval=3600)
+
+        # Act
+        first = cache.get_dictionary()
+        second = cache.get_dictionary()
+
+        # Assert
+        assert first == {'Game': 1}
+        assert second == {'Game': 2}
+        assert cache.get_statistics() == {'reloads': 2, 'hits': 0}
+
+    def test_get_with_loader(self, tmp_path):
+        # Arrange
+        file_name = tmp_path / 'settings.yml'
+        self._write_settings(file_name, {'Game': {'node': {}}})
+        loader = MagicMock(return_value='Compiled')
+        cache = SettingsCache(str(file_name), check_interval=0, loader=loader)
+
+        # Act
+        first = cache.get()
+        second = cache.get()
+        settings = cache.get_dictionary()
+
+        # Assert
+        assert first == second == 'Compiled'
+        assert settings == {'Game': {'node': {}}}
+        loader.assert_called_once_with(settings)
+        assert cache.get_statistics() == {'reloads': 1, 'hits': 2}
+
+    def test_get_instance_with_loader(self):
+        # Arrange
+        file_name = '/hck/it/shared-loader.yml'
+
+        # Act
+        cache_one = SettingsCache.get_instance(file_name)
+        cache_two = SettingsCache.get_instance(file_name, loader=len)
+
+        # Assert
+        assert cache_one is not cache_two
+        assert cache_two is SettingsCache.get_instance(file_name, loader=len)
+        assert cache_two.loader is len
+
+
+class TestValidateSettings:
+    def test_validate_settings(self):
+        # Arrange
+        expected = {'Game': {'node': {'actions': {0x7d: {'title': 'Change'}, 0x85: None}}}}
+
+        # Act
+        settings = validate_settings(expected)
+
+        # Assert
+        assert settings is expected
+
+    def test_validate_settings_not_dictionary(self):
+        # Act
+        with raises(ValueError) as error:
+            validate_settings(['Game'])
+
+        # Assert
+        assert error.value.args == ('The settings are not a dictionary.',)
+
+    def test_validate_settings_game_missing(self):
+        # Act
+        with raises(ValueError) as error:
+            validate_settings({'Game': {}})
+
+        # Assert
+        assert error.value.args == ('The Game settings are missing.',)
+
+    def test_validate_settings_limits(self):
+        # Arrange
+        expected = {'Game': {'max_messages': 64, 'max_bytes': 0, 'node': {}}}
+
+        # Act
+        settings = validate_settings(expected)
+
+        # Assert
+        assert settings is expected
+
+    def test_validate_settings_limit_not_number(self):
+        # Act
+        with raises(ValueError) as error:
+            validate_settings({'Game': {'max_messages': 'all', 'node': {}}})
+
+        # Assert
+        assert error.value.args == ('The Game max_messages (all) is not a positive number.',)
+
+    def test_validate_settings_limit_negative(self):
+        # Act
+        with raises(ValueError) as error:
+            validate_settings({'Game': {'max_bytes': -1, 'node': {}}})
+
+        # Assert
+        assert error.value.args == ('The Game max_bytes (-1) is not a positive number.',)
+
+    def test_validate_settings_codegen_invalid(self):
+        # Act
+        with raises(ValueError) as error:
+            validate_settings({'Game': {'codegen': 'fast', 'node': {}}})
+
+        # Assert
+        assert error.value.args == ('The Game codegen (fast) is not Yes or No.',)
+
+    def test_validate_settings_id(self):
+        # Arrange
+        expected = {'Game': {'id': {'size': 1, 'signed': False, 'endian': 'Big'}, 'node': {}}}
+
+        # Act
+        settings = validate_settings(expected)
+
+        # Assert
+        assert settings is expected
+
+    def test_validate_settings_id_invalid(self):
+        # Arrange
+        ids = [[1], {'size': 4}, {'size': True}, {'signed': 'no'}, {'endian': 'middle'}]
+
+        # Act
+        errors = []
+        for id_settings in ids:
+            with raises(ValueError) as error:
+                validate_settings({'Game': {'id': id_settings, 'node': {}}})
+            errors.append(error.value.args)
+
+        # Assert
+        assert errors == [
+            ('The Game id settings are not a dictionary.',),
+            ('The Game id size (4) is not 1 or 2 bytes.',),
+            ('The Game id size (True) is not 1 or 2 bytes.',),
+            ('The Game id signed (no) is not Yes or No.',),
+            ('The Game id endian (middle) is not little or big.',),
+        ]
+
+    def test_validate_settings_style(self):
+        # Arrange
+        expected = {'Game': {'node': {}}, 'Style': {'color': False, 'title': '01;93', 'host': 44}}
+
+        # Act
+        settings = validate_settings(expected)
+
+        # Assert
+        assert settings is expected
+
+    def test_validate_settings_style_invalid(self):
+        # Arrange
+        styles = [['44'], {'color': 'never'}, {'italic': '03'}, {'host': 'blue'}, {'error': True}]
+
+        # Act
+        errors = []
+        for style_settings in styles:
+            with raises(ValueError) as error:
+                validate_settings({'Game': {'node': {}}, 'Style': style_settings})
+            errors.append(error.value.args)
+
+        # Assert
+        assert errors == [
+            ('The Style settings are not a dictionary.',),
+            ('The Style color (never) is not Yes or No.',),
+            ('The Style italic is not title, normal, bold, light, error, host, node or color.',),
+            ('The Style host (blue) is not an ANSI code.',),
+            ('The Style error (True) is not an ANSI code.',),
+        ]
+
+    def test_validate_settings_request_not_dictionary(self):
+        # Act
+        with raises(ValueError) as error:
+            validate_settings({'Game': {'host': 'Hi'}})
+
+        # Assert
+        assert error.value.args == ('The Game host settings are not a dictionary.',)
+
+    def test_validate_settings_actions_not_dictionary(self):
+        # Act
+        with raises(ValueError) as error:
+            validate_settings({'Game': {'node': {'actions': [1, 2]}}})
+
+        # Assert
+        assert error.value.args == ('The Game node actions are not a dictionary.',)
+
+    def test_validate_settings_action_id_not_number(self):
+        # Act
+        with raises(ValueError) as error:
+            validate_settings({'Game': {'node': {'actions': {'0x7d': {}}}}})
+
+        # Assert
+        assert error.value.args == ('The Game node action ID (0x7d) is not a number.',)
+
+    def test_validate_settings_action_invalid(self):
+        # Act
+        with raises(ValueError) as error:
+            validate_settings({'Game': {'host': {'actions': {0x78: 'NPC'}}}})
+
+        # Assert
+        assert error.value.args == ('The Game host action (0x78) is invalid.',)
+
+    def test_validate_settings_lengths(self):
+        # Arrange
+        expected = {'Game': {'node': {'lengths': {0x7d: 2, 0x1f0: {'offset': 2}}}}}
+
+        # Act
+        settings = validate_settings(expected)
+
+        # Assert
+        assert settings is expected
+
+    def test_validate_settings_lengths_id_size(self):
+        # Arrange
+        expected = {'Game': {'id': {'size': 1}, 'node': {'lengths': {0x7d: 1, 0xf0: {'offset': 1}}}},
+                    'Profiles': {'login': {'host': {'lengths': {0x33: 1}}}}}
+
+        # Act
+        settings = validate_settings(expected)
+        with raises(ValueError) as error:
+            validate_settings({'Game': {'node': {}}, 'Profiles': {'login': {'host': {'lengths': {0x33: 1}}}}})
+
+        # Assert
+        assert settings is expected
+        assert error.value.args == ('The Game login host length (0x33) is not a number of bytes or an'
+                                    ' offset after the ID.',)
+
+    def test_validate_settings_lengths_not_dictionary(self):
+        # Act
+        with raises(ValueError) as error:
+            validate_settings({'Game': {'node': {'lengths': [2, 4]}}})
+
+        # Assert
+        assert error.value.args == ('The Game node lengths are not a dictionary.',)
+
+    def test_validate_settings_length_id_not_number(self):
+        # Act
+        with raises(ValueError) as error:
+            validate_settings({'Game': {'host': {'lengths': {'0x7d': 2}}}})
+
+        # Assert
+        assert error.value.args == ('The Game host length ID (0x7d) is not a number.',)
+
+    def test_validate_settings_length_invalid(self):
+        # Arrange
+        lengths = [1, 'all', True, {'offset': 0}, {'size': 2}]
+
+        # Act
+        errors = []
+        for length in lengths:
+            with raises(ValueError) as error:
+                validate_settings({'Game': {'node': {'lengths': {0x7d: length}}}})
+            errors.append(error.value.args)
+
+        # Assert
+        assert errors == [('The Game node length (0x7d) is not a number of bytes or an offset after'
+                           ' the ID.',)] * len(lengths)
+
+    def test_validate_settings_profiles(self):
+        # Arrange
+        expected = {'Game': {'node': {}}, 'Profiles': {'login': {'host': {'actions': {0x7d: None}}}}}
+
+        # Act
+        settings = validate_settings(expected)
+
+        # Assert
+        assert settings is expected
+
+    def test_validate_settings_profiles_invalid(self):
+        # Arrange
+        profiles = [['login'], {'login': None}, {'login': {'node': {'actions': {'0x7d': None}}}}]
+
+        # Act
+        errors = []
+        for profile in profiles:
+            with raises(ValueError) as error:
+                validate_settings({'Game': {'node': {}}, 'Profiles': profile})
+            errors.append(error.value.args)
+
+        # Assert
+        assert errors == [
+            ('The Profiles settings are not a dictionary.',),
+            ('The Profiles login settings are not a dictionary.',),
+            ('The Game login node action ID (0x7d) is not a number.',),
+        ]
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+Unit Test.
+"""
+import os
+from time import monotonic, sleep
+from unittest.mock import MagicMock, patch, call
+
+from pytest import raises
+from yaml import dump
+
+from src.sniparinject.core.schema import ProtocolSchema
+from src.sniparinject.core.settings_watcher import Inotify, SettingsWatcher
+
+
+def write_settings(path, content: dict) -> None:
+    with open(path, 'w', encoding='utf-8') as handle:
+        handle.write(dump(content))
+
+
+def wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = monotonic() + timeout
+    while not condition() and monotonic() < deadline:
+        sleep(0.01)
+    return condition()
+
+
+class TestInotify:
+    def test_watch_and_read_names(self, tmp_path):
+        # Arrange
+        inotify = Inotify.watch(str(tmp_path))
+
+        # Act
+        empty_names = inotify.read_names()
+        write_settings(tmp_path / 'settings.yml', {'Game': 1})
+        write_settings(tmp_path / 'other.yml', {'Game': 2})
+        names = inotify.read_names()
+        inotify.close()
+
+        # Assert
+        assert empty_names == set()
+        assert names == {'settings.yml', 'other.yml'}
+
+    @patch('src.sniparinject.core.settings_watcher.ctypes.CDLL')
+    def test_watch_without_inotify(self, mock_cdll: MagicMock):
+        # Arrange
+        mock_cdll.side_effect = OSError('No C library')
+
+        # Act
+        inotify = Inotify.watch('/tmp')
+
+        # Assert
+        assert inotify is None
+
+    @patch('src.sniparinject.core.settings_watcher.ctypes.CDLL')
+    def test_watch_init_error(self, mock_cdll: MagicMock):
+        # Arrange
+        mock_cdll.return_value.inotify_init1.return_value = -1
+
+        # Act
+        inotify = Inotify.watch('/tmp')
+
+        # Assert
+        assert inotify is None
+        mock_cdll.return_value.inotify_add_watch.assert_not_called()
+
+    @patch('src.sniparinject.core.settings_watcher.os.close')
+    @patch('src.sniparinject.core.settings_watcher.ctypes.CDLL')
+    def test_watch_add_watch_error(self, mock_cdll: MagicMock, mock_close: MagicMock):
+        # Arrange
+        mock_cdll.return_value.inotify_init1.return_value = 987
+        mock_cdll.return_value.inotify_add_watch.return_value = -1
+
+        # Act
+        inotify = Inotify.watch('/not/a/directory')
+
+        # Assert
+        assert inotify is None
+        mock_close.assert_called_once_with(987)
+
+
+class TestSettingsWatcher:
+    settings = {'Game': {'node': {'actions': {0x7d: {'title': 'Scenario change'}}}}}
+    new_settings = {'Game': {'host': {'actions': {0x78: {'title': 'NPC Info'}}}}}
+
+    def test___init__(self, tmp_path):
+        # Arrange
+        file_name = str(tmp_path / 'settings.yml')
+        write_settings(file_name, self.settings)
+
+        # Act
+        watcher = SettingsWatcher(file_name, 0.5, False)
+
+        # Assert
+        assert watcher.config_file == file_name
+        assert watcher.poll_interval == 0.5
+        assert watcher.use_inotify is False
+        assert watcher.current == self.settings
+        assert watcher.statistics == {'reloads': 0, 'errors': 0}
+        assert watcher.last_error is None
+        assert watcher.daemon is True
+
+    def test___init___invalid_settings(self, tmp_path):
+        # Arrange
+        file_name = str(tmp_path / 'settings.yml')
+        write_settings(file_name, {'Network': {}})
+
+        # Act
+        with raises(ValueError) as error:
+            SettingsWatcher(file_name)
+
+        # Assert
+        assert error.value.args == ('The Game settings are missing.',)
+
+    def test___init___loader(self, tmp_path):
+        # Arrange
+        file_name = str(tmp_path / 'settings.yml')
+        write_settings(file_name, self.settings)
+
+        # Act
+        watcher = SettingsWatcher(file_name, loader=lambda settings: len(settings['Game']))
+
+        # Assert
+        assert watcher.current == 1
+
+    def test_reload(self, tmp_path):
+        # Arrange
+        file_name = str(tmp_path / 'settings.yml')
+        write_settings(file_name, self.settings)
+        watcher = SettingsWatcher(file_name)
+        write_settings(file_name, self.new_settings)
+
+        # Act
+        published = watcher.reload()
+
+        # Assert
+        assert published is True
+        assert watcher.current == self.new_settings
+        assert watcher.statistics == {'reloads': 1, 'errors': 0}
+
+    @patch('builtins.print')
+    def test_reload_keep_last_valid_settings(self, mock_print: MagicMock, tmp_path):
+        # Arrange
+        file_name = str(tmp_path / 'settings.yml')
+        write_settings(file_name, self.settings)
+        watcher = SettingsWatcher(file_name)
+        write_settings(file_name, {'Game': {'node': 'Broken'}})
+
+        # Act
+        published = watcher.reload()
+
+        # Assert
+        assert published is False
+        assert watcher.current == self.settings
+        assert watcher.statistics == {'reloads': 0, 'errors': 1}
+        assert str(watcher.last_error) == 'The Game node settings are not a dictionary.'
+        mock_print.assert_has_calls([
+            call('\x1b[00;37;41mError Settings: The Game node settings are not a dictionary.\x1b[0m'),
+            call(f'\x1b[00;37;41mLocation: SettingsWatcher -> reload() -> {file_name}\x1b[0m'),
+            call('\x1b[00;37;41mThe last valid settings are still in use.\x1b[0m'),
+            call(),
+        ])
+
+    @patch('builtins.print')
+    def test_reload_error_with_location(self, mock_print: MagicMock, tmp_path):
+        # Arrange
+        file_name = str(tmp_path / 'settings.yml')
+        write_settings(file_name, self.settings)
+        watcher = SettingsWatcher(file_name, loader=ProtocolSchema.from_settings)
+        write_settings(file_name, {'Game': {'node': {'actions': {0x7d: {}}}}})
+
+        # Act
+        published = watcher.reload()
+
+        # Assert
+        assert published is False
+        assert watcher.current.node.actions[0x7d].title == 'Scenario change'
+        mock_print.assert_has_calls([
+            call('\x1b[00;37;41mError Settings: The action is empty.\x1b[0m'),
+            call(f'\x1b[00;37;41mLocation: SettingsWatcher -> reload() -> {file_name}'
+                 f' -> compile_request(node, 0x7d) -> compile_action()\x1b[0m'),
+        ])
+
+    def test_run_inotify(self, tmp_path):
+        # Arrange
+        file_name = str(tmp_path / 'settings.yml')
+        write_settings(file_name, self.settings)
+        watcher = SettingsWatcher(file_name)
+        watcher.start()
+        sleep(0.05)
+
+        # Act
+        write_settings(tmp_path / 'unrelated.yml', {'Game': {}})
+        temporary_file = str(tmp_path / 'settings.yml.swp')
+        write_settings(temporary_file, self.new_settings)
+        os.replace(temporary_file, file_name)
+        published = wait_for(lambda: watcher.current == self.new_settings)
+        watcher.stop()
+
+        # Assert
+        assert published is True
+        assert watcher.statistics == {'reloads': 1, 'errors': 0}
+        assert watcher.is_alive() is False
+
+    def test_run_polling(self, tmp_path):
+        # Arrange
+        file_name = str(tmp_path / 'settings.yml')
+        write_settings(file_name, self.settings)
+        watcher = SettingsWatcher(file_name, poll_interval=0.01, use_inotify=False)
+        watcher.start()
+        sleep(0.05)
+
+        # Act
+        write_settings(file_name, self.new_settings)
+        published = wait_for(lambda: watcher.current == self.new_settings)
+        watcher.stop()
+
+        # Assert
+        assert published is True
+        assert watcher.statistics == {'reloads': 1, 'errors': 0}
+
+    @patch('src.sniparinject.core.settings_watcher.Inotify.watch')
+    def test_run_polling_when_inotify_is_not_available(self, mock_watch: MagicMock, tmp_path):
+        # Arrange
+        file_name = str(tmp_path / 'settings.yml')
+        write_settings(file_name, self.settings)
+        mock_watch.return_value = None
+        watcher = SettingsWatcher(file_name, poll_interval=0.01)
+        watcher.start()
+
+        # Act
+        write_settings(file_name, self.new_settings)
+        published = wait_for(lambda: watcher.current == self.new_settings)
+        watcher.stop()
+
+        # Assert
+        assert published is True
+        mock_watch.assert_called_once_with(str(tmp_path))
+
+    def test_stop_without_start(self, tmp_path):
+        # Arrange
+        file_name = str(tmp_path / 'settings.yml')
+        write_settings(file_name, self.settings)
+        watcher = SettingsWatcher(file_name)
+
+        # Act
+        watcher.stop()
+
+        # Assert
+        assert watcher.is_alive() is False
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+Unit Test.
+"""
+from os import kill
+from signal import SIGINT, SIG_IGN
+from threading import Event
+from unittest.mock import patch, MagicMock, call
+
+from pytest import raises
+
+from src.sniparinject.core.capture import Flow
+from src.sniparinject.core.direction import Direction
+from src.sniparinject.core.parser import ProtocolParser
+from src.sniparinject.core.reassembly import StreamReassembler
+from src.sniparinject.core.shared_ring import SLOT_OBJECT, SLOT_PAYLOAD, SLOT_STOP
+from src.sniparinject.core.sharding import ShardedParser, parse_payload, parse_shard, shard_key
+
+
+def test_shard_key():
+    # Arrange
+    flow = Flow('tcp', '10.0.0.2', 5122, '10.0.0.1', 40000)
+    reply = Flow('tcp', '10.0.0.1', 40000, '10.0.0.2', 5122)
+
+    # Act
+    # Assert
+    assert shard_key(flow) == shard_key(reply) == ('tcp', ('10.0.0.1', 40000), ('10.0.0.2', 5122))
+    assert shard_key(flow._replace(protocol='udp')) != shard_key(flow)
+
+
+@patch('src.sniparinject.core.sharding.signal')
+def test_parse_shard(mock_signal: MagicMock):
+    # Arrange
+    settings = {'Game': {'node': {}, 'host': {'actions': {0x0a: {'title': 'Heal',
+                                                                  'structs': [{'type': 'unsigned short'}]}}}}}
+    cure = {'Game': {'node': {}, 'host': {'actions': {0x0a: {'title': 'Cure'}}}}}
+    tcp = Flow('tcp', '10.0.0.2', 5122, '10.0.0.3', 40000)
+    udp = Flow('udp', '10.0.0.2', 5122, '10.0.0.3', 40000)
+    ring = MagicMock()
+    ring.get.side_effect = [
+        (SLOT_PAYLOAD, tcp, Direction.HOST, 1, 100, memoryview(b'\x0a\x00\x01')),
+        (SLOT_PAYLOAD, tcp, Direction.HOST, 1, 103, memoryview(b'\x00\x0a\x00\x02\x00')),
+        (SLOT_PAYLOAD, tcp, Direction.HOST, 1, 100, memoryview(b'\x0a\x00\x01')),
+        (SLOT_OBJECT, None, Direction.HOST, 0, 0, cure),
+        (SLOT_PAYLOAD, udp, Direction.HOST, 0, 0, memoryview(b'\x0a\x00')),
+        (SLOT_OBJECT, None, Direction.HOST, 0, 0, tcp),
+        (SLOT_STOP, None, Direction.HOST, 0, 0, None),
+    ]
+    outbox = MagicMock()
+
+    # Act
+    with patch('src.sniparinject.core.sharding.StreamReassembler', wraps=StreamReassembler) as mock_reassembler:
+        parse_shard(settings, ring, 1, outbox, 4096, (None, 'Server'), 8)
+
+    # Assert
+    heal = '\x1b[00;93;44m<-- Heal\x1b[0m\x1b[00;30;44m |\x1b[0m\x1b[00;96;44m {}\x1b[0m\x1b[00;30;44m |\x1b[0m'
+    assert outbox.put.call_args_list == [
+        call([heal.format(1), heal.format(2)]),
+        call(['\x1b[00;93;44m<-- Cure\x1b[0m\x1b[00;30;44m |\x1b[0m']),
+        call((1, {'payloads': 3, 'messages': 3, 'leftover': 0},
+              {'segments': 3, 'retransmits': 1, 'out_of_order': 0, 'gaps': 0, 'flows': 0})),
+    ]
+    mock_reassembler.assert_called_once_with(4096, 8)
+    assert ring.get.call_args_list == [call(1)] * 7
+    assert ring.release.call_args_list == [call(1)] * 7
+    ring.close.assert_called_once_with()
+    mock_signal.assert_called_once_with(SIGINT, SIG_IGN)
+
+
+def test_parse_payload_limited_stream():
+    # Arrange
+    parser = ProtocolParser.from_settings({'Game': {'max_messages': 2, 'node': {}, 'host': {'actions': {
+        0x0a: {'title': 'Heal', 'structs': [{'type': 'unsigned short'}]}}}}})
+    reassembler = StreamReassembler(4096)
+    statistics = {'payloads': 0, 'messages': 0, 'leftover': 0}
+    flow = Flow('tcp', '10.0.0.2', 5122, '10.0.0.3', 40000)
+
+    # Act
+    first = parse_payload(parser, reassembler, statistics, flow, (Direction.HOST, None), 1,
+                          b'\x0a\x00\x01\x00\x0a\x00\x02\x00\x0a\x00\x03\x00\x0a\x00')
+    second = parse_payload(parser, reassembler, statistics, flow, (Direction.HOST, None), 15,
+                           b'\x04\x00\x0a\x00\x05\x00')
+
+    # Assert
+    heal = '\x1b[00;93;44m<-- Heal\x1b[0m\x1b[00;30;44m |\x1b[0m\x1b[00;96;44m {}\x1b[0m\x1b[00;30;44m |\x1b[0m'
+    assert first == [heal.format(1), heal.format(2)]
+    assert second == [heal.format(3), heal.format(4)]
+    assert statistics == {'payloads': 2, 'messages': 4, 'leftover': 0}
+    assert reassembler.streams[flow].tail == b'\x0a\x00\x05\x00'
+
+
+@patch('src.sniparinject.core.sharding.signal')
+def test_parse_shard_discard_without_reassembly(mock_signal: MagicMock):
+    # Arrange
+    ring = MagicMock()
+    ring.get.side_effect = [
+        (SLOT_OBJECT, None, Direction.HOST, 0, 0, Flow('tcp', '10.0.0.2', 5122, '10.0.0.3', 40000)),
+        (SLOT_STOP, None, Direction.HOST, 0, 0, None),
+    ]
+    outbox = MagicMock()
+
+    # Act
+    parse_shard({'Game': {'node': {}, 'host': {}}}, ring, 0, outbox, 0)
+
+    # Assert
+    outbox.put.assert_called_once_with((0, {'payloads': 0, 'messages': 0, 'leftover': 0}, None))
+    mock_signal.assert_called_once_with(SIGINT, SIG_IGN)
+
+
+class TestShardedParser:
+    settings = {
+        'Network': {'interface': ''},
+        'Game': {'node': {}, 'host': {'actions': {0x0a: {'title': 'Heal',
+                                                          'structs': [{'type': 'unsigned short'}]}}}},
+        'Server': {'port': 5122},
+    }
+
+    def test___init___workers_invalid(self):
+        # Act
+        with raises(RuntimeError) as error:
+            ShardedParser(self.settings, 0)
+
+        # Assert
+        assert error.value.args == ('Error: The workers (0) must be at least 1.',)
+
+    @patch('builtins.print')
+    def test_put(self, mock_print: MagicMock):
+        # Arrange
+        flows = [Flow('tcp', '10.0.0.2', 5122, f'10.0.0.{index}', 40000) for index in range(3, 7)]
+        sharded_parser = ShardedParser(self.settings, 2, max_stream_bytes=4096, queue_size=2)
+
+        # Act
+        sharded_parser.start()
+        for flow in flows:
+            sharded_parser.put(flow, Direction.HOST, None, 100, b'\x0a\x00\x01')
+            sharded_parser.put(flow, Direction.HOST, None, 103, memoryview(b'\x00\x0a\x00\x02\x00'))
+        sharded_parser.stop()
+
+        # Assert
+        heal = '\x1b[00;93;44m<-- Heal\x1b[0m\x1b[00;30;44m |\x1b[0m\x1b[00;96;44m {}\x1b[0m\x1b[00;30;44m |\x1b[0m'
+        assert mock_print.call_args_list == [call(heal.format(1) + '\n' + heal.format(2))] * 4
+        assert sharded_parser.get_statistics() == {'workers': 2, 'enqueued': 8, 'lost': 0, 'in_place': 8,
+                                                   'queued': 0}
+        assert sharded_parser.parser_statistics == {'payloads': 8, 'messages': 8, 'leftover': 0}
+        assert sharded_parser.reassembly_statistics == {'segments': 8, 'retransmits': 0, 'out_of_order': 0,
+                                                        'gaps': 0, 'flows': 4}
+
+    @patch('builtins.print')
+    def test_update_settings(self, mock_print: MagicMock):
+        # Arrange
+        settings = dict(self.settings, Game={'node': {}, 'host': {'actions': {0x0a: {'title': 'Cure'}}}})
+        sharded_parser = ShardedParser(self.settings, 1)
+
+        # Act
+        sharded_parser.start()
+        sharded_parser.update_settings(self.settings)
+        sharded_parser.put(Flow('udp', '10.0.0.2', 5122, '10.0.0.3', 1), Direction.HOST, None, 0, b'\x0a\x00\x01\x00')
+        sharded_parser.update_settings(settings)
+        sharded_parser.put(Flow('udp', '10.0.0.2', 5122, '10.0.0.3', 1), Direction.HOST, None, 0, b'\x0a\x00')
+        sharded_parser.stop()
+
+        # Assert
+        assert sharded_parser.settings is settings
+        assert mock_print.call_args_list == [
+            call('\x1b[00;93;44m<-- Heal\x1b[0m\x1b[00;30;44m |\x1b[0m\x1b[00;96;44m 1\x1b[0m'
+                 '\x1b[00;30;44m |\x1b[0m'),
+            call('\x1b[00;93;44m<-- Cure\x1b[0m\x1b[00;30;44m |\x1b[0m'),
+        ]
+        assert sharded_parser.reassembly_statistics is None
+
+    @patch('builtins.print')
+    def test_put_interrupted(self, mock_print: MagicMock):
+        # Arrange
+        flow = Flow('udp', '10.0.0.2', 5122, '10.0.0.3', 1)
+        printed = Event()
+        mock_print.side_effect = lambda *_: printed.set()
+        sharded_parser = ShardedParser(self.settings, 1)
+        sharded_parser.start()
+        sharded_parser.put(flow, Direction.HOST, None, 0, b'\x0a\x00\x01\x00')
+        assert printed.wait(30)
+
+        # Act
+        kill(sharded_parser._processes[0].pid, SIGINT)
+        for _ in range(9):
+            sharded_parser.put(flow, Direction.HOST, None, 0, b'\x0a\x00\x01\x00')
+        sharded_parser.stop()
+
+        # Assert
+        assert sharded_parser._processes[0].exitcode == 0
+        assert sharded_parser.parser_statistics == {'payloads': 10, 'messages': 10, 'leftover': 0}
+        assert mock_print.call_count == 10
+
+    @patch('src.sniparinject.core.sharding.WAIT_TIMEOUT', 0.01)
+    @patch('builtins.print')
+    def test_put_dead_worker(self, mock_print: MagicMock):
+        # Arrange
+        flow = Flow('udp', '10.0.0.2', 5122, '10.0.0.3', 1)
+        sharded_parser = ShardedParser(self.settings, 1, queue_size=1)
+        sharded_parser.start()
+        sharded_parser._processes[0].kill()
+        sharded_parser._processes[0].join()
+
+        # Act
+        for _ in range(3):
+            sharded_parser.put(flow, Direction.HOST, None, 0, b'\x0a\x00\x01\x00')
+        sharded_parser.stop()
+
+        # Assert
+        assert sharded_parser.get_statistics() == {'workers': 1, 'enqueued': 1, 'lost': 2, 'in_place': 1,
+                                                   'queued': 0}
+        assert sharded_parser.parser_statistics == {'payloads': 0, 'messages': 0, 'leftover': 0}
+        assert mock_print.call_args_list == [
+            call('\x1b[00;37;41mError Shards: The worker (0) died with the exit code (-9).\x1b[0m'),
+            call('\x1b[00;37;41mLocation: ShardedParser -> _send()\x1b[0m'),
+            call(),
+        ]
+
+    def test_discard(self):
+        # Arrange
+        flow = Flow('tcp', '10.0.0.2', 5122, '10.0.0.3', 40000)
+        sharded_parser = ShardedParser(self.settings, 2, max_stream_bytes=4096, max_flows=8)
+
+        # Act
+        with patch.object(sharded_parser.ring, 'put_object', return_value=True) as mock_put_object:
+            sharded_parser.discard(flow)
+        sharded_parser.ring.unlink()
+
+        # Assert
+        mock_put_object.assert_called_once_with(hash(shard_key(flow)) % 2, flow, timeout=1.0)
+        assert sharded_parser._processes[1]._args[4:] == (4096, (None,), 8)
+
+    def test_stop_slow_workers(self):
+        # Arrange
+        sharded_parser = ShardedParser(self.settings, 2)
+        slow = MagicMock(pid=1, exitcode=None)
+        slow.is_alive.return_value = True
+        sharded_parser._processes = [slow, MagicMock(pid=None)]
+
+        # Act
+        with patch.object(sharded_parser.ring, 'put_stop', side_effect=[False, True, True]) as mock_put_stop:
+            sharded_parser.stop()
+
+        # Assert
+        assert mock_put_stop.call_args_list == [call(0, timeout=1.0), call(0, timeout=1.0), call(1, timeout=1.0)]
+        slow.join.assert_has_calls([call(1.0), call()])
+        slow.terminate.assert_called_once_with()
+        assert sharded_parser._dead == set()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+Unit Test.
+"""
+from multiprocessing.shared_memory import SharedMemory
+
+from pytest import raises
+
+from src.sniparinject.core.capture import Flow
+from src.sniparinject.core.direction import Direction
+from src.sniparinject.core.shared_ring import (SLOT_OBJECT, SLOT_PAYLOAD, SLOT_STOP, SLOT_HEADER,
+                                               SharedRing)
+
+
+class TestSharedRing:
+    flow = Flow('tcp', '10.0.0.2', 5122, '192.168.1.7', 40000)
+
+    def test___init___slot_size_invalid(self):
+        # Act
+        with raises(RuntimeError) as error:
+            SharedRing(1, slot_size=SLOT_HEADER.size)
+
+        # Assert
+        assert error.value.args == ('Error: The slot size (25) must be bigger than 25.',)
+
+    def test_put_get(self):
+        # Arrange
+        ring = SharedRing(2, slots=2, slot_size=SLOT_HEADER.size + 4)
+        udp_flow = self.flow._replace(protocol='udp')
+        items = []
+
+        # Act
+        try:
+            for sequence in range(5):
+                ring.put(1, self.flow, Direction.NODE, sequence, memoryview(b'\x0a\x00\x01\x02'), 300)
+                kind, flow, direction, profile, read_sequence, data = ring.get(1)
+                items.append((kind, flow, direction, profile, read_sequence, bytes(data)))
+                data.release()
+                ring.release(1)
+
+            ring.put(0, udp_flow, Direction.HOST, 0xffffffff, b'\x0a\x00\x01\x02\x03')
+            items.append(ring.get(0))
+            ring.release(0)
+            statistics = ring.get_statistics()
+        finally:
+            ring.unlink()
+
+        # Assert
+        assert items[:5] == [(SLOT_PAYLOAD, self.flow, Direction.NODE, 300, sequence, b'\x0a\x00\x01\x02')
+                             for sequence in range(5)]
+        assert items[5] == (SLOT_PAYLOAD, udp_flow, Direction.HOST, 0, 0xffffffff, b'\x0a\x00\x01\x02\x03')
+        assert statistics == {'in_place': 5, 'queued': 1}
+
+    def test_put_object_and_stop(self):
+        # Arrange
+        ring = SharedRing(1, slots=4)
+
+        # Act
+        try:
+            ring.put_object(0, {'Game': {}})
+            ring.put(0, self.flow, Direction.HOST, 7, b'')
+            ring.put_stop(0)
+            items = []
+            for _ in range(3):
+                kind, flow, direction, profile, sequence, data = ring.get(0)
+                items.append((kind, flow, direction, profile, sequence,
+                              bytes(data) if kind == SLOT_PAYLOAD else data))
+                data = None
+                ring.release(0)
+        finally:
+            ring.unlink()
+
+        # Assert
+        assert items == [
+            (SLOT_OBJECT, None, Direction.HOST, 0, 0, {'Game': {}}),
+            (SLOT_PAYLOAD, self.flow, Direction.HOST, 0, 7, b''),
+            (SLOT_STOP, None, Direction.HOST, 0, 0, None),
+        ]
+
+    def test_put_timeout(self):
+        # Arrange
+        ring = SharedRing(1, slots=1)
+
+        # Act
+        try:
+            written = ring.put(0, self.flow, Direction.HOST, 0, b'\x0a', timeout=0)
+            full = [
+                ring.put(0, self.flow, Direction.HOST, 1, b'\x0b', timeout=0),
+                ring.put_object(0, {'Game': {}}, timeout=0),
+                ring.put_stop(0, timeout=0),
+            ]
+            statistics = ring.get_statistics()
+        finally:
+            ring.unlink()
+
+        # Assert
+        assert written is True
+        assert full == [False, False, False]
+        assert statistics == {'in_place': 1, 'queued': 0}
+
+    def test_close_unlink(self):
+        # Arrange
+        ring = SharedRing(1, slots=1)
+        name = ring.memory.name
+
+        # Act
+        ring.close()
+        closed = ring.memory.buf
+        ring.unlink()
+
+        # Assert
+        assert closed is None
+        with raises(FileNotFoundError):
+            SharedMemory(name)
@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+Unit Test.
+"""
+from json import loads
+from sqlite3 import DatabaseError, connect
+from unittest.mock import call, patch, MagicMock
+
+from pytest import raises
+
+from src.sniparinject.core.direction import Direction
+from src.sniparinject.core.parser import ProtocolParser, Record
+from src.sniparinject.core.sinks import FileSink, Sink, SinkTable, SQLiteSink, encode_value
+
+
+def test_encode_value():
+    # Act
+    with raises(TypeError) as error:
+        encode_value(1j)
+
+    # Assert
+    assert encode_value(memoryview(b'\x0a\xff')) == '0aff'
+    assert error.value.args == ('The value (1j) could not be written.',)
+
+
+def test_sink_abstract():
+    # Act
+    with raises(TypeError) as error:
+        Sink()
+
+    # Assert
+    assert 'abstract methods close, write' in error.value.args[0]
+
+
+class TestFileSink:
+    settings = {'Game': {
+        'host': {'actions': {0x7d: {'title': 'Scenario change'}}},
+        'node': {'actions': {
+            0x85: {'title': 'Player move to', 'structs': [
+                {'name': 'X', 'type': 'unsigned short'},
+                {'type': 'unsigned char', 'reference': {1: 'Up'}},
+                {'name': 'Map', 'type': 'chars', 'size': 2},
+                {'name': 'Path', 'type': 'unsigned char', 'size': 2},
+            ]},
+        }},
+    }}
+
+    def test___init___format_invalid(self, tmp_path):
+        # Act
+        with raises(RuntimeError) as error:
+            FileSink(str(tmp_path / 'messages.xml'), 'xml')
+
+        # Assert
+        assert error.value.args == ('Error: The Sink format (xml) is not jsonl or csv.',)
+
+    def test_write_json(self, tmp_path):
+        # Arrange
+        parser = ProtocolParser.from_settings(self.settings)
+        records = list(parser.parse(b'\x85\x00\x0c\x00\x01ab\x03\x04\x0a\x00\xff', Direction.NODE,
+                                    timestamp=1.5))
+        records.append(Record(Direction.NODE, None, error=('S.o.S', 'Phone cabin')))
+        scenario = next(iter(parser.parse(b'\x7d\x00', Direction.HOST, timestamp=2.5)))
+        sink = FileSink(str(tmp_path / 'messages.jsonl'))
+
+        # Act
+        for record in records:
+            sink.write(record)
+        sink.write(scenario, 'Login')
+        sink.write(scenario, 'Login')
+        sink.write(scenario)
+        sink.close()
+
+        # Assert
+        lines = (tmp_path / 'messages.jsonl').read_text().splitlines()
+        assert [loads(line) for line in lines] == [
+            {'timestamp': 1.5, 'direction': 'node', 'action_id': 0x85, 'action': 'Player move to',
+             'fields': {'X': 12, 'field_1': 'Up', 'Map': '6162', 'Path': [3, 4]}},
+            {'timestamp': 1.5, 'direction': 'node', 'action_id': 0x0a, 'data': 'ff'},
+            {'timestamp': 2.5, 'profile': 'Login', 'direction': 'host', 'action_id': 0x7d,
+             'action': 'Scenario change', 'fields': {}},
+            {'timestamp': 2.5, 'profile': 'Login', 'direction': 'host', 'action_id': 0x7d,
+             'action': 'Scenario change', 'fields': {}},
+            {'timestamp': 2.5, 'direction': 'host', 'action_id': 0x7d, 'action': 'Scenario change',
+             'fields': {}},
+        ]
+        assert sink.get_statistics() == {'records': 5, 'bytes': sum(len(line) + 1 for line in lines),
+                                         'rotations': 0}
+
+    def test_write_csv(self, tmp_path):
+        # Arrange
+        parser = ProtocolParser.from_settings(self.settings)
+        records = list(parser.parse(b'\x85\x00\x0c\x00\x02ab\x03\x04\x0a\x00\xff', Direction.NODE))
+        records += parser.parse(b'\x85\x00\x0d\x00\x01cd\x05\x06', Direction.NODE, timestamp=2.0)
+        records.append(Record(Direction.NODE, 0x85, parser.get_request(Direction.NODE).actions[0x85],
+                              timestamp=3.0))
+        scenario = next(iter(parser.parse(b'\x7d\x00', Direction.HOST, timestamp=4.0)))
+        sink = FileSink(str(tmp_path / 'messages.csv'), 'csv')
+
+        # Act
+        for record in records:
+            sink.write(record)
+        sink.write(records[0], 'Login')
+        sink.write(scenario)
+        sink.write(scenario)
+        sink.write(scenario, 'Login')
+        sink.close()
+
+        # Assert
+        assert (tmp_path / 'messages.node.0085.csv').read_text().splitlines() == [
+            'timestamp,direction,action_id,action,X,field_1,Map,Path',
+            '0.0,node,133,Player move to,12,2,6162,"[3,4]"',
+            '2.0,node,133,Player move to,13,Up,6364,"[5,6]"',
+            '3.0,node,133,Player move to',
+        ]
+        assert (tmp_path / 'messages.node.unknown.csv').read_text().splitlines() == [
+            'timestamp,direction,action_id,data',
+            '0.0,node,10,ff',
+        ]
+        assert (tmp_path / 'messages.Login.node.0085.csv').read_text().splitlines() == [
+            'timestamp,direction,action_id,action,X,field_1,Map,Path',
+            '0.0,node,133,Player move to,12,2,6162,"[3,4]"',
+        ]
+        assert (tmp_path / 'messages.host.007d.csv').read_text().splitlines() == [
+            'timestamp,direction,action_id,action',
+            '4.0,host,125,Scenario change',
+            '4.0,host,125,Scenario change',
+        ]
+        assert (tmp_path / 'messages.Login.host.007d.csv').read_text().splitlines() == [
+            'timestamp,direction,action_id,action',
+            '4.0,host,125,Scenario change',
+        ]
+        assert sink.get_statistics()['records'] == 8
+
+    def test_write_csv_quoted_header(self, tmp_path):
+        # Arrange
+        parser = ProtocolParser.from_settings({'Game': {'node': {'actions': {0x85: {'title': 'Move', 'structs': [
+            {'name': 'X, Y', 'type': 'unsigned char'},
+            {'name': 'Say "Hi"', 'type': 'unsigned char'},
+        ]}}}}})
+        sink = FileSink(str(tmp_path / 'messages.csv'), 'csv')
+
+        # Act
+        for record in parser.parse(b'\x85\x00\x01\x02', Direction.NODE, timestamp=1.0):
+            sink.write(record)
+        sink.close()
+
+        # Assert
+        assert (tmp_path / 'messages.node.0085.csv').read_text().splitlines() == [
+            'timestamp,direction,action_id,action,"X, Y","Say ""Hi"""',
+            '1.0,node,133,Move,1,2',
+        ]
+
+    def test_accepts(self, tmp_path):
+        # Arrange
+        sink = FileSink(str(tmp_path / 'messages.jsonl'), direction=Direction.HOST, actions=[0x7d])
+
+        # Act
+        # Assert
+        assert sink.accepts(Record(Direction.HOST, 0x7d)) is True
+        assert sink.accepts(Record(Direction.NODE, 0x7d)) is False
+        assert sink.accepts(Record(Direction.HOST, 0x85)) is False
+        sink.close()
+
+
+class TestSQLiteSink:
+    settings = TestFileSink.settings
+
+    def test___init___batch_size_invalid(self, tmp_path):
+        # Act
+        with raises(RuntimeError) as error:
+            SQLiteSink(str(tmp_path / 'session.db'), batch_size=10, max_rows=5)
+
+        # Assert
+        assert error.value.args == ('Error: The Sink batch_size (10) must be between 1 and max_rows (5).',)
+
+    def test_write(self, tmp_path):
+        # Arrange
+        path = str(tmp_path / 'session.db')
+        parser = ProtocolParser.from_settings(self.settings)
+        records = list(parser.parse(b'\x85\x00\x0c\x00\x01ab\x03\x04\x0a\x00\xff', Direction.NODE,
+                                    timestamp=1.5))
+        records += parser.parse(b'\x85\x00\x0d\x00\x02cd\x05\x06', Direction.NODE, timestamp=2.0)
+        records.append(Record(Direction.NODE, None, error=('S.o.S', 'Phone cabin')))
+        sink = SQLiteSink(path, batch_size=2)
+
+        # Act
+        for record in records:
+            sink.write(record)
+        sink.close()
+
+        # Assert
+        with connect(path) as connection:
+            assert connection.execute('PRAGMA journal_mode').fetchone() == ('wal',)
+            assert connection.execute('SELECT * FROM node_0085 ORDER BY timestamp').fetchall() == [
+                (1.5, 12, 'Up', b'ab', '[3,4]'),
+                (2.0, 13, 2, b'cd', '[5,6]'),
+            ]
+            assert [row[1] for row in connection.execute('PRAGMA table_info(node_0085)')] == [
+                'timestamp', 'X', 'field_1', 'Map', 'Path']
+            assert connection.execute('SELECT * FROM unknown').fetchall() == [(1.5, 'node', 0x0a, b'\xff')]
+            assert connection.execute('SELECT * FROM actions').fetchall() == [
+                ('node_0085', 'node', 0x85, 'Player move to')]
+            assert {row[1] for row in connection.execute("PRAGMA index_list('unknown')")} == {
+                'unknown_timestamp', 'unknown_action_id'}
+        statistics = sink.get_statistics()
+        assert statistics['records'] == statistics['rows'] == 3
+        assert statistics['dropped'] == statistics['errors'] == statistics['backlog'] == 0
+        assert statistics['tables'] == 1
+        assert statistics['transactions'] >= 1
+
+    def test_write_settings_changed(self, tmp_path):
+        # Arrange
+        path = str(tmp_path / 'session.db')
+        settings = {'Game': {'node': {'actions': {0x85: {'title': 'Player move to', 'structs': [
+            {'name': 'X', 'type': 'unsigned short'},
+        ]}}}}}
+        sink = SQLiteSink(path)
+        sink.write(next(iter(ProtocolParser.from_settings(settings).parse(b'\x85\x00\x0c\x00',
+                                                                          Direction.NODE))))
+        sink.close()
+        settings['Game']['node']['actions'][0x85]['structs'].append({'name': 'Y', 'type': 'unsigned short'})
+
+        # Act
+        sink = SQLiteSink(path)
+        sink.write(next(iter(ProtocolParser.from_settings(settings).parse(b'\x85\x00\x0d\x00\x0e\x00',
+                                                                          Direction.NODE))))
+        sink.close()
+
+        # Assert
+        with connect(path) as connection:
+            assert connection.execute('SELECT * FROM node_0085').fetchall() == [(0.0, 12, None), (0.0, 13, 14)]
+
+    @patch('src.sniparinject.core.sinks.Thread')
+    def test_write_dropped(self, mock_thread: MagicMock, tmp_path):
+        # Arrange
+        sink = SQLiteSink(str(tmp_path / 'session.db'), batch_size=1, max_rows=2)
+
+        # Act
+        for action_id in range(3):
+            sink.write(Record(Direction.HOST, action_id, data=memoryview(b'data')))
+
+        # Assert
+        assert mock_thread.return_value.start.call_count == 1
+        assert sink.get_statistics()['records'] == 2
+        assert sink.get_statistics()['dropped'] == 1
+        assert sink.get_statistics()['backlog'] == 2
+        assert sink._queue[0] == (Record(Direction.HOST, 0, data=b'data'), None)
+        sink.close()
+
+    def test_write_profile(self, tmp_path):
+        # Arrange
+        path = str(tmp_path / 'session.db')
+        settings = {'Game': {'host': {'actions': {0x7d: {'title': 'Scenario change', 'structs': [
+            {'name': 'Map', 'type': 'unsigned short'},
+            {'name': 'map', 'type': 'unsigned short'},
+            {'name': 'Timestamp', 'type': 'unsigned short'},
+        ]}}}}}
+        record = next(iter(ProtocolParser.from_settings(settings).parse(b'\x7d\x00\x01\x00\x02\x00\x03\x00',
+                                                                        Direction.HOST)))
+        sink = SQLiteSink(path)
+
+        # Act
+        sink.write(record)
+        sink.write(record, 'Login')
+        sink.close()
+        sink.close()
+
+        # Assert
+        with connect(path) as connection:
+            assert connection.execute('SELECT * FROM host_007d').fetchall() == [(0.0, 1, 2, 3)]
+            assert connection.execute('SELECT * FROM Login_host_007d').fetchall() == [(0.0, 1, 2, 3)]
+            assert [row[1] for row in connection.execute('PRAGMA table_info(Login_host_007d)')] == [
+                'timestamp', 'Map', 'map_1', 'Timestamp_2']
+            assert connection.execute('SELECT name FROM actions ORDER BY name').fetchall() == [
+                ('Login_host_007d',), ('host_007d',)]
+        assert sink.get_statistics()['tables'] == 2
+
+    @patch('src.sniparinject.core.sinks.Thread')
+    def test__run(self, mock_thread: MagicMock, tmp_path):
+        # Arrange
+        mock_thread.return_value.is_alive.return_value = False
+        sink = SQLiteSink(str(tmp_path / 'session.db'), commit_interval=0.5)
+        sink.write(Record(Direction.HOST, 1, data=b'data'))
+        timeouts = []
+
+        def wait(timeout: float) -> bool:
+            timeouts.append(timeout)
+            sink._stopped = len(timeouts) == 2
+            return True
+
+        # Act
+        with patch.object(sink._ready, 'wait', side_effect=wait):
+            sink._run()
+        sink.close()
+
+        # Assert
+        assert timeouts == [0.5, 0.5]
+        statistics = sink.get_statistics()
+        assert (statistics['rows'], statistics['transactions'], statistics['max_backlog']) == (1, 1, 1)
+        mock_thread.return_value.join.assert_not_called()
+
+    @patch('src.sniparinject.core.sinks.Thread')
+    def test__insert_database_error(self, mock_thread: MagicMock, tmp_path):
+        # Arrange
+        settings = {'Game': {'node': {'actions': {0x85: {'title': 'Player move to', 'structs': [
+            {'name': 'X', 'type': 'unsigned short'},
+        ]}}}}}
+        record = next(iter(ProtocolParser.from_settings(settings).parse(b'\x85\x00\x0c\x00', Direction.NODE)))
+        other = next(iter(ProtocolParser.from_settings(settings).parse(b'\x85\x00\x0d\x00', Direction.NODE)))
+        sink = SQLiteSink(str(tmp_path / 'session.db'))
+        sink._insert([(record, None)])
+        sink._connection.execute('DROP TABLE node_0085')
+
+        # Act
+        sink._insert([(record, None), (record, None)])
+        with patch.object(sink, '_get_rows', side_effect=DatabaseError('database is locked')):
+            sink._insert([(record, None)])
+        sink._insert([(other, None)])
+
+        # Assert
+        assert sink._connection.in_transaction is False
+        assert sink._connection.execute('SELECT * FROM node_0085').fetchall() == [(0.0, 13)]
+        statistics = sink.get_statistics()
+        assert (statistics['rows'], statistics['errors'], statistics['tables']) == (2, 3, 1)
+        sink.close()
+
+
+class TestSinkTable:
+    def test_from_settings(self, tmp_path):
+        # Arrange
+        settings = [
+            {'path': str(tmp_path / 'all.jsonl')},
+            {'path': str(tmp_path / 'moves.csv'), 'format': 'CSV', 'direction': 'Node', 'actions': [0x85],
+             'max_bytes': 1024, 'rotate_seconds': 60, 'compress': True},
+            {'path': str(tmp_path / 'session.db'), 'format': 'sqlite', 'batch_size': 500,
+             'commit_interval': 0.5},
+        ]
+
+        # Act
+        sinks = SinkTable.from_settings(settings)
+        sinks.close()
+
+        # Assert
+        assert [(sink.sink_format, sink.direction, sink.actions) for sink in sinks.sinks[:2]] == [
+            ('jsonl', None, None),
+            ('csv', Direction.NODE, frozenset({0x85})),
+        ]
+        assert isinstance(sinks.sinks[2], SQLiteSink)
+        assert (sinks.sinks[2].batch_size, sinks.sinks[2].commit_interval, sinks.sinks[2].max_rows) == (
+            500, 0.5, 262144)
+        assert sinks.sinks[1].file_options == {'max_bytes': 1024, 'rotate_seconds': 60.0, 'compress': True,
+                                               'buffer_size': 65536}
+
+    def test_from_settings_invalid(self, tmp_path):
+        # Arrange
+        settings = [
+            {'path': 'all.jsonl'},
+            [],
+            ['all.jsonl'],
+            [{'path': 'all.xml', 'format': 'xml'}],
+            [{'path': 'all.jsonl', 'direction': 'both'}],
+            [{'path': 'all.jsonl', 'actions': 0x85}],
+        ]
+
+        # Act
+        errors = []
+        for sink_settings in settings:
+            with raises(RuntimeError) as error:
+                SinkTable.from_settings(sink_settings)
+            errors.append(error.value.args)
+
+        # Assert
+        assert errors == [
+            ('Error: The Sinks are not a list of sinks.',),
+            ('Error: The Sinks are not a list of sinks.',),
+            ('Error: The Sink (all.jsonl) has no path.',),
+            ('Error: The Sink format (xml) is not jsonl, csv or sqlite.',),
+            ('Error: The Sink direction (both) is not host or node.',),
+            ('Error: The Sink actions (133) are not a list of IDs.',),
+        ]
+
+    def test_write(self):
+        # Arrange
+        sink_all = MagicMock()
+        sink_host = MagicMock()
+        sink_all.accepts.return_value = True
+        sink_host.accepts.side_effect = lambda record: record.direction is Direction.HOST
+        sinks = SinkTable([sink_all, sink_host])
+        records = [Record(Direction.HOST, 1), Record(Direction.NODE, 1), Record(Direction.HOST, 1)]
+
+        # Act
+        sinks.write(records, 'Login')
+
+        # Assert
+        assert sink_all.write.call_count == 3
+        assert sink_host.write.call_args_list == [call(records[0], 'Login'), call(records[2], 'Login')]
+        assert sink_host.accepts.call_count == 2
+
+    @patch('src.sniparinject.core.sinks.FileSink.close')
+    def test_from_settings_close_created(self, mock_close: MagicMock, tmp_path):
+        # Arrange
+        settings = [{'path': str(tmp_path / 'all.jsonl')}, {'path': str(tmp_path / 'all.xml'), 'format': 'xml'}]
+
+        # Act
+        with raises(RuntimeError) as error:
+            SinkTable.from_settings(settings)
+
+        # Assert
+        assert error.value.args == ('Error: The Sink format (xml) is not jsonl, csv or sqlite.',)
+        mock_close.assert_called_once_with()
+
+    def test_get_statistics(self):
+        # Arrange
+        sink = MagicMock()
+        sink.get_statistics.return_value = {'records': 2, 'bytes': 10, 'rotations': 1}
+
+        # Act
+        # Assert
+        assert SinkTable([sink, sink]).get_statistics() == {'sinks': 2, 'records': 4, 'bytes': 20,
+                                                            'rotations': 2}
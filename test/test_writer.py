@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+Unit Test.
+"""
+from io import StringIO
+from threading import Event
+from unittest.mock import MagicMock
+
+from pytest import raises
+
+from src.sniparinject.core.writer import ConsoleWriter
+
+
+class TestConsoleWriter:
+    def test___init__(self):
+        # Act
+        writer = ConsoleWriter()
+
+        # Assert
+        assert writer.buffer_lines == 256
+        assert writer.flush_interval == 0.05
+        assert writer.max_lines == 65536
+        assert writer.daemon is True
+        assert writer.get_statistics() == {'lines': 0, 'flushes': 0, 'dropped': 0, 'max_backlog': 0, 'backlog': 0}
+
+    def test___init___buffer_lines_invalid(self):
+        # Act
+        with raises(RuntimeError) as error:
+            ConsoleWriter(buffer_lines=10, max_lines=5)
+
+        # Assert
+        assert error.value.args == ('Error: The Output buffer_lines (10) must be between 1 and max_lines (5).',)
+
+    def test_from_settings(self):
+        # Act
+        writer = ConsoleWriter.from_settings({'buffer_lines': 8, 'flush_interval': 0.5})
+        default_writer = ConsoleWriter.from_settings(None)
+
+        # Assert
+        assert (writer.buffer_lines, writer.flush_interval, writer.max_lines) == (8, 0.5, 65536)
+        assert (default_writer.buffer_lines, default_writer.flush_interval) == (256, 0.05)
+
+    def test_write_drop(self):
+        # Arrange
+        stream = StringIO()
+        writer = ConsoleWriter(buffer_lines=2, max_lines=3, stream=stream)
+
+        # Act
+        writer.write(['Ji', 'Ja'])
+        writer.write(['Jo', 'Ju', 'Je'])
+        statistics = writer.get_statistics()
+        writer.stop()
+
+        # Assert
+        assert statistics == {'lines': 0, 'flushes': 0, 'dropped': 2, 'max_backlog': 3, 'backlog': 3}
+        assert stream.getvalue() == 'Ji\nJa\nJo\n'
+        assert writer.get_statistics() == {'lines': 3, 'flushes': 1, 'dropped': 2, 'max_backlog': 3, 'backlog': 0}
+
+    def test_stop_not_started_empty(self):
+        # Arrange
+        stream = MagicMock()
+        writer = ConsoleWriter(stream=stream)
+
+        # Act
+        writer.stop()
+
+        # Assert
+        stream.write.assert_not_called()
+        assert writer.get_statistics()['flushes'] == 0
+
+    def test_run_buffer_lines(self):
+        # Arrange
+        written = Event()
+        stream = MagicMock()
+        stream.write.side_effect = lambda text: written.set()
+        writer = ConsoleWriter(buffer_lines=3, flush_interval=60, stream=stream)
+
+        # Act
+        writer.start()
+        writer.write(['Ji'])
+        writer.write(['Ja'])
+        early = written.wait(0.05)
+        writer.write(['Jo'])
+        full = written.wait(5)
+        writer.write(['Ju'])
+        writer.stop()
+
+        # Assert
+        assert (early, full) == (False, True)
+        assert [args[0] for args, _ in stream.write.call_args_list] == ['Ji\nJa\nJo\n', 'Ju\n']
+        assert not writer.is_alive()
+        assert writer.get_statistics()['flushes'] == 2
+
+    def test_run_flush_interval(self):
+        # Arrange
+        written = Event()
+        stream = MagicMock()
+        stream.write.side_effect = lambda text: written.set()
+        writer = ConsoleWriter(buffer_lines=100, flush_interval=0.01, stream=stream)
+
+        # Act
+        writer.start()
+        writer.write(['Ji'])
+        flushed = written.wait(5)
+        writer.stop()
+
+        # Assert
+        assert flushed is True
+        stream.write.assert_called_once_with('Ji\n')
+        stream.flush.assert_called_once_with()
+        assert writer.get_statistics()['lines'] == 1